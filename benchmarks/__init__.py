@@ -0,0 +1 @@
+"""Sunlight benchmark harnesses."""
@@ -0,0 +1,79 @@
+"""Compare parser engines (native / auto / mineru) on real PDFs.
+
+Reports wall time, pages sent to MinerU and paragraph counts per engine::
+
+    python -m benchmarks.engine_bench test.pdf other.pdf
+    python -m benchmarks.engine_bench test.pdf --engines native auto
+
+``mineru`` is skipped when the MinerU CLI is not on PATH. MinerU results are
+cached under ``output/``, so pass ``--fresh`` to time a cold run.
+"""
+from __future__ import annotations
+
+import argparse
+import shutil
+import time
+from pathlib import Path
+from typing import Dict, List
+
+from src.parser import PaperParser
+from src.utils.tracing import get_tracer
+
+
+def bench_pdf(pdf_path: Path, engine: str) -> dict:
+    tracer = get_tracer()
+    tracer.reset()
+    started = time.perf_counter()
+    paper = PaperParser(engine=engine).parse(pdf_path)
+    elapsed = time.perf_counter() - started
+    mineru_s = sum(s.duration for s in tracer.spans if s.name == "mineru")
+    return {
+        "engine": engine,
+        "pdf": pdf_path.name,
+        "elapsed_s": round(elapsed, 3),
+        "mineru_s": round(mineru_s, 3),
+        "mineru_pages": tracer.counter("parse.mineru_fallback_pages"),
+        "paragraphs": len(paper.body),
+        "tables": len(paper.tables),
+        "figures": len(paper.figures),
+    }
+
+
+def available_engines(requested: List[str]) -> List[str]:
+    has_mineru = shutil.which("mineru") is not None
+    return [e for e in requested if e != "mineru" or has_mineru]
+
+
+def format_results(runs: List[Dict]) -> str:
+    lines = [f"{'pdf':<24} {'engine':<7} {'sec':>8} {'mineru s':>9} {'fb pages':>9} {'paras':>6} {'tables':>6}", "-" * 76]
+    for r in runs:
+        lines.append(
+            f"{r['pdf'][:24]:<24} {r['engine']:<7} {r['elapsed_s']:>8.2f} {r['mineru_s']:>9.2f} "
+            f"{r['mineru_pages']:>9g} {r['paragraphs']:>6} {r['tables']:>6}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parser engine comparison")
+    parser.add_argument("pdfs", nargs="+", type=Path)
+    parser.add_argument("--engines", nargs="+", choices=PaperParser.ENGINES, default=list(PaperParser.ENGINES))
+    parser.add_argument("--fresh", action="store_true", help="output/<pdf> MinerU 캐시 삭제 후 측정")
+    args = parser.parse_args()
+
+    engines = available_engines(args.engines)
+    skipped = sorted(set(args.engines) - set(engines))
+    if skipped:
+        print(f"skipped (mineru CLI not found): {', '.join(skipped)}")
+
+    runs = []
+    for pdf_path in args.pdfs:
+        for engine in engines:
+            if args.fresh:
+                shutil.rmtree(Path("output") / pdf_path.stem, ignore_errors=True)
+            runs.append(bench_pdf(pdf_path, engine))
+    print(format_results(runs))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,313 @@
+"""Local OpenAI-compatible stub server for translation benchmarks and tests.
+
+Serves ``POST /v1/chat/completions``. Each separator-delimited segment of the
+last user message is "translated" deterministically as ``"[<lang>] <segment>"``.
+Latency, HTTP 429/500 errors and malformed (separator-dropping) replies are
+injected according to :class:`StubConfig`. Requests with ``"stream": true``
+get a chunked ``text/event-stream`` reply (``chat.completion.chunk`` events,
+optional usage chunk, ``[DONE]``); ``stream_cut_rate`` drops the connection
+midway and ``stream_length_rate`` ends early with ``finish_reason="length"``.
+
+Prompt caching is simulated at message granularity: the longest run of
+leading messages seen in an earlier request counts as cached (if at least
+``cache_min_tokens``, rounded down to 128 tokens like OpenAI) and is reported
+as ``usage.prompt_tokens_details.cached_tokens``::
+
+    with MockOpenAIServer(StubConfig(latency="lognormal", latency_ms=300)) as server:
+        translator = PaperTranslator(api_key="stub", base_url=server.base_url)
+"""
+from __future__ import annotations
+
+import json
+import random
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+SEPARATOR = "---PARAGRAPH_SEPARATOR---"
+
+
+@dataclass
+class StubConfig:
+    """Behaviour of the stub server.
+
+    latency: ``"constant"``, ``"uniform"`` (0..2*latency_ms) or ``"lognormal"``
+        (median latency_ms, sigma latency_sigma).
+    latency_per_token_ms: extra latency per completion token, so larger
+        batches take longer like a real model.
+    straggler_rate / straggler_ms: share of requests that get *straggler_ms*
+        extra latency (a slow replica), for tail-latency hedging.
+    """
+
+    latency: str = "constant"
+    latency_ms: float = 0.0
+    latency_sigma: float = 0.5
+    latency_per_token_ms: float = 0.0
+    straggler_rate: float = 0.0
+    straggler_ms: float = 0.0
+    rate_429: float = 0.0
+    rate_500: float = 0.0
+    malformed_rate: float = 0.0
+    stream_cut_rate: float = 0.0
+    stream_length_rate: float = 0.0
+    stream_chunk_chars: int = 16
+    cache_min_tokens: int = 1024
+    seed: int = 0
+
+
+@dataclass
+class StubStats:
+    requests: int = 0
+    status: Dict[int, int] = field(default_factory=dict)
+    malformed: int = 0
+    streams: int = 0
+    stream_cuts: int = 0
+    prompt_tokens: int = 0
+    cached_tokens: int = 0
+    completion_tokens: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+
+
+def estimate_tokens(text: str) -> int:
+    return len(text) // 4 + 1
+
+
+def _usage(plan: dict) -> dict:
+    return {
+        "prompt_tokens": plan["prompt_tokens"],
+        "completion_tokens": plan["completion_tokens"],
+        "total_tokens": plan["prompt_tokens"] + plan["completion_tokens"],
+        "prompt_tokens_details": {"cached_tokens": plan["cached_tokens"]},
+    }
+
+
+class MockOpenAIServer:
+    """Threaded stub server; use as a context manager or call start()/stop()."""
+
+    def __init__(self, config: StubConfig | None = None, host: str = "127.0.0.1", port: int = 0):
+        self.config = config or StubConfig()
+        self.stats = StubStats()
+        self._rng = random.Random(self.config.seed)
+        self._lock = threading.Lock()
+        self._prefixes: set[int] = set()
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> "MockOpenAIServer":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "MockOpenAIServer":
+        return self.start()
+
+    def __exit__(self, *exc) -> None:
+        self.stop()
+
+    # ------------------------------------------------------------------
+
+    def _draw(self) -> tuple[float, float]:
+        """Return (base latency in seconds, uniform draw for fault injection)."""
+        cfg = self.config
+        with self._lock:
+            if cfg.latency == "uniform":
+                latency = self._rng.uniform(0, 2 * cfg.latency_ms)
+            elif cfg.latency == "lognormal" and cfg.latency_ms > 0:
+                latency = self._rng.lognormvariate(0, cfg.latency_sigma) * cfg.latency_ms
+            else:
+                latency = cfg.latency_ms
+            if cfg.straggler_rate and self._rng.random() < cfg.straggler_rate:
+                latency += cfg.straggler_ms
+            return latency / 1000, self._rng.random()
+
+    def _cached_tokens(self, messages: list[dict]) -> int:
+        """Tokens of the longest already-seen run of leading messages (0 below the minimum)."""
+        cached = 0
+        with self._lock:
+            prefix = ""
+            for message in messages[:-1]:
+                prefix += f"{message.get('role')}\x00{message.get('content', '')}\x00"
+                key = hash(prefix)
+                if key in self._prefixes:
+                    cached = estimate_tokens(prefix)
+                self._prefixes.add(key)
+        if cached < self.config.cache_min_tokens:
+            return 0
+        return cached - cached % 128
+
+    def _plan(self, body: dict) -> dict:
+        """Decide the reply for one request (status, content, fault, latency)."""
+        cfg = self.config
+        latency, roll = self._draw()
+        messages = body.get("messages") or []
+        prompt = "".join(str(m.get("content", "")) for m in messages)
+        payload = str(messages[-1].get("content", "")) if messages else ""
+        plan = {"latency": latency, "status": 200}
+
+        if roll < cfg.rate_429:
+            plan.update(status=429, error={"message": "Rate limit reached (stub)", "type": "rate_limit_error"})
+            return plan
+        if roll < cfg.rate_429 + cfg.rate_500:
+            plan.update(status=500, error={"message": "Internal error (stub)", "type": "server_error"})
+            return plan
+
+        segments = [s.strip() for s in payload.split(SEPARATOR)]
+        translated = [f"[ko] {s}" for s in segments]
+        threshold = cfg.rate_429 + cfg.rate_500 + cfg.malformed_rate
+        malformed = len(translated) > 1 and roll < threshold
+        if malformed:
+            translated[-2:] = [" ".join(translated[-2:])]
+        # Stream faults use their own slice of the same draw
+        stream_fault = None
+        if not malformed and roll < threshold + cfg.stream_cut_rate:
+            stream_fault = "cut"
+        elif not malformed and roll < threshold + cfg.stream_cut_rate + cfg.stream_length_rate:
+            stream_fault = "length"
+        plan.update(
+            content=f"\n{SEPARATOR}\n".join(translated),
+            malformed=malformed,
+            stream_fault=stream_fault,
+            prompt_tokens=estimate_tokens(prompt),
+        )
+        plan["cached_tokens"] = min(self._cached_tokens(messages), plan["prompt_tokens"])
+        plan["completion_tokens"] = estimate_tokens(plan["content"])
+        return plan
+
+    def _account(self, plan: dict) -> None:
+        with self._lock:
+            self.stats.malformed += int(plan["malformed"])
+            self.stats.prompt_tokens += plan["prompt_tokens"]
+            self.stats.cached_tokens += plan["cached_tokens"]
+            self.stats.completion_tokens += plan["completion_tokens"]
+
+    def _complete(self, body: dict) -> tuple[int, dict]:
+        cfg = self.config
+        plan = self._plan(body)
+        if plan["status"] != 200:
+            time.sleep(plan["latency"])
+            return plan["status"], {"error": plan["error"]}
+
+        content = plan["content"]
+        prompt_tokens = plan["prompt_tokens"]
+        completion_tokens = plan["completion_tokens"]
+        time.sleep(plan["latency"] + completion_tokens * cfg.latency_per_token_ms / 1000)
+        self._account(plan)
+        return 200, {
+            "id": f"chatcmpl-stub-{self.stats.requests}",
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": body.get("model", "stub"),
+            "choices": [{
+                "index": 0,
+                "message": {"role": "assistant", "content": content},
+                "finish_reason": "stop",
+            }],
+            "usage": _usage(plan),
+        }
+
+    def _make_handler(self):
+        stub = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_POST(self) -> None:  # noqa: N802 (http.server API)
+                started = time.perf_counter()
+                length = int(self.headers.get("Content-Length") or 0)
+                body = json.loads(self.rfile.read(length) or b"{}")
+                if self.path.rstrip("/").endswith("/chat/completions") and body.get("stream"):
+                    status = self._stream(body)
+                else:
+                    if self.path.rstrip("/").endswith("/chat/completions"):
+                        status, payload = stub._complete(body)
+                    else:
+                        status, payload = 404, {"error": {"message": f"unknown path {self.path}"}}
+                    self._send_json(status, payload)
+                with stub._lock:
+                    stub.stats.requests += 1
+                    stub.stats.status[status] = stub.stats.status.get(status, 0) + 1
+                    stub.stats.latencies_ms.append((time.perf_counter() - started) * 1000)
+
+            def _stream(self, body: dict) -> int:
+                """Send the completion as SSE chunks; returns the HTTP status."""
+                cfg = stub.config
+                plan = stub._plan(body)
+                time.sleep(plan["latency"])
+                if plan["status"] != 200:
+                    self._send_json(plan["status"], {"error": plan["error"]})
+                    return plan["status"]
+
+                content = plan["content"]
+                size = max(1, cfg.stream_chunk_chars)
+                pieces = [content[i : i + size] for i in range(0, len(content), size)] or [""]
+                fault = plan["stream_fault"]
+                stop_at = len(pieces) // 2 if fault else len(pieces)
+                with stub._lock:
+                    stub.stats.streams += 1
+                    stub.stats.stream_cuts += int(fault == "cut")
+
+                self.send_response(200)
+                self.send_header("Content-Type", "text/event-stream")
+                self.send_header("Transfer-Encoding", "chunked")
+                self.end_headers()
+                base = {"id": f"chatcmpl-stub-{stub.stats.requests}", "object": "chat.completion.chunk",
+                        "created": int(time.time()), "model": body.get("model", "stub")}
+                for piece in pieces[:stop_at]:
+                    time.sleep(estimate_tokens(piece) * cfg.latency_per_token_ms / 1000)
+                    self._send_event({**base, "choices": [
+                        {"index": 0, "delta": {"role": "assistant", "content": piece}, "finish_reason": None}]})
+                if fault == "cut":
+                    # Drop the connection without the terminating chunk
+                    self.close_connection = True
+                    return 200
+
+                stub._account(plan)
+                finish = "length" if fault == "length" else "stop"
+                self._send_event({**base, "choices": [{"index": 0, "delta": {}, "finish_reason": finish}]})
+                if (body.get("stream_options") or {}).get("include_usage"):
+                    self._send_event({**base, "choices": [], "usage": _usage(plan)})
+                self._send_chunk(b"data: [DONE]\n\n")
+                self._send_chunk(b"")
+                return 200
+
+            def _send_event(self, payload: dict) -> None:
+                self._send_chunk(f"data: {json.dumps(payload, ensure_ascii=False)}\n\n".encode("utf-8"))
+
+            def _send_chunk(self, data: bytes) -> None:
+                self.wfile.write(f"{len(data):X}\r\n".encode("ascii") + data + b"\r\n")
+                self.wfile.flush()
+
+            def _send_json(self, status: int, payload: dict) -> None:
+                data = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                try:
+                    self.wfile.write(data)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # client gave up (timeout or cancelled hedge)
+
+            def log_message(self, format, *args) -> None:  # noqa: A002
+                pass
+
+        return _Handler
+
+    def stats_dict(self) -> dict:
+        with self._lock:
+            data = asdict(self.stats)
+        data.pop("latencies_ms")
+        data["status"] = {str(k): v for k, v in data["status"].items()}
+        return data
@@ -0,0 +1,322 @@
+"""Parser micro-benchmark over the recorded content-list corpus (no MinerU).
+
+Times each stage of ``PaperParser.parse_blocks`` (layout, classify,
+paragraphs, extras) plus ``LatexNormalizer`` and ``ContentClassifier`` on
+their own, and gates regressions::
+
+    python -m benchmarks.parser_bench --large --save-baseline baseline.json
+    python -m benchmarks.parser_bench --large --check baseline.json --tolerance 1.5
+
+The gate fails (exit 1) when a stage gets slower than ``tolerance`` times the
+baseline, or when the per-block cost on the largest file exceeds
+``max_scaling`` times the per-block cost on the smallest (super-linear growth).
+
+``--layout`` compares ``LayoutAnalyzer`` against a pure-Python port that makes
+the same decisions with per-pair comparisons, on the corpus and on synthetic
+pages of growing density, and checks both produce identical layouts::
+
+    python -m benchmarks.parser_bench --layout --min-layout-speedup 2
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Sequence
+
+from benchmarks.parser_corpus import ensure_corpus
+from src.parser import ContentClassifier, LatexNormalizer, LayoutAnalyzer, PaperParser
+from src.utils.tracing import get_tracer
+
+STAGES = ("layout", "classify", "paragraphs", "extras")
+DENSE_PAGE_SIZES = (20, 50, 100, 200, 400)
+
+
+def bench_file(path: Path, repeat: int = 5) -> dict:
+    """Median per-stage timings in milliseconds for one content list."""
+    started = time.perf_counter()
+    blocks = PaperParser.load_content_list(path)
+    load_ms = (time.perf_counter() - started) * 1000
+
+    tracer = get_tracer()
+    parser = PaperParser()
+    normalizer = LatexNormalizer()
+    classifier = ContentClassifier()
+    texts = [b.get("text", "") for b in blocks if b.get("type") == "text"]
+
+    samples: Dict[str, List[float]] = {name: [] for name in (*STAGES, "total", "normalizer", "classifier")}
+    paragraphs = 0
+    for _ in range(repeat):
+        tracer.reset()
+        started = time.perf_counter()
+        paper = parser.parse_blocks(blocks)
+        samples["total"].append((time.perf_counter() - started) * 1000)
+        paragraphs = len(paper.body)
+        for span in tracer.spans:
+            if span.name in STAGES:
+                samples[span.name].append(span.duration * 1000)
+
+        started = time.perf_counter()
+        for text in texts:
+            normalizer.normalize(text)
+        samples["normalizer"].append((time.perf_counter() - started) * 1000)
+
+        started = time.perf_counter()
+        for block in blocks:
+            classifier.is_body_text(block)
+        samples["classifier"].append((time.perf_counter() - started) * 1000)
+
+    stages_ms = {name: round(statistics.median(values), 3) for name, values in samples.items() if values}
+    return {
+        "file": path.name,
+        "blocks": len(blocks),
+        "paragraphs": paragraphs,
+        "load_ms": round(load_ms, 3),
+        "stages_ms": stages_ms,
+        "us_per_block": round(stages_ms["total"] * 1000 / max(len(blocks), 1), 3),
+    }
+
+
+def pairwise_annotate(blocks: Iterable[dict], analyzer: LayoutAnalyzer, is_flow: Callable[[dict], bool] | None = None) -> List[dict]:
+    """Reference port of ``LayoutAnalyzer.annotate`` using per-pair Python checks.
+
+    Columns come from single-linkage over every pair of narrow blocks whose x
+    starts lie within the gap, and bands from comparing each block against every
+    spanning block top. The output must match the vectorized analyzer exactly.
+    """
+    is_flow = is_flow or (lambda b: b.get("type", "text") in analyzer.flow_types)
+    pages: Dict[int, List[dict]] = {}
+    for block in blocks:
+        pages.setdefault(block.get("page_idx", 0), []).append(block)
+
+    result: List[dict] = []
+    for page in pages.values():
+        if not page or not LayoutAnalyzer._has_bboxes(page):
+            result.extend(page)
+            continue
+        n = len(page)
+        x0 = [float(b["bbox"][0]) for b in page]
+        y0 = [float(b["bbox"][1]) for b in page]
+        x1 = [float(b["bbox"][2]) for b in page]
+        widths = [x1[i] - x0[i] for i in range(n)]
+        page_width = max(x1) - min(x0)
+        spanning = [page_width > 0 and widths[i] > analyzer.span_ratio * page_width for i in range(n)]
+
+        columns = [-1] * n
+        narrow = [i for i in range(n) if not spanning[i]]
+        if narrow:
+            gap = analyzer.gap_ratio * statistics.median(widths[i] for i in narrow)
+            parent = {i: i for i in narrow}
+
+            def find(i: int) -> int:
+                while parent[i] != i:
+                    parent[i] = parent[parent[i]]
+                    i = parent[i]
+                return i
+
+            for a in narrow:
+                for b in narrow:
+                    if a < b and abs(x0[a] - x0[b]) <= gap:
+                        parent[find(a)] = find(b)
+            groups: Dict[int, List[int]] = {}
+            for i in narrow:
+                groups.setdefault(find(i), []).append(i)
+            ordered = sorted(groups.values(), key=lambda g: min(x0[i] for i in g))
+            overlap = any(
+                min(x0[i] for i in ordered[k + 1]) < max(x1[i] for i in ordered[k])
+                for k in range(len(ordered) - 1)
+            )
+            for label, group in enumerate(ordered):
+                for i in group:
+                    columns[i] = 0 if overlap else label
+
+        tops = [y0[i] for i in range(n) if spanning[i]]
+        bands = [sum(1 for top in tops if top <= y0[i]) for i in range(n)]
+        order = sorted(range(n), key=lambda i: (bands[i], columns[i], y0[i]))
+
+        flow = [i for i in order if is_flow(page[i])]
+        heads, tails = set(), set()
+        for k, i in enumerate(flow):
+            key = (bands[i], columns[i])
+            if k == 0 or (bands[flow[k - 1]], columns[flow[k - 1]]) != key:
+                heads.add(i)
+            if k == len(flow) - 1 or (bands[flow[k + 1]], columns[flow[k + 1]]) != key:
+                tails.add(i)
+
+        for rank, i in enumerate(order):
+            result.append({
+                **page[i],
+                "layout": {
+                    "band": bands[i],
+                    "column": columns[i],
+                    "order": rank,
+                    "col_head": i in heads,
+                    "col_tail": i in tails,
+                },
+            })
+    return result
+
+
+def dense_page(blocks_per_page: int, columns: int = 2) -> List[dict]:
+    """One synthetic page with *blocks_per_page* short text blocks in *columns* columns."""
+    width = 540 / columns
+    blocks = []
+    for i in range(blocks_per_page):
+        col, row = i % columns, i // columns
+        # x 시작을 조금씩 흔들어 실제 추출 결과처럼 만든다
+        x = 36 + col * width + (i * 7 % 5) * 0.5
+        blocks.append({"type": "text", "text": f"line {i}", "page_idx": 0, "bbox": [x, 40 + row * 10, x + width - 20, 48 + row * 10]})
+    return blocks
+
+
+def bench_layout(blocks: List[dict], repeat: int = 5, is_flow: Callable[[dict], bool] | None = None) -> dict:
+    """Best-of-*repeat* timings of vectorized vs pairwise layout analysis on *blocks*."""
+    analyzer = LayoutAnalyzer()
+    vectorized = analyzer.annotate(blocks, is_flow=is_flow)
+    pairwise = pairwise_annotate(blocks, analyzer, is_flow=is_flow)
+    if [b.get("layout") for b in vectorized] != [b.get("layout") for b in pairwise]:
+        raise AssertionError("vectorized and pairwise layout analysis disagree")
+
+    def best_ms(fn: Callable[[], object]) -> float:
+        best = float("inf")
+        for _ in range(repeat):
+            started = time.perf_counter()
+            fn()
+            best = min(best, time.perf_counter() - started)
+        return best * 1000
+
+    vectorized_ms = best_ms(lambda: analyzer.annotate(blocks, is_flow=is_flow))
+    pairwise_ms = best_ms(lambda: pairwise_annotate(blocks, analyzer, is_flow=is_flow))
+    pages = len({b.get("page_idx", 0) for b in blocks})
+    return {
+        "blocks": len(blocks),
+        "blocks_per_page": round(len(blocks) / max(pages, 1), 1),
+        "vectorized_ms": round(vectorized_ms, 3),
+        "pairwise_ms": round(pairwise_ms, 3),
+        "speedup": round(pairwise_ms / vectorized_ms, 2) if vectorized_ms else 0.0,
+    }
+
+
+def run_layout(include_large: bool = False, repeat: int = 5, sizes: Sequence[int] = DENSE_PAGE_SIZES) -> Dict[str, dict]:
+    """Layout comparison on each corpus file and on dense synthetic pages."""
+    is_flow = ContentClassifier().is_body_text
+    results = {
+        name: bench_layout(PaperParser.load_content_list(path), repeat, is_flow)
+        for name, path in ensure_corpus(include_large).items()
+    }
+    for size in sizes:
+        results[f"dense_{size}"] = bench_layout(dense_page(size), repeat, is_flow)
+    return results
+
+
+def check_layout(results: Dict[str, dict], min_speedup: float) -> List[str]:
+    """The densest page must run at least *min_speedup* x faster vectorized than pairwise."""
+    dense = [r for r in results.values() if r["blocks_per_page"] >= 100]
+    if not dense:
+        return []
+    densest = max(dense, key=lambda r: r["blocks_per_page"])
+    if densest["speedup"] < min_speedup:
+        return [
+            f"layout: {densest['blocks_per_page']:.0f} blocks/page only {densest['speedup']:.2f}x faster "
+            f"than pairwise (< {min_speedup}x)"
+        ]
+    return []
+
+
+def format_layout(results: Dict[str, dict]) -> str:
+    header = f"{'case':<14} {'blocks':>7} {'per page':>9} {'vector ms':>10} {'pairwise ms':>12} {'speedup':>8}"
+    lines = [header, "-" * len(header)]
+    for name, r in results.items():
+        lines.append(
+            f"{name:<14} {r['blocks']:>7} {r['blocks_per_page']:>9.1f} "
+            f"{r['vectorized_ms']:>10.2f} {r['pairwise_ms']:>12.2f} {r['speedup']:>7.2f}x"
+        )
+    return "\n".join(lines)
+
+
+def run(include_large: bool = False, repeat: int = 5) -> Dict[str, dict]:
+    return {name: bench_file(path, repeat) for name, path in ensure_corpus(include_large).items()}
+
+
+def check(results: Dict[str, dict], baseline: Dict[str, dict], tolerance: float = 1.5, max_scaling: float = 3.0) -> List[str]:
+    """Return human-readable regression messages (empty list = pass)."""
+    problems: List[str] = []
+    for name, result in results.items():
+        old = baseline.get(name)
+        if not old:
+            continue
+        for stage, value in result["stages_ms"].items():
+            prev = old["stages_ms"].get(stage)
+            # 1ms 미만 단계는 측정 잡음이 커서 제외
+            if prev and prev >= 1.0 and value > prev * tolerance:
+                problems.append(f"{name}/{stage}: {value:.2f} ms > {tolerance}x baseline {prev:.2f} ms")
+
+    problems.extend(check_scaling(results, max_scaling))
+    return problems
+
+
+def check_scaling(results: Dict[str, dict], max_scaling: float = 3.0) -> List[str]:
+    """Per-block cost of the largest file must stay within *max_scaling* x the smallest."""
+    if len(results) < 2:
+        return []
+    ordered = sorted(results.values(), key=lambda r: r["blocks"])
+    smallest, largest = ordered[0], ordered[-1]
+    if largest["us_per_block"] > smallest["us_per_block"] * max_scaling:
+        return [
+            f"scaling: {largest['file']} costs {largest['us_per_block']:.1f} us/block, "
+            f"> {max_scaling}x {smallest['file']} ({smallest['us_per_block']:.1f} us/block)"
+        ]
+    return []
+
+
+def format_results(results: Dict[str, dict]) -> str:
+    header = f"{'file':<14} {'blocks':>7} {'paras':>6} " + " ".join(f"{s:>10}" for s in (*STAGES, "total")) + f" {'us/block':>9}"
+    lines = [header, "-" * len(header)]
+    for name, r in results.items():
+        stages = " ".join(f"{r['stages_ms'].get(s, 0):>10.2f}" for s in (*STAGES, "total"))
+        lines.append(f"{name:<14} {r['blocks']:>7} {r['paragraphs']:>6} {stages} {r['us_per_block']:>9.1f}")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Parser micro-benchmark")
+    parser.add_argument("--large", action="store_true", help="large/xlarge corpus 포함")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--save-baseline", help="결과를 baseline JSON으로 저장")
+    parser.add_argument("--check", help="baseline JSON과 비교해 회귀 시 exit 1")
+    parser.add_argument("--tolerance", type=float, default=1.5)
+    parser.add_argument("--max-scaling", type=float, default=3.0)
+    parser.add_argument("--layout", action="store_true", help="벡터화 vs 쌍별 비교 레이아웃 분석 시간 비교")
+    parser.add_argument("--min-layout-speedup", type=float, default=0.0, help="가장 빽빽한 페이지의 최소 속도 향상 배수")
+    args = parser.parse_args()
+
+    if args.layout:
+        layout = run_layout(args.large, args.repeat)
+        print(format_layout(layout))
+        problems = check_layout(layout, args.min_layout_speedup) if args.min_layout_speedup else []
+        for problem in problems:
+            print(f"REGRESSION {problem}")
+        sys.exit(1 if problems else 0)
+
+    results = run(args.large, args.repeat)
+    print(format_results(results))
+
+    if args.save_baseline:
+        Path(args.save_baseline).write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"baseline saved: {args.save_baseline}")
+
+    if args.check:
+        baseline = json.loads(Path(args.check).read_text(encoding="utf-8"))
+        problems = check(results, baseline, args.tolerance, args.max_scaling)
+    else:
+        problems = check_scaling(results, args.max_scaling)
+    for problem in problems:
+        print(f"REGRESSION {problem}")
+    sys.exit(1 if problems else 0)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,165 @@
+"""Parser benchmark corpus of MinerU ``*_content_list.json`` files.
+
+The committed files in ``benchmarks/corpus/`` follow the MinerU 2.x pipeline
+content-list format (normalized x1000 bboxes, ``page_idx``, ``text_level``,
+``table_body``/``table_caption``, OCR-style spaced LaTeX). They are produced by
+this deterministic generator so that very large inputs do not have to be
+committed: ``large`` and ``xlarge`` are written to ``benchmarks/corpus/generated/``
+on first use::
+
+    python -m benchmarks.parser_corpus            # (re)write committed files
+    python -m benchmarks.parser_corpus --large    # also write large/xlarge
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, List
+
+CORPUS_DIR = Path(__file__).resolve().parent / "corpus"
+GENERATED_DIR = CORPUS_DIR / "generated"
+
+
+@dataclass(frozen=True)
+class CorpusSpec:
+    pages: int
+    columns: int
+    math_ratio: float
+    committed: bool = True
+
+
+CORPUS: Dict[str, CorpusSpec] = {
+    "small_1col": CorpusSpec(pages=4, columns=1, math_ratio=0.1),
+    "medium_2col": CorpusSpec(pages=16, columns=2, math_ratio=0.15),
+    "math_2col": CorpusSpec(pages=12, columns=2, math_ratio=0.7),
+    "large_2col": CorpusSpec(pages=150, columns=2, math_ratio=0.2, committed=False),
+    "xlarge_2col": CorpusSpec(pages=600, columns=2, math_ratio=0.2, committed=False),
+}
+
+_WORDS = (
+    "we propose model training data attention layer token gradient loss network "
+    "transformer baseline benchmark accuracy results method approach representation "
+    "encoder decoder sequence learning optimization parameter evaluation dataset"
+).split()
+
+_INLINE_MATH = [
+    r"$\mathrm { x } _ { i } ^ { 2 }$",
+    r"$1 0 0 \%$",
+    r"$\mathbf { W } \in \mathbb { R } ^ { d \times d }$",
+    r"$0 . 5$",
+    r"$\text { s o f t m a x } ( q k ^ { \top } )$",
+    r"$\alpha _ { t }$",
+]
+
+
+def _sentence(rng: random.Random, math_ratio: float) -> str:
+    words = [rng.choice(_WORDS) for _ in range(rng.randint(8, 20))]
+    if rng.random() < math_ratio:
+        for _ in range(rng.randint(1, 3)):
+            words.insert(rng.randrange(len(words)), rng.choice(_INLINE_MATH))
+    return " ".join(words).capitalize() + "."
+
+
+def generate(name: str, spec: CorpusSpec, seed: int = 0) -> List[dict]:
+    """Build a deterministic content list for *spec*."""
+    rng = random.Random(f"{name}:{seed}")
+    blocks: List[dict] = []
+    col_width = 880 // spec.columns - 20 * (spec.columns - 1)
+    section = 1
+
+    def text_block(page: int, col: int, y: int, height: int, text: str, **extra) -> dict:
+        x0 = 60 + col * (col_width + 40)
+        return {"type": "text", "text": text, "bbox": [x0, y, x0 + col_width, y + height], "page_idx": page, **extra}
+
+    for page in range(spec.pages):
+        blocks.append({"type": "header", "text": "Preprint. Under review.", "bbox": [60, 20, 400, 40], "page_idx": page})
+        if page == 0:
+            blocks.append({"type": "text", "text": "A Synthetic Study of Paper Parsing", "text_level": 1,
+                           "bbox": [150, 60, 850, 100], "page_idx": 0})
+            blocks.append({"type": "text", "text": "Alice Kim, Bob Lee\nSunlight University",
+                           "bbox": [300, 110, 700, 150], "page_idx": 0})
+            blocks.append({"type": "text", "text": "Abstract " + " ".join(_sentence(rng, spec.math_ratio) for _ in range(4)),
+                           "bbox": [120, 160, 880, 300], "page_idx": 0})
+            blocks.append(text_block(0, 0, 320, 30, f"{section} Introduction", text_level=1))
+            section += 1
+        y_start = 360 if page == 0 else 60
+        for col in range(spec.columns):
+            y = y_start
+            while y < 880:
+                roll = rng.random()
+                height = rng.randint(60, 180)
+                if roll < 0.06:
+                    blocks.append(text_block(page, col, y, 30, f"{section} Section {section}", text_level=1))
+                    section += 1
+                    height = 30
+                elif roll < 0.12:
+                    latex = r"\mathcal { L } = - \sum _ { i } y _ { i } \log p _ { i }"
+                    x0 = 60 + col * (col_width + 40) + 40
+                    blocks.append({"type": "equation", "text": f"$${latex}$$", "text_format": "latex",
+                                   "bbox": [x0, y, x0 + col_width - 80, y + 40], "page_idx": page})
+                    height = 40
+                elif roll < 0.15:
+                    rows = "".join(
+                        f"<tr><td>{rng.choice(_WORDS)}</td><td>{rng.randint(50, 99)}.{rng.randint(0, 9)}</td></tr>"
+                        for _ in range(rng.randint(3, 8))
+                    )
+                    blocks.append({"type": "table", "img_path": f"images/t{page}_{col}_{y}.jpg",
+                                   "table_caption": [f"Table: {_sentence(rng, 0)}"], "table_footnote": [],
+                                   "table_body": f"<table><tr><th>Method</th><th>Score</th></tr>{rows}</table>",
+                                   "bbox": text_block(page, col, y, height, "")["bbox"], "page_idx": page})
+                elif roll < 0.18:
+                    blocks.append({"type": "image", "img_path": f"images/f{page}_{col}_{y}.jpg",
+                                   "image_caption": [f"Figure: {_sentence(rng, 0)}"], "image_footnote": [],
+                                   "bbox": text_block(page, col, y, height, "")["bbox"], "page_idx": page})
+                else:
+                    text = " ".join(_sentence(rng, spec.math_ratio) for _ in range(max(1, height // 40)))
+                    if rng.random() < 0.25:
+                        # 컬럼/페이지 넘김으로 끊긴 문장
+                        text = text.rstrip(".") + " and the"
+                    blocks.append(text_block(page, col, y, height, text))
+                y += height + 12
+        blocks.append({"type": "page_footnote", "text": "Code: https://example.org/sunlight",
+                       "bbox": [60, 930, 480, 950], "page_idx": page})
+        blocks.append({"type": "page_number", "text": str(page + 1), "bbox": [490, 960, 510, 975], "page_idx": page})
+
+    last = spec.pages - 1
+    blocks.append({"type": "text", "text": "References", "text_level": 1, "bbox": [60, 890, 300, 910], "page_idx": last})
+    for i in range(10):
+        blocks.append({"type": "text", "sub_type": "ref_text", "text": f"[{i + 1}] A. Author. A paper. 2024.",
+                       "bbox": [60, 910 + i, 480, 911 + i], "page_idx": last})
+    return blocks
+
+
+def corpus_path(name: str) -> Path:
+    spec = CORPUS[name]
+    directory = CORPUS_DIR if spec.committed else GENERATED_DIR
+    return directory / f"{name}_content_list.json"
+
+
+def ensure_corpus(include_large: bool = False, overwrite: bool = False) -> Dict[str, Path]:
+    """Return name -> path, generating missing (or all, with *overwrite*) files."""
+    paths: Dict[str, Path] = {}
+    for name, spec in CORPUS.items():
+        if not spec.committed and not include_large:
+            continue
+        path = corpus_path(name)
+        if overwrite or not path.exists():
+            path.parent.mkdir(parents=True, exist_ok=True)
+            path.write_text(json.dumps(generate(name, spec), ensure_ascii=False) + "\n", encoding="utf-8")
+        paths[name] = path
+    return paths
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Write the parser benchmark corpus")
+    parser.add_argument("--large", action="store_true", help="large/xlarge 파일도 생성")
+    args = parser.parse_args()
+    for name, path in ensure_corpus(include_large=args.large, overwrite=True).items():
+        print(f"{name:<14} {path.stat().st_size / 1024:>9.1f} KiB  {path}")
+
+
+if __name__ == "__main__":
+    main()
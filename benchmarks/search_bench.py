@@ -0,0 +1,158 @@
+"""Search index benchmark over a synthetic bilingual corpus.
+
+Indexes *papers* synthetic papers (English originals plus Korean
+translations, Zipf-distributed vocabulary) and reports index build time,
+database size and query latency percentiles for rare, common and mixed
+queries in both languages::
+
+    python -m benchmarks.search_bench --papers 10000 --paragraphs 40
+    python -m benchmarks.search_bench --papers 500 --db /tmp/search.sqlite3
+
+Results are written as JSON to ``benchmarks/results/``.
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import random
+import tempfile
+import time
+from pathlib import Path
+from typing import List
+
+from src.models import Paragraph, ParsedPaper
+from src.search import SearchIndex
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+_SYLLABLES = "가나다라마바사아자차카타파하거너더러머버서어저처커터퍼허고노도로모보소오조초"
+_LETTERS = "abcdefghiklmnoprstuvw"
+
+
+def _vocabulary(rng: random.Random, size: int, korean: bool) -> List[str]:
+    words = set()
+    while len(words) < size:
+        if korean:
+            words.add("".join(rng.choice(_SYLLABLES) for _ in range(rng.randint(2, 4))))
+        else:
+            words.add("".join(rng.choice(_LETTERS) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+class SyntheticCorpus:
+    """Paired English/Korean papers drawn from Zipf-distributed vocabularies."""
+
+    def __init__(self, vocabulary: int = 20000, paragraphs: int = 40, seed: int = 0):
+        self.rng = random.Random(seed)
+        self.paragraphs = paragraphs
+        self.english = _vocabulary(self.rng, vocabulary, korean=False)
+        self.korean = _vocabulary(self.rng, vocabulary, korean=True)
+        self.weights = [1 / (rank + 1) for rank in range(vocabulary)]
+
+    def _sentence(self, vocab: List[str], ranks: List[int]) -> str:
+        return " ".join(vocab[r] for r in ranks)
+
+    def paper(self) -> tuple[ParsedPaper, ParsedPaper]:
+        original, translated = [], []
+        for i in range(self.paragraphs):
+            ranks = self.rng.choices(range(len(self.english)), self.weights, k=self.rng.randint(30, 120))
+            bbox = [60, 80, 480, 300]
+            original.append(Paragraph(text=self._sentence(self.english, ranks) + ".", page=i // 8, bbox=bbox))
+            # Korean particles glued to words, as in real translations
+            korean = " ".join(self.korean[r] + self.rng.choice(("", "", "을", "의", "는")) for r in ranks)
+            translated.append(Paragraph(text=korean + ".", page=i // 8, bbox=bbox))
+
+        def wrap(body):
+            return ParsedPaper(body=body, tables=[], figures=[], equations=[], metadata={})
+
+        return wrap(original), wrap(translated)
+
+    def queries(self, n: int) -> List[tuple[str, str]]:
+        """(kind, query) pairs: rare/common single words and two-word phrases per language."""
+        queries = []
+        size = len(self.english)
+        for i in range(n):
+            vocab = self.english if i % 2 == 0 else self.korean
+            lang = "en" if i % 2 == 0 else "ko"
+            kind = ("rare", "common", "mixed")[i // 2 % 3]
+            if kind == "rare":
+                query = vocab[self.rng.randrange(size // 2, size)]
+            elif kind == "common":
+                query = vocab[self.rng.randrange(20)]
+            else:
+                query = f"{vocab[self.rng.randrange(20)]} {vocab[self.rng.randrange(100, 2000)]}"
+            queries.append((f"{lang}-{kind}", query))
+        return queries
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_benchmark(
+    papers: int, paragraphs: int = 40, queries: int = 300, db: str | None = None, seed: int = 0
+) -> dict:
+    corpus = SyntheticCorpus(paragraphs=paragraphs, seed=seed)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(db) if db else Path(tmp) / "search.sqlite3"
+        index = SearchIndex(path)
+        started = time.perf_counter()
+        for i in range(papers):
+            original, translated = corpus.paper()
+            index.add_paper(f"paper-{i:06d}", original, translated, "ko")
+        build_s = time.perf_counter() - started
+
+        latencies: dict = {}
+        hits: dict = {}
+        for kind, query in corpus.queries(queries):
+            started = time.perf_counter()
+            result = index.search(query, limit=20)
+            latencies.setdefault(kind, []).append((time.perf_counter() - started) * 1000)
+            hits.setdefault(kind, []).append(len(result))
+        all_ms = [ms for values in latencies.values() for ms in values]
+        stats = index.stats()
+        db_bytes = sum(p.stat().st_size for p in path.parent.glob(path.name + "*"))
+        index.close()
+
+    return {
+        "papers": papers,
+        "paragraphs": stats["paragraphs"],
+        "terms": stats["terms"],
+        "build_s": round(build_s, 2),
+        "db_mb": round(db_bytes / 2**20, 1),
+        "query_ms": {f"p{q}": round(_percentile(all_ms, q), 2) for q in (50, 95, 99)},
+        "by_kind": {
+            kind: {
+                "p50_ms": round(_percentile(values, 50), 2),
+                "p95_ms": round(_percentile(values, 95), 2),
+                "avg_hits": round(sum(hits[kind]) / len(hits[kind]), 1),
+            }
+            for kind, values in sorted(latencies.items())
+        },
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Search index benchmark")
+    parser.add_argument("--papers", type=int, default=1000)
+    parser.add_argument("--paragraphs", type=int, default=40, help="논문당 문단 수")
+    parser.add_argument("--queries", type=int, default=300)
+    parser.add_argument("--db", help="색인 파일 (기본: 임시 디렉토리, 실행 후 삭제)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: benchmarks/results/search-<timestamp>.json)")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.papers, args.paragraphs, args.queries, args.db, args.seed)
+    print(json.dumps(result, indent=2, ensure_ascii=False))
+    out = Path(args.out) if args.out else RESULTS_DIR / f"search-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps(result, indent=2), encoding="utf-8")
+    print(f"saved: {out}")
+
+
+if __name__ == "__main__":
+    main()
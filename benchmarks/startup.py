@@ -0,0 +1,69 @@
+"""Import-time report for the CLI startup path.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter and
+summarizes the slowest imports::
+
+    python -m benchmarks.startup             # src.cli, top 20
+    python -m benchmarks.startup src.app -n 40
+"""
+from __future__ import annotations
+
+import argparse
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+REPO_ROOT = Path(__file__).resolve().parent.parent
+
+
+@dataclass
+class ImportRecord:
+    module: str
+    self_us: int
+    cumulative_us: int
+
+
+def import_time_report(module: str = "src.cli") -> List[ImportRecord]:
+    """Import *module* in a subprocess and return every import it triggered."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=REPO_ROOT,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    records: List[ImportRecord] = []
+    for line in proc.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|", 2)
+        records.append(ImportRecord(name.strip(), int(self_us), int(cumulative_us)))
+    return records
+
+
+def top_level_packages(records: List[ImportRecord]) -> set[str]:
+    return {r.module.split(".")[0] for r in records}
+
+
+def format_report(records: List[ImportRecord], top: int = 20) -> str:
+    total_ms = max((r.cumulative_us for r in records), default=0) / 1000
+    lines = [f"{'cumulative ms':>14} {'self ms':>9}  module", "-" * 48]
+    for r in sorted(records, key=lambda r: r.cumulative_us, reverse=True)[:top]:
+        lines.append(f"{r.cumulative_us / 1000:14.1f} {r.self_us / 1000:9.1f}  {r.module}")
+    lines.append("-" * 48)
+    lines.append(f"{len(records)} imports, {total_ms:.1f} ms for the slowest top-level import")
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Import-time startup report")
+    parser.add_argument("module", nargs="?", default="src.cli")
+    parser.add_argument("-n", "--top", type=int, default=20)
+    args = parser.parse_args()
+    print(format_report(import_time_report(args.module), args.top))
+
+
+if __name__ == "__main__":
+    main()
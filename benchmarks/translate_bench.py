@@ -0,0 +1,272 @@
+"""End-to-end translation benchmark against the local OpenAI stub.
+
+Drives ``PaperTranslator.translate_async`` over synthetic papers and reports
+throughput, batch latency percentiles, request counts and tokens::
+
+    python -m benchmarks.translate_bench --sizes 50 500 5000 --latency-ms 300 \\
+        --latency lognormal --rate-429 0.02 --malformed-rate 0.05
+    python -m benchmarks.translate_bench --compare benchmarks/results/<old>.json
+    python -m benchmarks.translate_bench --backend local --local-model models/opus-mt-en-ko
+    python -m benchmarks.translate_bench --backend echo   # scheduling overhead only
+    python -m benchmarks.translate_bench --stream --stream-cut-rate 0.1 --latency-per-token-ms 2
+    python -m benchmarks.translate_bench --straggler-rate 0.05 --straggler-ms 5000   # hedging
+    python -m benchmarks.translate_bench --straggler-rate 0.05 --straggler-ms 5000 --no-hedge
+
+Every backend goes through the same ``PaperTranslator`` batching, caching and
+scheduling, so the numbers are directly comparable. Only ``openai`` talks to
+the stub server (latency/fault options apply to it alone).
+
+Results are written as JSON to ``benchmarks/results/`` so runs can be compared.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import contextlib
+import json
+import random
+import statistics
+import time
+from dataclasses import asdict
+from pathlib import Path
+from typing import List
+
+from benchmarks.mock_openai import MockOpenAIServer, StubConfig
+from src.models import Paragraph, ParsedPaper
+from src.translator import BACKENDS, PaperTranslator, create_backend
+from src.translator.hedging import reset_latency_trackers
+from src.utils.tracing import get_tracer
+
+RESULTS_DIR = Path(__file__).resolve().parent / "results"
+
+_WORDS = (
+    "model training data attention layer token gradient loss network transformer "
+    "baseline benchmark accuracy results method approach representation encoder "
+    "decoder sequence learning optimization parameter evaluation dataset sample"
+).split()
+
+
+def synthetic_paper(n_paragraphs: int, seed: int = 0) -> ParsedPaper:
+    """Paper with *n_paragraphs* body paragraphs of 20-120 words.
+
+    Roughly 5% of paragraphs are pure math and 5% repeat an earlier paragraph,
+    so skip and dedup paths are exercised as in real papers; a third of the
+    prose paragraphs end with inline math and a citation (masked spans).
+    """
+    rng = random.Random(seed)
+    body: List[Paragraph] = []
+    for i in range(n_paragraphs):
+        roll = rng.random()
+        if roll < 0.05:
+            text = f"$x_{{{i}}} = \\sum_j w_j h_j$"
+        elif roll < 0.10 and body:
+            text = rng.choice(body).text
+        else:
+            words = [rng.choice(_WORDS) for _ in range(rng.randint(20, 120))]
+            text = f"Paragraph {i}: " + " ".join(words).capitalize() + "."
+            if rng.random() < 0.33:
+                text += f" We set $\\lambda_{{{i}}} = \\frac{{1}}{{\\sqrt{{d_k}}}}$ as in [{i % 40 + 1}, {i % 7 + 41}]."
+        body.append(Paragraph(text=text, page=i // 8, bbox=[60, 80, 480, 300]))
+    if body:
+        # First paragraph is the abstract, so the per-paper prompt context has a header
+        body[0].section = "Abstract"
+    title = {"type": "text", "text": "A Synthetic Paper for Translation Benchmarks", "text_level": 1, "page_idx": 0}
+    return ParsedPaper(body=body, tables=[], figures=[], equations=[], metadata={"raw": [title]})
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(q / 100 * (len(ordered) - 1))))
+    return ordered[idx]
+
+
+def run_benchmark(
+    n_paragraphs: int,
+    config: StubConfig,
+    batch_size: int = 25,
+    seed: int = 0,
+    backend: str = "openai",
+    local_model: str | None = None,
+    stream: bool = False,
+    hedge: bool = True,
+) -> dict:
+    """Translate one synthetic paper with *backend* and return the metrics."""
+    paper = synthetic_paper(n_paragraphs, seed)
+    tracer = get_tracer()
+    tracer.reset()
+    reset_latency_trackers()
+
+    server = MockOpenAIServer(config) if backend == "openai" else None
+    with server or contextlib.nullcontext():
+        if server is not None:
+            translator = PaperTranslator(api_key="stub", base_url=server.base_url, hedge=hedge)
+        else:
+            options = {"model_dir": local_model} if backend == "local" else {}
+            translator = PaperTranslator(backend=create_backend(backend, **options), hedge=hedge)
+        started = time.perf_counter()
+        result = asyncio.run(translator.translate_async(paper, "ko", batch_size=batch_size, stream=stream))
+        elapsed = time.perf_counter() - started
+        if server is not None:
+            stub_stats = server.stats_dict()
+        else:
+            stub_stats = {
+                "requests": int(tracer.counter("translate.requests")),
+                "status": {},
+                "malformed": 0,
+                "prompt_tokens": 0,
+                "cached_tokens": 0,
+                "completion_tokens": 0,
+            }
+
+    batch_spans = [s for s in tracer.spans if s.name == "translate.batch"]
+    # Latency of packed batches; halves of split batches are counted per depth
+    batch_ms = [s.duration * 1000 for s in batch_spans if not s.attributes.get("depth")]
+    bisect = {
+        dict(labels)["depth"]: count
+        for (name, labels), count in sorted(tracer.counters.items())
+        if name == "translate.bisect"
+    }
+    translate_span = next((s for s in tracer.spans if s.name == "translate"), None)
+    first_segment_ms = translate_span.attributes.get("first_segment_ms") if translate_span else None
+    untranslated = sum(
+        1 for src, dst in zip(paper.body, result.body)
+        if src.text == dst.text and not PaperTranslator._should_skip_translation(src.text)
+    )
+    return {
+        "backend": backend,
+        "stream": stream,
+        "paragraphs": n_paragraphs,
+        "batch_size": batch_size,
+        "elapsed_s": round(elapsed, 4),
+        "paragraphs_per_s": round(n_paragraphs / elapsed, 2) if elapsed else None,
+        "first_segment_ms": first_segment_ms,
+        "batches": len(batch_ms),
+        "batch_latency_ms": {
+            "p50": round(_percentile(batch_ms, 50), 2),
+            "p99": round(_percentile(batch_ms, 99), 2),
+            "mean": round(statistics.fmean(batch_ms), 2) if batch_ms else 0.0,
+        },
+        "requests": stub_stats["requests"],
+        "status": stub_stats["status"],
+        "malformed_replies": stub_stats["malformed"],
+        "prompt_tokens": stub_stats["prompt_tokens"],
+        "cached_tokens": stub_stats["cached_tokens"],
+        "cache_hit_rate": (
+            round(stub_stats["cached_tokens"] / stub_stats["prompt_tokens"], 3) if stub_stats["prompt_tokens"] else 0.0
+        ),
+        "completion_tokens": stub_stats["completion_tokens"],
+        "retries": tracer.counter("translate.retries"),
+        "fallbacks": tracer.counter("translate.fallbacks"),
+        "bisect": bisect,
+        "stream_resumes": tracer.counter("translate.stream_resumes"),
+        "mask_saved_tokens": tracer.counter("translate.mask_saved_tokens"),
+        "placeholder_errors": tracer.counter("translate.placeholder_errors"),
+        "hedges": tracer.counter("translate.hedges"),
+        "hedge_wins": tracer.counter("translate.hedge_wins"),
+        "hedge_rate": round(tracer.counter("translate.hedges") / len(batch_ms), 3) if batch_ms else 0.0,
+        "hedge_wasted_tokens": tracer.counter("translate.hedge_wasted_tokens"),
+        "untranslated": untranslated,
+    }
+
+
+def format_results(runs: List[dict]) -> str:
+    lines = [
+        f"{'paras':>6} {'sec':>8} {'para/s':>8} {'1st ms':>8} {'p50 ms':>8} {'p99 ms':>8} {'reqs':>6} "
+        f"{'tokens in/out':>16} {'cached':>7} {'fallbk':>6}",
+        "-" * 93,
+    ]
+    for r in runs:
+        tokens = f"{r['prompt_tokens']}/{r['completion_tokens']}"
+        lines.append(
+            f"{r['paragraphs']:>6} {r['elapsed_s']:>8.2f} {r['paragraphs_per_s'] or 0:>8.1f} "
+            f"{r.get('first_segment_ms') or 0:>8.1f} "
+            f"{r['batch_latency_ms']['p50']:>8.1f} {r['batch_latency_ms']['p99']:>8.1f} "
+            f"{r['requests']:>6} {tokens:>16} {r.get('cache_hit_rate', 0.0):>7.1%} {r['fallbacks']:>6g}"
+        )
+    return "\n".join(lines)
+
+
+def compare(current: List[dict], baseline: List[dict]) -> str:
+    """Relative change per paragraph count for throughput, p99 and requests."""
+    base = {r["paragraphs"]: r for r in baseline}
+    lines = [f"{'paras':>6} {'para/s':>10} {'p99 ms':>10} {'requests':>10}", "-" * 40]
+    for r in current:
+        old = base.get(r["paragraphs"])
+        if not old:
+            continue
+
+        def delta(new, prev):
+            return f"{(new - prev) / prev * 100:+.1f}%" if prev else "n/a"
+
+        lines.append(
+            f"{r['paragraphs']:>6} {delta(r['paragraphs_per_s'] or 0, old['paragraphs_per_s'] or 0):>10} "
+            f"{delta(r['batch_latency_ms']['p99'], old['batch_latency_ms']['p99']):>10} "
+            f"{delta(r['requests'], old['requests']):>10}"
+        )
+    return "\n".join(lines)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Translation benchmark with a local OpenAI stub")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--batch-size", type=int, default=25)
+    parser.add_argument("--backend", choices=BACKENDS, default="openai")
+    parser.add_argument("--local-model", help="--backend local 의 CTranslate2 모델 디렉토리")
+    parser.add_argument("--latency", choices=["constant", "uniform", "lognormal"], default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=200.0)
+    parser.add_argument("--latency-per-token-ms", type=float, default=0.0)
+    parser.add_argument("--straggler-rate", type=float, default=0.0, help="느린 응답(straggler) 비율")
+    parser.add_argument("--straggler-ms", type=float, default=0.0, help="straggler 추가 지연")
+    parser.add_argument("--no-hedge", action="store_true", help="느린 배치 중복 요청(hedging) 끄기")
+    parser.add_argument("--rate-429", type=float, default=0.0)
+    parser.add_argument("--rate-500", type=float, default=0.0)
+    parser.add_argument("--malformed-rate", type=float, default=0.0)
+    parser.add_argument("--stream", action="store_true", help="배치를 스트리밍으로 요청 (세그먼트 단위 수신)")
+    parser.add_argument("--stream-cut-rate", type=float, default=0.0)
+    parser.add_argument("--stream-length-rate", type=float, default=0.0)
+    parser.add_argument(
+        "--cache-min-tokens", type=int, default=1024, help="스텁 프롬프트 캐시가 적용되는 최소 접두사 토큰 수"
+    )
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--out", help="결과 JSON 경로 (기본: benchmarks/results/translate-<timestamp>.json)")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    args = parser.parse_args()
+
+    config = StubConfig(
+        latency=args.latency,
+        latency_ms=args.latency_ms,
+        latency_per_token_ms=args.latency_per_token_ms,
+        straggler_rate=args.straggler_rate,
+        straggler_ms=args.straggler_ms,
+        rate_429=args.rate_429,
+        rate_500=args.rate_500,
+        malformed_rate=args.malformed_rate,
+        stream_cut_rate=args.stream_cut_rate,
+        stream_length_rate=args.stream_length_rate,
+        cache_min_tokens=args.cache_min_tokens,
+        seed=args.seed,
+    )
+    if args.backend == "local" and not args.local_model:
+        parser.error("--backend local requires --local-model")
+    runs = [
+        run_benchmark(
+            n, config, args.batch_size, args.seed, args.backend, args.local_model, args.stream, not args.no_hedge
+        )
+        for n in args.sizes
+    ]
+    print(format_results(runs))
+
+    out = Path(args.out) if args.out else RESULTS_DIR / f"translate-{time.strftime('%Y%m%d-%H%M%S')}.json"
+    out.parent.mkdir(parents=True, exist_ok=True)
+    out.write_text(json.dumps({"backend": args.backend, "config": asdict(config), "runs": runs}, indent=2), encoding="utf-8")
+    print(f"saved: {out}")
+
+    if args.compare:
+        baseline = json.loads(Path(args.compare).read_text(encoding="utf-8"))["runs"]
+        print(compare(runs, baseline))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,441 @@
+"""번역 결과 JSON API (웹 UI와 같은 단계별 파이프라인 사용, 표준 라이브러리 HTTP 서버).
+
+    python -m src.api --port 8765
+
+    POST /jobs                       {"url": "...", "pages": "1-5", "sections": "abstract", "lang": "ko"}
+                                     (pages/sections는 목록도 가능: ["1-5", 8], ["abstract", "method"])
+                                     -> 202 {"id": ..., "status": "queued"}
+    GET  /jobs/<id>                  상태/진행률 (완료 시 페이지별 문단 수)
+    GET  /jobs/<id>/pages/<n>        n쪽(0부터) 문단 쌍 {"id", "original", "translated", "page", "bboxes"}
+    GET  /jobs/<id>/pages/<n>/image  n쪽 PNG (?scale=1.5, 0.5~4)
+    POST /jobs/<id>/viewport         {"pages": [3, 4]} -> 해당 페이지 배치를 먼저 번역
+    GET  /search?q=...&lang=ko       번역한 논문의 원문/번역 문단 검색 (lang=original: 원문만)
+
+모든 GET 응답은 ETag를 붙여 ``If-None-Match``가 같으면 304를 돌려주고, JSON은
+``Accept-Encoding: gzip``이면 압축한다. 대기열이 가득 차면 503 + Retry-After.
+잘못된 쿼리/본문 값은 400 JSON 오류. 끝난 작업은 ``job_ttl`` 초 뒤(또는 작업이 ``max_jobs`` 개를
+넘으면 오래된 것부터) 메모리에서 지운다.
+"""
+from __future__ import annotations
+
+import argparse
+import asyncio
+import base64
+import gzip
+import hashlib
+import json
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+from dotenv import load_dotenv
+
+from src.pipeline import Pipeline, PipelineBusy, SectionNotFound, pdf_to_images, process_paper, shared_catalog, shared_search_index
+from src.utils.arxiv import ARXIV_PATTERN
+from src.utils.selection import parse_page_spec
+from src.utils.tracing import get_tracer
+
+load_dotenv()
+
+# 이보다 작은 응답은 압축하지 않음
+GZIP_MIN_BYTES = 512
+
+# 페이지 이미지 배율 범위 / 작업별로 캐시하는 이미지 수
+MIN_SCALE, MAX_SCALE = 0.5, 4.0
+MAX_JOB_IMAGES = 16
+# 검색 결과 수 상한
+MAX_SEARCH_LIMIT = 100
+# 번역 대상 언어 태그 (ko, en, zh-Hant ...). 저널 경로에도 쓰이므로 형식을 제한한다
+LANG_PATTERN = re.compile(r"[A-Za-z]{2,3}(-[A-Za-z0-9]{2,8})*")
+
+
+@dataclass
+class Job:
+    """API 번역 작업 하나의 상태."""
+
+    id: str
+    url: str
+    pages: Optional[List[int]] = None
+    sections: List[str] = field(default_factory=list)
+    lang: str = "ko"
+    status: str = "queued"  # queued | running | done | error
+    progress: float = 0.0
+    message: str = ""
+    error: Optional[str] = None
+    created: float = field(default_factory=time.time)
+    finished: Optional[float] = None
+    pdf_path: Optional[str] = None
+    pairs: List[dict] = field(default_factory=list)
+    viewport: object = None
+    images: "OrderedDict[tuple, bytes]" = field(default_factory=OrderedDict)
+    # 여러 핸들러 스레드가 images를 함께 고치므로 잠금
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False, compare=False)
+
+    def page_counts(self) -> Dict[int, int]:
+        counts: Dict[int, int] = {}
+        for pair in self.pairs:
+            counts[pair["page"]] = counts.get(pair["page"], 0) + 1
+        return dict(sorted(counts.items()))
+
+    def summary(self) -> dict:
+        data = {
+            "id": self.id,
+            "url": self.url,
+            "lang": self.lang,
+            "status": self.status,
+            "progress": round(self.progress, 3),
+            "message": self.message,
+            "created": self.created,
+            "finished": self.finished,
+        }
+        if self.error:
+            data["error"] = self.error
+        if self.status == "done":
+            data["paragraphs"] = len(self.pairs)
+            data["pages"] = [{"page": p, "paragraphs": n} for p, n in self.page_counts().items()]
+        return data
+
+
+class ApiService:
+    """작업 저장소 + 파이프라인을 돌리는 이벤트 루프 스레드.
+
+    HTTP 핸들러 스레드는 :meth:`call`로 코루틴을 루프에 넘기고 결과를 기다린다.
+    끝난 작업은 *job_ttl* 초가 지나거나 작업이 *max_jobs* 개를 넘으면 (오래된 것부터) 지운다.
+    """
+
+    def __init__(self, pipeline: Optional[Pipeline] = None, job_ttl: float = 3600.0, max_jobs: int = 200):
+        self.pipeline = pipeline or Pipeline.from_env()
+        self.job_ttl = job_ttl
+        self.max_jobs = max_jobs
+        self.jobs: Dict[str, Job] = {}
+        self._lock = threading.Lock()
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, daemon=True)
+        self._thread.start()
+
+    def call(self, coro, timeout: Optional[float] = None):
+        return asyncio.run_coroutine_threadsafe(coro, self.loop).result(timeout)
+
+    def get(self, job_id: str) -> Optional[Job]:
+        with self._lock:
+            self._evict()
+            return self.jobs.get(job_id)
+
+    def _evict(self) -> None:
+        """만료된 끝난 작업을 지우고, 그래도 많으면 오래 전에 끝난 작업부터 지운다 (잠금 안에서 호출)."""
+        now = time.time()
+        finished = sorted((job for job in self.jobs.values() if job.finished is not None), key=lambda j: j.finished)
+        excess = len(self.jobs) - self.max_jobs
+        for job in finished:
+            if job.finished + self.job_ttl > now and excess <= 0:
+                break
+            del self.jobs[job.id]
+            excess -= 1
+            get_tracer().add("api.jobs_evicted")
+
+    def submit(self, url: str, pages_spec: str = "", sections_spec: str = "", lang: str = "ko") -> Job:
+        """작업 등록 후 백그라운드 실행. 잘못된 입력은 ValueError, 혼잡하면 PipelineBusy."""
+        from src.translator import ViewportHint
+
+        url = (url or "").strip()
+        if not ARXIV_PATTERN.search(url):
+            raise ValueError("유효한 arXiv URL이 아닙니다. (예: https://arxiv.org/abs/2301.12345)")
+        if not LANG_PATTERN.fullmatch(lang or ""):
+            raise ValueError(f"지원하지 않는 언어 코드입니다: {lang!r} (예: ko, en)")
+        # 다운로드 전이라 페이지 수를 모른다: MAX_PAGES로 검사하고 process_paper가 실제 수로 자른다
+        pages = parse_page_spec(pages_spec, page_count=None)
+        self.pipeline.admit()
+        job = Job(
+            id=uuid.uuid4().hex[:12],
+            url=url,
+            pages=pages,
+            sections=[s for s in (sections_spec or "").split(",") if s.strip()],
+            lang=lang,
+            viewport=ViewportHint(),
+        )
+        with self._lock:
+            self._evict()
+            self.jobs[job.id] = job
+        asyncio.run_coroutine_threadsafe(self._run(job), self.loop)
+        return job
+
+    async def _run(self, job: Job) -> None:
+        def progress(fraction, desc=None):
+            job.progress = fraction
+            job.message = desc or ""
+
+        job.status = "running"
+        try:
+            result = await process_paper(
+                self.pipeline,
+                job.url,
+                job.pages,
+                job.sections,
+                target_lang=job.lang,
+                progress=progress,
+                viewport=job.viewport,
+                catalog=shared_catalog(),
+                index=shared_search_index(),
+            )
+        except (PipelineBusy, SectionNotFound, ValueError) as exc:
+            job.status, job.error = "error", str(exc)
+        except Exception as exc:  # 작업 하나의 실패가 서버를 멈추지 않도록
+            get_tracer().add("api.job_errors")
+            job.status, job.error = "error", f"{type(exc).__name__}: {exc}"
+        else:
+            job.pdf_path, job.pairs = result.pdf_path, result.pairs
+            job.status, job.progress, job.message = "done", 1.0, "완료"
+        job.finished = time.time()
+
+    def search(self, query: str, lang: Optional[str] = None, limit: int = 20) -> dict:
+        """검색 색인 조회. 카탈로그가 있으면 결과에 arXiv ID를 붙인다."""
+        from src.search import ORIGINAL
+
+        index, catalog = shared_search_index(), shared_catalog()
+        started = time.perf_counter()
+        hits = index.search(query, lang=ORIGINAL if lang == "original" else lang, limit=limit) if index else []
+        elapsed_ms = (time.perf_counter() - started) * 1000
+        results = []
+        for hit in hits:
+            data = hit.to_dict()
+            paper = catalog.paper(hit.paper) if catalog is not None else None
+            data["arxiv_id"] = paper["arxiv_id"] if paper is not None else None
+            results.append(data)
+        return {"query": query, "hits": results, "ms": round(elapsed_ms, 2)}
+
+    def page_image(self, job: Job, page: int, scale: float) -> Optional[bytes]:
+        """*page* PNG (작업별로 최근 :data:`MAX_JOB_IMAGES` 개 캐시). 페이지가 없으면 None."""
+        key = (page, scale)
+        with job.lock:
+            png = job.images.get(key)
+            if png is not None:
+                job.images.move_to_end(key)
+                return png
+        # 렌더링은 잠금 밖에서: 같은 페이지를 동시에 요청하면 두 번 그릴 수 있지만 결과는 같다
+        images = self.call(self.pipeline.render.submit(pdf_to_images, job.pdf_path, scale=scale, pages=[page]))
+        if not images:
+            return None
+        png = base64.b64decode(images[0]["base64"])
+        with job.lock:
+            job.images[key] = png
+            job.images.move_to_end(key)
+            while len(job.images) > MAX_JOB_IMAGES:
+                job.images.popitem(last=False)
+        return png
+
+
+def _number(text: str, kind, low, high):
+    """쿼리/본문 값을 *kind* (int/float)로 바꾸고 [*low*, *high*] 범위를 검사. 아니면 ValueError."""
+    try:
+        value = kind(text)
+    except (TypeError, ValueError):
+        raise ValueError(f"숫자가 아닙니다: {text!r}") from None
+    if not low <= value <= high:  # NaN도 여기서 걸러짐
+        raise ValueError(f"{low}~{high} 범위를 벗어났습니다: {text!r}")
+    return value
+
+
+def _text(value, name: str) -> str:
+    """본문 문자열 필드. 문자열이 아니면 ValueError."""
+    if not isinstance(value, str):
+        raise ValueError(f"{name}: 문자열이어야 합니다: {value!r}")
+    return value
+
+
+def _spec(value, name: str, items=(str,)) -> str:
+    """본문의 페이지/섹션 지정 (문자열 또는 *items* 타입의 목록)을 쉼표로 이은 문자열로. 아니면 ValueError."""
+    if value is None:
+        return ""
+    if isinstance(value, str):
+        return value
+    if isinstance(value, list) and all(isinstance(v, items) and not isinstance(v, bool) for v in value):
+        return ",".join(str(v) for v in value)
+    raise ValueError(f"{name}: 문자열 또는 목록이어야 합니다: {value!r}")
+
+
+def _etag(body: bytes) -> str:
+    # 약한 ETag: gzip 여부와 관계없이 같은 내용이면 같은 값
+    return f'W/"{hashlib.sha1(body).hexdigest()[:20]}"'
+
+
+def make_handler(service: ApiService):
+    class _ApiHandler(BaseHTTPRequestHandler):
+        def _send(self, status: int, body: bytes, content_type: str, headers: Optional[dict] = None) -> None:
+            etag = _etag(body)
+            if status == 200 and etag in (self.headers.get("If-None-Match") or ""):
+                self.send_response(304)
+                self.send_header("ETag", etag)
+                self.end_headers()
+                return
+            compress = (
+                content_type.startswith("application/json")
+                and len(body) >= GZIP_MIN_BYTES
+                and "gzip" in (self.headers.get("Accept-Encoding") or "")
+            )
+            if compress:
+                body = gzip.compress(body, compresslevel=5)
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("ETag", etag)
+            self.send_header("Vary", "Accept-Encoding")
+            if compress:
+                self.send_header("Content-Encoding", "gzip")
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _json(self, status: int, data, headers: Optional[dict] = None) -> None:
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            self._send(status, body, "application/json; charset=utf-8", headers)
+
+        def _error(self, status: int, message: str, headers: Optional[dict] = None) -> None:
+            self._json(status, {"error": message}, headers)
+
+        def _read_json(self) -> dict:
+            length = int(self.headers.get("Content-Length") or 0)
+            data = json.loads(self.rfile.read(length) or b"{}")
+            if not isinstance(data, dict):
+                raise ValueError("JSON object required")
+            return data
+
+        def _job(self, job_id: str) -> Optional[Job]:
+            job = service.get(job_id)
+            if job is None:
+                self._error(404, f"작업을 찾을 수 없습니다: {job_id}")
+            return job
+
+        def do_POST(self) -> None:  # noqa: N802 (http.server API)
+            parts = urlparse(self.path).path.strip("/").split("/")
+            try:
+                data = self._read_json()
+            except ValueError:
+                self._error(400, "JSON 본문이 필요합니다.")
+                return
+            if parts == ["jobs"]:
+                try:
+                    job = service.submit(
+                        _text(data.get("url", ""), "url"),
+                        _spec(data.get("pages"), "pages", (str, int)),
+                        _spec(data.get("sections"), "sections"),
+                        _text(data.get("lang", "ko"), "lang"),
+                    )
+                except PipelineBusy as exc:
+                    self._error(503, str(exc), {"Retry-After": "30"})
+                    return
+                except ValueError as exc:
+                    self._error(400, str(exc))
+                    return
+                self._json(202, job.summary(), {"Location": f"/jobs/{job.id}"})
+            elif len(parts) == 3 and parts[0] == "jobs" and parts[2] == "viewport":
+                job = self._job(parts[1])
+                if job is None:
+                    return
+                try:
+                    pages = [_number(p, int, 0, 100_000) for p in data.get("pages", [])]
+                except (TypeError, ValueError) as exc:
+                    self._error(400, f"pages: {exc}")
+                    return
+                job.viewport.set(pages)
+                self._json(200, {"id": job.id, "viewport": pages})
+            else:
+                self._error(404, "없는 경로입니다.")
+
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            url = urlparse(self.path)
+            parts = url.path.strip("/").split("/")
+            if parts == ["search"]:
+                query = parse_qs(url.query)
+                q = (query.get("q") or [""])[0].strip()
+                if not q:
+                    self._error(400, "검색어(q)가 필요합니다.")
+                    return
+                lang = (query.get("lang") or [None])[0]
+                try:
+                    limit = _number((query.get("limit") or ["20"])[0], int, 1, MAX_SEARCH_LIMIT)
+                except ValueError as exc:
+                    self._error(400, f"limit: {exc}")
+                    return
+                self._json(200, service.search(q, lang, limit))
+                return
+            if len(parts) < 2 or parts[0] != "jobs":
+                self._error(404, "없는 경로입니다.")
+                return
+            job = self._job(parts[1])
+            if job is None:
+                return
+            if len(parts) == 2:
+                self._json(200, job.summary())
+                return
+            if parts[2] != "pages" or len(parts) not in (4, 5) or not (parts[3].isascii() and parts[3].isdigit()):
+                self._error(404, "없는 경로입니다.")
+                return
+            if job.status != "done":
+                self._error(409, f"작업이 아직 끝나지 않았습니다 ({job.status}).")
+                return
+            page = int(parts[3])
+            if len(parts) == 4:
+                pairs = [
+                    {k: p[k] for k in ("id", "original", "translated", "page", "bboxes")}
+                    for p in job.pairs
+                    if any(region["page"] == page for region in p["bboxes"])
+                ]
+                self._json(200, {"id": job.id, "page": page, "pairs": pairs})
+            elif parts[4] == "image":
+                try:
+                    scale = _number(parse_qs(url.query).get("scale", ["1.5"])[0], float, MIN_SCALE, MAX_SCALE)
+                except ValueError as exc:
+                    self._error(400, f"scale: {exc}")
+                    return
+                try:
+                    png = service.page_image(job, page, scale)
+                except PipelineBusy as exc:
+                    self._error(503, str(exc), {"Retry-After": "10"})
+                    return
+                if png is None:
+                    self._error(404, f"페이지가 없습니다: {page}")
+                    return
+                self._send(200, png, "image/png", {"Cache-Control": "max-age=86400"})
+            else:
+                self._error(404, "없는 경로입니다.")
+
+        def log_message(self, format, *args) -> None:  # noqa: A002
+            pass
+
+    return _ApiHandler
+
+
+def serve_api(
+    port: int = 8765, host: str = "127.0.0.1", service: Optional[ApiService] = None
+) -> ThreadingHTTPServer:
+    """JSON API를 데몬 스레드에서 실행하고 서버를 반환 (``server.shutdown()``으로 종료)."""
+    server = ThreadingHTTPServer((host, port), make_handler(service or ApiService()))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="논문 번역 JSON API 서버")
+    parser.add_argument("--host", default="127.0.0.1", help="바인드 주소 (기본: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=8765, help="포트 (기본: 8765)")
+    args = parser.parse_args()
+
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(ApiService()))
+    server.daemon_threads = True
+    print(f"JSON API: http://{args.host}:{args.port}/jobs")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -1,116 +1,73 @@
-import asyncio
-import base64
 import json
 import os
-import re
-import tempfile
+from functools import lru_cache
 
-import fitz  # PyMuPDF
 import gradio as gr
-import requests
 from dotenv import load_dotenv
 
-from src.parser import PaperParser
-from src.translator import PaperTranslator
+from src.pipeline import Pipeline, PipelineBusy, SectionNotFound, pdf_to_images, process_paper, shared_catalog, shared_search_index
+from src.utils.arxiv import ARXIV_PATTERN
+from src.utils.math_render import MATH_CSS, render_math
+from src.utils.selection import parse_page_spec, selection_pages
+from src.utils.tracing import get_tracer, serve_metrics
 
 load_dotenv()
 
-# arXiv URL 패턴: abs, pdf, html 등 다양한 형태 지원
-ARXIV_PATTERN = re.compile(
-    r"(?:https?://)?(?:www\.)?arxiv\.org/(?:abs|pdf|html)/(\d{4}\.\d{4,5}(?:v\d+)?)"
-)
-
-
-def download_arxiv_pdf(url: str) -> str:
-    """arXiv URL에서 PDF를 다운로드하여 임시 파일 경로를 반환."""
-    match = ARXIV_PATTERN.search(url.strip())
-    if not match:
-        raise ValueError(f"유효한 arXiv URL이 아닙니다: {url}")
-
-    paper_id = match.group(1)
-    pdf_url = f"https://arxiv.org/pdf/{paper_id}"
-
-    resp = requests.get(pdf_url, timeout=60)
-    resp.raise_for_status()
-
-    tmp_dir = tempfile.mkdtemp()
-    pdf_path = os.path.join(tmp_dir, f"{paper_id}.pdf")
-    with open(pdf_path, "wb") as f:
-        f.write(resp.content)
-    return pdf_path
-
-
-def pdf_to_images(pdf_path, scale=1.5):
-    """PDF를 페이지별 base64 이미지로 변환."""
-    doc = fitz.open(pdf_path)
-    images = []
-    for page_num in range(len(doc)):
-        page = doc[page_num]
-        mat = fitz.Matrix(scale, scale)
-        pix = page.get_pixmap(matrix=mat)
-        img_bytes = pix.tobytes("png")
-        img_base64 = base64.b64encode(img_bytes).decode("utf-8")
-        images.append({
-            "base64": img_base64,
-            "width": pix.width,
-            "height": pix.height,
-            "scale": scale,
-        })
-    doc.close()
-    return images
-
-
-def process_pdf(arxiv_url, progress=gr.Progress()):
-    """arXiv URL -> PDF 다운로드 -> 파싱 -> 번역 -> HTML 결과 반환."""
-    if not arxiv_url or not arxiv_url.strip():
-        raise gr.Error("arXiv URL을 입력하세요. (예: https://arxiv.org/abs/2301.12345)")
 
-    url = arxiv_url.strip()
-    if not ARXIV_PATTERN.search(url):
-        raise gr.Error("유효한 arXiv URL이 아닙니다. (예: https://arxiv.org/abs/2301.12345)")
+@lru_cache(maxsize=1)
+def _pipeline():
+    """요청 간에 공유하는 단계별 작업 풀 (src.pipeline 참고)."""
+    return Pipeline.from_env()
 
-    progress(0.02, desc="arXiv에서 PDF 다운로드 중...")
-    pdf_path = download_arxiv_pdf(url)
 
-    progress(0.05, desc="파싱 중...")
-    parser = PaperParser()
-    parsed = parser.parse(pdf_path)
+async def process_pdf(arxiv_url, pages_spec="", sections_spec="", progress=gr.Progress()):
+    """arXiv URL -> PDF 다운로드 -> 파싱 -> 번역 -> HTML 결과 반환.
 
-    progress(0.1, desc="번역 준비 중...")
-    translator = PaperTranslator()
+    pages_spec ("1-5,8") / sections_spec ("abstract,introduction")을 주면
+    해당 페이지/섹션만 파싱·번역·렌더링한다.
 
-    def on_batch_done(completed, total):
-        frac = 0.1 + 0.75 * (completed / total)
-        progress(frac, desc=f"번역 중... ({completed}/{total} 배치)")
+    다운로드/파싱/렌더링은 단계별 풀에서, 번역은 이벤트 루프에서 실행한다.
+    대기열이 가득 찬 단계가 있으면 바로 거절한다.
+    """
+    if not arxiv_url or not arxiv_url.strip():
+        raise gr.Error("arXiv URL을 입력하세요. (예: https://arxiv.org/abs/2301.12345)")
 
-    translated = asyncio.run(
-        translator.translate_async(
-            parsed, "ko", batch_size=25, on_batch_done=on_batch_done
+    url = arxiv_url.strip()
+    if not ARXIV_PATTERN.search(url):
+        raise gr.Error("유효한 arXiv URL이 아닙니다. (예: https://arxiv.org/abs/2301.12345)")
+    try:
+        # 다운로드 전이라 페이지 수를 모른다: MAX_PAGES로 검사하고 process_paper가 실제 수로 자른다
+        pages = parse_page_spec(pages_spec, page_count=None)
+    except ValueError as exc:
+        raise gr.Error(str(exc)) from exc
+    sections = [s for s in (sections_spec or "").split(",") if s.strip()]
+
+    pipeline = _pipeline()
+    try:
+        result = await process_paper(
+            pipeline, url, pages, sections, progress=progress, catalog=shared_catalog(), index=shared_search_index()
         )
-    )
 
-    progress(0.9, desc="PDF 이미지 변환 중...")
-    pdf_images = pdf_to_images(pdf_path, scale=1.5)
+        progress(0.9, desc="PDF 이미지 변환 중...")
+        render_pages = pages
+        if sections:
+            render_pages = selection_pages(result.parsed.body)
+        pdf_images = await pipeline.render.submit(pdf_to_images, result.pdf_path, scale=1.5, pages=render_pages)
+    except (PipelineBusy, SectionNotFound, ValueError) as exc:
+        raise gr.Error(str(exc)) from exc
 
     progress(0.95, desc="결과 생성 중...")
-    pairs = []
-    for i, (orig, trans) in enumerate(zip(parsed.body, translated.body)):
-        bboxes = orig.bboxes or [{"bbox": orig.bbox or [0, 0, 0, 0], "page": orig.page or 0}]
-        pairs.append({
-            "id": i,
-            "original": orig.text,
-            "translated": trans.text,
-            "bbox": orig.bbox or [0, 0, 0, 0],
-            "page": orig.page or 0,
-            "bboxes": bboxes,
-        })
+    tracer = get_tracer()
+    pairs = result.pairs
 
+    with tracer.span("generate_html", paragraphs=len(pairs), pages=len(pdf_images)):
+        html = generate_html(pairs, pdf_images)
     progress(1.0, desc="완료!")
-    return generate_html(pairs, pdf_images)
+    return html
 
 
 def generate_html(pairs, pdf_images):
-    """PDF 이미지 뷰어 + 번역본 HTML 생성."""
+    """PDF 이미지 뷰어 + 번역본 HTML 생성 (수식은 서버에서 MathML로 렌더링)."""
 
     total_paras = len(pairs)
     total_pages = len(pdf_images)
@@ -127,24 +84,27 @@ def generate_html(pairs, pdf_images):
             f"onmouseenter='highlightMultiBbox({bboxes_json}, {para_id})' "
             f'onmouseleave="clearHighlight()">'
             f'<span class="para-page-badge">p.{page_num}</span>'
-            f'<span class="para-text">{p["translated"]}</span>'
+            f'<span class="para-text">{render_math(p["translated"])}</span>'
             f'</div>'
         )
 
     # 페이지별 이미지 HTML
     pdf_pages_html = ""
-    for i, img in enumerate(pdf_images):
+    for img_idx, img in enumerate(pdf_images):
+        # 페이지 선택 시 이미지 순서와 PDF 페이지 번호가 다르다
+        i = img.get("page", img_idx)
         bbox_rects = ""
         for p in pairs:
             for region in p["bboxes"]:
                 if region["page"] != i:
                     continue
-                bbox = region["bbox"]
-                x = (bbox[0] / 1000) * img["width"]
-                y = (bbox[1] / 1000) * img["height"]
-                width = ((bbox[2] - bbox[0]) / 1000) * img["width"]
-                height = ((bbox[3] - bbox[1]) / 1000) * img["height"]
-                bbox_rects += f'''
+                # 줄 bbox가 있으면 줄 단위 영역, 없으면 블록 전체 영역
+                for bbox in region.get("lines") or [region["bbox"]]:
+                    x = (bbox[0] / 1000) * img["width"]
+                    y = (bbox[1] / 1000) * img["height"]
+                    width = ((bbox[2] - bbox[0]) / 1000) * img["width"]
+                    height = ((bbox[3] - bbox[1]) / 1000) * img["height"]
+                    bbox_rects += f'''
             <rect class="bbox-area" data-id="{p["id"]}"
                   x="{x}" y="{y}" width="{width}" height="{height}"
                   onmouseenter="highlightTranslation({p["id"]})"
@@ -156,7 +116,7 @@ def generate_html(pairs, pdf_images):
         <div class="pdf-page" data-page="{i}">
             <div class="page-number-label">
                 <span class="page-num-text">Page {page_label}</span>
-                <span class="page-num-total">/ {total_pages}</span>
+                <span class="page-num-total">/ {img.get("page_count", total_pages)}</span>
             </div>
             <div class="pdf-image-container">
                 <img src="data:image/png;base64,{img["base64"]}" />
@@ -173,20 +133,8 @@ def generate_html(pairs, pdf_images):
         </div>
         '''
 
-    katex_cdn = """
-    <link rel="stylesheet" href="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.css">
-    <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/katex.min.js"></script>
-    <script defer src="https://cdn.jsdelivr.net/npm/katex@0.16.9/dist/contrib/auto-render.min.js"
-            onload="renderMathInElement(document.body, {
-                delimiters: [
-                    {left: '$$', right: '$$', display: true},
-                    {left: '$', right: '$', display: false}
-                ],
-                throwOnError: false
-            });"></script>
-    """
-
-    html = katex_cdn + f"""
+    # 수식은 위에서 MathML로 변환 완료 -- 브라우저 쪽 조판 스크립트 없음
+    html = MATH_CSS + f"""
     <style>
         @import url('https://fonts.googleapis.com/css2?family=Inter:wght@400;500;600;700&family=Noto+Sans+KR:wght@400;500;600;700&display=swap');
 
@@ -526,7 +474,6 @@ window.highlightMultiBbox = function(bboxes, paraId) {
 
     for (var i = 0; i < bboxes.length; i++) {
         var region = bboxes[i];
-        var bbox = region.bbox;
         var pageIdx = region.page;
 
         var svg = document.querySelector('.pdf-overlay[data-page="' + pageIdx + '"]');
@@ -536,20 +483,25 @@ window.highlightMultiBbox = function(bboxes, paraId) {
         var svgW = viewBox.width;
         var svgH = viewBox.height;
 
-        var x = (bbox[0] / 1000) * svgW;
-        var y = (bbox[1] / 1000) * svgH;
-        var width = ((bbox[2] - bbox[0]) / 1000) * svgW;
-        var height = ((bbox[3] - bbox[1]) / 1000) * svgH;
-
-        var rect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
-        rect.setAttribute('x', x);
-        rect.setAttribute('y', y);
-        rect.setAttribute('width', width);
-        rect.setAttribute('height', height);
-        rect.setAttribute('class', 'highlight-rect');
-        svg.appendChild(rect);
-
-        window.currentHighlights.push({ svg: svg, rect: rect });
+        // 줄 bbox가 있으면 줄 단위로 하이라이트
+        var rects = region.lines && region.lines.length ? region.lines : [region.bbox];
+        for (var j = 0; j < rects.length; j++) {
+            var bbox = rects[j];
+            var x = (bbox[0] / 1000) * svgW;
+            var y = (bbox[1] / 1000) * svgH;
+            var width = ((bbox[2] - bbox[0]) / 1000) * svgW;
+            var height = ((bbox[3] - bbox[1]) / 1000) * svgH;
+
+            var rect = document.createElementNS('http://www.w3.org/2000/svg', 'rect');
+            rect.setAttribute('x', x);
+            rect.setAttribute('y', y);
+            rect.setAttribute('width', width);
+            rect.setAttribute('height', height);
+            rect.setAttribute('class', 'highlight-rect');
+            svg.appendChild(rect);
+
+            window.currentHighlights.push({ svg: svg, rect: rect });
+        }
     }
 
 };
@@ -697,18 +649,31 @@ def create_app():
                 size="lg",
             )
 
+        with gr.Row():
+            pages_input = gr.Textbox(label="페이지 (선택)", placeholder="1-5,8", scale=1)
+            sections_input = gr.Textbox(
+                label="섹션 (선택)", placeholder="abstract,introduction,conclusion", scale=2
+            )
+
         output_html = gr.HTML(label="결과")
 
+        # 동시 요청은 받아 두고 단계별 풀(src.pipeline)이 실행 수/대기열을 제한
         submit_btn.click(
             fn=process_pdf,
-            inputs=[arxiv_input],
+            inputs=[arxiv_input, pages_input, sections_input],
             outputs=[output_html],
+            concurrency_limit=int(os.getenv("SUNLIGHT_MAX_REQUESTS", "16")),
         )
 
     return app
 
 
 if __name__ == "__main__":
+    # Prometheus 텍스트 포맷 메트릭 (SUNLIGHT_METRICS_PORT 설정 시 /metrics 노출)
+    metrics_port = os.getenv("SUNLIGHT_METRICS_PORT")
+    if metrics_port:
+        serve_metrics(int(metrics_port))
+
     app = create_app()
     app.launch(
         head=HIGHLIGHT_HEAD,
@@ -0,0 +1,71 @@
+"""여러 논문을 배치 작업(Batch API)으로 한 번에 번역하는 야간 실행용 CLI.
+
+    python -m src.bulk_cli papers/*.pdf --workdir output/bulk/nightly --out-dir output/bulk/md
+
+같은 --workdir 로 다시 실행하면 중단된 작업(state.json)을 이어서 처리한다.
+"""
+import argparse
+from pathlib import Path
+
+from dotenv import load_dotenv
+
+from src.parser import PaperParser
+from src.utils.arxiv import ARXIV_PATTERN, download_arxiv_pdf
+from src.utils.tracing import get_tracer
+
+load_dotenv()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="논문 일괄 번역 (배치 작업 API)")
+    parser.add_argument("pdfs", nargs="+", help="입력 PDF 파일 경로 또는 arXiv URL")
+    parser.add_argument("--workdir", default="output/bulk/default", help="요청 파일/상태 저장 디렉토리 (재시작 시 동일하게)")
+    parser.add_argument("--out-dir", default="output/bulk/md", help="논문별 Markdown 출력 디렉토리")
+    parser.add_argument("-l", "--lang", default="ko", help="번역 대상 언어 (기본: ko)")
+    parser.add_argument("--model", default="gpt-4o-mini", help="배치 요청에 사용할 모델")
+    parser.add_argument("--engine", choices=PaperParser.ENGINES, default="auto", help="파싱 엔진 (기본: auto)")
+    parser.add_argument("--poll-interval", type=float, default=60.0, help="작업 상태 확인 간격(초)")
+    parser.add_argument("--local", action="store_true", help="OpenAI 대신 파일 기반 로컬 배치(echo 번역)로 실행")
+    parser.add_argument("--glossary", default="output/glossary.json", help="공용 용어집 JSON (프롬프트 컨텍스트에 포함)")
+    parser.add_argument("--profile", action="store_true", help="단계별 소요 시간/카운터 요약 출력")
+    args = parser.parse_args()
+    get_tracer().reset()  # 같은 프로세스에서 여러 번 실행해도 이번 실행의 트레이스만
+
+    # 번역 모듈은 openai를 import하므로 인자 검사 후 로드
+    from src.cli import generate_markdown
+    from src.translator import TermStore
+    from src.translator.bulk import BulkTranslator, LocalBatchClient, OpenAIBatchClient
+
+    papers = {}
+    paper_parser = PaperParser(engine=args.engine)
+    for source in args.pdfs:
+        pdf_path = download_arxiv_pdf(source) if ARXIV_PATTERN.search(source) else source
+        paper_id = Path(pdf_path).stem
+        print(f"파싱 중: {pdf_path}")
+        papers[paper_id] = paper_parser.parse(pdf_path)
+
+    workdir = Path(args.workdir)
+    client = LocalBatchClient(workdir / "local_jobs", target_lang=args.lang) if args.local else OpenAIBatchClient()
+    bulk = BulkTranslator(
+        client,
+        workdir,
+        target_lang=args.lang,
+        model=args.model,
+        poll_interval=args.poll_interval,
+        glossary=TermStore(args.glossary),
+    )
+    print(f"배치 번역: {len(papers)}편 ({workdir})")
+    translated = bulk.run(papers)
+
+    out_dir = Path(args.out_dir)
+    out_dir.mkdir(parents=True, exist_ok=True)
+    for paper_id, paper in translated.items():
+        path = out_dir / f"{paper_id}.md"
+        path.write_text(generate_markdown(paper), encoding="utf-8")
+        print(f"저장 완료: {path}")
+    if args.profile:
+        print(get_tracer().format_summary())
+
+
+if __name__ == "__main__":
+    main()
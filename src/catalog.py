@@ -0,0 +1,395 @@
+"""처리한 논문/산출물 SQLite 카탈로그.
+
+``output/<stem>/...`` 경로를 하나씩 확인하지 않고 논문이 이미 다운로드/파싱/번역되었는지
+키 조회 한 번으로 알 수 있도록 기록한다. 여러 프로세스(CLI, 웹 UI, API)가 동시에 쓰도록
+WAL 모드로 열고, 스레드마다 연결을 따로 쓴다.
+
+    python -m src.catalog list
+    python -m src.catalog show 2301.12345
+    python -m src.catalog gc --dry-run
+
+테이블:
+- ``papers``: PDF 해시(sha256) 기준 논문 (arXiv ID/버전, PDF 경로, 크기)
+- ``parses``: 파싱 기록 (엔진, 페이지, 소요 시간, 문단 수, 산출물 디렉토리와 크기)
+- ``parse_outputs``: 캐시된 MinerU 결과(content list) 경로 (전체 문서 또는 페이지 구간별).
+  파서는 이 기록으로 재사용할 결과를 찾는다.
+- ``translations``: 번역 기록 (언어, 모델, 소요 시간, 문단 수)
+"""
+from __future__ import annotations
+
+import argparse
+import hashlib
+import os
+import re
+import shutil
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from src.utils.arxiv import ARXIV_PATTERN
+
+DEFAULT_PATH = "output/catalog.sqlite3"
+
+# 다운로드한 파일명 (2301.12345.pdf, 2301.12345v2.pdf)
+ARXIV_ID_RE = re.compile(r"^(\d{4}\.\d{4,5}(?:v\d+)?)$")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS papers (
+    pdf_hash   TEXT PRIMARY KEY,
+    arxiv_id   TEXT,
+    version    TEXT,
+    stem       TEXT NOT NULL,
+    pdf_path   TEXT NOT NULL,
+    pdf_bytes  INTEGER NOT NULL,
+    created    REAL NOT NULL,
+    updated    REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS papers_arxiv ON papers (arxiv_id, version);
+CREATE INDEX IF NOT EXISTS papers_stem ON papers (stem);
+
+CREATE TABLE IF NOT EXISTS parses (
+    pdf_hash       TEXT NOT NULL REFERENCES papers (pdf_hash) ON DELETE CASCADE,
+    engine         TEXT NOT NULL,
+    pages          TEXT NOT NULL,
+    artifact_path  TEXT,
+    artifact_bytes INTEGER,
+    paragraphs     INTEGER,
+    seconds        REAL,
+    created        REAL NOT NULL,
+    PRIMARY KEY (pdf_hash, engine, pages)
+);
+
+-- 전체 문서 결과는 first_page = last_page = -1
+CREATE TABLE IF NOT EXISTS parse_outputs (
+    pdf_hash      TEXT NOT NULL REFERENCES papers (pdf_hash) ON DELETE CASCADE,
+    first_page    INTEGER NOT NULL,
+    last_page     INTEGER NOT NULL,
+    content_list  TEXT NOT NULL,
+    created       REAL NOT NULL,
+    PRIMARY KEY (pdf_hash, first_page, last_page)
+);
+
+CREATE TABLE IF NOT EXISTS translations (
+    pdf_hash    TEXT NOT NULL REFERENCES papers (pdf_hash) ON DELETE CASCADE,
+    lang        TEXT NOT NULL,
+    model       TEXT NOT NULL,
+    paragraphs  INTEGER,
+    seconds     REAL,
+    created     REAL NOT NULL,
+    PRIMARY KEY (pdf_hash, lang, model)
+);
+"""
+
+
+def file_hash(path: str | Path, chunk_size: int = 1 << 20) -> str:
+    """PDF 내용의 sha256 (경로/파일명과 무관한 논문 키)."""
+    digest = hashlib.sha256()
+    with Path(path).open("rb") as handle:
+        for chunk in iter(lambda: handle.read(chunk_size), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def split_arxiv_id(source: str) -> tuple[Optional[str], Optional[str]]:
+    """arXiv URL/파일명 -> (ID, 버전). ``2301.12345v2`` -> ("2301.12345", "v2")."""
+    match = ARXIV_PATTERN.search(source) or ARXIV_ID_RE.search(Path(source).stem)
+    if not match:
+        return None, None
+    paper_id = match.group(1)
+    base, _, version = paper_id.partition("v")
+    return base, f"v{version}" if version else None
+
+
+def connect(path: str | Path) -> sqlite3.Connection:
+    """여러 프로세스가 동시에 기록하는 SQLite 연결 (WAL + 잠금 대기). 스레드마다 따로 연다."""
+    conn = sqlite3.connect(path, timeout=10)
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA foreign_keys=ON")
+    return conn
+
+
+def backend_model(backend) -> str:
+    """번역 기록용 모델 이름 (OpenAI 모델명, 로컬 모델 디렉토리 또는 백엔드 이름)."""
+    return getattr(backend, "model", None) or getattr(backend, "model_dir", None) or backend.name
+
+
+def _tree_bytes(path: Path) -> int:
+    if path.is_file():
+        return path.stat().st_size
+    return sum(p.stat().st_size for p in path.rglob("*") if p.is_file())
+
+
+class Catalog:
+    """논문/파싱/번역 기록. 모든 조회는 기본 키 또는 인덱스 조회다."""
+
+    def __init__(self, path: str | Path = DEFAULT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self) -> sqlite3.Connection:
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # 논문
+    # ------------------------------------------------------------------
+
+    def register_pdf(self, pdf_path: str | Path, source: Optional[str] = None) -> str:
+        """PDF를 등록(또는 경로 갱신)하고 해시를 반환. *source*는 arXiv URL 등 원래 입력."""
+        pdf_path = Path(pdf_path)
+        pdf_hash = file_hash(pdf_path)
+        arxiv_id, version = split_arxiv_id(source or str(pdf_path))
+        now = time.time()
+        with self._conn() as conn:
+            conn.execute(
+                """
+                INSERT INTO papers (pdf_hash, arxiv_id, version, stem, pdf_path, pdf_bytes, created, updated)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (pdf_hash) DO UPDATE SET
+                    arxiv_id = COALESCE(excluded.arxiv_id, papers.arxiv_id),
+                    version = COALESCE(excluded.version, papers.version),
+                    stem = excluded.stem,
+                    pdf_path = excluded.pdf_path,
+                    updated = excluded.updated
+                """,
+                (pdf_hash, arxiv_id, version, pdf_path.stem, str(pdf_path.resolve()), pdf_path.stat().st_size, now, now),
+            )
+        return pdf_hash
+
+    def paper(self, pdf_hash: str) -> Optional[sqlite3.Row]:
+        return self._conn().execute("SELECT * FROM papers WHERE pdf_hash = ?", (pdf_hash,)).fetchone()
+
+    def find_arxiv(self, arxiv_id: str, version: Optional[str] = None) -> Optional[sqlite3.Row]:
+        """arXiv ID(버전 생략 시 가장 최근 갱신)의 논문."""
+        if version:
+            query = "SELECT * FROM papers WHERE arxiv_id = ? AND version = ? ORDER BY updated DESC LIMIT 1"
+            params = (arxiv_id, version)
+        else:
+            query, params = "SELECT * FROM papers WHERE arxiv_id = ? ORDER BY updated DESC LIMIT 1", (arxiv_id,)
+        return self._conn().execute(query, params).fetchone()
+
+    def cached_pdf(self, source: str) -> Optional[str]:
+        """버전이 명시된 arXiv URL의 PDF가 이미 받아져 있으면 그 경로 (다운로드 생략용).
+
+        버전 없는 URL은 arXiv에서 최신판이 바뀔 수 있으므로 캐시하지 않는다 (None).
+        기록된 경로는 임시 디렉토리일 수 있어 파일이 남아 있고 내용 해시가 같을 때만 쓴다.
+        """
+        arxiv_id, version = split_arxiv_id(source)
+        if not arxiv_id or not version:
+            return None
+        rows = self._conn().execute(
+            "SELECT pdf_hash, pdf_path FROM papers WHERE arxiv_id = ? AND version = ? ORDER BY updated DESC",
+            (arxiv_id, version),
+        ).fetchall()
+        for row in rows:
+            path = Path(row["pdf_path"])
+            if path.is_file() and file_hash(path) == row["pdf_hash"]:
+                return str(path)
+        return None
+
+    def papers(self) -> List[sqlite3.Row]:
+        return self._conn().execute("SELECT * FROM papers ORDER BY updated DESC").fetchall()
+
+    # ------------------------------------------------------------------
+    # 파싱 / 번역 기록
+    # ------------------------------------------------------------------
+
+    def record_parse(
+        self,
+        pdf_hash: str,
+        engine: str,
+        pages: Optional[Iterable[int]] = None,
+        artifact_path: str | Path | None = None,
+        paragraphs: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> None:
+        """파싱 결과 기록. *artifact_path*는 MinerU 출력 디렉토리 (없으면 None)."""
+        artifact = Path(artifact_path) if artifact_path else None
+        size = _tree_bytes(artifact) if artifact is not None and artifact.exists() else None
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parses VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    pdf_hash,
+                    engine,
+                    _pages_key(pages),
+                    str(artifact) if size is not None else None,
+                    size,
+                    paragraphs,
+                    seconds,
+                    time.time(),
+                ),
+            )
+
+    def parse(self, pdf_hash: str, engine: str, pages: Optional[Iterable[int]] = None) -> Optional[sqlite3.Row]:
+        return self._conn().execute(
+            "SELECT * FROM parses WHERE pdf_hash = ? AND engine = ? AND pages = ?",
+            (pdf_hash, engine, _pages_key(pages)),
+        ).fetchone()
+
+    def record_parse_output(
+        self, pdf_hash: str, content_list: str | Path, page_range: Optional[Tuple[int, int]] = None
+    ) -> None:
+        """MinerU 결과 경로 기록. *page_range* 는 0부터 시작하는 (start, end), 전체 문서면 None."""
+        first, last = page_range if page_range is not None else (-1, -1)
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO parse_outputs VALUES (?, ?, ?, ?, ?)",
+                (pdf_hash, first, last, str(content_list), time.time()),
+            )
+
+    def parse_outputs(self, pdf_hash: str) -> Dict[Optional[Tuple[int, int]], Path]:
+        """남아 있는 MinerU 결과 ``{None(전체 문서) 또는 (start, end): content list 경로}``."""
+        rows = self._conn().execute(
+            "SELECT first_page, last_page, content_list FROM parse_outputs WHERE pdf_hash = ?", (pdf_hash,)
+        ).fetchall()
+        outputs: Dict[Optional[Tuple[int, int]], Path] = {}
+        for row in rows:
+            path = Path(row["content_list"])
+            if path.exists():
+                key = None if row["first_page"] < 0 else (row["first_page"], row["last_page"])
+                outputs[key] = path
+        return outputs
+
+    def record_translation(
+        self,
+        pdf_hash: str,
+        lang: str,
+        model: str,
+        paragraphs: Optional[int] = None,
+        seconds: Optional[float] = None,
+    ) -> None:
+        with self._conn() as conn:
+            conn.execute(
+                "INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                (pdf_hash, lang, model, paragraphs, seconds, time.time()),
+            )
+
+    def translation(self, pdf_hash: str, lang: str, model: str) -> Optional[sqlite3.Row]:
+        return self._conn().execute(
+            "SELECT * FROM translations WHERE pdf_hash = ? AND lang = ? AND model = ?", (pdf_hash, lang, model)
+        ).fetchone()
+
+    def languages(self, pdf_hash: str) -> List[str]:
+        rows = self._conn().execute(
+            "SELECT DISTINCT lang FROM translations WHERE pdf_hash = ? ORDER BY lang", (pdf_hash,)
+        ).fetchall()
+        return [row["lang"] for row in rows]
+
+    # ------------------------------------------------------------------
+    # 정리
+    # ------------------------------------------------------------------
+
+    def gc(self, root: str | Path = "output", min_age_hours: float = 24.0, dry_run: bool = False) -> List[Path]:
+        """고아 산출물 제거 후 지운(지울) 경로 목록 반환.
+
+        - 산출물 경로가 사라진 파싱 기록은 경로를 비우고, 사라진 MinerU 결과 기록은 지운다.
+        - *root* 아래 논문 디렉토리(MinerU 출력/용어집이 있는 ``<stem>/``) 중 어떤 논문에도
+          연결되지 않고 *min_age_hours* 보다 오래된 것은 지운다 (진행 중인 파싱 보호).
+        """
+        root = Path(root)
+        conn = self._conn()
+        if not dry_run:
+            with conn:
+                for row in conn.execute("SELECT rowid, artifact_path FROM parses WHERE artifact_path IS NOT NULL"):
+                    if not Path(row["artifact_path"]).exists():
+                        conn.execute(
+                            "UPDATE parses SET artifact_path = NULL, artifact_bytes = NULL WHERE rowid = ?",
+                            (row["rowid"],),
+                        )
+                for row in conn.execute("SELECT rowid, content_list FROM parse_outputs"):
+                    if not Path(row["content_list"]).exists():
+                        conn.execute("DELETE FROM parse_outputs WHERE rowid = ?", (row["rowid"],))
+        referenced = {
+            Path(row["artifact_path"]).resolve()
+            for row in conn.execute("SELECT artifact_path FROM parses WHERE artifact_path IS NOT NULL")
+        }
+        stems = {row["stem"] for row in conn.execute("SELECT stem FROM papers")}
+        cutoff = time.time() - min_age_hours * 3600
+        removed = []
+        for path in sorted(root.iterdir()) if root.is_dir() else []:
+            if not path.is_dir() or not _is_artifact_dir(path):
+                continue
+            if path.resolve() in referenced or path.name in stems or path.stat().st_mtime > cutoff:
+                continue
+            removed.append(path)
+            if not dry_run:
+                shutil.rmtree(path, ignore_errors=True)
+        return removed
+
+
+def _pages_key(pages: Optional[Iterable[int]]) -> str:
+    return "all" if pages is None else ",".join(str(p) for p in sorted(set(pages)))
+
+
+def _is_artifact_dir(path: Path) -> bool:
+    """MinerU 출력(auto/, hybrid_auto/, pages_*/) 또는 논문별 용어집이 있는 디렉토리."""
+    if (path / "glossary.json").exists() or (path / "auto").is_dir() or (path / "hybrid_auto").is_dir():
+        return True
+    return any(path.glob("pages_*-*"))
+
+
+def open_catalog() -> Optional[Catalog]:
+    """SUNLIGHT_CATALOG (기본 output/catalog.sqlite3) 카탈로그. ``off``면 None."""
+    path = os.getenv("SUNLIGHT_CATALOG", DEFAULT_PATH)
+    return None if path.lower() == "off" else Catalog(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="처리한 논문 카탈로그")
+    parser.add_argument("--db", default=os.getenv("SUNLIGHT_CATALOG", DEFAULT_PATH), help="카탈로그 SQLite 파일")
+    commands = parser.add_subparsers(dest="command", required=True)
+    commands.add_parser("list", help="등록된 논문 목록")
+    show = commands.add_parser("show", help="논문 하나의 파싱/번역 기록")
+    show.add_argument("key", help="arXiv ID, PDF 해시 또는 파일명(stem)")
+    gc = commands.add_parser("gc", help="어떤 논문에도 연결되지 않은 산출물 디렉토리 삭제")
+    gc.add_argument("--root", default="output", help="산출물 루트 (기본: output)")
+    gc.add_argument("--min-age-hours", type=float, default=24.0, help="이보다 최근에 바뀐 디렉토리는 유지")
+    gc.add_argument("--dry-run", action="store_true", help="지우지 않고 대상만 출력")
+    args = parser.parse_args()
+
+    catalog = Catalog(args.db)
+    if args.command == "list":
+        for row in catalog.papers():
+            langs = ",".join(catalog.languages(row["pdf_hash"])) or "-"
+            arxiv = f"{row['arxiv_id']}{row['version'] or ''}" if row["arxiv_id"] else "-"
+            print(f"{row['pdf_hash'][:12]}  {arxiv:<16} {row['stem']:<30} 번역: {langs}")
+    elif args.command == "show":
+        conn = catalog._conn()
+        row = (
+            catalog.paper(args.key)
+            or catalog.find_arxiv(*split_arxiv_id(args.key))
+            or conn.execute("SELECT * FROM papers WHERE stem = ? OR pdf_hash LIKE ?", (args.key, f"{args.key}%")).fetchone()
+        )
+        if row is None:
+            parser.exit(1, f"카탈로그에 없음: {args.key}\n")
+        print(dict(row))
+        for parse in conn.execute("SELECT * FROM parses WHERE pdf_hash = ?", (row["pdf_hash"],)):
+            print("  parse:", dict(parse))
+        for trans in conn.execute("SELECT * FROM translations WHERE pdf_hash = ?", (row["pdf_hash"],)):
+            print("  translation:", dict(trans))
+    elif args.command == "gc":
+        removed = catalog.gc(args.root, min_age_hours=args.min_age_hours, dry_run=args.dry_run)
+        verb = "삭제 대상" if args.dry_run else "삭제"
+        for path in removed:
+            print(f"{verb}: {path}")
+        print(f"{verb} {len(removed)}개")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,11 +1,18 @@
 import argparse
+import time
 from pathlib import Path
 
 from dotenv import load_dotenv
 
-from src.app import ARXIV_PATTERN, download_arxiv_pdf
-from src.parser import PaperParser
-from src.translator import PaperTranslator
+from src.catalog import DEFAULT_PATH as CATALOG_PATH
+from src.catalog import Catalog, backend_model, file_hash
+from src.parser import MiddleJsonLoader, PaperParser
+from src.search import DEFAULT_PATH as SEARCH_PATH
+from src.search import SearchIndex
+from src.utils.arxiv import ARXIV_PATTERN, download_arxiv_pdf
+from src.utils.pdf_utils import pdf_page_count
+from src.utils.selection import parse_page_spec, select_sections
+from src.utils.tracing import get_tracer
 
 load_dotenv()
 
@@ -20,31 +27,148 @@ def main() -> None:
         "-l", "--lang", default="ko", help="번역 대상 언어 (기본: ko)"
     )
     parser.add_argument("--no-translate", action="store_true", help="번역 없이 파싱만")
+    parser.add_argument(
+        "--engine",
+        choices=PaperParser.ENGINES,
+        default="auto",
+        help="파싱 엔진: auto(텍스트 레이어 우선, 필요한 페이지만 MinerU), native, mineru (기본: auto)",
+    )
+    # src.translator는 openai를 import하므로 선택지(backends.BACKENDS)는 인자 파싱 후 번역할 때만 검사
+    parser.add_argument(
+        "--backend",
+        default="openai",
+        help="번역 백엔드: openai, local(CTranslate2 CPU 모델), echo(테스트용)",
+    )
+    parser.add_argument("--local-model", help="--backend local 에서 사용할 CTranslate2 모델 디렉토리")
+    parser.add_argument(
+        "--glossary", default="output/glossary.json", help="논문 간 공유하는 용어집 JSON (기본: output/glossary.json)"
+    )
+    parser.add_argument(
+        "--catalog", default=CATALOG_PATH, help=f"처리 기록 카탈로그 SQLite 파일, off면 기록 안 함 (기본: {CATALOG_PATH})"
+    )
+    parser.add_argument(
+        "--search-index",
+        default=SEARCH_PATH,
+        help=f"번역 결과를 추가할 검색 색인 SQLite 파일, off면 색인 안 함 (기본: {SEARCH_PATH})",
+    )
+    parser.add_argument(
+        "--journal-dir",
+        default="output/journal",
+        help="끝난 배치를 기록해 중단된 번역을 이어서 하는 작업 저널 디렉토리, off면 기록 안 함 (기본: output/journal)",
+    )
+    parser.add_argument("--pages", help="처리할 페이지 (1부터, 예: 1-5,8)")
+    parser.add_argument("--sections", help="번역할 섹션 (쉼표 구분, 예: abstract,introduction,conclusion)")
+    parser.add_argument(
+        "--middle-json", action="store_true", help="MinerU middle.json 줄 정보로 문단 병합 (MinerU 처리 페이지)"
+    )
+    parser.add_argument("--profile", action="store_true", help="단계별 소요 시간/카운터 요약 출력")
+    parser.add_argument("--trace-out", help="트레이스(span/counter)를 JSONL 파일로 저장")
     args = parser.parse_args()
-
+    get_tracer().reset()  # 같은 프로세스에서 여러 번 실행해도 이번 실행의 트레이스만
+    if not args.no_translate:
+        from src.translator import BACKENDS
+
+        if args.backend not in BACKENDS:
+            parser.error(f"--backend: {args.backend!r} 는 지원하지 않습니다 (선택: {', '.join(BACKENDS)})")
+        if args.backend == "local" and not args.local_model:
+            parser.error("--backend local 에는 --local-model 이 필요합니다")
+    try:
+        # 형식은 다운로드 전에 검사하고, 실제 페이지 수로는 PDF를 받은 뒤 다시 자른다
+        parse_page_spec(args.pages)
+    except ValueError as exc:
+        parser.error(str(exc))
+
+    catalog = None if args.catalog.lower() == "off" else Catalog(args.catalog)
     pdf_path = args.pdf
     if ARXIV_PATTERN.search(pdf_path):
-        print(f"arXiv에서 PDF 다운로드 중: {pdf_path}")
-        pdf_path = download_arxiv_pdf(pdf_path)
-        print(f"다운로드 완료: {pdf_path}")
+        cached = catalog.cached_pdf(pdf_path) if catalog is not None else None
+        if cached:
+            print(f"이미 받은 PDF 사용: {cached}")
+            pdf_path = cached
+        else:
+            print(f"arXiv에서 PDF 다운로드 중: {pdf_path}")
+            pdf_path = download_arxiv_pdf(pdf_path)
+            print(f"다운로드 완료: {pdf_path}")
+    pdf_hash = catalog.register_pdf(pdf_path, args.pdf) if catalog is not None else None
+    try:
+        pages = parse_page_spec(args.pages, page_count=pdf_page_count(pdf_path)) if args.pages else None
+    except ValueError as exc:
+        parser.error(str(exc))
 
     print(f"파싱 중: {pdf_path}")
-    paper_parser = PaperParser()
-    parsed = paper_parser.parse(pdf_path)
+    paper_parser = PaperParser(
+        engine=args.engine, middle_loader=MiddleJsonLoader() if args.middle_json else None, catalog=catalog
+    )
+    started = time.perf_counter()
+    parsed = paper_parser.parse(pdf_path, pages=pages, pdf_hash=pdf_hash)
+    if catalog is not None:
+        catalog.record_parse(
+            pdf_hash,
+            args.engine,
+            pages,
+            artifact_path=Path("output") / Path(pdf_path).stem,
+            paragraphs=len(parsed.body),
+            seconds=time.perf_counter() - started,
+        )
+    if args.sections:
+        # 번역 전에 선택해서 번역 비용이 선택한 섹션 크기에 비례하도록
+        parsed.body = select_sections(parsed.body, args.sections.split(","))
     print(f"  - 본문: {len(parsed.body)}개 문단")
     print(f"  - 테이블: {len(parsed.tables)}개")
     print(f"  - 수식: {len(parsed.equations)}개")
 
     if not args.no_translate:
-        print(f"번역 중: {args.lang}")
-        translator = PaperTranslator()
-        parsed = translator.translate(parsed, args.lang)
+        # openai 클라이언트는 번역할 때만 로드 (--no-translate 시작 시간 단축)
+        from src.translator import PaperTranslator, TermStore, TranslationJournal, create_backend
+
+        print(f"번역 중: {args.lang} ({args.backend})")
+        options = {"model_dir": args.local_model} if args.backend == "local" else {}
+        # 논문별 용어집은 MinerU 출력과 같은 output/<stem>/ 에 저장
+        glossary = TermStore(
+            Path("output") / Path(pdf_path).stem / "glossary.json", parent=TermStore(args.glossary)
+        )
+        translator = PaperTranslator(backend=create_backend(args.backend, **options), glossary=glossary)
+        model = backend_model(translator.backend)
+        previous = catalog.translation(pdf_hash, args.lang, model) if catalog is not None else None
+        if previous is not None:
+            print(f"  (이전에 같은 모델로 번역한 기록 있음: {previous['paragraphs']}개 문단)")
+        started = time.perf_counter()
+        original = parsed
+        journal = None
+        if args.journal_dir.lower() != "off":
+            # 같은 PDF/언어/모델 작업이 중간에 죽었으면 끝난 문단은 저널에서 복원
+            journal = TranslationJournal.for_job(
+                pdf_hash or file_hash(pdf_path), args.lang, model, root=args.journal_dir
+            )
+        try:
+            parsed = translator.translate(parsed, args.lang, journal=journal)
+        finally:
+            if journal is not None:
+                journal.close()
+        glossary.commit()
+        restored = get_tracer().counter("translate.journal_restored")
+        if restored:
+            print(f"  - 저널에서 복원: {restored:g}개 문단")
+        if catalog is not None:
+            catalog.record_translation(
+                pdf_hash, args.lang, model, paragraphs=len(parsed.body), seconds=time.perf_counter() - started
+            )
+        # 일부 페이지/섹션만 처리한 실행은 문단 번호가 전체 논문과 달라 색인하지 않는다
+        if args.search_index.lower() != "off" and pages is None and not args.sections:
+            SearchIndex(args.search_index).add_paper(pdf_hash or Path(pdf_path).stem, original, parsed, args.lang)
 
     output_path = Path(args.output)
     md_content = generate_markdown(parsed)
     output_path.write_text(md_content, encoding="utf-8")
     print(f"저장 완료: {output_path}")
 
+    tracer = get_tracer()
+    if args.trace_out:
+        tracer.export_jsonl(args.trace_out)
+        print(f"트레이스 저장: {args.trace_out}")
+    if args.profile:
+        print(tracer.format_summary())
+
 
 def generate_markdown(paper) -> str:
     """ParsedPaper를 Markdown으로 변환."""
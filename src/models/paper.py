@@ -11,6 +11,7 @@ class Paragraph:
     block_id: Optional[str] = None
     bbox: Optional[List[float]] = None
     bboxes: Optional[List[dict]] = None  # [{"bbox": [...], "page": int}, ...]
+    section: Optional[str] = None  # 문단이 속한 최상위 섹션 제목
 
 
 @dataclass
@@ -1,6 +1,17 @@
 from .content_classifier import ContentClassifier
 from .latex_normalizer import LatexNormalizer
+from .layout_analyzer import LayoutAnalyzer
+from .middle_loader import MiddleJsonLoader
 from .mineru_parser import PaperParser
+from .native_extractor import NativeExtractor
 from .paragraph_builder import ParagraphBuilder
 
-__all__ = ["ContentClassifier", "LatexNormalizer", "PaperParser", "ParagraphBuilder"]
+__all__ = [
+    "ContentClassifier",
+    "LatexNormalizer",
+    "LayoutAnalyzer",
+    "MiddleJsonLoader",
+    "NativeExtractor",
+    "PaperParser",
+    "ParagraphBuilder",
+]
@@ -21,6 +21,15 @@ class LatexNormalizer:
         "texttt",
     )
 
+    # 수식 구간: $$...$$, $...$, \(...\), \[...\], \begin{..}...\end{..}
+    # (번역기의 수식 전용 판별과 placeholder 마스킹에서 함께 사용)
+    MATH_SPAN_PATTERN = (
+        r"\$\$[\s\S]+?\$\$"
+        r"|\$[^\$]+\$"
+        r"|\\[\(\[][\s\S]+?\\[\)\]]"
+        r"|\\begin\{[^}]+\}[\s\S]+?\\end\{[^}]+\}"
+    )
+
     def normalize(self, text: str) -> str:
         """수식 텍스트 정규화 메인 함수."""
         if not text:
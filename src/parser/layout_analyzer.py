@@ -0,0 +1,128 @@
+"""페이지 단위 레이아웃 분석 (컬럼 클러스터링, 읽기 순서, 연속 후보)."""
+from __future__ import annotations
+
+from typing import Callable, Iterable, List
+
+import numpy as np
+
+
+class LayoutAnalyzer:
+    """페이지별 블록 bbox를 NumPy 배열로 모아 컬럼/읽기 순서를 계산.
+
+    - 페이지 폭의 ``span_ratio`` 이상을 차지하는 블록(와이드 그림, 표, 단일 컬럼 문단)은
+      컬럼에 속하지 않고(``column == -1``) 페이지를 위아래 band로 나눈다.
+    - 나머지 블록은 x 시작 좌표를 정렬해 ``gap_ratio * 중앙값 폭`` 보다 큰 간격에서
+      끊어 컬럼으로 묶는다. 컬럼 수에 제한이 없으므로 3단 레이아웃도 처리된다.
+    - 읽기 순서는 (band, column, y) 순으로 정렬한다.
+
+    결과 블록에는 ``layout`` 키가 추가된다::
+
+        {"band": int, "column": int, "order": int, "col_head": bool, "col_tail": bool}
+
+    ``col_head`` / ``col_tail`` 은 같은 band·컬럼 안에서 본문 흐름 블록(``flow_types``)의
+    첫/마지막 블록인지를 나타내며, 컬럼 넘김 연속 후보 판단에 쓰인다.
+    """
+
+    FLOW_TYPES = frozenset({"text", "title", "list"})
+
+    def __init__(self, span_ratio: float = 0.6, gap_ratio: float = 0.5, flow_types: Iterable[str] | None = None):
+        self.span_ratio = span_ratio
+        self.gap_ratio = gap_ratio
+        self.flow_types = frozenset(flow_types) if flow_types is not None else self.FLOW_TYPES
+
+    def annotate(self, blocks: Iterable[dict], is_flow: Callable[[dict], bool] | None = None) -> List[dict]:
+        """블록을 페이지별 읽기 순서로 정렬하고 layout 정보를 붙인 복사본을 반환.
+
+        페이지 순서는 입력에서 처음 등장한 순서를 유지한다. *is_flow* 를 주면
+        ``flow_types`` 대신 그 판정으로 본문 흐름 블록을 고른다 (예: 사사 각주 제외).
+        """
+        is_flow = is_flow or (lambda b: b.get("type", "text") in self.flow_types)
+        pages: dict[int, List[dict]] = {}
+        for block in blocks:
+            pages.setdefault(block.get("page_idx", 0), []).append(block)
+
+        result: List[dict] = []
+        for page_blocks in pages.values():
+            result.extend(self._annotate_page(page_blocks, is_flow))
+        return result
+
+    @staticmethod
+    def _has_bboxes(blocks: List[dict]) -> bool:
+        for block in blocks:
+            bbox = block.get("bbox")
+            if not isinstance(bbox, (list, tuple)) or len(bbox) != 4:
+                return False
+        return True
+
+    def _annotate_page(self, blocks: List[dict], is_flow: Callable[[dict], bool]) -> List[dict]:
+        # bbox가 없는 블록이 섞인 페이지는 원래 순서를 그대로 신뢰
+        if not blocks or not self._has_bboxes(blocks):
+            return list(blocks)
+
+        boxes = np.asarray([b["bbox"] for b in blocks], dtype=float)
+        x0, y0, x1 = boxes[:, 0], boxes[:, 1], boxes[:, 2]
+        widths = x1 - x0
+
+        page_width = x1.max() - x0.min()
+        spanning = widths > self.span_ratio * page_width if page_width > 0 else np.zeros(len(blocks), dtype=bool)
+        columns = self._cluster_columns(x0, x1, widths, ~spanning)
+
+        # 와이드 블록이 페이지를 band로 나눈다. 와이드 블록 자신은 자기가 여는 band의
+        # 맨 앞(column -1)에 놓인다.
+        span_tops = np.sort(y0[spanning])
+        bands = np.searchsorted(span_tops, y0, side="right")
+
+        order = np.lexsort((y0, columns, bands))
+
+        # 흐름 블록만 대상으로 (band, column) 그룹의 첫/마지막 블록 표시
+        flow_mask = np.fromiter((is_flow(b) for b in blocks), dtype=bool, count=len(blocks))
+        flow_order = order[flow_mask[order]]
+        keys = bands[flow_order] * (columns.max() + 2) + (columns[flow_order] + 1)
+        heads = np.ones(len(flow_order), dtype=bool)
+        tails = np.ones(len(flow_order), dtype=bool)
+        if len(flow_order) > 1:
+            changed = keys[1:] != keys[:-1]
+            heads[1:] = changed
+            tails[:-1] = changed
+        col_head = np.zeros(len(blocks), dtype=bool)
+        col_tail = np.zeros(len(blocks), dtype=bool)
+        col_head[flow_order] = heads
+        col_tail[flow_order] = tails
+
+        annotated: List[dict] = []
+        for rank, idx in enumerate(order.tolist()):
+            annotated.append({
+                **blocks[idx],
+                "layout": {
+                    "band": int(bands[idx]),
+                    "column": int(columns[idx]),
+                    "order": rank,
+                    "col_head": bool(col_head[idx]),
+                    "col_tail": bool(col_tail[idx]),
+                },
+            })
+        return annotated
+
+    def _cluster_columns(self, x0: np.ndarray, x1: np.ndarray, widths: np.ndarray, narrow: np.ndarray) -> np.ndarray:
+        """좁은 블록의 x 시작 좌표를 1차원 간격 기준으로 컬럼에 배정."""
+        columns = np.full(len(x0), -1, dtype=int)
+        if not narrow.any():
+            return columns
+
+        xs = x0[narrow]
+        sorted_idx = np.argsort(xs, kind="stable")
+        sorted_xs = xs[sorted_idx]
+        gap = self.gap_ratio * np.median(widths[narrow])
+        splits = np.flatnonzero(np.diff(sorted_xs) > gap) + 1
+        labels = np.searchsorted(sorted_xs[splits], xs, side="right")
+
+        if len(splits):
+            # 컬럼 x 범위가 겹치면 진짜 다단이 아님 (가운데 정렬 수식 등) -> 단일 컬럼
+            starts = np.concatenate(([0], splits))
+            lefts = np.minimum.reduceat(sorted_xs, starts)
+            rights = np.maximum.reduceat(x1[narrow][sorted_idx], starts)
+            if np.any(lefts[1:] < rights[:-1]):
+                labels = np.zeros(len(xs), dtype=int)
+
+        columns[narrow] = labels
+        return columns
@@ -0,0 +1,143 @@
+"""MinerU ``*_middle.json`` 스트리밍 로더: content list 블록에 줄 단위 정보를 붙인다."""
+from __future__ import annotations
+
+import json
+from pathlib import Path
+from typing import Iterable, Iterator, List
+
+# 줄 정보를 붙일 middle.json 블록 타입 (본문 흐름 블록)
+_LINE_BLOCK_TYPES = {"text", "title", "list", "index", "ref_text", "interline_equation"}
+
+
+class MiddleJsonLoader:
+    """``middle.json`` 의 ``pdf_info`` 페이지를 하나씩 읽어 블록에 ``lines`` 를 붙인다.
+
+    middle.json은 content list보다 수 배 크므로 전체를 ``json.load`` 하지 않고,
+    ``pdf_info`` 배열 원소(페이지)를 ``JSONDecoder.raw_decode`` 로 한 개씩 디코딩한다.
+    메모리에는 읽기 버퍼와 현재 페이지만 올라간다.
+
+    붙이는 ``lines`` 형식은 NativeExtractor와 같다:
+    ``[{"bbox"(정규화×1000), "font_size", "spans": [span type, ...]}]``.
+    pipeline 백엔드는 span에 폰트 크기를 기록하지 않으므로 ``font_size`` 는 줄 높이(pt)로 근사한다.
+    """
+
+    def __init__(self, chunk_size: int = 1 << 20, min_iou: float = 0.5):
+        self.chunk_size = chunk_size
+        self.min_iou = min_iou
+
+    def iter_pages(self, path: str | Path) -> Iterator[dict]:
+        """``pdf_info`` 배열의 페이지 dict를 순서대로 yield."""
+        decoder = json.JSONDecoder()
+        with Path(path).open("r", encoding="utf-8") as handle:
+            buffer = ""
+            pos = -1
+            # "pdf_info": [ 위치 찾기
+            while pos < 0:
+                chunk = handle.read(self.chunk_size)
+                if not chunk:
+                    return
+                buffer += chunk
+                key = buffer.find('"pdf_info"')
+                if key >= 0:
+                    bracket = buffer.find("[", key)
+                    if bracket >= 0:
+                        pos = bracket + 1
+                elif len(buffer) > 16:
+                    # 키가 청크 경계에 걸칠 수 있으므로 끝부분만 남긴다
+                    buffer = buffer[-16:]
+
+            eof = False
+            while True:
+                while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+                    pos += 1
+                if pos < len(buffer) and buffer[pos] == "]":
+                    return
+                try:
+                    page, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                    chunk = handle.read(self.chunk_size)
+                    eof = not chunk
+                    # 디코딩이 끝난 앞부분은 버린다
+                    buffer = buffer[pos:] + chunk
+                    pos = 0
+                    continue
+                yield page
+                pos = end
+
+    def attach(self, blocks: Iterable[dict], middle_path: str | Path) -> List[dict]:
+        """*blocks* (content list) 중 본문 블록에 middle.json의 줄 정보를 붙인 복사본을 반환.
+
+        bbox가 가장 많이 겹치는 middle 블록(IoU ≥ ``min_iou``)과 짝짓는다.
+        매칭되지 않은 블록은 그대로 둔다.
+        """
+        result = [dict(b) for b in blocks]
+        by_page: dict[int, List[dict]] = {}
+        for block in result:
+            if block.get("bbox") and block.get("type", "text") in ("text", "title", "list"):
+                by_page.setdefault(block.get("page_idx", 0), []).append(block)
+
+        for page in self.iter_pages(middle_path):
+            candidates = by_page.pop(page.get("page_idx", -1), None)
+            if not candidates:
+                continue
+            width, height = page.get("page_size") or (0, 0)
+            if not width or not height:
+                continue
+            middle_blocks = [
+                (self._normalize(mb["bbox"], width, height), mb)
+                for mb in page.get("para_blocks", [])
+                if mb.get("type") in _LINE_BLOCK_TYPES and mb.get("bbox")
+            ]
+            for block in candidates:
+                best, best_iou = None, self.min_iou
+                for bbox, mb in middle_blocks:
+                    iou = self._iou(block["bbox"], bbox)
+                    if iou >= best_iou:
+                        best, best_iou = mb, iou
+                if best is not None:
+                    lines = self._lines(best, width, height)
+                    if lines:
+                        block["lines"] = lines
+            if not by_page:
+                break
+        return result
+
+    @classmethod
+    def _lines(cls, middle_block: dict, width: float, height: float) -> List[dict]:
+        # list 등은 하위 blocks 안에 lines가 있다
+        raw_lines = list(middle_block.get("lines") or [])
+        for sub in middle_block.get("blocks") or []:
+            raw_lines.extend(sub.get("lines") or [])
+        lines = []
+        for line in raw_lines:
+            spans = [
+                s.get("type", "text")
+                for s in line.get("spans", [])
+                if s.get("type", "text") != "text" or s.get("content", "").strip()
+            ]
+            if not line.get("bbox") or not spans:
+                continue
+            lines.append({
+                "bbox": cls._normalize(line["bbox"], width, height),
+                "font_size": round(line["bbox"][3] - line["bbox"][1], 2),
+                "spans": spans,
+            })
+        return lines
+
+    @staticmethod
+    def _normalize(bbox, width: float, height: float) -> List[int]:
+        # MinerU content list와 같은 방식 (page_size 기준 ×1000, 내림)
+        x0, y0, x1, y1 = bbox
+        return [int(x0 * 1000 / width), int(y0 * 1000 / height), int(x1 * 1000 / width), int(y1 * 1000 / height)]
+
+    @staticmethod
+    def _iou(a, b) -> float:
+        ix = min(a[2], b[2]) - max(a[0], b[0])
+        iy = min(a[3], b[3]) - max(a[1], b[1])
+        if ix <= 0 or iy <= 0:
+            return 0.0
+        inter = ix * iy
+        union = (a[2] - a[0]) * (a[3] - a[1]) + (b[2] - b[0]) * (b[3] - b[1]) - inter
+        return inter / union if union > 0 else 0.0
@@ -1,48 +1,111 @@
 from __future__ import annotations
 
 import json
+import logging
+import shutil
 import subprocess
 from pathlib import Path
 from typing import Iterable
 
 from src.models import Figure, Paragraph, ParsedPaper, Table
 from src.parser.content_classifier import ContentClassifier
+from src.parser.layout_analyzer import LayoutAnalyzer
+from src.parser.middle_loader import MiddleJsonLoader
+from src.parser.native_extractor import NativeExtractor
 from src.parser.paragraph_builder import ParagraphBuilder
+from src.utils.tracing import get_tracer
+
+logger = logging.getLogger(__name__)
 
 
 class PaperParser:
-    def __init__(self, classifier: ContentClassifier | None = None) -> None:
+    """PDF -> ParsedPaper 파서.
+
+    engine:
+        - ``"mineru"``: 모든 페이지를 MinerU 레이아웃/OCR 파이프라인으로 처리 (기본값)
+        - ``"native"``: PyMuPDF 텍스트 레이어만 사용 (가장 빠름, 수식은 유니코드 그대로)
+        - ``"auto"``: native로 추출하고 품질 기준을 통과하지 못한 페이지만 MinerU로 처리
+
+    middle_loader를 주면 MinerU 결과의 ``*_middle.json`` 에서 줄 단위 bbox/span 정보를
+    읽어 블록에 붙인다 (문단 병합 판단과 하이라이트 좌표가 줄 단위로 정확해짐).
+
+    catalog (:class:`~src.catalog.Catalog`)를 주면 캐시된 MinerU 결과(전체 문서/페이지 구간)를
+    카탈로그 기록으로 찾고, 기록이 없을 때만 ``output/<stem>`` 을 뒤진다 (찾은 결과와 새로
+    실행한 결과는 카탈로그에 기록).
+    """
+
+    ENGINES = ("mineru", "native", "auto")
+
+    def __init__(
+        self,
+        classifier: ContentClassifier | None = None,
+        layout_analyzer: LayoutAnalyzer | None = None,
+        engine: str = "mineru",
+        native_extractor: NativeExtractor | None = None,
+        middle_loader: MiddleJsonLoader | None = None,
+        catalog=None,
+    ) -> None:
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown parser engine: {engine!r} (expected one of {self.ENGINES})")
         self.classifier = classifier or ContentClassifier()
+        self.layout_analyzer = layout_analyzer or LayoutAnalyzer()
         self.paragraph_builder = ParagraphBuilder()
+        self.engine = engine
+        self.native_extractor = native_extractor or NativeExtractor()
+        self.middle_loader = middle_loader
+        self.catalog = catalog
+        self._pdf_hashes: dict[Path, str] = {}
+
+    def parse(
+        self, pdf_path: str | Path, pages: Iterable[int] | None = None, pdf_hash: str | None = None
+    ) -> ParsedPaper:
+        """PDF를 파싱. *pages* (0부터 시작)를 주면 해당 페이지만 추출/MinerU 처리한다.
 
-    def parse(self, pdf_path: str | Path) -> ParsedPaper:
+        *pdf_hash* 는 카탈로그 키 (생략하면 카탈로그가 있을 때 PDF를 등록해 구한다).
+        """
         pdf_path = Path(pdf_path)
         if not pdf_path.exists():
             raise FileNotFoundError(f"PDF not found: {pdf_path}")
+        if self.catalog is not None and self.engine != "native":
+            self._pdf_hashes[pdf_path] = pdf_hash or self.catalog.register_pdf(pdf_path)
+
+        pages = sorted(set(pages)) if pages is not None else None
+        with get_tracer().span("parse", pdf=pdf_path.name, engine=self.engine, pages=len(pages) if pages else None):
+            return self.parse_blocks(self._load_blocks(pdf_path, pages))
+
+    def parse_blocks(self, blocks: Iterable[dict]) -> ParsedPaper:
+        """MinerU content list 블록을 ParsedPaper로 변환 (MinerU 실행 없이 사용 가능)."""
+        tracer = get_tracer()
+        # 페이지별 컬럼/읽기 순서 분석 (와이드 그림·표도 band 분할에 쓰이도록 전체 블록 대상)
+        with tracer.span("layout"):
+            blocks = self.layout_analyzer.annotate(blocks, is_flow=self.classifier.is_body_text)
 
-        blocks = list(self._run_mineru(pdf_path))
-        body_blocks = [b for b in blocks if self.classifier.is_body_text(b)]
+        with tracer.span("classify", blocks=len(blocks)):
+            body_blocks = [b for b in blocks if self.classifier.is_body_text(b)]
 
-        # 논문 앞부분 메타 정보(저자, 소속 등) 제거:
-        # 첫 번째 제목(논문 타이틀) 이후 ~ 두 번째 제목(Introduction 등) 이전 블록 스킵
-        body_blocks = self._strip_front_matter(body_blocks)
+            # 논문 앞부분 메타 정보(저자, 소속 등) 제거:
+            # 첫 번째 제목(논문 타이틀) 이후 ~ 두 번째 제목(Introduction 등) 이전 블록 스킵
+            body_blocks = self._strip_front_matter(body_blocks)
 
-        # References 이후 블록 제거
-        ref_idx = None
-        for i, b in enumerate(body_blocks):
-            text = (b.get("text") or "").strip().upper()
-            if b.get("text_level") == 1 and text in ("REFERENCES", "BIBLIOGRAPHY"):
-                ref_idx = i
-                break
-        if ref_idx is not None:
-            body_blocks = body_blocks[:ref_idx]
+            # References 이후 블록 제거
+            ref_idx = None
+            for i, b in enumerate(body_blocks):
+                text = (b.get("text") or "").strip().upper()
+                if b.get("text_level") == 1 and text in ("REFERENCES", "BIBLIOGRAPHY"):
+                    ref_idx = i
+                    break
+            if ref_idx is not None:
+                body_blocks = body_blocks[:ref_idx]
 
-        paragraphs = self.paragraph_builder.merge_broken_paragraphs(body_blocks)
+        with tracer.span("paragraphs", blocks=len(body_blocks)) as span:
+            paragraphs = self.paragraph_builder.merge_broken_paragraphs(body_blocks)
+            span.attributes["paragraphs"] = len(paragraphs)
 
-        tables = [self._to_table(b) for b in blocks if self.classifier.is_table(b)]
-        figures = [self._to_figure(b) for b in blocks if self.classifier.is_figure(b)]
-        equations = [b.get("latex", "") for b in blocks if self.classifier.is_equation(b)]
-        metadata = self._extract_metadata(blocks)
+        with tracer.span("extras"):
+            tables = [self._to_table(b) for b in blocks if self.classifier.is_table(b)]
+            figures = [self._to_figure(b) for b in blocks if self.classifier.is_figure(b)]
+            equations = [b.get("latex") or b.get("text", "") for b in blocks if self.classifier.is_equation(b)]
+            metadata = self._extract_metadata(blocks)
 
         return ParsedPaper(
             body=paragraphs,
@@ -80,71 +143,232 @@ class PaperParser:
 
         return blocks[: first_title_idx + 1] + kept + blocks[second_title_idx:]
 
-    def _run_mineru(self, pdf_path: Path) -> Iterable[dict]:
-        """Run MinerU CLI and yield content list blocks."""
-        output_root = Path("output")
+    def _load_blocks(self, pdf_path: Path, pages: list[int] | None = None) -> Iterable[dict]:
+        """설정된 엔진으로 content list 형태의 블록을 만든다."""
+        if self.engine == "mineru":
+            if pages is None:
+                return self._run_mineru(pdf_path)
+            return self._run_mineru_pages(pdf_path, pages)
 
+        tracer = get_tracer()
+        with tracer.span("native", pdf=pdf_path.name) as span:
+            blocks, fallback_pages = self.native_extractor.extract(pdf_path, pages=pages)
+            span.attributes["blocks"] = len(blocks)
+            span.attributes["fallback_pages"] = len(fallback_pages)
+        if self.engine == "native" or not fallback_pages:
+            return blocks
+
+        if shutil.which("mineru") is None:
+            # MinerU 미설치: 품질이 낮더라도 텍스트 레이어로 추출
+            logger.warning("MinerU CLI를 찾을 수 없어 %d개 페이지를 텍스트 레이어로 처리합니다.", len(fallback_pages))
+            tracer.add("parse.text_layer_fallback_pages", len(fallback_pages))
+            extra, _ = self.native_extractor.extract(pdf_path, pages=fallback_pages, force=True)
+            return sorted(blocks + extra, key=lambda b: b.get("page_idx", 0))
+
+        # auto: 품질 기준을 통과하지 못한 페이지만 MinerU로 처리
+        tracer.add("parse.mineru_fallback_pages", len(fallback_pages))
+        blocks.extend(self._run_mineru_pages(pdf_path, fallback_pages))
+        # 페이지 순서대로 합친다 (페이지 내 순서는 LayoutAnalyzer가 정한다)
+        return sorted(blocks, key=lambda b: b.get("page_idx", 0))
+
+    def _run_mineru_pages(self, pdf_path: Path, pages: Iterable[int]) -> list[dict]:
+        """지정한 페이지만 MinerU로 처리. 이미 처리된 페이지 구간 캐시가 있으면 재사용하고
+        남은 페이지만 연속 구간 단위로 실행한다."""
+        outputs = self._cached_outputs(pdf_path)
+        remaining = set(pages)
+        groups: list[tuple[int, int]] = []
+        if None in outputs:
+            groups = self._page_ranges(remaining)
+            remaining = set()
+        for start, end in self._widest_first(outputs):
+            covered = {p for p in remaining if start <= p <= end}
+            groups.extend(self._page_ranges(covered))
+            remaining -= covered
+        groups.extend(self._page_ranges(remaining))
+
+        blocks: list[dict] = []
+        for start, end in groups:
+            blocks.extend(self._run_mineru(pdf_path, page_range=(start, end)))
+        return sorted(blocks, key=lambda b: b.get("page_idx", 0))
+
+    def _cached_outputs(self, pdf_path: Path, output_root: Path = Path("output")) -> dict:
+        """캐시된 MinerU 결과 ``{None(전체 문서) 또는 (start, end): content list 경로}``.
+
+        카탈로그 기록을 먼저 보고, 기록이 없을 때만 파일 시스템을 뒤져 찾은 것을 기록한다.
+        """
+        pdf_hash = self._pdf_hashes.get(pdf_path)
+        if pdf_hash is not None:
+            outputs = self.catalog.parse_outputs(pdf_hash)
+            if outputs:
+                get_tracer().add("catalog.parse_hits")
+                return outputs
+
+        outputs = {}
+        content_list_path = self._content_list_path(pdf_path, output_root)
+        if content_list_path.exists():
+            outputs[None] = content_list_path
+        for start, end in self._cached_page_ranges(pdf_path, output_root):
+            outputs[(start, end)] = self._range_content_list_path(pdf_path, start, end, output_root)
+        if pdf_hash is not None:
+            for page_range, path in outputs.items():
+                self.catalog.record_parse_output(pdf_hash, path, page_range)
+        return outputs
+
+    @staticmethod
+    def _widest_first(outputs: dict) -> list[tuple[int, int]]:
+        return sorted((r for r in outputs if r is not None), key=lambda r: (r[0] - r[1], r[0]))
+
+    @staticmethod
+    def _content_list_path(pdf_path: Path, output_root: Path = Path("output")) -> Path:
+        """전체 문서 MinerU 결과(content list) 경로. hybrid 백엔드 캐시가 있으면 그 경로."""
         # pipeline 백엔드는 auto/ 디렉토리에 출력
-        content_list_path = (
-            output_root
-            / pdf_path.stem
-            / "auto"
-            / f"{pdf_path.stem}_content_list.json"
-        )
+        content_list_path = output_root / pdf_path.stem / "auto" / f"{pdf_path.stem}_content_list.json"
         # hybrid 백엔드 캐시도 확인 (이전 실행 결과 재사용)
-        hybrid_path = (
-            output_root
-            / pdf_path.stem
-            / "hybrid_auto"
-            / f"{pdf_path.stem}_content_list.json"
-        )
+        hybrid_path = output_root / pdf_path.stem / "hybrid_auto" / f"{pdf_path.stem}_content_list.json"
         if hybrid_path.exists():
-            content_list_path = hybrid_path
-
-        if not content_list_path.exists():
-            output_root.mkdir(parents=True, exist_ok=True)
-
-            devices = ["mps", "cpu"]
-            last_error: subprocess.CalledProcessError | None = None
-            for device in devices:
-                cmd = [
-                    "mineru",
-                    "-p",
-                    str(pdf_path),
-                    "-o",
-                    str(output_root),
-                    "-b",
-                    "pipeline",
-                    "-d",
-                    device,
-                ]
-                try:
-                    subprocess.run(cmd, check=True, capture_output=True, text=True)
-                    last_error = None
+            return hybrid_path
+        return content_list_path
+
+    @staticmethod
+    def _range_content_list_path(pdf_path: Path, start: int, end: int, output_root: Path = Path("output")) -> Path:
+        run_root = output_root / pdf_path.stem / f"pages_{start}-{end}"
+        return run_root / pdf_path.stem / "auto" / f"{pdf_path.stem}_content_list.json"
+
+    @classmethod
+    def _cached_page_ranges(cls, pdf_path: Path, output_root: Path = Path("output")) -> list[tuple[int, int]]:
+        """MinerU 결과가 캐시된 페이지 구간 목록 (넓은 구간 우선)."""
+        ranges = []
+        for run_root in (output_root / pdf_path.stem).glob("pages_*-*"):
+            start, _, end = run_root.name[len("pages_"):].partition("-")
+            if not (start.isdigit() and end.isdigit()):
+                continue
+            if cls._range_content_list_path(pdf_path, int(start), int(end), output_root).exists():
+                ranges.append((int(start), int(end)))
+        return sorted(ranges, key=lambda r: (r[0] - r[1], r[0]))
+
+    @staticmethod
+    def _page_ranges(pages: Iterable[int]) -> list[tuple[int, int]]:
+        """정렬된 페이지 번호를 연속 구간 [(start, end), ...] (양끝 포함)으로 묶는다."""
+        ranges: list[tuple[int, int]] = []
+        for page in sorted(set(pages)):
+            if ranges and page == ranges[-1][1] + 1:
+                ranges[-1] = (ranges[-1][0], page)
+            else:
+                ranges.append((page, page))
+        return ranges
+
+    def _run_mineru(self, pdf_path: Path, page_range: tuple[int, int] | None = None) -> Iterable[dict]:
+        """Run MinerU CLI and yield content list blocks.
+
+        *page_range* (0-based, 양끝 포함)가 주어지면 해당 페이지만 처리한다.
+        전체 문서 결과나 구간을 포함하는 페이지 구간 결과가 이미 캐시되어 있으면
+        그 결과에서 해당 페이지만 골라 쓴다.
+        """
+        output_root = Path("output")
+        outputs = self._cached_outputs(pdf_path, output_root)
+        content_list_path = outputs.get(None) or self._content_list_path(pdf_path, output_root)
+
+        run_root = output_root
+        extra_args: list[str] = []
+        page_offset = 0
+        cache_key = None
+        if page_range is not None and None not in outputs:
+            # 페이지 구간별 결과는 별도 디렉토리에 캐시. MinerU는 잘라낸 PDF 기준으로
+            # page_idx를 0부터 매기므로 시작 페이지만큼 보정한다.
+            start, end = page_range
+            for cached_start, cached_end in self._widest_first(outputs):
+                if cached_start <= start and end <= cached_end:
+                    start, end = cached_start, cached_end
+                    content_list_path = outputs[(start, end)]
                     break
-                except subprocess.CalledProcessError as exc:
-                    last_error = exc
+            else:
+                extra_args = ["-s", str(start), "-e", str(end)]
+                content_list_path = self._range_content_list_path(pdf_path, start, end, output_root)
+            run_root = output_root / pdf_path.stem / f"pages_{start}-{end}"
+            page_offset = start
+            cache_key = (start, end)
 
-            if last_error is not None:
-                raise RuntimeError(
-                    f"MinerU failed with exit code {last_error.returncode}: "
-                    f"{last_error.stderr.strip()}"
-                ) from last_error
+        with get_tracer().span("mineru", cached=content_list_path.exists(), pages=page_range) as span:
+            if not content_list_path.exists():
+                span.attributes["device"] = self._invoke_mineru(pdf_path, run_root, extra_args)
 
-        if not content_list_path.exists():
-            raise FileNotFoundError(f"MinerU output not found: {content_list_path}")
+            if not content_list_path.exists():
+                raise FileNotFoundError(f"MinerU output not found: {content_list_path}")
+            pdf_hash = self._pdf_hashes.get(pdf_path)
+            if pdf_hash is not None and outputs.get(cache_key) != content_list_path:
+                self.catalog.record_parse_output(pdf_hash, content_list_path, cache_key)
 
-        with content_list_path.open("r", encoding="utf-8") as handle:
-            blocks = json.load(handle)
+            with content_list_path.open("r", encoding="utf-8") as handle:
+                blocks = json.load(handle)
+            span.attributes["blocks"] = len(blocks)
+
+        middle_path = content_list_path.with_name(f"{pdf_path.stem}_middle.json")
+        if self.middle_loader is not None and middle_path.exists():
+            with get_tracer().span("middle_json"):
+                blocks = self.middle_loader.attach((b for b in blocks if isinstance(b, dict)), middle_path)
 
         for block in blocks:
-            if isinstance(block, dict):
-                yield block
+            if not isinstance(block, dict):
+                continue
+            if page_offset:
+                block = {**block, "page_idx": block.get("page_idx", 0) + page_offset}
+            if page_range is not None and not page_range[0] <= block.get("page_idx", 0) <= page_range[1]:
+                continue
+            yield block
+
+    @staticmethod
+    def _invoke_mineru(pdf_path: Path, output_root: Path, extra_args: list[str] | None = None) -> str:
+        """MinerU CLI 실행 (mps 실패 시 cpu fallback). 성공한 device를 반환."""
+        output_root.mkdir(parents=True, exist_ok=True)
+
+        devices = ["mps", "cpu"]
+        last_error: subprocess.CalledProcessError | None = None
+        for device in devices:
+            cmd = [
+                "mineru",
+                "-p",
+                str(pdf_path),
+                "-o",
+                str(output_root),
+                "-b",
+                "pipeline",
+                "-d",
+                device,
+                *(extra_args or []),
+            ]
+            try:
+                subprocess.run(cmd, check=True, capture_output=True, text=True)
+                return device
+            except subprocess.CalledProcessError as exc:
+                last_error = exc
+
+        raise RuntimeError(
+            f"MinerU failed with exit code {last_error.returncode}: "
+            f"{last_error.stderr.strip()}"
+        ) from last_error
+
+    @staticmethod
+    def load_content_list(path: str | Path) -> list[dict]:
+        """저장된 ``*_content_list.json`` 을 읽어 블록 리스트로 반환."""
+        with Path(path).open("r", encoding="utf-8") as handle:
+            blocks = json.load(handle)
+        return [b for b in blocks if isinstance(b, dict)]
+
+    def parse_content_list(self, path: str | Path, middle_path: str | Path | None = None) -> ParsedPaper:
+        """MinerU를 실행하지 않고 기록된 content list 파일을 파싱.
+
+        *middle_path* 를 주면 해당 ``middle.json`` 의 줄 정보를 붙여서 파싱한다.
+        """
+        blocks = self.load_content_list(path)
+        if middle_path is not None:
+            blocks = (self.middle_loader or MiddleJsonLoader()).attach(blocks, middle_path)
+        return self.parse_blocks(blocks)
 
+    # MinerU 2.x content list는 table_body / table_caption / image_caption 키를 쓴다
     def _to_table(self, block: dict) -> Table:
         return Table(
-            html=block.get("html", ""),
-            caption=block.get("caption"),
+            html=block.get("html") or block.get("table_body", ""),
+            caption=block.get("caption") or block.get("table_caption"),
             page=block.get("page_idx"),
             table_id=block.get("id"),
         )
@@ -152,7 +376,7 @@ class PaperParser:
     def _to_figure(self, block: dict) -> Figure:
         return Figure(
             path=block.get("img_path", ""),
-            caption=block.get("caption"),
+            caption=block.get("caption") or block.get("image_caption"),
             page=block.get("page_idx"),
             figure_id=block.get("id"),
         )
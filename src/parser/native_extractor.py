@@ -0,0 +1,199 @@
+"""PyMuPDF 텍스트 레이어 기반 빠른 추출기 (born-digital PDF용 MinerU 우회 경로)."""
+from __future__ import annotations
+
+import re
+from collections import Counter
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+# 수식 전용 폰트 (Computer Modern / AMS / 일반 Math 폰트)
+_MATH_FONT_RE = re.compile(r"CMMI|CMSY|CMEX|MSBM|MSAM|Math|Symbol|rsfs|esint", re.IGNORECASE)
+# "1 Introduction", "3.2 Results", "II. RELATED WORK" 등 섹션 제목
+_SECTION_RE = re.compile(r"^(?:[IVX]+\.|\d+(?:\.\d+)*\.?|[A-Z]\.)\s+[A-Z]")
+# "Fig. 1.", "Figure 2:", "Table 3:", "TABLE IV" 등 캡션
+_CAPTION_RE = re.compile(r"^(?P<kind>fig(?:ure)?|table)\.?\s*(?:\d+|[IVX]+)\b", re.IGNORECASE)
+
+
+@dataclass
+class PageQuality:
+    """페이지별 텍스트 레이어 품질. ``reasons`` 가 비어 있으면 native 추출 사용."""
+
+    page_idx: int
+    chars: int = 0
+    math_ratio: float = 0.0
+    table_rules: int = 0
+    reasons: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.reasons
+
+
+class NativeExtractor:
+    """PDF 텍스트 레이어에서 MinerU content list와 같은 형태의 블록을 추출.
+
+    블록 형식: ``{"type", "text", "bbox"(정규화×1000), "page_idx", "text_level"?, "lines"}``.
+    ``lines`` 는 ``[{"bbox", "font_size", "spans": [span type, ...]}]`` 이다.
+
+    페이지 품질 기준(``assess``)을 통과하지 못한 페이지(스캔본, 수식 밀집, 표)는
+    ``extract`` 결과의 fallback 페이지 목록으로 돌려주어 MinerU가 처리하게 한다.
+    """
+
+    def __init__(
+        self,
+        min_chars: int = 200,
+        max_math_ratio: float = 0.08,
+        max_table_rules: int = 3,
+        title_size_ratio: float = 1.15,
+    ):
+        self.min_chars = min_chars
+        self.max_math_ratio = max_math_ratio
+        self.max_table_rules = max_table_rules
+        self.title_size_ratio = title_size_ratio
+
+    def extract(
+        self, pdf_path: str | Path, pages: Iterable[int] | None = None, force: bool = False
+    ) -> Tuple[List[dict], List[int]]:
+        """(블록 리스트, MinerU로 넘겨야 할 페이지 번호 리스트)를 반환.
+
+        *force* 이면 품질 검사 없이 모든 페이지를 추출한다 (MinerU가 없을 때).
+        """
+        import fitz  # PyMuPDF, native 엔진 사용 시에만 로드
+
+        blocks: List[dict] = []
+        fallback: List[int] = []
+        with fitz.open(str(pdf_path)) as doc:
+            page_numbers = range(len(doc)) if pages is None else [p for p in pages if 0 <= p < len(doc)]
+            raw_pages: Dict[int, dict] = {}
+            sizes: Counter = Counter()
+            for page_idx in page_numbers:
+                page = doc[page_idx]
+                data = page.get_text("dict", flags=fitz.TEXTFLAGS_TEXT)
+                if not force and not self.assess(page, data).ok:
+                    fallback.append(page_idx)
+                    continue
+                raw_pages[page_idx] = {
+                    "data": data,
+                    "images": [info["bbox"] for info in page.get_image_info()],
+                    "size": (page.rect.width, page.rect.height),
+                }
+                for raw in data["blocks"]:
+                    for line in raw.get("lines", []):
+                        for span in line["spans"]:
+                            sizes[round(span["size"], 1)] += len(span["text"].strip())
+
+            # 본문 폰트 크기 = 글자 수 기준 최빈값
+            body_size = sizes.most_common(1)[0][0] if sizes else 10.0
+            for page_idx, raw_page in raw_pages.items():
+                blocks.extend(self._page_blocks(page_idx, raw_page, body_size))
+        return blocks, fallback
+
+    def assess(self, page, data: dict) -> PageQuality:
+        """텍스트 레이어 품질 검사: 스캔본 / 수식 밀집 / 표 포함 여부."""
+        quality = PageQuality(page_idx=page.number)
+        math_chars = 0
+        replacement_chars = 0
+        for raw in data["blocks"]:
+            for line in raw.get("lines", []):
+                for span in line["spans"]:
+                    n = len(span["text"].strip())
+                    quality.chars += n
+                    replacement_chars += span["text"].count("�")
+                    if _MATH_FONT_RE.search(span["font"]):
+                        math_chars += n
+
+        if quality.chars < self.min_chars and page.get_image_info():
+            quality.reasons.append("scanned")
+        if quality.chars and replacement_chars / quality.chars > 0.01:
+            quality.reasons.append("encoding")
+        quality.math_ratio = math_chars / quality.chars if quality.chars else 0.0
+        if quality.math_ratio > self.max_math_ratio:
+            quality.reasons.append("math")
+
+        # 가로 괘선(표의 rule)이 많으면 표가 있는 페이지
+        for drawing in page.get_drawings():
+            rect = drawing.get("rect")
+            if rect is not None and rect.height < 2 and rect.width > 50:
+                quality.table_rules += 1
+        if quality.table_rules >= self.max_table_rules:
+            quality.reasons.append("table")
+        return quality
+
+    def _page_blocks(self, page_idx: int, raw_page: dict, body_size: float) -> List[dict]:
+        width, height = raw_page["size"]
+
+        def norm(bbox) -> List[int]:
+            x0, y0, x1, y1 = bbox
+            return [
+                round(x0 / width * 1000),
+                round(y0 / height * 1000),
+                round(x1 / width * 1000),
+                round(y1 / height * 1000),
+            ]
+
+        blocks: List[dict] = []
+        for raw in raw_page["data"]["blocks"]:
+            lines = []
+            line_texts = []
+            max_size = 0.0
+            for line in raw.get("lines", []):
+                text = "".join(span["text"] for span in line["spans"]).strip()
+                if not text:
+                    continue
+                size = max(span["size"] for span in line["spans"])
+                max_size = max(max_size, size)
+                line_texts.append(text)
+                lines.append({
+                    "bbox": norm(line["bbox"]),
+                    "font_size": round(size, 2),
+                    "spans": [
+                        "inline_equation" if _MATH_FONT_RE.search(span["font"]) else "text"
+                        for span in line["spans"]
+                        if span["text"].strip()
+                    ],
+                })
+            if not line_texts:
+                continue
+
+            text = self._join_lines(line_texts)
+            bbox = norm(raw["bbox"])
+            block = {"type": "text", "text": text, "bbox": bbox, "page_idx": page_idx, "lines": lines}
+
+            words = len(text.split())
+            caption = _CAPTION_RE.match(text)
+            if any(tuple(line.get("dir", (1, 0))) != (1, 0) for line in raw.get("lines", [])):
+                # 회전된 텍스트 (arXiv 스탬프 등)
+                block["type"] = "aside_text"
+            elif caption:
+                # 캡션은 본문이 아니라 그림/표 블록의 캡션으로 둔다 (MinerU content list 형식)
+                if caption.group("kind").lower() == "table":
+                    block = {"type": "table", "table_body": "", "table_caption": [text], "bbox": bbox, "page_idx": page_idx}
+                else:
+                    block = {"type": "image", "img_path": "", "image_caption": [text], "bbox": bbox, "page_idx": page_idx}
+            elif bbox[1] > 750 and max_size < body_size * 0.9:
+                # 본문보다 작은 글씨로 페이지 하단에 있는 블록 = 각주
+                block["type"] = "page_footnote"
+            elif bbox[3] < 50 or bbox[1] > 950:
+                block["type"] = "page_number" if text.isdigit() else ("header" if bbox[3] < 50 else "footer")
+            elif words <= 20 and not text.endswith(".") and (
+                max_size >= body_size * self.title_size_ratio or _SECTION_RE.match(text)
+            ):
+                # MinerU와 동일하게 제목은 type "text" + text_level 1
+                block["text_level"] = 1
+            blocks.append(block)
+
+        for image_bbox in raw_page["images"]:
+            blocks.append({"type": "image", "img_path": "", "bbox": norm(image_bbox), "page_idx": page_idx})
+        return blocks
+
+    @staticmethod
+    def _join_lines(lines: List[str]) -> str:
+        """줄을 공백으로 잇되, 줄 끝 하이픈으로 나뉜 단어는 붙인다."""
+        parts: List[str] = []
+        for line in lines:
+            if parts and parts[-1].endswith("-") and line[:1].islower():
+                parts[-1] = parts[-1][:-1] + line
+            else:
+                parts.append(line)
+        return " ".join(parts)
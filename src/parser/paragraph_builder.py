@@ -1,12 +1,22 @@
 from __future__ import annotations
 
-from typing import Iterable, List
+import re
+from typing import Iterable, Iterator, List
 
 from src.models import Paragraph
 from src.parser.latex_normalizer import LatexNormalizer
 
+# 번호 붙은 최상위 섹션 제목 ("3 Method", "3. Method", IEEE 스타일 "IV. RESULTS")
+_TOP_SECTION_RE = re.compile(r"^(?:[IVX]+\.|\d+\.?)\s+")
+# 하위 섹션 제목 ("3.1 Setup", IEEE 스타일 "A. Datasets"): 번호 붙은 상위 섹션 안에서만 인정
+_SUBSECTION_RE = re.compile(r"^(?:\d+\.\d+|(?P<letter>[A-Z])\.\s)")
+
 
 class ParagraphBuilder:
+    # 줄 bbox(정규화×1000) 기준 허용 오차: 들여쓰기 판정 / 마지막 줄이 꽉 찼는지 판정
+    INDENT_TOLERANCE = 8
+    FULL_LINE_TOLERANCE = 20
+
     def __init__(self, normalizer: LatexNormalizer | None = None):
         self.normalizer = normalizer or LatexNormalizer()
 
@@ -53,68 +63,124 @@ class ParagraphBuilder:
         stripped = current_text.rstrip()
         if not stripped:
             return False
-        # 컬럼이 바뀌면서 다음 블록이 현재보다 훨씬 위에 있으면 별개 문단
-        cur_bbox = current_block.get("bbox", [0, 0, 0, 0])
-        nxt_bbox = next_block.get("bbox", [0, 0, 0, 0])
         same_page = current_block.get("page_idx", 0) == next_block.get("page_idx", 0)
-        col_change = same_page and abs(cur_bbox[0] - nxt_bbox[0]) > 100
-        if col_change and nxt_bbox[1] < cur_bbox[1] - 100:
-            return False
+        cur_layout = current_block.get("layout")
+        nxt_layout = next_block.get("layout")
+        if same_page and cur_layout and nxt_layout:
+            # LayoutAnalyzer 결과: 같은 band에서 컬럼이 바뀌면 이전 컬럼의 끝 -> 다음 컬럼의
+            # 시작으로 넘어가는 경우만 연속 후보
+            col_change = (
+                cur_layout["band"] == nxt_layout["band"]
+                and cur_layout["column"] != nxt_layout["column"]
+            )
+            if col_change and not (cur_layout["col_tail"] and nxt_layout["col_head"]):
+                return False
+        else:
+            # 레이아웃 정보가 없으면: 컬럼이 바뀌면서 다음 블록이 현재보다 훨씬 위에 있으면 별개 문단
+            cur_bbox = current_block.get("bbox", [0, 0, 0, 0])
+            nxt_bbox = next_block.get("bbox", [0, 0, 0, 0])
+            col_change = same_page and abs(cur_bbox[0] - nxt_bbox[0]) > 100
+            if col_change and nxt_bbox[1] < cur_bbox[1] - 100:
+                return False
         # 다음 블록이 소문자로 시작하면 문단이 이어지는 것 (컬럼/페이지 넘김)
         next_stripped = next_text.lstrip()
         if next_stripped and next_stripped[0].islower():
             return True
+        # 줄 정보가 있으면 기하로 판단: 마지막 줄이 꽉 차 있고 다음 첫 줄이 들여쓰기되지 않았으면 연속
+        last_full = ParagraphBuilder._last_line_full(current_block)
+        next_indented = ParagraphBuilder._first_line_indented(next_block)
+        if last_full is not None and next_indented is not None:
+            return last_full and not next_indented
         # 현재 텍스트가 문장종결 부호로 끝나면 병합하지 않음
         if stripped[-1] in ".!?:;":
             return False
         return True
 
+    @classmethod
+    def _last_line_full(cls, block: dict) -> bool | None:
+        """마지막 줄이 블록 오른쪽 끝까지 차 있는지. 판단할 줄 정보가 없으면 None."""
+        lines = block.get("lines")
+        if not lines or len(lines) < 2:
+            return None
+        right = max(line["bbox"][2] for line in lines)
+        return lines[-1]["bbox"][2] >= right - cls.FULL_LINE_TOLERANCE
+
+    @classmethod
+    def _first_line_indented(cls, block: dict) -> bool | None:
+        """첫 줄이 나머지 줄보다 들여쓰기되어 있는지. 판단할 줄 정보가 없으면 None."""
+        lines = block.get("lines")
+        if not lines or len(lines) < 2:
+            return None
+        left = min(line["bbox"][0] for line in lines[1:])
+        return lines[0]["bbox"][0] > left + cls.INDENT_TOLERANCE
+
     def merge_broken_paragraphs(self, blocks: Iterable[dict]) -> List[Paragraph]:
         """블록을 순회하며 끊어진 문단을 병합한다."""
-        block_list = list(blocks)
-        if not block_list:
-            return []
+        return list(self.iter_merged_paragraphs(blocks))
 
-        paragraphs: List[Paragraph] = []
-        i = 0
-        while i < len(block_list):
-            block = block_list[i]
+    def iter_merged_paragraphs(self, blocks: Iterable[dict]) -> Iterator[Paragraph]:
+        """끊어진 문단을 병합하며 완성된 문단을 즉시 yield하는 스트리밍 병합기.
+
+        각 블록은 한 번만 추출/정규화되고, 병합 텍스트는 조각 리스트로 모았다가
+        문단 경계가 결정되는 시점에 한 번만 join한다. 다음 블록을 미리 읽지 않으므로
+        입력이 제너레이터여도 앞 문단부터 바로 하위 단계(번역 등)로 넘길 수 있다.
+        """
+        pieces: List[str] = []
+        regions: List[dict] = []
+        last_block: dict | None = None
+        section: str | None = None
+        piece_section: str | None = None
+        numbered = False  # 현재 섹션이 번호 붙은 최상위 섹션인지
+        last_letter: str | None = None  # 현재 섹션 안의 마지막 "A." 형식 하위 섹션 글자
+
+        for block in blocks:
             text = self._extract_text(block)
             if not text or not text.strip():
-                i += 1
                 continue
 
             normalized = self.normalizer.normalize(text.strip())
-            merged_text = normalized
-            regions = [{"bbox": block.get("bbox", [0, 0, 0, 0]), "page": block.get("page_idx", 0)}]
-
-            # 다음 블록과 병합 가능한지 반복 확인
-            while i + 1 < len(block_list):
-                next_block = block_list[i + 1]
-                next_text = self._extract_text(next_block)
-                if not next_text or not next_text.strip():
-                    i += 1
-                    continue
-
-                next_normalized = self.normalizer.normalize(next_text.strip())
-                if self._should_merge(block_list[i], next_block, merged_text, next_normalized):
-                    merged_text = merged_text + " " + next_normalized
-                    regions.append({"bbox": next_block.get("bbox", [0, 0, 0, 0]), "page": next_block.get("page_idx", 0)})
-                    i += 1
+            region = {"bbox": block.get("bbox", [0, 0, 0, 0]), "page": block.get("page_idx", 0)}
+            if block.get("lines"):
+                # 하이라이트를 줄 단위로 정확히 그릴 수 있도록 줄 bbox를 함께 전달
+                region["lines"] = [line["bbox"] for line in block["lines"]]
+
+            if block.get("text_level") == 1:
+                sub = _SUBSECTION_RE.match(normalized) if numbered else None
+                letter = sub.group("letter") if sub else None
+                if letter in ("I", "V", "X") and (last_letter is None or ord(letter) != ord(last_letter) + 1):
+                    # "V. CONCLUSION"은 로마 숫자 섹션 (직전 하위 섹션이 "U."일 때만 하위 섹션 "V.")
+                    sub = None
+                if sub:
+                    last_letter = letter or last_letter
                 else:
-                    break
-
-            paragraphs.append(
-                Paragraph(
-                    text=merged_text,
-                    page=regions[0]["page"],
-                    bbox=regions[0]["bbox"],
-                    bboxes=regions if len(regions) > 1 else None,
-                )
-            )
-            i += 1
+                    section = normalized
+                    numbered = bool(_TOP_SECTION_RE.match(normalized))
+                    last_letter = None
+
+            # 병합 텍스트의 끝은 항상 마지막 조각의 끝과 같다
+            if last_block is not None and self._should_merge(last_block, block, pieces[-1], normalized):
+                pieces.append(normalized)
+                regions.append(region)
+            else:
+                if pieces:
+                    yield self._make_paragraph(pieces, regions, piece_section)
+                pieces = [normalized]
+                regions = [region]
+                piece_section = section
+            last_block = block
+
+        if pieces:
+            yield self._make_paragraph(pieces, regions, piece_section)
 
-        return paragraphs
+    @staticmethod
+    def _make_paragraph(pieces: List[str], regions: List[dict], section: str | None = None) -> Paragraph:
+        return Paragraph(
+            text=" ".join(pieces),
+            page=regions[0]["page"],
+            bbox=regions[0]["bbox"],
+            bboxes=regions if len(regions) > 1 or "lines" in regions[0] else None,
+            section=section,
+        )
 
     def detect_paragraph_boundaries(self, lines: Iterable[str]) -> List[int]:
         boundaries: List[int] = []
@@ -0,0 +1,454 @@
+"""웹 UI/API 요청 처리 단계별 작업 풀 (다운로드 -> 파싱 -> 번역 -> 렌더링).
+
+요청마다 스레드 하나가 모든 단계를 순서대로 처리하면 CPU를 쓰는 MinerU 파싱과 PDF
+래스터화가 다른 사용자의 I/O 대기와 같은 스레드/GIL을 다툰다. 단계별로 실행기를 나눈다:
+
+- ``download``: 블로킹 HTTP 다운로드 -> 스레드 풀
+- ``parse``, ``render``: CPU 작업 -> 전용 프로세스 풀 (spawn)
+- 번역: 이벤트 루프에서 ``translate_async`` (동시 번역 수만 제한)
+
+각 단계는 동시 실행 수(*workers*)와 대기열 길이(*max_queue*)를 가진다. 대기열이 가득
+차면 :class:`PipelineBusy`로 즉시 거절한다 (무한정 쌓이지 않도록). 대기 시간은
+``pipeline.<stage>`` span의 ``queued_ms`` 속성으로 기록된다. 프로세스 풀 워커가 남긴
+span/카운터(``mineru``, ``layout``, ``render`` ...)는 결과와 함께 돌려받아 부모 프로세스의
+tracer에 ``pipeline.<stage>`` 의 하위 span으로 합친다 (``/metrics``, ``--profile`` 에 보이도록).
+
+프로세스 풀에서 실행되는 함수는 이 모듈의 최상위 함수여야 한다 (웹 스택을 import하지
+않도록 app.py가 아닌 여기에 둔다). 웹 UI(app.py)와 JSON API(api.py)가 공유하는 논문 처리
+흐름(:func:`process_paper`)도 여기에 있다.
+"""
+from __future__ import annotations
+
+import asyncio
+import base64
+import functools
+import multiprocessing
+import os
+import time
+from collections import OrderedDict
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Iterable, List, Optional
+
+from src.models.paper import ParsedPaper
+from src.utils.arxiv import download_arxiv_pdf
+from src.utils.pdf_utils import pdf_page_count
+from src.utils.selection import select_sections
+from src.utils.tracing import get_tracer
+
+
+class SectionNotFound(ValueError):
+    """선택한 섹션이 논문에 없음."""
+
+
+class PipelineBusy(RuntimeError):
+    """단계의 대기열이 가득 차 요청을 받을 수 없음."""
+
+    def __init__(self, stage: str):
+        super().__init__(f"서버가 혼잡합니다 ({stage} 대기열 가득 참). 잠시 후 다시 시도하세요.")
+        self.stage = stage
+
+
+class Stage:
+    """동시 실행 수와 대기열 길이가 제한된 실행 단계.
+
+    *executor*가 None이면 코루틴을 이벤트 루프에서 그대로 실행한다 (I/O 단계).
+    """
+
+    def __init__(self, name: str, workers: int, max_queue: int, executor: Optional[Executor] = None):
+        self.name = name
+        self.workers = workers
+        self.max_queue = max_queue
+        self.executor = executor
+        self.waiting = 0
+        self.running = 0
+        self._slots: Optional[asyncio.Semaphore] = None
+
+    @property
+    def saturated(self) -> bool:
+        return self.waiting >= self.max_queue
+
+    async def _run(self, fn: Callable, *args, **kwargs):
+        if self.executor is None:
+            return await fn(*args, **kwargs)
+        loop = asyncio.get_running_loop()
+        if not isinstance(self.executor, ProcessPoolExecutor):
+            return await loop.run_in_executor(self.executor, functools.partial(fn, *args, **kwargs))
+        # 워커 프로세스의 tracer는 따로이므로 기록을 돌려받아 합친다
+        try:
+            result, snapshot = await loop.run_in_executor(self.executor, functools.partial(_traced_call, fn, args, kwargs))
+        except Exception as exc:
+            snapshot = getattr(exc, "trace_snapshot", None)
+            if snapshot is not None:
+                get_tracer().merge(snapshot)
+            raise
+        get_tracer().merge(snapshot)
+        return result
+
+    async def submit(self, fn: Callable, *args, **kwargs):
+        """빈 자리가 나면 ``fn(*args, **kwargs)`` 실행. 대기열이 가득 차 있으면 :class:`PipelineBusy`."""
+        tracer = get_tracer()
+        if self.running >= self.workers and self.saturated:
+            tracer.add("pipeline.rejected", stage=self.name)
+            raise PipelineBusy(self.name)
+        if self._slots is None:
+            self._slots = asyncio.Semaphore(self.workers)
+        queued = time.perf_counter()
+        self.waiting += 1
+        try:
+            await self._slots.acquire()
+        finally:
+            self.waiting -= 1
+        self.running += 1
+        try:
+            with tracer.span(f"pipeline.{self.name}") as span:
+                span.attributes["queued_ms"] = round((time.perf_counter() - queued) * 1000, 1)
+                return await self._run(fn, *args, **kwargs)
+        finally:
+            self.running -= 1
+            self._slots.release()
+
+    def shutdown(self) -> None:
+        if self.executor is not None:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+
+
+class Pipeline:
+    """웹 UI가 공유하는 단계 묶음. 크기는 환경 변수로 조정한다.
+
+    SUNLIGHT_PARSE_WORKERS (기본 1), SUNLIGHT_RENDER_WORKERS (기본 2),
+    SUNLIGHT_DOWNLOAD_WORKERS (기본 4), SUNLIGHT_TRANSLATE_CONCURRENCY (기본 4),
+    SUNLIGHT_MAX_QUEUE (단계별 대기열, 기본 8).
+    """
+
+    def __init__(
+        self,
+        parse_workers: int = 1,
+        render_workers: int = 2,
+        download_workers: int = 4,
+        translate_concurrency: int = 4,
+        max_queue: int = 8,
+        process_pools: bool = True,
+    ):
+        def _pool(workers: int) -> Executor:
+            if not process_pools:
+                return ThreadPoolExecutor(workers)
+            # fork는 부모의 스레드/락 상태를 복사하므로 spawn 사용
+            return ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context("spawn"))
+
+        self.download = Stage("download", download_workers, max_queue, ThreadPoolExecutor(download_workers))
+        self.parse = Stage("parse", parse_workers, max_queue, _pool(parse_workers))
+        self.render = Stage("render", render_workers, max_queue, _pool(render_workers))
+        self.translate = Stage("translate", translate_concurrency, max_queue)
+
+    @classmethod
+    def from_env(cls) -> "Pipeline":
+        return cls(
+            parse_workers=int(os.getenv("SUNLIGHT_PARSE_WORKERS", "1")),
+            render_workers=int(os.getenv("SUNLIGHT_RENDER_WORKERS", "2")),
+            download_workers=int(os.getenv("SUNLIGHT_DOWNLOAD_WORKERS", "4")),
+            translate_concurrency=int(os.getenv("SUNLIGHT_TRANSLATE_CONCURRENCY", "4")),
+            max_queue=int(os.getenv("SUNLIGHT_MAX_QUEUE", "8")),
+        )
+
+    @property
+    def stages(self) -> list[Stage]:
+        return [self.download, self.parse, self.translate, self.render]
+
+    def admit(self) -> None:
+        """새 요청을 받기 전 검사: 대기열이 가득 찬 단계가 있으면 바로 거절."""
+        for stage in self.stages:
+            if stage.running >= stage.workers and stage.saturated:
+                get_tracer().add("pipeline.rejected", stage=stage.name)
+                raise PipelineBusy(stage.name)
+
+    def shutdown(self) -> None:
+        for stage in self.stages:
+            stage.shutdown()
+
+
+# ------------------------------------------------------------------
+# 프로세스 풀에서 실행되는 작업
+# ------------------------------------------------------------------
+
+
+def _traced_call(fn: Callable, args: tuple, kwargs: dict):
+    """워커 프로세스에서 *fn* 실행 후 ``(결과, tracer 스냅샷)``. 실패하면 예외에 스냅샷을 붙인다."""
+    tracer = get_tracer()
+    tracer.reset()
+    try:
+        result = fn(*args, **kwargs)
+    except Exception as exc:
+        exc.trace_snapshot = tracer.snapshot()
+        raise
+    return result, tracer.snapshot()
+
+
+def parse_pdf(pdf_path: str, pages: Optional[list[int]] = None, pdf_hash: Optional[str] = None) -> ParsedPaper:
+    """middle.json 줄 정보로 문단 병합/하이라이트를 줄 단위로 처리하는 파싱.
+
+    *pdf_hash* 를 주면 캐시된 MinerU 결과를 카탈로그(:func:`shared_catalog`)에서 찾는다.
+    """
+    from src.parser import MiddleJsonLoader, PaperParser
+
+    parser = PaperParser(middle_loader=MiddleJsonLoader(), catalog=shared_catalog() if pdf_hash else None)
+    return parser.parse(pdf_path, pages=pages, pdf_hash=pdf_hash)
+
+
+@functools.lru_cache(maxsize=32)
+def _render_page(pdf_path, page_num, scale):
+    """페이지 하나를 렌더링 (같은 논문의 추가 페이지 요청 시 이미 렌더링한 페이지 재사용).
+
+    캐시는 프로세스별이다 (렌더링 프로세스 풀의 각 워커가 따로 가진다). base64 PNG 한 장이
+    수백 KB라 워커마다 최근 32장만 둔다.
+    """
+    import fitz  # PyMuPDF
+
+    with fitz.open(pdf_path) as doc:
+        pix = doc[page_num].get_pixmap(matrix=fitz.Matrix(scale, scale))
+        return {
+            "base64": base64.b64encode(pix.tobytes("png")).decode("utf-8"),
+            "width": pix.width,
+            "height": pix.height,
+            "scale": scale,
+            "page": page_num,
+            "page_count": len(doc),
+        }
+
+
+def pdf_to_images(pdf_path, scale=1.5, pages: Optional[Iterable[int]] = None):
+    """PDF를 페이지별 base64 이미지로 변환. *pages* (0부터 시작)를 주면 해당 페이지만."""
+    import fitz  # PyMuPDF
+
+    with get_tracer().span("render", scale=scale) as span:
+        with fitz.open(pdf_path) as doc:
+            page_count = len(doc)
+        page_nums = range(page_count) if pages is None else [p for p in pages if 0 <= p < page_count]
+        images = [_render_page(str(pdf_path), page_num, scale) for page_num in page_nums]
+        span.attributes["pages"] = len(images)
+    return images
+
+
+# ------------------------------------------------------------------
+# 논문 처리 흐름 (웹 UI / API 공용)
+# ------------------------------------------------------------------
+
+
+@functools.lru_cache(maxsize=1)
+def shared_backend():
+    """SUNLIGHT_BACKEND (openai | local | echo) 번역 백엔드. local 모델은 한 번만 로드한다.
+
+    local은 SUNLIGHT_LOCAL_MODEL (CTranslate2 모델 디렉토리)이 필요하다.
+    openai는 요청마다 새 클라이언트를 쓰도록 캐시하지 않는다.
+    """
+    from src.translator import create_backend
+
+    name = os.getenv("SUNLIGHT_BACKEND", "openai")
+    if name == "local":
+        return create_backend("local", model_dir=os.environ["SUNLIGHT_LOCAL_MODEL"])
+    return None if name == "openai" else create_backend(name)
+
+
+@functools.lru_cache(maxsize=1)
+def shared_catalog():
+    """SUNLIGHT_CATALOG (기본 output/catalog.sqlite3) 카탈로그. ``off``면 None."""
+    from src.catalog import open_catalog
+
+    return open_catalog()
+
+
+@functools.lru_cache(maxsize=1)
+def shared_search_index():
+    """SUNLIGHT_SEARCH (기본 output/search.sqlite3) 검색 색인. ``off``면 None."""
+    from src.search import open_search_index
+
+    return open_search_index()
+
+
+class LRUCache(OrderedDict):
+    """*maxsize* 개를 넘으면 가장 오래 쓰지 않은 항목부터 버리는 dict."""
+
+    def __init__(self, maxsize: int):
+        super().__init__()
+        self.maxsize = maxsize
+
+    def __getitem__(self, key):
+        value = super().__getitem__(key)
+        self.move_to_end(key)
+        return value
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self.move_to_end(key)
+        while len(self) > self.maxsize:
+            self.popitem(last=False)
+
+
+# 요청 간에 공유하는 번역 캐시 (추가 페이지/섹션 요청 시 이미 번역한 문단은 재사용).
+# 웹/API 프로세스가 계속 떠 있으므로 최근 문단 20000개(수십 MB)까지만 둔다.
+TRANSLATION_CACHE = LRUCache(maxsize=20000)
+
+
+@functools.lru_cache(maxsize=1)
+def shop_glossary():
+    """모든 논문이 공유하는 용어집 (SUNLIGHT_GLOSSARY, 기본 output/glossary.json)."""
+    from src.translator import TermStore
+
+    return TermStore(os.getenv("SUNLIGHT_GLOSSARY", "output/glossary.json"))
+
+
+def open_journal(pdf_path: str, pdf_hash: Optional[str], target_lang: str, model: str):
+    """(PDF, 언어, 모델) 작업 저널. SUNLIGHT_JOURNAL (기본 output/journal) 아래, ``off``면 None."""
+    from src.catalog import file_hash
+    from src.translator import TranslationJournal
+
+    root = os.getenv("SUNLIGHT_JOURNAL", "output/journal")
+    if root.lower() == "off":
+        return None
+    return TranslationJournal.for_job(pdf_hash or file_hash(pdf_path), target_lang, model, root=root)
+
+
+def _no_progress(fraction, desc=None) -> None:
+    pass
+
+
+@dataclass
+class PaperResult:
+    """처리된 논문: 원문/번역 ParsedPaper와 문단 쌍."""
+
+    pdf_path: str
+    parsed: ParsedPaper
+    translated: ParsedPaper
+    #: 문단별 ``{"id", "original", "translated", "bbox", "page", "bboxes"}``
+    pairs: List[dict] = field(default_factory=list)
+    #: 카탈로그 키 (카탈로그를 쓰지 않으면 None)
+    pdf_hash: Optional[str] = None
+
+
+def build_pairs(parsed: ParsedPaper, translated: ParsedPaper) -> List[dict]:
+    """원문/번역 문단 쌍 (뷰어 하이라이트용 bbox 포함)."""
+    pairs = []
+    for i, (orig, trans) in enumerate(zip(parsed.body, translated.body)):
+        bboxes = orig.bboxes or [{"bbox": orig.bbox or [0, 0, 0, 0], "page": orig.page or 0}]
+        pairs.append({
+            "id": i,
+            "original": orig.text,
+            "translated": trans.text,
+            "bbox": orig.bbox or [0, 0, 0, 0],
+            "page": orig.page or 0,
+            "bboxes": bboxes,
+        })
+    return pairs
+
+
+async def process_paper(
+    pipeline: Pipeline,
+    url: str,
+    pages: Optional[list[int]] = None,
+    sections: Iterable[str] = (),
+    target_lang: str = "ko",
+    progress: Callable = _no_progress,
+    viewport=None,
+    catalog=None,
+    index=None,
+) -> PaperResult:
+    """arXiv URL -> 다운로드 -> 파싱 -> (섹션 선택) -> 번역.
+
+    *progress*는 ``progress(fraction, desc=...)`` 형태로 호출된다 (gr.Progress 호환).
+    *viewport* (:class:`~src.translator.ViewportHint`)가 있으면 해당 페이지 배치를 먼저
+    번역한다. 대기열이 가득 찬 단계가 있으면 :class:`PipelineBusy`. *pages* 가 PDF 페이지
+    수를 모두 벗어나면 ValueError.
+
+    *catalog* (:class:`~src.catalog.Catalog`)를 주면 이미 받은 PDF는 다시 받지 않고,
+    파싱/번역 기록(소요 시간, 문단 수, 모델)을 남긴다. 끝난 배치는 작업 저널
+    (:func:`open_journal`)에 기록되어, 중간에 죽은 같은 작업을 다시 요청하면 남은 문단만
+    번역한다. *index*
+    (:class:`~src.search.SearchIndex`)를 주면 번역이 끝난 원문/번역 문단을 색인한다 (논문
+    전체를 처리한 경우만).
+    """
+    from src.catalog import backend_model
+    from src.translator import PaperTranslator, TermStore
+
+    sections = [s for s in sections if s.strip()]
+    pipeline.admit()
+
+    pdf_path = await asyncio.to_thread(catalog.cached_pdf, url) if catalog is not None else None
+    if pdf_path is None:
+        progress(0.02, desc="arXiv에서 PDF 다운로드 중...")
+        pdf_path = await pipeline.download.submit(download_arxiv_pdf, url)
+    else:
+        get_tracer().add("catalog.download_hits")
+    pdf_hash = await asyncio.to_thread(catalog.register_pdf, pdf_path, url) if catalog is not None else None
+    if pages is not None:
+        # 요청 시에는 페이지 수를 몰라 MAX_PAGES까지만 검사했으므로 실제 페이지 수로 자른다
+        page_count = await asyncio.to_thread(pdf_page_count, pdf_path)
+        pages = [p for p in pages if p < page_count]
+        if not pages:
+            raise ValueError(f"선택한 페이지가 없습니다 (PDF는 {page_count}쪽)")
+
+    progress(0.05, desc="파싱 중...")
+    started = time.perf_counter()
+    parsed = await pipeline.parse.submit(parse_pdf, pdf_path, pages, pdf_hash)
+    if catalog is not None:
+        await asyncio.to_thread(
+            catalog.record_parse,
+            pdf_hash,
+            "mineru",
+            pages,
+            artifact_path=Path("output") / Path(pdf_path).stem,
+            paragraphs=len(parsed.body),
+            seconds=time.perf_counter() - started,
+        )
+    if sections:
+        # 번역 전에 문단을 골라 번역 비용이 선택한 섹션 크기에 비례하도록
+        parsed.body = select_sections(parsed.body, sections)
+        if not parsed.body:
+            raise SectionNotFound(f"선택한 섹션을 찾을 수 없습니다: {', '.join(sections)}")
+
+    progress(0.1, desc="번역 준비 중...")
+    # 논문별 용어집 (없는 용어는 공용 용어집에서 찾음) -- 배치 간 용어 통일
+    glossary = TermStore(Path("output") / Path(pdf_path).stem / "glossary.json", parent=shop_glossary())
+    translator = PaperTranslator(backend=shared_backend(), cache=TRANSLATION_CACHE, glossary=glossary)
+
+    # 스트리밍: 배치 전체가 끝나기 전에 문단 단위로 진행 상황을 갱신
+    total_paras = max(len(parsed.body), 1)
+    done_paras: set[str] = set()
+
+    def on_segment(unit_id, _text):
+        if unit_id.startswith("body:") and unit_id not in done_paras:
+            done_paras.add(unit_id)
+            frac = 0.1 + 0.75 * (len(done_paras) / total_paras)
+            progress(frac, desc=f"번역 중... ({len(done_paras)}/{total_paras} 문단)")
+
+    started = time.perf_counter()
+    journal = await asyncio.to_thread(open_journal, pdf_path, pdf_hash, target_lang, backend_model(translator.backend))
+    try:
+        translated = await pipeline.translate.submit(
+            translator.translate_async,
+            parsed,
+            target_lang,
+            batch_size=25,
+            stream=True,
+            on_segment=on_segment,
+            viewport=viewport,
+            journal=journal,
+        )
+    finally:
+        if journal is not None:
+            journal.close()
+    await asyncio.to_thread(glossary.commit)
+    if catalog is not None:
+        await asyncio.to_thread(
+            catalog.record_translation,
+            pdf_hash,
+            target_lang,
+            backend_model(translator.backend),
+            paragraphs=len(translated.body),
+            seconds=time.perf_counter() - started,
+        )
+    if index is not None and pages is None and not sections:
+        # 일부 페이지/섹션만 처리한 결과로 전체 논문 색인을 덮어쓰지 않는다
+        # (색인의 문단 번호는 전체 논문 기준 뷰어 문단 번호와 같아야 한다)
+        await asyncio.to_thread(index.add_paper, pdf_hash or Path(pdf_path).stem, parsed, translated, target_lang)
+    return PaperResult(pdf_path, parsed, translated, build_pairs(parsed, translated), pdf_hash)
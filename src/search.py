@@ -0,0 +1,318 @@
+"""번역한 논문의 원문/번역 문단 전문 검색 (SQLite 역색인).
+
+논문 번역이 끝날 때마다 원문과 번역 문단을 색인에 추가한다(같은 논문/언어를 다시 넣으면
+교체). 검색 결과는 문단 번호·페이지·bbox를 담고 있어 뷰어에서 바로 해당 위치로 이동할 수 있다.
+
+    python -m src.search "attention head"
+    python -m src.search "트랜스포머" --lang ko
+
+토큰화:
+- 한글/가나/한자 연속 구간은 글자 2-gram (조사가 붙어도 "모델을"에서 "모델"이 검색됨,
+  한 글자짜리 구간만 1-gram). 한 글자 검색어는 같은 한 글자 구간만 찾는다.
+- 그 밖의 문자/숫자 연속 구간은 단어 하나 (NFKC + casefold).
+
+검색은 모든 검색어 토큰을 포함하는 문단(AND)을 찾는다. 문서 빈도가 가장 낮은 토큰부터
+posting 목록을 (term, doc) 기본 키로 조인하고, SQL 안에서 점수(검색어가 그대로 들어 있는
+문단과 짧은 문단이 위)를 매겨 상위 *limit* 개만 읽는다. 점수를 매기는 후보는 최근 색인 순으로
+최대 ``MAX_CANDIDATES``개다: 그보다 많은 문단에 들어 있는 흔한 검색어는 오래된 문단이 빠질 수 있다.
+
+원문은 논문 전체를 파싱했을 때만 색인한다 (문단 번호가 뷰어의 전체 논문 문단 번호와 같도록).
+"""
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import re
+import threading
+import time
+import unicodedata
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Optional, Sequence
+
+from src.catalog import connect
+from src.models.paper import Paragraph, ParsedPaper
+
+DEFAULT_PATH = "output/search.sqlite3"
+
+# 원문 문단의 lang 값
+ORIGINAL = ""
+
+# 한 검색에서 점수를 매길 최대 후보 문단 수 / 조인할 최대 토큰 수
+MAX_CANDIDATES = 2000
+MAX_QUERY_TERMS = 12
+
+_CJK = "가-힣ㄱ-ㆎ぀-ヿ一-鿿"
+_TOKEN_RE = re.compile(rf"([{_CJK}]+)|[^\W_{_CJK}]+")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS docs (
+    id        INTEGER PRIMARY KEY,
+    paper     TEXT NOT NULL,
+    lang      TEXT NOT NULL,
+    paragraph INTEGER NOT NULL,
+    page      INTEGER,
+    bbox      TEXT,
+    text      TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS docs_paper ON docs (paper, lang);
+
+CREATE TABLE IF NOT EXISTS terms (
+    id   INTEGER PRIMARY KEY,
+    term TEXT NOT NULL UNIQUE,
+    df   INTEGER NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS postings (
+    term INTEGER NOT NULL,
+    doc  INTEGER NOT NULL,
+    PRIMARY KEY (term, doc)
+) WITHOUT ROWID;
+"""
+
+
+def _normalize(text: str) -> str:
+    return unicodedata.normalize("NFKC", text).casefold()
+
+
+def tokenize(text: str) -> List[str]:
+    """색인/검색 토큰 (순서 유지, 중복 포함)."""
+    tokens = []
+    for match in _TOKEN_RE.finditer(_normalize(text)):
+        run = match.group(1)
+        if run is None:
+            tokens.append(match.group(0))
+        elif len(run) == 1:
+            tokens.append(run)
+        else:
+            tokens.extend(run[i : i + 2] for i in range(len(run) - 1))
+    return tokens
+
+
+class SearchHit(NamedTuple):
+    """검색 결과 문단 하나. *paragraph*는 뷰어 문단 쌍의 ``id``와 같다."""
+
+    paper: str
+    lang: str  # 원문이면 ""
+    paragraph: int
+    page: Optional[int]
+    bbox: Optional[list]
+    snippet: str
+    score: float
+
+    @property
+    def side(self) -> str:
+        return "original" if self.lang == ORIGINAL else "translated"
+
+    def to_dict(self) -> dict:
+        data = self._asdict()
+        data["side"] = self.side
+        return data
+
+
+class SearchIndex:
+    """원문/번역 문단 역색인. 논문 단위로 추가/교체한다."""
+
+    def __init__(self, path: str | Path = DEFAULT_PATH):
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(_SCHEMA)
+
+    def _conn(self):
+        conn = getattr(self._local, "conn", None)
+        if conn is None:
+            conn = self._local.conn = connect(self.path)
+            conn.create_function("sunlight_score", 2, _score, deterministic=True)
+        return conn
+
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    # ------------------------------------------------------------------
+    # 색인
+    # ------------------------------------------------------------------
+
+    def add_paper(
+        self,
+        paper: str,
+        original: ParsedPaper,
+        translated: Optional[ParsedPaper] = None,
+        lang: Optional[str] = None,
+    ) -> int:
+        """논문의 원문(과 *lang* 번역) 문단을 색인하고 색인한 문단 수를 반환.
+
+        *paper*는 카탈로그의 PDF 해시 등 논문 키. 번역 문단의 위치는 같은 번호의 원문
+        문단에서 가져온다.
+        """
+        with self._conn() as conn:
+            count = self._replace(conn, paper, ORIGINAL, original.body, original.body)
+            if translated is not None:
+                if not lang:
+                    raise ValueError("번역 문단을 색인하려면 lang이 필요합니다")
+                count += self._replace(conn, paper, lang, translated.body, original.body)
+        return count
+
+    def remove_paper(self, paper: str) -> None:
+        with self._conn() as conn:
+            langs = [row["lang"] for row in conn.execute("SELECT DISTINCT lang FROM docs WHERE paper = ?", (paper,))]
+            for lang in langs:
+                self._remove(conn, paper, lang)
+
+    def _replace(
+        self, conn, paper: str, lang: str, body: Sequence[Paragraph], locations: Sequence[Paragraph]
+    ) -> int:
+        self._remove(conn, paper, lang)
+        postings: Dict[str, List[int]] = {}
+        for i, para in enumerate(body):
+            where = locations[i] if i < len(locations) else para
+            doc = conn.execute(
+                "INSERT INTO docs (paper, lang, paragraph, page, bbox, text) VALUES (?, ?, ?, ?, ?, ?)",
+                (paper, lang, i, where.page, json.dumps(where.bbox) if where.bbox else None, para.text),
+            ).lastrowid
+            for term in set(tokenize(para.text)):
+                postings.setdefault(term, []).append(doc)
+        conn.executemany(
+            "INSERT INTO terms (term, df) VALUES (?, ?) ON CONFLICT (term) DO UPDATE SET df = df + excluded.df",
+            [(term, len(docs)) for term, docs in postings.items()],
+        )
+        term_ids = self._term_ids(conn, list(postings))
+        # (term, doc) 순으로 넣어 B-tree 페이지를 차례로 채움
+        conn.executemany(
+            "INSERT INTO postings VALUES (?, ?)",
+            sorted((term_ids[term], doc) for term, docs in postings.items() for doc in docs),
+        )
+        return len(body)
+
+    def _remove(self, conn, paper: str, lang: str) -> None:
+        rows = conn.execute("SELECT id, text FROM docs WHERE paper = ? AND lang = ?", (paper, lang)).fetchall()
+        if not rows:
+            return
+        postings: Dict[str, List[int]] = {}
+        for row in rows:
+            for term in set(tokenize(row["text"])):
+                postings.setdefault(term, []).append(row["id"])
+        conn.executemany("UPDATE terms SET df = df - ? WHERE term = ?", [(len(d), t) for t, d in postings.items()])
+        term_ids = self._term_ids(conn, list(postings))
+        conn.executemany(
+            "DELETE FROM postings WHERE term = ? AND doc = ?",
+            [(term_ids[term], doc) for term, docs in postings.items() for doc in docs],
+        )
+        conn.execute("DELETE FROM docs WHERE paper = ? AND lang = ?", (paper, lang))
+
+    @staticmethod
+    def _term_ids(conn, terms: List[str], chunk: int = 900) -> Dict[str, int]:
+        ids = {}
+        for i in range(0, len(terms), chunk):
+            part = terms[i : i + chunk]
+            rows = conn.execute(f"SELECT term, id FROM terms WHERE term IN ({','.join('?' * len(part))})", part)
+            ids.update((row["term"], row["id"]) for row in rows)
+        return ids
+
+    # ------------------------------------------------------------------
+    # 검색
+    # ------------------------------------------------------------------
+
+    def search(self, query: str, lang: Optional[str] = None, limit: int = 20) -> List[SearchHit]:
+        """*query*의 모든 토큰을 포함하는 문단. *lang*을 주면 그 언어만 (``""``는 원문만)."""
+        terms = list(dict.fromkeys(tokenize(query)))
+        if not terms:
+            return []
+        conn = self._conn()
+        marks = ",".join("?" * len(terms))
+        found = conn.execute(f"SELECT id, df FROM terms WHERE term IN ({marks}) AND df > 0", terms).fetchall()
+        if len(found) < len(terms):
+            return []  # 어디에도 없는 토큰
+        term_ids = [row["id"] for row in sorted(found, key=lambda row: row["df"])][:MAX_QUERY_TERMS]
+
+        # 가장 드문 토큰의 posting을 기준으로 나머지 토큰을 기본 키 조회로 조인
+        joins = "".join(
+            f" JOIN postings p{i} ON p{i}.term = ? AND p{i}.doc = p0.doc" for i in range(1, len(term_ids))
+        )
+        params: list = term_ids[1:]
+        where = "p0.term = ?"
+        params.append(term_ids[0])
+        if lang is not None:
+            joins += " JOIN docs d ON d.id = p0.doc"
+            where += " AND d.lang = ?"
+            params.append(lang)
+        phrase = _normalize(query).strip()
+        rows = conn.execute(
+            f"""
+            SELECT d.*, sunlight_score(d.text, ?) AS score
+            FROM (SELECT p0.doc FROM postings p0{joins} WHERE {where} ORDER BY p0.doc DESC LIMIT ?) c
+            JOIN docs d ON d.id = c.doc
+            ORDER BY score DESC, d.id DESC
+            LIMIT ?
+            """,
+            (phrase, *params, MAX_CANDIDATES, limit),
+        )
+        return [
+            SearchHit(
+                paper=row["paper"],
+                lang=row["lang"],
+                paragraph=row["paragraph"],
+                page=row["page"],
+                bbox=json.loads(row["bbox"]) if row["bbox"] else None,
+                snippet=_snippet(row["text"], max(_normalize(row["text"]).find(phrase), 0)),
+                score=round(row["score"], 4),
+            )
+            for row in rows
+        ]
+
+    def stats(self) -> dict:
+        conn = self._conn()
+        return {
+            "papers": conn.execute("SELECT COUNT(DISTINCT paper) FROM docs").fetchone()[0],
+            "paragraphs": conn.execute("SELECT COUNT(*) FROM docs").fetchone()[0],
+            "terms": conn.execute("SELECT COUNT(*) FROM terms WHERE df > 0").fetchone()[0],
+        }
+
+
+def _score(text: str, phrase: str) -> float:
+    """검색어가 그대로 있으면 2배, 긴 문단일수록 약간 감점 (SQL 함수 ``sunlight_score``)."""
+    normalized = _normalize(text)
+    return (2.0 if phrase in normalized else 1.0) / (1.0 + math.log1p(len(normalized) / 200))
+
+
+def _snippet(text: str, position: int, width: int = 160) -> str:
+    """*position* 주변 *width*자 (정규화 전후 길이가 거의 같다고 보고 원문에서 자름)."""
+    start = max(0, min(position - width // 4, len(text) - width))
+    snippet = text[start : start + width].strip()
+    return ("…" if start > 0 else "") + snippet + ("…" if start + width < len(text) else "")
+
+
+def open_search_index() -> Optional[SearchIndex]:
+    """SUNLIGHT_SEARCH (기본 output/search.sqlite3) 검색 색인. ``off``면 None."""
+    path = os.getenv("SUNLIGHT_SEARCH", DEFAULT_PATH)
+    return None if path.lower() == "off" else SearchIndex(path)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="번역한 논문 문단 검색")
+    parser.add_argument("query", nargs="?", help="검색어 (원문/번역 모두)")
+    parser.add_argument("--db", default=os.getenv("SUNLIGHT_SEARCH", DEFAULT_PATH), help="검색 색인 SQLite 파일")
+    parser.add_argument("--lang", help="이 언어의 번역만 검색 (원문만: --lang original)")
+    parser.add_argument("--limit", type=int, default=20, help="최대 결과 수 (기본: 20)")
+    args = parser.parse_args()
+
+    index = SearchIndex(args.db)
+    if not args.query:
+        print(index.stats())
+        return
+    lang = ORIGINAL if args.lang == "original" else args.lang
+    started = time.perf_counter()
+    hits = index.search(args.query, lang=lang, limit=args.limit)
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    for hit in hits:
+        print(f"{hit.paper[:12]}  #{hit.paragraph:<4} p.{(hit.page or 0) + 1:<3} [{hit.lang or 'original'}] {hit.snippet}")
+    print(f"{len(hits)}건 ({elapsed_ms:.1f}ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,3 +1,30 @@
-from .openai_translator import PaperTranslator
+from .backends import BACKENDS, CTranslate2Backend, EchoBackend, StreamInterrupted, TranslationBackend, create_backend
+from .bulk import BulkTranslator, LocalBatchClient, OpenAIBatchClient
+from .context import PaperContext
+from .glossary import TermStore
+from .journal import TranslationJournal
+from .openai_translator import OpenAIBackend, PaperTranslator
+from .scheduler import BatchScheduler, ViewportHint
+from .units import TranslationUnit, apply_translations, collect_units
 
-__all__ = ["PaperTranslator"]
+__all__ = [
+    "BACKENDS",
+    "BatchScheduler",
+    "BulkTranslator",
+    "CTranslate2Backend",
+    "EchoBackend",
+    "LocalBatchClient",
+    "OpenAIBackend",
+    "OpenAIBatchClient",
+    "PaperContext",
+    "PaperTranslator",
+    "StreamInterrupted",
+    "TermStore",
+    "TranslationBackend",
+    "TranslationJournal",
+    "TranslationUnit",
+    "ViewportHint",
+    "apply_translations",
+    "collect_units",
+    "create_backend",
+]
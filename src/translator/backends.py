@@ -0,0 +1,277 @@
+"""Translation backends behind :class:`~src.translator.PaperTranslator`.
+
+A backend only turns a list of texts into a list of translations. Batch
+packing, caching, de-duplication, retries and scheduling stay in
+``PaperTranslator`` so every backend is driven the same way and their
+throughput can be compared directly (see ``benchmarks/translate_bench.py``).
+
+- ``OpenAIBackend`` (``src.translator.openai_translator``): chat completions.
+- ``CTranslate2Backend``: a local CPU model (Marian/NLLB converted with
+  ``ct2-transformers-converter``), loaded once, batched across paragraphs.
+- ``EchoBackend``: deterministic ``"[<lang>] <text>"`` output for tests.
+"""
+from __future__ import annotations
+
+import asyncio
+import re
+from abc import ABC, abstractmethod
+import threading
+from pathlib import Path
+from typing import AsyncIterator
+
+from src.utils.tracing import get_tracer
+
+# Sentence boundary for sentence-level NMT models (Marian is trained on sentences)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+(?=[A-Z(\[$\\])")
+
+
+class StreamInterrupted(RuntimeError):
+    """A streamed batch ended before every segment was received (cut connection,
+    ``finish_reason == "length"``). Segments yielded before it are complete."""
+
+
+class SegmentSplitter:
+    """Incrementally split streamed text on a separator.
+
+    :meth:`feed` returns the segments completed by a delta (the separator may be
+    split across deltas); :meth:`close` returns the final, unterminated segment.
+    """
+
+    def __init__(self, separator: str):
+        self.separator = separator
+        self._buffer = ""
+
+    def feed(self, delta: str) -> list[str]:
+        self._buffer += delta
+        segments = []
+        while True:
+            idx = self._buffer.find(self.separator)
+            if idx < 0:
+                return segments
+            segments.append(self._buffer[:idx].strip())
+            self._buffer = self._buffer[idx + len(self.separator) :]
+
+    def close(self) -> str:
+        tail, self._buffer = self._buffer.strip(), ""
+        return tail
+
+
+class TranslationBackend(ABC):
+    """Interface every translation backend implements.
+
+    Subclasses must implement :meth:`translate_batch` (an abstract method, so an
+    incomplete backend fails at construction); the async variants default to
+    running the sync call in a worker thread. ``translate_batch`` may return a
+    list of the wrong length (e.g. a model that merged segments) --
+    ``PaperTranslator`` detects that, retries and splits the batch in half
+    down to :meth:`translate_text` per text.
+    """
+
+    name = "base"
+    #: Total tokens (input + output) one request can hold.
+    max_context_tokens = 8000
+    #: How many batches ``PaperTranslator`` may have in flight at once.
+    max_concurrency = 10
+    #: Whether the translate methods accept ``glossary={term: translation}``.
+    supports_glossary = False
+    #: Whether the translate methods accept ``context=PaperContext`` (stable prompt prefix).
+    supports_context = False
+    #: Whether placeholders like ``⟦0⟧`` survive translation, so math,
+    #: citations, URLs and code can be masked (see :mod:`src.translator.masking`).
+    supports_masking = False
+    #: Whether a slow request may be raced against a duplicate (remote APIs;
+    #: a local model would only contend with itself), see :mod:`src.translator.hedging`.
+    supports_hedging = False
+    #: Output tokens per input token (Korean output takes more tokens than English input).
+    output_token_ratio = 1.5
+    #: Per-request deadline: fixed allowance (connect, queueing, first token) plus
+    #: generation time of the expected output, capped at ``max_deadline_s``.
+    deadline_base_s = 10.0
+    deadline_per_output_token_s = 0.02
+    max_deadline_s = 300.0
+
+    def estimate_tokens(self, text: str) -> int:
+        """Rough token estimate (~4 characters per token) used for batch packing."""
+        return len(text) // 4 + 1
+
+    def expected_output_tokens(self, texts: list[str]) -> int:
+        return int(sum(self.estimate_tokens(t) for t in texts) * self.output_token_ratio)
+
+    def deadline(self, texts: list[str]) -> float:
+        """Seconds to allow a request for *texts*, scaled by the expected output."""
+        expected = self.expected_output_tokens(texts)
+        return min(self.deadline_base_s + expected * self.deadline_per_output_token_s, self.max_deadline_s)
+
+    @abstractmethod
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        """Translate *texts* in one request; returns one translation per text."""
+
+    def translate_text(self, text: str, target_lang: str) -> str:
+        return self.translate_batch([text], target_lang)[0]
+
+    async def translate_batch_async(self, texts: list[str], target_lang: str) -> list[str]:
+        return await asyncio.to_thread(self.translate_batch, texts, target_lang)
+
+    async def translate_text_async(self, text: str, target_lang: str) -> str:
+        return await asyncio.to_thread(self.translate_text, text, target_lang)
+
+    async def stream_batch(self, texts: list[str], target_lang: str) -> AsyncIterator[str]:
+        """Yield translations in order, each as soon as it is complete.
+
+        Backends that cannot stream yield the whole batch after one call. A
+        streaming backend raises (e.g. :class:`StreamInterrupted`) when the
+        stream breaks; everything yielded before that is kept by the caller.
+        """
+        for translation in await self.translate_batch_async(texts, target_lang):
+            yield translation
+
+
+class EchoBackend(TranslationBackend):
+    """Deterministic backend: prefixes every text with ``"[<lang>] "``."""
+
+    name = "echo"
+    max_concurrency = 64
+    supports_masking = True
+
+    def __init__(self, prefix: str = "[{lang}] "):
+        self.prefix = prefix
+        self.calls: list[list[str]] = []
+
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        self.calls.append(list(texts))
+        get_tracer().add("translate.requests")
+        prefix = self.prefix.format(lang=target_lang)
+        return [f"{prefix}{text}" for text in texts]
+
+    async def translate_batch_async(self, texts: list[str], target_lang: str) -> list[str]:
+        # No I/O: skip the thread hop so tests and benchmarks measure scheduling only
+        return self.translate_batch(texts, target_lang)
+
+
+class CTranslate2Backend(TranslationBackend):
+    """Local CPU translation with a CTranslate2 model.
+
+    *model_dir* is a converted model directory, e.g.::
+
+        ct2-transformers-converter --model Helsinki-NLP/opus-mt-tc-big-en-ko \\
+            --output_dir models/opus-mt-en-ko --quantization int8
+
+    The tokenizer is loaded with ``transformers.AutoTokenizer`` from
+    *tokenizer* (defaults to *model_dir*). Paragraphs are split into sentences,
+    all sentences of a batch are translated in one ``translate_batch`` call and
+    joined back per paragraph. Multilingual models (NLLB, M2M) need
+    *target_prefix*, e.g. ``{"ko": "kor_Hang"}``, and *source_lang*.
+
+    ``ctranslate2`` and ``transformers`` are imported on first use.
+    """
+
+    name = "ctranslate2"
+    max_context_tokens = 1024
+    # One model instance already uses all intra-op threads; overlapping calls only contend
+    max_concurrency = 1
+
+    def __init__(
+        self,
+        model_dir: str | Path,
+        tokenizer: str | Path | None = None,
+        device: str = "cpu",
+        compute_type: str = "int8",
+        beam_size: int = 2,
+        max_batch_size: int = 32,
+        intra_threads: int = 0,
+        source_lang: str | None = None,
+        target_prefix: dict[str, str] | None = None,
+    ):
+        self.model_dir = str(model_dir)
+        self.tokenizer_name = str(tokenizer or model_dir)
+        self.device = device
+        self.compute_type = compute_type
+        self.beam_size = beam_size
+        self.max_batch_size = max_batch_size
+        self.intra_threads = intra_threads
+        self.source_lang = source_lang
+        self.target_prefix = target_prefix or {}
+        self._translator = None
+        self._tokenizer = None
+        self._load_lock = threading.Lock()
+
+    def _load(self):
+        """Load model and tokenizer once (thread-safe)."""
+        with self._load_lock:
+            if self._translator is None:
+                import ctranslate2
+                from transformers import AutoTokenizer
+
+                with get_tracer().span("translate.load_model", backend=self.name, model=self.model_dir):
+                    self._translator = ctranslate2.Translator(
+                        self.model_dir,
+                        device=self.device,
+                        compute_type=self.compute_type,
+                        intra_threads=self.intra_threads,
+                    )
+                    kwargs = {"src_lang": self.source_lang} if self.source_lang else {}
+                    self._tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_name, **kwargs)
+        return self._translator, self._tokenizer
+
+    def estimate_tokens(self, text: str) -> int:
+        if self._tokenizer is not None:
+            return len(self._tokenizer.encode(text))
+        return super().estimate_tokens(text)
+
+    @staticmethod
+    def split_sentences(text: str) -> list[str]:
+        return [s for s in _SENTENCE_RE.split(text.strip()) if s]
+
+    def translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
+        translator, tokenizer = self._load()
+        sentences: list[str] = []
+        counts: list[int] = []
+        for text in texts:
+            parts = self.split_sentences(text) or [text]
+            sentences.extend(parts)
+            counts.append(len(parts))
+
+        source = [tokenizer.convert_ids_to_tokens(tokenizer.encode(s)) for s in sentences]
+        prefix = self.target_prefix.get(target_lang)
+        results = translator.translate_batch(
+            source,
+            target_prefix=[[prefix]] * len(source) if prefix else None,
+            beam_size=self.beam_size,
+            max_batch_size=self.max_batch_size,
+            max_input_length=self.max_context_tokens,
+        )
+        get_tracer().add("translate.requests")
+
+        decoded = []
+        for result in results:
+            tokens = result.hypotheses[0]
+            if prefix and tokens and tokens[0] == prefix:
+                tokens = tokens[1:]
+            decoded.append(tokenizer.decode(tokenizer.convert_tokens_to_ids(tokens), skip_special_tokens=True))
+
+        translated: list[str] = []
+        start = 0
+        for count in counts:
+            translated.append(" ".join(decoded[start : start + count]))
+            start += count
+        return translated
+
+
+BACKENDS = ("openai", "local", "echo")
+
+
+def create_backend(name: str = "openai", **options) -> TranslationBackend:
+    """Build a backend by name: ``"openai"``, ``"local"`` (CTranslate2) or ``"echo"``.
+
+    *options* are passed to the backend constructor.
+    """
+    if name == "openai":
+        # openai is only imported when this backend is chosen
+        from src.translator.openai_translator import OpenAIBackend
+
+        return OpenAIBackend(**options)
+    if name == "local":
+        return CTranslate2Backend(**options)
+    if name == "echo":
+        return EchoBackend(**options)
+    raise ValueError(f"Unknown translation backend: {name!r} (expected one of {BACKENDS})")
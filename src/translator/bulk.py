@@ -0,0 +1,457 @@
+"""Offline bulk translation through an asynchronous batch-job API.
+
+For nightly corpus runs latency does not matter, but cost and throughput do:
+batch-job APIs (OpenAI ``/v1/batches``) run requests within a completion
+window at a discount and without interactive rate limits. :class:`BulkTranslator`
+
+1. collects the pending translation units of many papers, packs them into
+   batches exactly like ``PaperTranslator`` and writes one chat-completions
+   request per batch to a JSONL file (``requests-r<round>.jsonl``),
+2. submits the file as a batch job and polls until it finishes,
+3. reads the results back and maps them into each ``ParsedPaper``.
+
+Batches whose result is missing, failed or has the wrong segment count are
+sent again as single-text requests in a second round. Everything the runner
+needs to continue lives in ``<workdir>/state.json``, written after every
+step: a crashed runner started again with the same papers picks up the
+outstanding job instead of submitting a new one. Before submitting, the state
+is saved as ``submitting`` together with the SHA-256 of the request file and
+the job is tagged with that hash, so a crash between the upload and the next
+save is reconciled on restart by looking the job up instead of paying twice.
+
+:class:`OpenAIBatchClient` talks to the OpenAI Batch API;
+:class:`LocalBatchClient` is a file-based stand-in for tests and dry runs.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import time
+import uuid
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Callable, Dict, Iterator, List, Optional
+
+from src.models.paper import ParsedPaper
+from src.translator.backends import EchoBackend, TranslationBackend
+from src.translator.context import PaperContext
+from src.translator.openai_translator import OpenAIBackend, PaperTranslator
+from src.translator.units import apply_translations, collect_units
+from src.utils.tracing import get_tracer
+
+logger = logging.getLogger(__name__)
+
+#: Batch-job states after which no more results will arrive
+TERMINAL_STATES = {"completed", "failed", "expired", "cancelled"}
+_ENDPOINT = "/v1/chat/completions"
+
+
+def _write_atomic(path: Path, text: str) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(path.suffix + ".tmp")
+    tmp.write_text(text, encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def _read_jsonl(text: str) -> Iterator[dict]:
+    for line in text.splitlines():
+        if line.strip():
+            yield json.loads(line)
+
+
+class BatchClient(ABC):
+    """Interface of a batch-job service.
+
+    :meth:`submit`, :meth:`status` and :meth:`results` are abstract;
+    :meth:`find` is optional.
+    """
+
+    @abstractmethod
+    def submit(self, request_path: Path, request_hash: Optional[str] = None) -> str:
+        """Upload *request_path* (JSONL) and start a job tagged with *request_hash*; returns the job id."""
+
+    def find(self, request_hash: str) -> Optional[str]:
+        """Id of an existing job tagged with *request_hash*, or ``None``.
+
+        Clients that cannot look jobs up return ``None``; a runner resumed
+        mid-submit then submits again and may create a duplicate job.
+        """
+        return None
+
+    @abstractmethod
+    def status(self, job_id: str) -> str:
+        """Job state, e.g. ``"in_progress"`` or one of :data:`TERMINAL_STATES`."""
+
+    @abstractmethod
+    def results(self, job_id: str) -> Iterator[dict]:
+        """Result lines (``{"custom_id", "response", "error"}``) of a finished job."""
+
+
+class OpenAIBatchClient(BatchClient):
+    """OpenAI Batch API (``files.create`` + ``batches.create``)."""
+
+    def __init__(self, client=None, completion_window: str = "24h", lookup_limit: int = 100):
+        if client is None:
+            from openai import OpenAI
+
+            client = OpenAI()
+        self.client = client
+        self.completion_window = completion_window
+        self.lookup_limit = lookup_limit
+
+    def submit(self, request_path: Path, request_hash: Optional[str] = None) -> str:
+        with open(request_path, "rb") as handle:
+            upload = self.client.files.create(file=handle, purpose="batch")
+        options = {"metadata": {"request_hash": request_hash}} if request_hash else {}
+        batch = self.client.batches.create(
+            input_file_id=upload.id, endpoint=_ENDPOINT, completion_window=self.completion_window, **options
+        )
+        return batch.id
+
+    def find(self, request_hash: str) -> Optional[str]:
+        # A crashed submit is resumed soon after, so the most recent page is enough
+        for batch in self.client.batches.list(limit=self.lookup_limit).data:
+            if (batch.metadata or {}).get("request_hash") == request_hash:
+                return batch.id
+        return None
+
+    def status(self, job_id: str) -> str:
+        return self.client.batches.retrieve(job_id).status
+
+    def results(self, job_id: str) -> Iterator[dict]:
+        batch = self.client.batches.retrieve(job_id)
+        # Successful lines and per-request errors are in separate files
+        for file_id in (batch.output_file_id, batch.error_file_id):
+            if file_id:
+                yield from _read_jsonl(self.client.files.content(file_id).text)
+
+
+class LocalBatchClient(BatchClient):
+    """File-based stand-in: jobs are directories under *root*.
+
+    ``<root>/<job_id>/input.jsonl`` is the submitted file and ``status.json``
+    the job state. The job completes on the *polls_to_complete*-th
+    :meth:`status` call: each request's segments are translated with
+    *backend* (default :class:`EchoBackend`) and written to ``output.jsonl``
+    in the OpenAI result format.
+    """
+
+    def __init__(
+        self,
+        root: str | Path,
+        backend: Optional[TranslationBackend] = None,
+        target_lang: str = "ko",
+        polls_to_complete: int = 1,
+    ):
+        self.root = Path(root)
+        self.backend = backend or EchoBackend()
+        self.target_lang = target_lang
+        self.polls_to_complete = polls_to_complete
+
+    def _job(self, job_id: str) -> Path:
+        return self.root / job_id
+
+    def submit(self, request_path: Path, request_hash: Optional[str] = None) -> str:
+        job_id = f"batch_local_{uuid.uuid4().hex[:12]}"
+        job = self._job(job_id)
+        job.mkdir(parents=True)
+        (job / "input.jsonl").write_text(Path(request_path).read_text(encoding="utf-8"), encoding="utf-8")
+        state = {"status": "validating", "polls": 0, "request_hash": request_hash}
+        _write_atomic(job / "status.json", json.dumps(state))
+        return job_id
+
+    def find(self, request_hash: str) -> Optional[str]:
+        if not self.root.exists():
+            return None
+        for job in self.root.iterdir():
+            path = job / "status.json"
+            if path.exists() and json.loads(path.read_text(encoding="utf-8")).get("request_hash") == request_hash:
+                return job.name
+        return None
+
+    def status(self, job_id: str) -> str:
+        path = self._job(job_id) / "status.json"
+        state = json.loads(path.read_text(encoding="utf-8"))
+        if state["status"] not in TERMINAL_STATES:
+            state["polls"] += 1
+            if state["polls"] >= self.polls_to_complete:
+                self._process(job_id)
+                state["status"] = "completed"
+            else:
+                state["status"] = "in_progress"
+            _write_atomic(path, json.dumps(state))
+        return state["status"]
+
+    def _process(self, job_id: str) -> None:
+        job = self._job(job_id)
+        lines = []
+        for request in _read_jsonl((job / "input.jsonl").read_text(encoding="utf-8")):
+            payload = request["body"]["messages"][-1]["content"]
+            segments = OpenAIBackend._split(payload)
+            translated = self.backend.translate_batch(segments, self.target_lang)
+            content = f"\n{OpenAIBackend.SEPARATOR}\n".join(translated)
+            lines.append({
+                "id": f"{job_id}-{len(lines)}",
+                "custom_id": request["custom_id"],
+                "response": {
+                    "status_code": 200,
+                    "body": {
+                        "choices": [{"index": 0, "message": {"role": "assistant", "content": content},
+                                     "finish_reason": "stop"}],
+                        "usage": {"prompt_tokens": len(payload) // 4 + 1, "completion_tokens": len(content) // 4 + 1},
+                    },
+                },
+                "error": None,
+            })
+        _write_atomic(job / "output.jsonl", "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines))
+
+    def results(self, job_id: str) -> Iterator[dict]:
+        path = self._job(job_id) / "output.jsonl"
+        if path.exists():
+            yield from _read_jsonl(path.read_text(encoding="utf-8"))
+
+
+class BulkTranslator:
+    """Translate many papers through a :class:`BatchClient`; see the module docstring.
+
+    *cache* is the same ``(target_lang, text) -> translation`` dict
+    ``PaperTranslator`` uses: cached texts are not submitted and new results
+    are added to it. With a *glossary* the per-paper prompt context includes
+    its known terms (no priming request is made in bulk mode).
+    """
+
+    def __init__(
+        self,
+        client: BatchClient,
+        workdir: str | Path,
+        target_lang: str = "ko",
+        model: str = "gpt-4o-mini",
+        batch_size: int = 25,
+        max_batch_tokens: int = 4000,
+        poll_interval: float = 60.0,
+        max_rounds: int = 2,
+        cache: Optional[dict] = None,
+        glossary=None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.client = client
+        self.workdir = Path(workdir)
+        self.target_lang = target_lang
+        self.model = model
+        self.batch_size = batch_size
+        self.max_batch_tokens = max_batch_tokens
+        self.poll_interval = poll_interval
+        self.max_rounds = max_rounds
+        self.cache = cache if cache is not None else {}
+        self.glossary = glossary
+        self._sleep = sleep
+
+    @property
+    def state_path(self) -> Path:
+        return self.workdir / "state.json"
+
+    # ------------------------------------------------------------------
+    # State
+    # ------------------------------------------------------------------
+
+    def load_state(self) -> Optional[dict]:
+        if not self.state_path.exists():
+            return None
+        return json.loads(self.state_path.read_text(encoding="utf-8"))
+
+    def _save(self, state: dict) -> None:
+        _write_atomic(self.state_path, json.dumps(state, ensure_ascii=False))
+
+    # ------------------------------------------------------------------
+    # Steps
+    # ------------------------------------------------------------------
+
+    def _pending_texts(self, paper: ParsedPaper) -> List[str]:
+        pending: Dict[str, None] = {}
+        for unit in collect_units(paper):
+            if PaperTranslator._should_skip_translation(unit.text):
+                continue
+            if (self.target_lang, unit.text) not in self.cache:
+                pending[unit.text] = None
+        return list(pending)
+
+    def prepare(self, papers: Dict[str, ParsedPaper], state: Optional[dict] = None) -> dict:
+        """Write the request file for the next round and return the new state.
+
+        Round 1 covers every pending text; later rounds re-send the texts of
+        ``state["retry"]`` one per request.
+        """
+        round_no = state["round"] + 1 if state else 1
+        single = round_no > 1
+        batches: Dict[str, dict] = {}
+        lines = []
+        for paper_id, paper in papers.items():
+            texts = state["retry"].get(paper_id, []) if state else self._pending_texts(paper)
+            if not texts:
+                continue
+            context = PaperContext.from_paper(paper, self.glossary, texts) or None
+            groups = (
+                [[t] for t in texts]
+                if single
+                else PaperTranslator._pack_batches(texts, self.batch_size, self.max_batch_tokens)
+            )
+            for group in groups:
+                custom_id = f"r{round_no}-{len(batches):06d}"
+                if single:
+                    messages = OpenAIBackend._single_messages(group[0], self.target_lang, context=context)
+                else:
+                    messages = OpenAIBackend._batch_messages(group, self.target_lang, context=context)
+                body = {"model": self.model, "messages": messages}
+                if context:
+                    body["prompt_cache_key"] = context.cache_key
+                lines.append({"custom_id": custom_id, "method": "POST", "url": _ENDPOINT, "body": body})
+                batches[custom_id] = {"paper": paper_id, "texts": group, "single": single}
+
+        request_file = f"requests-r{round_no}.jsonl"
+        _write_atomic(
+            self.workdir / request_file, "".join(json.dumps(line, ensure_ascii=False) + "\n" for line in lines)
+        )
+        new_state = {
+            "version": 1,
+            "target_lang": self.target_lang,
+            "round": round_no,
+            "status": "prepared" if batches else "done",
+            "job_id": None,
+            "request_file": request_file,
+            "papers": sorted(papers),
+            "batches": batches,
+            "translations": state["translations"] if state else {},
+            "retry": {},
+        }
+        self._save(new_state)
+        get_tracer().add("bulk.requests", len(batches))
+        return new_state
+
+    def submit(self, state: dict) -> dict:
+        """Submit the round's request file, recording a ``submitting`` marker first."""
+        request_path = self.workdir / state["request_file"]
+        state["request_hash"] = hashlib.sha256(request_path.read_bytes()).hexdigest()
+        state["status"] = "submitting"
+        self._save(state)
+        state["job_id"] = self.client.submit(request_path, state["request_hash"])
+        state["status"] = "submitted"
+        self._save(state)
+        logger.info("Submitted bulk round %d as %s (%d requests)", state["round"], state["job_id"], len(state["batches"]))
+        return state
+
+    def reconcile(self, state: dict) -> dict:
+        """Resolve a ``submitting`` marker left by a crash: adopt the tagged job or submit again."""
+        job_id = self.client.find(state["request_hash"])
+        if job_id is None:
+            logger.warning("No bulk job found for round %d (request %s); submitting again",
+                           state["round"], state["request_hash"][:12])
+            return self.submit(state)
+        logger.info("Recovered bulk round %d as %s", state["round"], job_id)
+        get_tracer().add("bulk.reconciled")
+        state["job_id"] = job_id
+        state["status"] = "submitted"
+        self._save(state)
+        return state
+
+    def wait(self, state: dict) -> str:
+        """Poll the job until it reaches a terminal state."""
+        while True:
+            status = self.client.status(state["job_id"])
+            if status in TERMINAL_STATES:
+                return status
+            self._sleep(self.poll_interval)
+
+    def collect(self, state: dict, status: str = "completed") -> dict:
+        """Store the job's results; batches without a usable result go to ``state["retry"]``."""
+        tracer = get_tracer()
+        if status != "completed":
+            logger.warning("Bulk job %s ended as %s; collecting partial results", state["job_id"], status)
+        received = set()
+        for line in self.client.results(state["job_id"]):
+            batch = state["batches"].get(line.get("custom_id"))
+            if batch is None:
+                continue
+            response = line.get("response") or {}
+            body = response.get("body") or {}
+            if response.get("status_code") != 200 or not body.get("choices"):
+                continue
+            content = body["choices"][0]["message"]["content"] or ""
+            segments = [content.strip()] if batch["single"] else OpenAIBackend._split(content)
+            usage = body.get("usage") or {}
+            for field in ("prompt_tokens", "completion_tokens"):
+                if isinstance(usage.get(field), int):
+                    tracer.add(f"bulk.{field}", usage[field])
+            if len(segments) != len(batch["texts"]):
+                logger.warning("Bulk result %s: got %d segments, expected %d", line["custom_id"],
+                               len(segments), len(batch["texts"]))
+                continue
+            received.add(line["custom_id"])
+            paper_translations = state["translations"].setdefault(batch["paper"], {})
+            paper_translations.update(zip(batch["texts"], segments))
+
+        retry: Dict[str, List[str]] = {}
+        for custom_id, batch in state["batches"].items():
+            if custom_id not in received:
+                retry.setdefault(batch["paper"], []).extend(batch["texts"])
+        tracer.add("bulk.failed_requests", len(state["batches"]) - len(received))
+        state["retry"] = retry
+        state["status"] = "collected"
+        self._save(state)
+        return state
+
+    def apply(self, papers: Dict[str, ParsedPaper], state: dict) -> Dict[str, ParsedPaper]:
+        """Map translations into each paper (texts without one keep the source)."""
+        results = {}
+        for paper_id, paper in papers.items():
+            translated = state["translations"].get(paper_id, {})
+            for text, trans in translated.items():
+                self.cache[(self.target_lang, text)] = trans
+            mapping = {}
+            for unit in collect_units(paper):
+                if PaperTranslator._should_skip_translation(unit.text):
+                    continue
+                trans = self.cache.get((self.target_lang, unit.text))
+                if trans is not None:
+                    mapping[unit.unit_id] = trans
+            results[paper_id] = apply_translations(paper, mapping)
+        return results
+
+    # ------------------------------------------------------------------
+
+    def run(self, papers: Dict[str, ParsedPaper]) -> Dict[str, ParsedPaper]:
+        """Prepare, submit, wait, collect (and retry) -- resuming from ``state.json``.
+
+        *papers* maps a stable id (e.g. the arXiv id) to its parsed paper;
+        a restarted runner must be given the same ids.
+        """
+        state = self.load_state()
+        if state is not None and state["papers"] != sorted(papers):
+            raise ValueError(
+                f"{self.state_path} belongs to a different set of papers; use another workdir"
+            )
+        if state is not None:
+            logger.info("Resuming bulk run: round %d, %s", state["round"], state["status"])
+
+        with get_tracer().span("bulk", papers=len(papers)) as span:
+            if state is None:
+                state = self.prepare(papers)
+            while state["status"] != "done":
+                if state["status"] == "prepared":
+                    state = self.submit(state)
+                elif state["status"] == "submitting":
+                    state = self.reconcile(state)
+                elif state["status"] == "submitted":
+                    state = self.collect(state, self.wait(state))
+                elif state["status"] == "collected":
+                    if state["retry"] and state["round"] < self.max_rounds:
+                        state = self.prepare(papers, state)
+                    else:
+                        state["status"] = "done"
+                        self._save(state)
+            untranslated = sum(len(texts) for texts in state["retry"].values())
+            span.attributes.update(rounds=state["round"], untranslated=untranslated)
+            if untranslated:
+                get_tracer().add("bulk.untranslated", untranslated)
+        return self.apply(papers, state)
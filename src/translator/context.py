@@ -0,0 +1,102 @@
+"""Per-paper prompt context: the byte-identical prefix of every batch request.
+
+Providers cache prompt prefixes (OpenAI: automatically from 1024 tokens, in
+128-token steps; cached input is billed at a discount and skips prefill).
+A request only hits the cache up to its first differing byte, so requests
+are laid out as::
+
+    system  SYSTEM_PROMPT_BATCH + PaperContext.render()   <- same for a whole paper
+    system  per-batch glossary (terms introduced here)    <- varies
+    user    separator-joined segments                     <- varies
+
+:class:`PaperContext` is built once per translation run and never changes
+during it: the title/abstract header and a snapshot of the glossary terms
+the paper uses, sorted so the text does not depend on dict order. Terms
+learned later in the run go into the per-batch message instead.
+"""
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass
+from typing import Iterable, Optional, Tuple
+
+from src.models.paper import ParsedPaper
+from src.utils.selection import paragraph_section
+
+#: Abstract characters included in the header (keeps the prefix bounded)
+MAX_ABSTRACT_CHARS = 1500
+
+
+@dataclass(frozen=True)
+class PaperContext:
+    """Stable, paper-level part of the translation prompt."""
+
+    title: str = ""
+    abstract: str = ""
+    glossary: Tuple[Tuple[str, str], ...] = ()
+
+    def __bool__(self) -> bool:
+        return bool(self.title or self.abstract or self.glossary)
+
+    @property
+    def terms(self) -> set[str]:
+        """Glossary keys in the prefix."""
+        return {term for term, _ in self.glossary}
+
+    @property
+    def cache_key(self) -> str:
+        """Routing key for provider prompt caches: one per paper."""
+        digest = hashlib.sha256(f"{self.title}\n{self.abstract}".encode("utf-8")).hexdigest()
+        return f"paper-{digest[:16]}"
+
+    def render(self) -> str:
+        """Prompt text appended to the system prompt (empty for an empty context)."""
+        parts = []
+        if self.title or self.abstract:
+            parts.append(
+                "\n## Paper context\n"
+                "For terminology and tone only. Do not translate or output it.\n"
+                + (f"Title: {self.title}\n" if self.title else "")
+                + (f"Abstract: {self.abstract}\n" if self.abstract else "")
+            )
+        if self.glossary:
+            parts.append(
+                "\n## Paper glossary\n"
+                "Translate these terms as given, without adding the English term "
+                "in parentheses unless told so below.\n"
+                + "".join(f"- {term}: {translation}\n" for term, translation in self.glossary)
+            )
+        return "".join(parts)
+
+    @classmethod
+    def from_paper(
+        cls,
+        paper: ParsedPaper,
+        glossary=None,
+        texts: Iterable[str] = (),
+        max_abstract_chars: int = MAX_ABSTRACT_CHARS,
+    ) -> "PaperContext":
+        """Header from *paper* plus the *glossary* terms found in *texts*.
+
+        The title is the first ``text_level == 1`` block of ``metadata["raw"]``;
+        the abstract is the text of the paragraphs in the abstract section.
+        """
+        title = _title(paper) or ""
+        abstract = " ".join(p.text for p in paper.body if paragraph_section(p) == "abstract")
+        if abstract.lower().startswith("abstract"):
+            abstract = abstract[len("abstract"):].lstrip(" .:-—\n")
+        if len(abstract) > max_abstract_chars:
+            abstract = abstract[:max_abstract_chars].rsplit(" ", 1)[0] + " …"
+        terms: Tuple[Tuple[str, str], ...] = ()
+        if glossary is not None:
+            keys = glossary.find("\n".join(texts))
+            terms = tuple(sorted((key, glossary.get(key)) for key in keys))
+        return cls(title=title, abstract=abstract, glossary=terms)
+
+
+def _title(paper: ParsedPaper) -> Optional[str]:
+    raw = paper.metadata.get("raw", []) if isinstance(paper.metadata, dict) else []
+    for block in raw:
+        if block.get("text_level") == 1 and (block.get("text") or "").strip():
+            return " ".join(block["text"].split())
+    return None
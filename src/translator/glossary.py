@@ -0,0 +1,204 @@
+"""Terminology memory shared by the batches of a paper and across papers.
+
+Batches are translated independently and concurrently, so without help every
+batch re-decides how to translate a term and re-explains it as
+``"강화 학습(Reinforcement Learning)"``. A :class:`TermStore` maps English terms
+to the translation chosen once:
+
+1. **Prime** -- before the batches run, repeated Title Case phrases and acronym
+   expansions are extracted with regexes (:func:`extract_terms`) and the
+   unknown ones are translated in one short request.
+2. **Inject** -- each batch gets a compact glossary of the known terms it
+   contains. The batch with a term's first occurrence (in reading order) is
+   told to write ``translation(English)``; every later batch just the
+   translation.
+3. **Learn** -- ``번역(Term)`` pairs found in batch results are added for the
+   batches that start later (:func:`learned_terms`).
+
+Stores are layered: a per-paper store with a per-shop *parent*. Lookups fall
+through to the parent, new terms go to the paper store, and :meth:`TermStore.commit`
+persists both and promotes the paper's terms to the shop, so later papers start
+with them.
+"""
+from __future__ import annotations
+
+import json
+import os
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+# 2-4 capitalized words: "Graph Neural Network", "Mixture-of-Experts Layer"
+_TITLE_TERM_RE = re.compile(r"\b[A-Z][a-z]+(?:[- ](?:of|[A-Z][a-z]+)){1,3}\b")
+# "long short-term memory (LSTM)": the words before an all-caps acronym
+_ACRONYM_DEF_RE = re.compile(r"((?:[A-Za-z][\w-]*\s+){1,6})\(([A-Z][A-Za-z]*[A-Z])s?\)")
+# "그래프 신경망(Graph Neural Network)" in a translation
+_LEARN_RE = re.compile(r"((?:[가-힣]+\s+){0,3}[가-힣]+)\s?\(([A-Za-z][A-Za-z-]*(?:\s+[A-Za-z][A-Za-z-]*){0,4})\)")
+# A trailing "(English)" the model may add to a primed term
+_PAREN_SUFFIX_RE = re.compile(r"\s*\([^)]*\)\s*$")
+
+# Sentence openers that start Title Case runs without being terms ("In Table", "We Propose")
+_STOP_FIRST = {
+    "a", "an", "and", "as", "at", "by", "for", "from", "in", "it", "on", "our", "the",
+    "this", "these", "to", "we", "with", "figure", "fig", "table", "section", "appendix", "eq",
+}
+# Korean words ending in a particle or adnominal ending are not part of a term
+_PARTICLE_ENDINGS = ("은", "는", "이", "가", "을", "를", "의", "에", "에서", "로", "으로", "와", "과", "도", "한", "된", "적인")
+
+
+def term_key(term: str) -> str:
+    """Lookup key: case- and whitespace-insensitive."""
+    return " ".join(term.split()).casefold()
+
+
+def extract_terms(texts: Iterable[str], min_count: int = 2, limit: int = 60) -> Dict[str, str]:
+    """Candidate terms of a paper as ``{key: surface form}``, most frequent first.
+
+    Title Case phrases must occur in at least *min_count* texts; acronym
+    expansions ("long short-term memory (LSTM)") are kept on one occurrence,
+    since the acronym itself then recurs.
+    """
+    counts: Counter[str] = Counter()
+    surface: Dict[str, str] = {}
+    for text in texts:
+        seen = set()
+        for match in _TITLE_TERM_RE.finditer(text):
+            words = match.group(0).split(" ")
+            while words and words[0].split("-")[0].lower() in _STOP_FIRST:
+                words = words[1:]
+            if len(words) < 2 and "-" not in "".join(words):
+                continue
+            term = " ".join(words)
+            key = term_key(term)
+            surface.setdefault(key, term)
+            seen.add(key)
+        for match in _ACRONYM_DEF_RE.finditer(text):
+            expansion = _acronym_expansion(match.group(1).split(), match.group(2))
+            if expansion:
+                key = term_key(expansion)
+                surface.setdefault(key, expansion)
+                counts[key] += min_count  # one definition is enough
+        counts.update(seen)
+    ranked = [key for key, count in counts.most_common() if count >= min_count]
+    return {key: surface[key] for key in ranked[:limit]}
+
+
+def _acronym_expansion(words: List[str], acronym: str) -> Optional[str]:
+    # Initials of the expansion, counting hyphenated parts: short-term -> S, T
+    take = []
+    initials = ""
+    for word in reversed(words):
+        take.insert(0, word)
+        initials = "".join(part[0] for w in take for part in w.split("-") if part).upper()
+        if len(initials) >= len(acronym):
+            break
+    if initials != acronym.upper():
+        return None
+    return " ".join(take)
+
+
+def learned_terms(translation: str) -> List[Tuple[str, str]]:
+    """``(English, 번역)`` pairs written as ``번역(English)`` in *translation*.
+
+    As many Korean words are taken before the parenthesis as the English term
+    has words, minus leading words that end in a particle ("제안하는 그래프 신경망"
+    -> "그래프 신경망"). Bare acronyms are skipped -- they are usually kept as-is.
+    """
+    pairs = []
+    for match in _LEARN_RE.finditer(translation):
+        english = " ".join(match.group(2).split())
+        if english.isupper() or len(english) < 3:
+            continue
+        korean = match.group(1).split()[-len(english.split()):]
+        while len(korean) > 1 and korean[0].endswith(_PARTICLE_ENDINGS):
+            korean = korean[1:]
+        pairs.append((english, " ".join(korean)))
+    return pairs
+
+
+class TermStore:
+    """English term -> chosen translation, optionally persisted to JSON.
+
+    *parent* is a fallback store (e.g. the shop-wide glossary under a paper's
+    glossary). The file format is ``{"terms": {key: translation}}``.
+    """
+
+    def __init__(self, path: str | Path | None = None, parent: Optional["TermStore"] = None):
+        self.path = Path(path) if path else None
+        self.parent = parent
+        self.terms: Dict[str, str] = {}
+        self._version = 0
+        self._pattern: Optional[re.Pattern] = None
+        self._pattern_generation: Optional[tuple] = None
+        if self.path and self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            self.terms = {term_key(k): v for k, v in data.get("terms", {}).items()}
+
+    def __len__(self) -> int:
+        return len(self.keys())
+
+    def __contains__(self, term: str) -> bool:
+        return self.get(term) is not None
+
+    def keys(self) -> set[str]:
+        keys = set(self.terms)
+        if self.parent is not None:
+            keys |= self.parent.keys()
+        return keys
+
+    def get(self, term: str) -> Optional[str]:
+        key = term_key(term)
+        if key in self.terms:
+            return self.terms[key]
+        return self.parent.get(key) if self.parent is not None else None
+
+    def learn(self, term: str, translation: str) -> bool:
+        """Record *translation* unless the term already has one (first choice wins)."""
+        translation = translation.strip()
+        if not translation or term in self:
+            return False
+        self.terms[term_key(term)] = translation
+        self._version += 1
+        return True
+
+    def _generation(self) -> tuple:
+        return (self._version,) + (self.parent._generation() if self.parent is not None else ())
+
+    def find(self, text: str) -> Dict[str, str]:
+        """Known terms occurring in *text* as ``{key: surface form}``."""
+        generation = self._generation()
+        if self._pattern_generation != generation:
+            # Space in a key matches any whitespace; longest term wins
+            keys = sorted(self.keys(), key=len, reverse=True)
+            alternatives = [r"\s+".join(map(re.escape, key.split())) for key in keys]
+            self._pattern = re.compile(r"\b(?:%s)\b" % "|".join(alternatives), re.IGNORECASE) if keys else None
+            self._pattern_generation = generation
+        if self._pattern is None:
+            return {}
+        return {term_key(m.group(0)): m.group(0) for m in self._pattern.finditer(text)}
+
+    def save(self) -> None:
+        """Write the store's own terms to :attr:`path` (atomically; no-op without a path)."""
+        if self.path is None or (not self.terms and not self.path.exists()):
+            return
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp.write_text(
+            json.dumps({"terms": dict(sorted(self.terms.items()))}, ensure_ascii=False, indent=1),
+            encoding="utf-8",
+        )
+        os.replace(tmp, self.path)
+
+    def commit(self) -> None:
+        """Save this store, copy its new terms into the parent and save that too."""
+        self.save()
+        if self.parent is not None:
+            for key, translation in self.terms.items():
+                self.parent.learn(key, translation)
+            self.parent.save()
+
+    @staticmethod
+    def clean_translation(text: str) -> str:
+        """Drop the ``(English)`` suffix a model adds when translating a bare term."""
+        return _PAREN_SUFFIX_RE.sub("", text).strip()
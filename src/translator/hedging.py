@@ -0,0 +1,158 @@
+"""Tail-latency hedging for batch requests.
+
+A paper is done only when its slowest batch is, and provider latency has a
+long tail: one batch stuck in a slow replica holds up the whole paper. A
+hedged call sends a duplicate request when the first one runs longer than
+the running p95 latency of batches of the same size, keeps whichever
+finishes first and cancels the other.
+
+- :class:`LatencyTracker` keeps recent latencies per token-size bucket
+  (powers of two of the estimated input tokens). It is shared per backend and
+  model across translators (:func:`latency_tracker`), so the p95 is known from
+  the first batches of later papers on.
+- :class:`HedgeBudget` caps duplicates at a fraction of the requests, so
+  hedging never more than slightly raises the request rate.
+
+``translate.hedges`` counts duplicates sent, ``translate.hedge_wins`` the
+ones that finished first, and ``translate.hedge_wasted_tokens`` estimates the
+tokens of the cancelled requests (input plus expected output).
+"""
+from __future__ import annotations
+
+import asyncio
+import math
+import threading
+import time
+from collections import deque
+from typing import Awaitable, Callable, Deque, Dict, Optional, TypeVar
+
+from src.utils.tracing import get_tracer
+
+T = TypeVar("T")
+
+
+class LatencyTracker:
+    """Recent request latencies per token-size bucket."""
+
+    def __init__(self, window: int = 200, min_samples: int = 8):
+        self.window = window
+        self.min_samples = min_samples
+        self._samples: Dict[int, Deque[float]] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def bucket(tokens: int) -> int:
+        """0 for up to 256 tokens, then one bucket per doubling."""
+        return max(0, math.ceil(math.log2(max(tokens, 1) / 256)))
+
+    def observe(self, tokens: int, seconds: float) -> None:
+        with self._lock:
+            samples = self._samples.setdefault(self.bucket(tokens), deque(maxlen=self.window))
+            samples.append(seconds)
+
+    def p95(self, tokens: int) -> Optional[float]:
+        """p95 latency of the bucket of *tokens*, or None until it has ``min_samples``."""
+        with self._lock:
+            samples = sorted(self._samples.get(self.bucket(tokens), ()))
+        if len(samples) < self.min_samples:
+            return None
+        return samples[min(len(samples) - 1, math.ceil(0.95 * len(samples)) - 1)]
+
+
+class HedgeBudget:
+    """Allow a duplicate for at most *ratio* of the requests (plus one to start)."""
+
+    def __init__(self, ratio: float = 0.1):
+        self.ratio = ratio
+        self.requests = 0
+        self.hedges = 0
+
+    def request(self) -> None:
+        self.requests += 1
+
+    def take(self) -> bool:
+        if self.hedges + 1 > self.ratio * self.requests + 1:
+            return False
+        self.hedges += 1
+        return True
+
+
+_TRACKERS: Dict[str, LatencyTracker] = {}
+_TRACKERS_LOCK = threading.Lock()
+
+
+def latency_tracker(key: str) -> LatencyTracker:
+    """Process-wide tracker for *key* (backend name and model)."""
+    with _TRACKERS_LOCK:
+        return _TRACKERS.setdefault(key, LatencyTracker())
+
+
+def reset_latency_trackers() -> None:
+    """Forget all latency history (benchmarks and tests start cold)."""
+    with _TRACKERS_LOCK:
+        _TRACKERS.clear()
+
+
+async def hedged(
+    call: Callable[[], Awaitable[T]],
+    tokens: int,
+    tracker: LatencyTracker,
+    budget: Optional[HedgeBudget] = None,
+    expected_output_tokens: int = 0,
+) -> T:
+    """Await ``call()``; if it outlasts the bucket's p95, race it against a second ``call()``.
+
+    The first successful result wins and the other request is cancelled. If
+    one of the two fails, the other is still awaited; if both fail, the first
+    request's error is raised. Without *budget* or a known p95 this is a plain
+    ``await call()`` that only records the latency.
+    """
+    tracer = get_tracer()
+    if budget is not None:
+        budget.request()
+    started = time.perf_counter()
+    primary = asyncio.ensure_future(call())
+    threshold = tracker.p95(tokens) if budget is not None else None
+    if threshold is None:
+        result = await primary
+        tracker.observe(tokens, time.perf_counter() - started)
+        return result
+
+    try:
+        done, _ = await asyncio.wait({primary}, timeout=threshold)
+    except asyncio.CancelledError:
+        primary.cancel()
+        raise
+    if done or not budget.take():
+        result = await primary
+        tracker.observe(tokens, time.perf_counter() - started)
+        return result
+
+    tracer.add("translate.hedges")
+    hedge_started = time.perf_counter()
+    backup = asyncio.ensure_future(call())
+    pending = {primary, backup}
+    try:
+        while pending:
+            done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                if task.exception() is None:
+                    winner = task
+                    break
+            else:
+                continue
+            break
+        else:
+            # Both failed: surface the original request's error
+            raise primary.exception()
+    finally:
+        for task in pending:
+            task.cancel()
+    if pending:
+        tracer.add("translate.hedge_wasted_tokens", tokens + expected_output_tokens)
+    if winner is backup:
+        tracer.add("translate.hedge_wins")
+        tracker.observe(tokens, time.perf_counter() - hedge_started)
+    else:
+        tracker.observe(tokens, time.perf_counter() - started)
+    return winner.result()
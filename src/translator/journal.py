@@ -0,0 +1,126 @@
+"""Append-only journal of finished batches, so a killed job can resume.
+
+Translations of a running job otherwise live only in memory: if the process
+dies at batch 40 of 50, all 40 are paid for again. A :class:`TranslationJournal`
+is one JSONL file per job -- same PDF (content hash), target language and
+model -- with one line per finished batch::
+
+    {"t": 1730000000.0, "units": [{"ids": ["body:3"], "src": "<sha1>", "out": "..."}]}
+
+Each line goes out in a single ``write`` on an ``O_APPEND`` descriptor and is
+``fsync``-ed before the batch counts as done, so a crash leaves at most one
+torn line at the end; it is ignored on replay and cut off before the next
+append.
+
+On restart, :meth:`TranslationJournal.restore` returns the recorded
+translations of the units whose source text is unchanged (matched by digest,
+so the journal stays valid when a different page or section selection
+renumbers the units) and only the others are sent to the backend.
+"""
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+from src.utils.tracing import get_tracer
+
+#: Default directory for job journals
+JOURNAL_DIR = "output/journal"
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha1(text.encode("utf-8")).hexdigest()
+
+
+def journal_key(pdf_hash: str, target_lang: str, model: str) -> str:
+    """File name stem of the journal for one (PDF, language, model) job."""
+    return hashlib.sha256(f"{pdf_hash}\0{target_lang}\0{model}".encode("utf-8")).hexdigest()[:24]
+
+
+class TranslationJournal:
+    """Append-only record of finished batches for one translation job."""
+
+    def __init__(self, path: str | Path):
+        self.path = Path(path)
+        self._fd: int | None = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def for_job(
+        cls, pdf_hash: str, target_lang: str, model: str, root: str | Path = JOURNAL_DIR
+    ) -> "TranslationJournal":
+        return cls(Path(root) / f"{journal_key(pdf_hash, target_lang, model)}.jsonl")
+
+    def _read(self) -> Tuple[List[dict], int]:
+        """Complete entries and the byte offset where they end."""
+        if not self.path.exists():
+            return [], 0
+        entries, end = [], 0
+        data = self.path.read_bytes()
+        for line in data.splitlines(keepends=True):
+            if not line.endswith(b"\n"):
+                break  # torn final write
+            try:
+                entries.append(json.loads(line))
+            except ValueError:
+                break
+            end += len(line)
+        return entries, end
+
+    def replay(self) -> Dict[str, str]:
+        """Source digest -> translation of every recorded unit (later entries win)."""
+        done: Dict[str, str] = {}
+        for entry in self._read()[0]:
+            for unit in entry["units"]:
+                done[unit["src"]] = unit["out"]
+        return done
+
+    def restore(self, texts: Iterable[str]) -> Dict[str, str]:
+        """Recorded translations of *texts* (source text -> translation)."""
+        done = self.replay()
+        restored = {}
+        for text in texts:
+            trans = done.get(_digest(text))
+            if trans is not None:
+                restored[text] = trans
+        if restored:
+            get_tracer().add("translate.journal_restored", len(restored))
+        return restored
+
+    def record(self, units: Sequence[Tuple[Sequence[str], str, str]]) -> None:
+        """Durably append one finished batch of ``(unit_ids, source, translation)``."""
+        if not units:
+            return
+        line = json.dumps(
+            {
+                "t": round(time.time(), 3),
+                "units": [{"ids": list(ids), "src": _digest(src), "out": out} for ids, src, out in units],
+            },
+            ensure_ascii=False,
+        )
+        payload = (line + "\n").encode("utf-8")
+        with self._lock:
+            fd = self._open()
+            os.write(fd, payload)
+            os.fsync(fd)
+
+    def _open(self) -> int:
+        if self._fd is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            # Drop a torn tail left by a crash so the next line starts clean
+            _, end = self._read()
+            if self.path.exists() and self.path.stat().st_size > end:
+                os.truncate(self.path, end)
+            self._fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        return self._fd
+
+    def close(self) -> None:
+        with self._lock:
+            if self._fd is not None:
+                os.close(self._fd)
+                self._fd = None
@@ -0,0 +1,93 @@
+"""Placeholder masking of text the model must copy verbatim.
+
+Math, citations, URLs and code are not translated, yet sent to the model and
+echoed back -- paid for twice and occasionally corrupted, which then costs a
+retry. Before a backend call every such span is replaced by a short
+placeholder ``⟦0⟧``, ``⟦1⟧``, ... and restored in the reply::
+
+    masked = mask_text(r"The loss $\\mathcal{L} = -\\log p(y|x)$ [12] ...")
+    masked.text        # "The loss ⟦0⟧ ⟦1⟧ ..."
+    unmask_text(translation, masked.spans)
+
+A reply that lost or invented a placeholder raises :class:`PlaceholderError`;
+the translator treats it like a misaligned batch (retry, then halving).
+
+Math spans use :attr:`LatexNormalizer.MATH_SPAN_PATTERN`, the same pattern
+that decides whether a paragraph is math only and skipped altogether.
+"""
+from __future__ import annotations
+
+import re
+from typing import NamedTuple, Tuple
+
+from src.parser.latex_normalizer import LatexNormalizer
+
+_CITE_COMMANDS = r"cite[a-zA-Z]*|ref|eqref|autoref|cref|Cref|label"
+
+# Alternatives in priority order; the first one matching at a position wins
+_SPAN_RE = re.compile(
+    "|".join(
+        (
+            LatexNormalizer.MATH_SPAN_PATTERN,
+            # \cite{a,b}, \citep[p.~3]{a}, \ref{fig:1}
+            rf"\\(?:{_CITE_COMMANDS})\*?(?:\[[^\]]*\])*\{{[^}}]*\}}",
+            # numeric citations: [12], [3, 5-7]
+            r"\[\d+(?:\s*[,–-]\s*\d+)*\]",
+            # URLs, without trailing sentence punctuation
+            r"(?:https?://|www\.)[^\s<>()\[\]]*[^\s<>()\[\].,;:!?'\"]",
+            # inline code: `x`, \texttt{x}
+            r"`[^`\n]+`",
+            r"\\texttt\{[^}]*\}",
+        )
+    )
+)
+_PLACEHOLDER_RE = re.compile(r"⟦\s*(\d+)\s*⟧")
+
+#: Spans shorter than this stay in the text (a placeholder is not cheaper)
+MIN_SPAN_CHARS = 5
+
+
+class PlaceholderError(ValueError):
+    """A translation does not contain exactly the placeholders it was sent."""
+
+
+class MaskedText(NamedTuple):
+    text: str
+    #: Original span for placeholder ``⟦i⟧`` at index *i*
+    spans: Tuple[str, ...] = ()
+
+
+def placeholder(index: int) -> str:
+    return f"⟦{index}⟧"
+
+
+def mask_text(text: str, min_chars: int = MIN_SPAN_CHARS) -> MaskedText:
+    """Replace math, citations, URLs and code in *text* by placeholders."""
+    spans: list[str] = []
+
+    def _replace(match: re.Match) -> str:
+        span = match.group(0)
+        if len(span) < min_chars:
+            return span
+        spans.append(span)
+        return placeholder(len(spans) - 1)
+
+    if "⟦" in text:
+        # Would be mistaken for our own placeholders on the way back
+        return MaskedText(text)
+    masked = _SPAN_RE.sub(_replace, text)
+    return MaskedText(masked, tuple(spans))
+
+
+def unmask_text(translation: str, spans: Tuple[str, ...]) -> str:
+    """Put *spans* back into *translation*; raise :class:`PlaceholderError` on a mismatch."""
+    if not spans:
+        return translation
+    found = [int(i) for i in _PLACEHOLDER_RE.findall(translation)]
+    missing = set(range(len(spans))) - set(found)
+    unknown = {i for i in found if i >= len(spans)}
+    if missing or unknown:
+        raise PlaceholderError(
+            f"placeholders missing {sorted(missing)} / unknown {sorted(unknown)} in translation"
+        )
+    return _PLACEHOLDER_RE.sub(lambda m: spans[int(m.group(1))], translation)
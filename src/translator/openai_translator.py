@@ -2,15 +2,40 @@ import asyncio
 import logging
 import os
 import re
+import time
+from dataclasses import replace
 
 from openai import AsyncOpenAI, OpenAI
 
-from src.models.paper import Paragraph, ParsedPaper
+from src.models.paper import ParsedPaper
+from src.parser.latex_normalizer import LatexNormalizer
+from src.translator.backends import SegmentSplitter, StreamInterrupted, TranslationBackend
+from src.translator.context import PaperContext
+from src.translator.glossary import TermStore, extract_terms, learned_terms
+from src.translator.hedging import HedgeBudget, hedged, latency_tracker
+from src.translator.journal import TranslationJournal
+from src.translator.masking import MaskedText, PlaceholderError, mask_text, unmask_text
+from src.translator.scheduler import BatchScheduler, ScheduledBatch, ViewportHint, deferred_unit_ids
+from src.translator.units import apply_translations, collect_units
+from src.utils.tracing import get_tracer
 
 logger = logging.getLogger(__name__)
 
 
-class PaperTranslator:
+class OpenAIBackend(TranslationBackend):
+    """OpenAI chat completions backend (any OpenAI-compatible endpoint).
+
+    A batch is sent as one request with the texts joined by :attr:`SEPARATOR`.
+    """
+
+    name = "openai"
+    max_context_tokens = 16000
+    max_concurrency = 10
+    supports_glossary = True
+    supports_context = True
+    supports_masking = True
+    supports_hedging = True
+
     SEPARATOR = "---PARAGRAPH_SEPARATOR---"
 
     SYSTEM_PROMPT_BATCH = (
@@ -30,6 +55,15 @@ class PaperTranslator:
         "5. Preserve the separator '{separator}' exactly as-is between "
         "paragraphs. The number of separated segments in your output MUST "
         "equal the number in the input.\n"
+        "6. Copy placeholders such as ⟦0⟧ exactly as they appear; each one "
+        "stands for a formula, citation, URL or code span.\n"
+    )
+
+    GLOSSARY_PROMPT = (
+        "\n## Glossary\n"
+        "Translate these terms exactly as given. A term given with its English "
+        "in parentheses is introduced here: use that form at its first "
+        "occurrence only. Do not add the English to the other terms.\n"
     )
 
     SYSTEM_PROMPT_SINGLE = (
@@ -46,23 +80,212 @@ class PaperTranslator:
         "published papers.\n"
         "4. Output ONLY the translated text. Do not include any commentary, "
         "notes, or explanations.\n"
+        "5. Copy placeholders such as ⟦0⟧ exactly as they appear; each one "
+        "stands for a formula, citation, URL or code span.\n"
     )
 
-    # Pattern to detect text that is purely LaTeX math (possibly with whitespace)
-    _LATEX_ONLY_RE = re.compile(
-        r"^\s*("
-        r"\$\$[\s\S]+?\$\$"        # $$...$$
-        r"|\$[^\$]+\$"             # $...$
-        r"|\\[\(\[][\s\S]+?\\[\)\]]"  # \(...\) or \[...\]
-        r"|\\begin\{[^}]+\}[\s\S]+?\\end\{[^}]+\}"  # \begin{...}...\end{...}
-        r")\s*$"
-    )
-
-    def __init__(self, api_key: str | None = None, model: str = "gpt-4o-mini"):
-        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
-        self.async_client = AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"))
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "gpt-4o-mini",
+        base_url: str | None = None,
+    ):
+        # base_url points at any OpenAI-compatible endpoint (local stub, proxy);
+        # None falls back to OPENAI_BASE_URL / the public API.
+        self.client = OpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), base_url=base_url)
+        self.async_client = AsyncOpenAI(api_key=api_key or os.getenv("OPENAI_API_KEY"), base_url=base_url)
         self.model = model
 
+    @staticmethod
+    def _record_usage(response) -> None:
+        """Add the token usage reported by the API (incl. cached prompt tokens) to the pipeline counters."""
+        tracer = get_tracer()
+        tracer.add("translate.requests")
+        usage = getattr(response, "usage", None)
+        for field in ("prompt_tokens", "completion_tokens"):
+            value = getattr(usage, field, None)
+            if isinstance(value, int):
+                tracer.add(f"translate.{field}", value)
+        # Prompt-cache hits (prefix tokens the provider did not prefill again)
+        cached = getattr(getattr(usage, "prompt_tokens_details", None), "cached_tokens", None)
+        if isinstance(cached, int):
+            tracer.add("translate.cached_tokens", cached)
+
+    # Prompt builders are classmethods so request files can be written without a client
+    @classmethod
+    def _glossary_prompt(cls, glossary: dict[str, str] | None) -> str:
+        if not glossary:
+            return ""
+        lines = "".join(f"- {term}: {translation}\n" for term, translation in glossary.items())
+        return cls.GLOSSARY_PROMPT + lines
+
+    @classmethod
+    def _messages(cls, system_prompt: str, payload: str, glossary, context) -> list[dict]:
+        # Stable prefix first (system prompt + paper context) so provider prompt
+        # caches hit across batches; everything batch-specific comes after it
+        messages = [{"role": "system", "content": system_prompt + (context.render() if context else "")}]
+        if glossary:
+            messages.append({"role": "system", "content": cls._glossary_prompt(glossary).lstrip("\n")})
+        messages.append({"role": "user", "content": payload})
+        return messages
+
+    @classmethod
+    def _batch_messages(
+        cls, texts: list[str], target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ) -> list[dict]:
+        system_prompt = cls.SYSTEM_PROMPT_BATCH.format(target_lang=target_lang, separator=cls.SEPARATOR)
+        return cls._messages(system_prompt, f"\n{cls.SEPARATOR}\n".join(texts), glossary, context)
+
+    @classmethod
+    def _single_messages(
+        cls, text: str, target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ) -> list[dict]:
+        system_prompt = cls.SYSTEM_PROMPT_SINGLE.format(target_lang=target_lang)
+        return cls._messages(system_prompt, text, glossary, context)
+
+    @staticmethod
+    def _cache_options(context: PaperContext | None) -> dict:
+        # Route all batches of a paper to the same prompt cache
+        return {"prompt_cache_key": context.cache_key} if context else {}
+
+    @classmethod
+    def _split(cls, content: str) -> list[str]:
+        return [t.strip() for t in content.split(cls.SEPARATOR)]
+
+    def translate_batch(
+        self, texts: list[str], target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ) -> list[str]:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._batch_messages(texts, target_lang, glossary, context),
+            timeout=self.deadline(texts),
+            **self._cache_options(context),
+        )
+        self._record_usage(response)
+        return self._split(response.choices[0].message.content)
+
+    def translate_text(
+        self, text: str, target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ) -> str:
+        response = self.client.chat.completions.create(
+            model=self.model,
+            messages=self._single_messages(text, target_lang, glossary, context),
+            timeout=self.deadline([text]),
+            **self._cache_options(context),
+        )
+        self._record_usage(response)
+        return response.choices[0].message.content
+
+    async def translate_batch_async(
+        self, texts: list[str], target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ) -> list[str]:
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._batch_messages(texts, target_lang, glossary, context),
+            timeout=self.deadline(texts),
+            **self._cache_options(context),
+        )
+        self._record_usage(response)
+        return self._split(response.choices[0].message.content)
+
+    async def translate_text_async(
+        self, text: str, target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ) -> str:
+        response = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._single_messages(text, target_lang, glossary, context),
+            timeout=self.deadline([text]),
+            **self._cache_options(context),
+        )
+        self._record_usage(response)
+        return response.choices[0].message.content
+
+    async def stream_batch(
+        self, texts: list[str], target_lang: str, glossary: dict[str, str] | None = None, context: PaperContext | None = None
+    ):
+        """Stream the completion and yield each segment when its separator arrives.
+
+        The last segment is only yielded once the model finishes normally; a
+        cut stream or ``finish_reason == "length"`` raises
+        :class:`StreamInterrupted` after the segments completed so far.
+        """
+        stream = await self.async_client.chat.completions.create(
+            model=self.model,
+            messages=self._batch_messages(texts, target_lang, glossary, context),
+            timeout=self.deadline(texts),
+            stream=True,
+            stream_options={"include_usage": True},
+            **self._cache_options(context),
+        )
+        splitter = SegmentSplitter(self.SEPARATOR)
+        finish_reason = None
+        usage_chunk = None
+        try:
+            async for chunk in stream:
+                if getattr(chunk, "usage", None) is not None:
+                    usage_chunk = chunk
+                for choice in chunk.choices:
+                    delta = getattr(choice.delta, "content", None)
+                    if delta:
+                        for segment in splitter.feed(delta):
+                            yield segment
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+        finally:
+            # Release the connection now, also when the stream broke midway
+            await stream.close()
+        self._record_usage(usage_chunk)
+        if finish_reason != "stop":
+            raise StreamInterrupted(f"stream ended with finish_reason={finish_reason!r}")
+        yield splitter.close()
+
+
+class PaperTranslator:
+    """Translate a :class:`ParsedPaper` with a pluggable :class:`TranslationBackend`.
+
+    Batch packing, caching, de-duplication, retries and concurrency are shared
+    by all backends; *backend* defaults to :class:`OpenAIBackend` built from
+    *api_key*, *model* and *base_url*. With a *glossary*
+    (:class:`~src.translator.glossary.TermStore`), terms are translated once
+    and kept consistent across batches; see :mod:`src.translator.glossary`.
+    With *mask* (default), math, citations, URLs and code are sent as
+    placeholders and restored afterwards; see :mod:`src.translator.masking`.
+    With *hedge* (default), a batch request that runs past the p95 latency of
+    its size is raced against a duplicate; see :mod:`src.translator.hedging`.
+    """
+
+    SEPARATOR = OpenAIBackend.SEPARATOR
+
+    # Pattern to detect text that is purely LaTeX math (possibly with whitespace):
+    # $$...$$, $...$, \(...\), \[...\] or \begin{...}...\end{...}
+    _LATEX_ONLY_RE = re.compile(rf"^\s*({LatexNormalizer.MATH_SPAN_PATTERN})\s*$")
+
+    def __init__(
+        self,
+        api_key: str | None = None,
+        model: str = "gpt-4o-mini",
+        base_url: str | None = None,
+        cache: dict[tuple[str, str], str] | None = None,
+        backend: TranslationBackend | None = None,
+        glossary: TermStore | None = None,
+        mask: bool = True,
+        hedge: bool = True,
+    ):
+        self.backend = backend or OpenAIBackend(api_key=api_key, model=model, base_url=base_url)
+        # Race slow batches against a duplicate (backends with ``supports_hedging``
+        # only), at most ``hedge_budget.ratio`` of the requests
+        self.hedge_budget = HedgeBudget() if hedge and getattr(self.backend, "supports_hedging", False) else None
+        self._latency = latency_tracker(f"{self.backend.name}:{getattr(self.backend, 'model', '')}")
+        # Replace math/citations/URLs/code by placeholders in backend calls
+        # (backends with ``supports_masking`` only)
+        self.mask = mask
+        # Terminology memory injected into batch prompts (backends with
+        # ``supports_glossary`` only); the caller persists it with ``commit()``
+        self.glossary = glossary
+        # (target_lang, source text) -> translated text; pass a shared dict to
+        # reuse translations across translator instances (e.g. follow-up requests)
+        self._cache: dict[tuple[str, str], str] = cache if cache is not None else {}
+
     @staticmethod
     def _should_skip_translation(text: str) -> bool:
         """Return True if *text* should not be sent for translation.
@@ -96,20 +319,47 @@ class PaperTranslator:
     # Public API
     # ------------------------------------------------------------------
 
-    def translate(self, paper: ParsedPaper, target_lang: str = "ko") -> ParsedPaper:
-        """Batch translate body text while preserving tables, figures, and equations."""
+    def translate(
+        self, paper: ParsedPaper, target_lang: str = "ko", journal: TranslationJournal | None = None
+    ) -> ParsedPaper:
+        """Batch translate body text while preserving tables, figures, and equations.
+
+        With a *journal*, paragraphs recorded by an earlier run of the same job
+        are restored instead of sent, and every finished batch is recorded.
+        """
         translated_body = []
         batch_size = 25
+        use_glossary = self._uses_glossary()
+        introduced: set[str] = set()
+        restored = journal.restore(p.text for p in paper.body) if journal else {}
+        done = dict(restored)  # source text -> translation
+        if use_glossary:
+            self._prime_glossary([para.text for para in paper.body if para.text not in restored], target_lang)
+        context = self._paper_context(paper, [para.text for para in paper.body])
+        self._record_mask_savings(
+            [p.text for p in paper.body if p.text not in restored and not self._should_skip_translation(p.text)]
+        )
 
         for i in range(0, len(paper.body), batch_size):
             batch = paper.body[i : i + batch_size]
-            texts = [para.text for para in batch]
-            translated_texts = self._translate_batch(texts, target_lang)
-
-            for j, trans_text in enumerate(translated_texts):
-                translated_body.append(
-                    Paragraph(text=trans_text, page=batch[j].page, bbox=batch[j].bbox)
-                )
+            todo = [(i + j, para.text) for j, para in enumerate(batch) if para.text not in restored]
+            texts = [text for _, text in todo]
+            if texts:
+                glossary = self._batch_glossary(texts, introduced, context) if use_glossary else None
+                with get_tracer().span("translate.batch", size=len(texts), backend=self.backend.name):
+                    translated_texts = self._translate_batch(
+                        texts, target_lang, self._prompt_kwargs(glossary, context)
+                    )
+                if use_glossary:
+                    self._learn_terms(translated_texts)
+                if journal:
+                    journal.record([([f"body:{k}"], text, trans) for (k, text), trans in zip(todo, translated_texts)])
+                done.update(zip(texts, translated_texts))
+            if use_glossary:
+                introduced.update(self.glossary.find("\n".join(para.text for para in batch)))
+
+            for para in batch:
+                translated_body.append(replace(para, text=done[para.text]))
 
         return ParsedPaper(
             body=translated_body,
@@ -119,151 +369,460 @@ class PaperTranslator:
             metadata=paper.metadata,
         )
 
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token estimate (~4 characters per token) used for batch packing."""
+        return len(text) // 4 + 1
+
+    @classmethod
+    def _pack_batches(
+        cls, texts: list[str], batch_size: int, max_batch_tokens: int, estimate_tokens=None
+    ) -> list[list[str]]:
+        """Greedily pack *texts* in order into batches bounded by count and tokens."""
+        estimate_tokens = estimate_tokens or cls._estimate_tokens
+        batches: list[list[str]] = []
+        current: list[str] = []
+        current_tokens = 0
+        for text in texts:
+            tokens = estimate_tokens(text)
+            if current and (len(current) >= batch_size or current_tokens + tokens > max_batch_tokens):
+                batches.append(current)
+                current, current_tokens = [], 0
+            current.append(text)
+            current_tokens += tokens
+        if current:
+            batches.append(current)
+        return batches
+
     async def translate_async(
         self,
         paper: ParsedPaper,
         target_lang: str = "ko",
         batch_size: int = 25,
         on_batch_done=None,
+        include_extras: bool = True,
+        max_batch_tokens: int = 4000,
+        stream: bool = False,
+        on_segment=None,
+        viewport: ViewportHint | None = None,
+        budget_tokens: int | None = None,
+        journal: TranslationJournal | None = None,
     ) -> ParsedPaper:
         """Batch translate in parallel using async requests.
 
-        Paragraphs that should be skipped (math-only, very short, empty) are
-        kept as-is and excluded from the API call to save tokens and latency.
+        Every text-bearing part of the paper -- body paragraphs and, with
+        *include_extras*, table cells and captions, figure captions and page
+        footnotes -- is turned into a :class:`TranslationUnit` and scheduled in
+        the same batches. Batches are packed by paragraph count and estimated
+        tokens (capped at half the backend context, leaving room for the
+        output), identical texts are sent once, and results are cached per
+        translator instance. At most ``backend.max_concurrency`` batches are in
+        flight.
+
+        Batches run in reading order (page, then position) rather than all at
+        once, so early pages finish first under rate limiting. Batches on the
+        pages of *viewport* (a :class:`ViewportHint` the caller may update
+        while this runs) are promoted; footnotes, references and the appendix
+        run last. With *budget_tokens*, deferred batches that would push the
+        estimated input tokens over the budget are skipped and keep their
+        source text. See :mod:`src.translator.scheduler`.
+
+        Each request has a deadline scaled by its expected output tokens
+        (``backend.deadline``). A batch request that runs past the running p95
+        latency of batches its size is raced against a duplicate (within
+        ``hedge_budget``); the first to finish wins and the other is cancelled.
+        The ``hedges`` attribute of the ``translate`` span counts them. Streamed
+        batches are not hedged, since their segments are already delivered as
+        they arrive.
+
+        A batch that still fails after one retry is split in half and the
+        halves go back to the scheduler (down to single paragraphs), so
+        fallback requests stay within ``max_concurrency`` and in reading order.
+        ``translate.bisect`` counts the halves per ``depth``.
+
+        With a glossary, the paper's candidate terms are translated first and
+        every batch gets the known terms it contains; terms learned from
+        finished batches are used by the batches that start later.
+
+        Backends with ``supports_context`` get a :class:`PaperContext` (title,
+        abstract, glossary snapshot) that is identical for every batch of the
+        paper, so provider-side prompt caching can reuse the prefix.
+
+        Units that should be skipped (math-only, very short, empty) are kept
+        as-is and excluded from the backend call to save tokens and latency.
+        In the others, math, citations, URLs and code are masked (see
+        :mod:`src.translator.masking`); the estimated input tokens saved are
+        the ``mask_saved_tokens`` attribute of the ``translate`` span.
 
         If *on_batch_done* is provided it is called as
         ``on_batch_done(completed, total)`` after each batch finishes.
+
+        If *on_segment* is provided it is called as ``on_segment(unit_id,
+        text)`` for every unit as soon as its translation is known (skipped and
+        cached units first). With *stream*, batches are streamed and each
+        paragraph is reported when its separator arrives instead of when the
+        whole batch is done; if a stream breaks, completed segments are kept and
+        only the tail is re-requested. A unit may be reported again if a
+        streamed batch turns out to be misaligned and is re-translated -- the
+        last call wins.
+
+        With a *journal* (:class:`~src.translator.journal.TranslationJournal`),
+        units recorded by an earlier run of the same job are restored like
+        cached ones and every finished batch is durably recorded before it
+        counts as done, so a restarted job only sends what is left.
         """
-        translated_body: list[Paragraph] = [None] * len(paper.body)  # type: ignore[list-item]
-
-        # 1) Pre-fill paragraphs that should be skipped
-        indices_to_translate: list[int] = []
-        for idx, para in enumerate(paper.body):
-            if self._should_skip_translation(para.text):
-                translated_body[idx] = Paragraph(
-                    text=para.text, page=para.page, bbox=para.bbox
-                )
-                logger.debug("Skipping translation for paragraph %d: %r", idx, para.text[:60])
+        tracer = get_tracer()
+        backend = self.backend
+        units = collect_units(paper, include_extras=include_extras)
+        translations: dict[str, str] = {}
+        started = time.perf_counter()
+        first_segment_ms: float | None = None
+
+        def _emit(unit_ids: list[str], text: str) -> None:
+            nonlocal first_segment_ms
+            if first_segment_ms is None:
+                first_segment_ms = (time.perf_counter() - started) * 1000
+            if on_segment:
+                for unit_id in unit_ids:
+                    on_segment(unit_id, text)
+
+        # 1) Pre-fill units that should be skipped or are already cached;
+        #    group the rest by text so duplicates are translated once
+        pending: dict[str, list[str]] = {}
+        restored = journal.restore(unit.text for unit in units) if journal else {}
+        cache_hits: list[tuple[list[str], str, str]] = []
+        for unit in units:
+            if self._should_skip_translation(unit.text):
+                translations[unit.unit_id] = unit.text
+                logger.debug("Skipping translation for %s: %r", unit.unit_id, unit.text[:60])
+            elif unit.text in restored:
+                translations[unit.unit_id] = restored[unit.text]
+            elif (target_lang, unit.text) in self._cache:
+                translations[unit.unit_id] = self._cache[(target_lang, unit.text)]
+                if journal:
+                    # The cache is in memory only: record its hits so a restart keeps them too
+                    cache_hits.append(([unit.unit_id], unit.text, translations[unit.unit_id]))
             else:
-                indices_to_translate.append(idx)
-
-        # 2) Build batches only from paragraphs that need translation
-        batches: list[tuple[list[int], list[Paragraph], list[str]]] = []
-        for i in range(0, len(indices_to_translate), batch_size):
-            chunk_indices = indices_to_translate[i : i + batch_size]
-            chunk_paras = [paper.body[ci] for ci in chunk_indices]
-            chunk_texts = [p.text for p in chunk_paras]
-            batches.append((chunk_indices, chunk_paras, chunk_texts))
+                pending.setdefault(unit.text, []).append(unit.unit_id)
+                continue
+            if on_segment:
+                on_segment(unit.unit_id, translations[unit.unit_id])
+
+        if cache_hits:
+            await asyncio.to_thread(journal.record, cache_hits)
+
+        # 2) Build token-packed batches in reading order with deferred text
+        #    (footnotes, references, appendix) last; a batch is deferred only
+        #    if all of its texts are
+        deferred_ids = deferred_unit_ids(units)
+        positions: dict[str, tuple[bool, int, int]] = {}
+        for order, unit in enumerate(units):
+            if unit.text in pending and unit.text not in positions:
+                deferred = all(uid in deferred_ids for uid in pending[unit.text])
+                page = unit.page if unit.page is not None else -1
+                positions[unit.text] = (deferred, page, order)
+        reading_order = sorted(pending, key=lambda t: positions[t])
+        mask_saved = self._record_mask_savings(reading_order)
+
+        max_batch_tokens = min(max_batch_tokens, backend.max_context_tokens // 2)
+        scheduled: list[ScheduledBatch] = []
+
+        def _schedule(texts: list[str], **fields) -> ScheduledBatch:
+            batch = ScheduledBatch(
+                index=len(scheduled),
+                texts=texts,
+                pages=sorted({positions[t][1] for t in texts if positions[t][1] >= 0}),
+                order=positions[texts[0]][2],
+                deferred=all(positions[t][0] for t in texts),
+                tokens=sum(backend.estimate_tokens(t) for t in texts),
+                **fields,
+            )
+            scheduled.append(batch)
+            return batch
+
+        for texts in self._pack_batches(reading_order, batch_size, max_batch_tokens, backend.estimate_tokens):
+            _schedule(texts)
+        scheduler = BatchScheduler(scheduled, viewport=viewport, budget_tokens=budget_tokens)
+        use_glossary = self._uses_glossary()
+        if use_glossary:
+            await self._prime_glossary_async(reading_order, target_lang)
+        # Built once: every batch request of this paper starts with the same bytes
+        context = self._paper_context(paper, reading_order)
 
-        semaphore = asyncio.Semaphore(10)
         completed_count = 0
-        total_batches = len(batches)
-
-        async def _do_batch(texts: list[str], lang: str) -> list[str]:
-            nonlocal completed_count
-            async with semaphore:
-                result = await self._translate_batch_async(texts, lang)
-                completed_count += 1
-                if on_batch_done:
-                    on_batch_done(completed_count, total_batches)
-                return result
-
-        tasks = [_do_batch(texts, target_lang) for _, _, texts in batches]
-        results = await asyncio.gather(*tasks)
-
-        # 3) Place translated texts back at their original indices
-        for (chunk_indices, chunk_paras, _), trans_texts in zip(batches, results):
-            for ci, para, trans in zip(chunk_indices, chunk_paras, trans_texts):
-                translated_body[ci] = Paragraph(
-                    text=trans, page=para.page, bbox=para.bbox
-                )
+        total_batches = len(scheduled)
+        hedges_before = self.hedge_budget.hedges if self.hedge_budget else 0
+        results: dict[int, list[str]] = {}
+
+        async def _do_batch(batch: ScheduledBatch, lang: str) -> list[str] | None:
+            nonlocal completed_count, total_batches
+            texts = batch.texts
+            origin = batch.index if batch.origin is None else batch.origin
+            glossary = None
+            if use_glossary:
+                # Terms seen in an earlier batch (reading order) were introduced there
+                earlier = "\n".join(t for b in scheduled[:origin] for t in b.texts)
+                glossary = self._batch_glossary(texts, set(self.glossary.find(earlier)), context)
+            prompt = self._prompt_kwargs(glossary, context)
+            with tracer.span(
+                "translate.batch",
+                size=len(texts),
+                backend=backend.name,
+                stream=stream,
+                page=batch.pages[0] if batch.pages else None,
+                tier=batch.tier,
+                depth=batch.depth,
+            ):
+                if stream and batch.depth == 0:
+                    result = await self._translate_batch_stream(
+                        texts, lang, lambda i, trans: _emit(pending[texts[i]], trans), prompt
+                    )
+                else:
+                    result = await self._attempt_batch_async(texts, lang, prompt, batch.depth)
+                    if result is None:
+                        # Retry the halves through the scheduler: they wait for
+                        # a free worker and keep their reading-order priority
+                        for half in self._bisect(texts, batch.depth):
+                            scheduler.push(_schedule(half, depth=batch.depth + 1, origin=origin))
+                        total_batches += 1
+                        return None
+                    for text, trans in zip(texts, result):
+                        _emit(pending[text], trans)
+            if journal:
+                await asyncio.to_thread(journal.record, [(pending[t], t, trans) for t, trans in zip(texts, result)])
+            if use_glossary:
+                self._learn_terms(result)
+            completed_count += 1
+            if on_batch_done:
+                on_batch_done(completed_count, total_batches - len(scheduler.skipped))
+            return result
+
+        in_flight = 0
+        wakeup = asyncio.Condition()
+
+        async def _worker() -> None:
+            # Each worker pulls the highest-priority batch when it becomes free,
+            # so a viewport change re-orders everything not yet started. An
+            # idle worker waits while others are busy, as they may split a
+            # batch and push its halves.
+            nonlocal in_flight
+            while True:
+                async with wakeup:
+                    while (batch := scheduler.pop()) is None and in_flight:
+                        await wakeup.wait()
+                    if batch is None:
+                        wakeup.notify_all()
+                        return
+                    in_flight += 1
+                try:
+                    result = await _do_batch(batch, target_lang)
+                    if result is not None:
+                        results[batch.index] = result
+                finally:
+                    async with wakeup:
+                        in_flight -= 1
+                        wakeup.notify_all()
+
+        with tracer.span(
+            "translate", units=len(units), pending=len(pending), batches=total_batches, backend=backend.name
+        ) as span:
+            # One worker per slot even for few batches: halves of a split
+            # batch can then run side by side
+            workers = backend.max_concurrency if total_batches else 0
+            await asyncio.gather(*(_worker() for _ in range(workers)))
+            if first_segment_ms is not None:
+                # Time to the first translated paragraph (what the viewer waits for)
+                span.attributes["first_segment_ms"] = round(first_segment_ms, 1)
+            if mask_saved:
+                span.attributes["mask_saved_tokens"] = mask_saved
+            if self.hedge_budget and self.hedge_budget.hedges > hedges_before:
+                span.attributes["hedges"] = self.hedge_budget.hedges - hedges_before
+            if scheduler.skipped:
+                span.attributes["skipped_batches"] = len(scheduler.skipped)
+                tracer.add("translate.deferred_skipped", sum(len(b.texts) for b in scheduler.skipped))
+
+        # 3) Map translated texts back to every unit that shares them; split
+        #    batches have no result of their own (their halves do) and texts
+        #    of skipped (over-budget) batches keep their source text
+        for batch in scheduled:
+            if batch.index not in results:
+                continue
+            for text, trans in zip(batch.texts, results[batch.index]):
+                self._cache[(target_lang, text)] = trans
+                for unit_id in pending[text]:
+                    translations[unit_id] = trans
+
+        return apply_translations(paper, translations)
 
-        return ParsedPaper(
-            body=translated_body,
-            tables=paper.tables,
-            figures=paper.figures,
-            equations=paper.equations,
-            metadata=paper.metadata,
+    # ------------------------------------------------------------------
+    # Glossary
+    # ------------------------------------------------------------------
+
+    def _uses_glossary(self) -> bool:
+        return self.glossary is not None and getattr(self.backend, "supports_glossary", False)
+
+    def _paper_context(self, paper: ParsedPaper, texts: list[str]) -> PaperContext | None:
+        """Stable prompt prefix for *paper* (backends with ``supports_context`` only)."""
+        if not getattr(self.backend, "supports_context", False):
+            return None
+        glossary = self.glossary if self._uses_glossary() else None
+        context = PaperContext.from_paper(paper, glossary, texts)
+        return context or None
+
+    @staticmethod
+    def _prompt_kwargs(glossary: dict[str, str] | None, context: PaperContext | None) -> dict:
+        # Only aware backends get the keywords (custom backends keep their signature)
+        kwargs = {}
+        if glossary:
+            kwargs["glossary"] = glossary
+        if context:
+            kwargs["context"] = context
+        return kwargs
+
+    def _prime_candidates(self, texts: list[str]) -> list[str]:
+        candidates = extract_terms(texts)
+        return [term for key, term in candidates.items() if key not in self.glossary]
+
+    def _learn_primed(self, terms: list[str], translated: list[str]) -> None:
+        if len(translated) != len(terms):
+            logger.warning("Glossary priming returned %d terms for %d; skipped.", len(translated), len(terms))
+            return
+        primed = sum(
+            self.glossary.learn(term, TermStore.clean_translation(trans))
+            for term, trans in zip(terms, translated)
         )
+        get_tracer().add("translate.glossary_primed", primed)
+
+    def _prime_glossary(self, texts: list[str], target_lang: str) -> None:
+        """First pass: translate the paper's unknown candidate terms in one request."""
+        terms = self._prime_candidates(texts)
+        if terms:
+            with get_tracer().span("translate.glossary_prime", terms=len(terms)):
+                try:
+                    self._learn_primed(terms, self.backend.translate_batch(terms, target_lang))
+                except Exception as exc:
+                    logger.warning("Glossary priming failed: %s", exc)
+
+    async def _prime_glossary_async(self, texts: list[str], target_lang: str) -> None:
+        terms = self._prime_candidates(texts)
+        if terms:
+            with get_tracer().span("translate.glossary_prime", terms=len(terms)):
+                try:
+                    self._learn_primed(terms, await self.backend.translate_batch_async(terms, target_lang))
+                except Exception as exc:
+                    logger.warning("Glossary priming failed: %s", exc)
+
+    def _batch_glossary(
+        self, texts: list[str], introduced: set[str], context: PaperContext | None = None
+    ) -> dict[str, str]:
+        """Per-batch glossary: known terms of the batch that the paper context lacks.
+
+        Terms not in *introduced* (not in an earlier batch in reading order)
+        are given as ``translation(English)`` so this batch introduces them.
+        Introduced terms already in the *context* prefix are left out.
+        """
+        in_prefix = context.terms if context else set()
+        entries = {}
+        for key, surface in self.glossary.find("\n".join(texts)).items():
+            if key in introduced and key in in_prefix:
+                continue
+            translation = self.glossary.get(key)
+            entries[surface] = translation if key in introduced else f"{translation}({surface})"
+        get_tracer().add("translate.glossary_terms", len(entries))
+        return entries
+
+    def _learn_terms(self, translations: list[str]) -> None:
+        learned = sum(
+            self.glossary.learn(english, korean)
+            for text in translations
+            for english, korean in learned_terms(text)
+        )
+        if learned:
+            get_tracer().add("translate.glossary_learned", learned)
 
     # ------------------------------------------------------------------
     # Batch translation (sync)
     # ------------------------------------------------------------------
 
-    def _translate_batch(self, texts: list[str], target_lang: str) -> list[str]:
-        """Translate multiple text blocks in a single request."""
+    def _translate_batch(
+        self, texts: list[str], target_lang: str, prompt: dict | None = None, depth: int = 0
+    ) -> list[str]:
+        """Translate multiple text blocks in a single backend call.
+
+        A failed or misaligned batch is split in half and each half retried
+        (see :meth:`_bisect`) down to single paragraphs.
+        """
         if not texts:
             return []
+        if depth and len(texts) == 1:
+            return [self._translate_text(texts[0], target_lang, prompt)]
 
-        separator = f"\n{self.SEPARATOR}\n"
-        combined = separator.join(texts)
-        system_prompt = self.SYSTEM_PROMPT_BATCH.format(
-            target_lang=target_lang, separator=self.SEPARATOR
-        )
-
+        masks = self._mask(texts)
         try:
-            response = self.client.chat.completions.create(
-                model=self.model,
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": combined},
-                ],
-                timeout=60,
+            translated = self.backend.translate_batch([m.text for m in masks], target_lang, **(prompt or {}))
+
+            if len(translated) == len(texts):
+                return self._unmask(translated, masks)
+            logger.warning(
+                "Batch count mismatch: got %d, expected %d. Splitting the batch.",
+                len(translated),
+                len(texts),
             )
-            result = response.choices[0].message.content
+        except PlaceholderError as exc:
+            logger.warning("Batch lost placeholders: %s. Splitting the batch.", exc)
+        except Exception as exc:
+            logger.error("Batch translation error: %s", exc)
 
-            translated = [t.strip() for t in result.split(self.SEPARATOR)]
+        if depth == 0:
+            get_tracer().add("translate.fallbacks")
+        if len(texts) == 1:
+            return [self._translate_text(texts[0], target_lang, prompt)]
+        return [
+            trans
+            for half in self._bisect(texts, depth)
+            for trans in self._translate_batch(half, target_lang, prompt, depth + 1)
+        ]
 
-            if len(translated) != len(texts):
-                logger.warning(
-                    "Batch count mismatch: got %d, expected %d. "
-                    "Falling back to individual translation.",
-                    len(translated),
-                    len(texts),
-                )
-                return [self._translate_text(t, target_lang) for t in texts]
+    @staticmethod
+    def _bisect(texts: list[str], depth: int) -> tuple[list[str], list[str]]:
+        """Halves of a failed batch at *depth*, counted per depth they reach.
 
-            return translated
-        except Exception as exc:
-            logger.error("Batch translation error: %s", exc)
-            return [self._translate_text(t, target_lang) for t in texts]
+        Halving instead of sending every paragraph on its own keeps a bad batch
+        at O(log n) extra requests when one paragraph is at fault (a formula
+        the model merges, a segment it refuses) and the system prompt is not
+        re-sent once per paragraph.
+        """
+        middle = (len(texts) + 1) // 2
+        get_tracer().add("translate.bisect", 2, depth=depth + 1)
+        return texts[:middle], texts[middle:]
 
     # ------------------------------------------------------------------
-    # Batch translation (async) -- with 1 retry on count mismatch
+    # Batch translation (async) -- 1 retry, then halving
     # ------------------------------------------------------------------
 
-    async def _translate_batch_async(self, texts: list[str], target_lang: str) -> list[str]:
-        """Translate multiple text blocks in a single async request.
+    async def _attempt_batch_async(
+        self, texts: list[str], target_lang: str, prompt: dict | None = None, depth: int = 0
+    ) -> list[str] | None:
+        """Translate a batch at *depth*, or return None if it has to be split.
 
-        If the number of returned segments does not match the input, one retry
-        is attempted before falling back to individual translation.
+        Packed batches (depth 0) get one retry on a count mismatch or error;
+        halves get a single attempt. Single paragraphs below depth 0 use the
+        single-text prompt, which cannot be misaligned.
         """
-        if not texts:
-            return []
-
-        separator = f"\n{self.SEPARATOR}\n"
-        combined = separator.join(texts)
-        system_prompt = self.SYSTEM_PROMPT_BATCH.format(
-            target_lang=target_lang, separator=self.SEPARATOR
-        )
-        messages = [
-            {"role": "system", "content": system_prompt},
-            {"role": "user", "content": combined},
-        ]
+        if depth and len(texts) == 1:
+            return [await self._translate_text_async(texts[0], target_lang, prompt)]
 
-        max_attempts = 2  # initial + 1 retry
+        masks = self._mask(texts)
+        max_attempts = 1 if depth else 2
         for attempt in range(1, max_attempts + 1):
             try:
-                response = await self.async_client.chat.completions.create(
-                    model=self.model,
-                    messages=messages,
-                    timeout=60,
-                )
-                result = response.choices[0].message.content
-                translated = [t.strip() for t in result.split(self.SEPARATOR)]
+                if attempt > 1:
+                    get_tracer().add("translate.retries")
+                    logger.info("Retrying batch translation...")
+                translated = await self._hedged_batch([m.text for m in masks], target_lang, prompt)
 
                 if len(translated) == len(texts):
-                    return translated
+                    return self._unmask(translated, masks)
 
                 logger.warning(
                     "Batch count mismatch (attempt %d/%d): got %d, expected %d.",
@@ -272,71 +831,172 @@ class PaperTranslator:
                     len(translated),
                     len(texts),
                 )
-
-                if attempt < max_attempts:
-                    logger.info("Retrying batch translation...")
-                    continue
-
-                # Exhausted retries -- fall back to individual
+            except PlaceholderError as exc:
                 logger.warning(
-                    "Batch retry exhausted. Falling back to individual translation "
-                    "for %d paragraphs.",
-                    len(texts),
+                    "Batch lost placeholders (attempt %d/%d): %s", attempt, max_attempts, exc
                 )
-                tasks = [self._translate_text_async(t, target_lang) for t in texts]
-                return await asyncio.gather(*tasks)
-
             except Exception as exc:
                 logger.error(
                     "Async batch error (attempt %d/%d): %s", attempt, max_attempts, exc
                 )
-                if attempt < max_attempts:
-                    logger.info("Retrying batch translation after error...")
-                    continue
 
+        if depth == 0:
+            get_tracer().add("translate.fallbacks")
+        if len(texts) == 1:
+            return [await self._translate_text_async(texts[0], target_lang, prompt)]
+        logger.warning("Batch of %d paragraphs failed at depth %d. Splitting it.", len(texts), depth)
+        return None
+
+    async def _hedged_batch(self, texts: list[str], target_lang: str, prompt: dict | None = None) -> list[str]:
+        """One backend batch call, hedged if it outlasts the p95 of its size."""
+        backend = self.backend
+        return await hedged(
+            lambda: backend.translate_batch_async(texts, target_lang, **(prompt or {})),
+            sum(backend.estimate_tokens(t) for t in texts),
+            self._latency,
+            self.hedge_budget,
+            expected_output_tokens=backend.expected_output_tokens(texts),
+        )
+
+    async def _translate_batch_async(
+        self, texts: list[str], target_lang: str, prompt: dict | None = None, depth: int = 0
+    ) -> list[str]:
+        """Translate multiple text blocks in a single async backend call.
+
+        If the number of returned segments does not match the input, one retry
+        is attempted; after that the batch is halved and the halves are
+        translated one after another (recursively, down to single paragraphs),
+        so the caller's concurrency slot is never exceeded.
+        ``translate_async`` does not use this for its own batches -- it pushes
+        the halves back to the scheduler instead.
+        """
+        if not texts:
+            return []
+        translated = await self._attempt_batch_async(texts, target_lang, prompt, depth)
+        if translated is not None:
+            return translated
+        results = []
+        for half in self._bisect(texts, depth):
+            results.extend(await self._translate_batch_async(half, target_lang, prompt, depth + 1))
+        return results
+
+    # ------------------------------------------------------------------
+    # Batch translation (streamed) -- keep completed segments, resume the tail
+    # ------------------------------------------------------------------
+
+    async def _translate_batch_stream(
+        self, texts: list[str], target_lang: str, on_text, prompt: dict | None = None
+    ) -> list[str]:
+        """Stream a batch, calling ``on_text(index, translation)`` per segment.
+
+        When the stream breaks, segments already received are kept and only
+        ``texts[len(done):]`` is requested again (at most one resume without
+        progress). If a stream completes with the wrong number of segments the
+        alignment of that attempt cannot be trusted: its segments are dropped and
+        the rest goes through the non-streamed retry/fallback path.
+        """
+        if not texts:
+            return []
+
+        tracer = get_tracer()
+        masks = self._mask(texts)
+        done: list[str] = []
+        failures = 0
+        while len(done) < len(texts):
+            start = len(done)
+            remaining = [m.text for m in masks[start:]]
+            try:
+                async for segment in self.backend.stream_batch(remaining, target_lang, **(prompt or {})):
+                    if len(done) < len(texts):
+                        # A segment that lost a placeholder ends the stream like
+                        # a broken connection: it is requested again
+                        segment = self._unmask([segment], masks[len(done) : len(done) + 1])[0]
+                        on_text(len(done), segment)
+                    done.append(segment)
+            except Exception as exc:
+                del done[len(texts):]
                 logger.warning(
-                    "Batch retry exhausted after error. Falling back to individual "
-                    "translation for %d paragraphs.",
-                    len(texts),
+                    "Stream broke after %d/%d segments: %s", len(done), len(texts), exc
+                )
+                failures += 1 if len(done) == start else 0
+                if failures >= 2:
+                    break
+                tracer.add("translate.stream_resumes")
+                continue
+
+            if len(done) != len(texts):
+                logger.warning(
+                    "Streamed batch count mismatch: got %d, expected %d.",
+                    len(done) - start,
+                    len(remaining),
                 )
-                tasks = [self._translate_text_async(t, target_lang) for t in texts]
-                return await asyncio.gather(*tasks)
+                del done[start:]
+            break
 
-        # Should not be reached, but satisfy type checker
-        return texts  # pragma: no cover
+        if len(done) < len(texts):
+            rest = await self._translate_batch_async(texts[len(done):], target_lang, prompt)
+            for offset, trans in enumerate(rest):
+                on_text(len(done) + offset, trans)
+            done.extend(rest)
+        return done
 
     # ------------------------------------------------------------------
     # Single-paragraph translation
     # ------------------------------------------------------------------
 
-    def _translate_text(self, text: str, target_lang: str) -> str:
-        """Translate a single text string."""
+    def _translate_text(self, text: str, target_lang: str, prompt: dict | None = None) -> str:
+        """Translate a single text string (unmasked if its placeholders get lost)."""
         if self._should_skip_translation(text):
             return text
+        masked = self._mask([text])[0]
+        translated = self.backend.translate_text(masked.text, target_lang, **(prompt or {}))
+        try:
+            return self._unmask([translated], [masked])[0]
+        except PlaceholderError as exc:
+            logger.warning("Single translation lost placeholders: %s. Sending it unmasked.", exc)
+            return self.backend.translate_text(text, target_lang, **(prompt or {}))
 
-        system_prompt = self.SYSTEM_PROMPT_SINGLE.format(target_lang=target_lang)
-
-        response = self.client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text},
-            ],
-        )
-        return response.choices[0].message.content
-
-    async def _translate_text_async(self, text: str, target_lang: str) -> str:
-        """Translate a single text string asynchronously."""
+    async def _translate_text_async(self, text: str, target_lang: str, prompt: dict | None = None) -> str:
+        """Translate a single text string asynchronously (see :meth:`_translate_text`)."""
         if self._should_skip_translation(text):
             return text
+        masked = self._mask([text])[0]
+        translated = await self.backend.translate_text_async(masked.text, target_lang, **(prompt or {}))
+        try:
+            return self._unmask([translated], [masked])[0]
+        except PlaceholderError as exc:
+            logger.warning("Single translation lost placeholders: %s. Sending it unmasked.", exc)
+            return await self.backend.translate_text_async(text, target_lang, **(prompt or {}))
 
-        system_prompt = self.SYSTEM_PROMPT_SINGLE.format(target_lang=target_lang)
+    # ------------------------------------------------------------------
+    # Placeholder masking
+    # ------------------------------------------------------------------
 
-        response = await self.async_client.chat.completions.create(
-            model=self.model,
-            messages=[
-                {"role": "system", "content": system_prompt},
-                {"role": "user", "content": text},
-            ],
-        )
-        return response.choices[0].message.content
+    def _uses_masking(self) -> bool:
+        return self.mask and getattr(self.backend, "supports_masking", False)
+
+    def _mask(self, texts: list[str]) -> list[MaskedText]:
+        if not self._uses_masking():
+            return [MaskedText(t) for t in texts]
+        return [mask_text(t) for t in texts]
+
+    @staticmethod
+    def _unmask(translated: list[str], masks: list[MaskedText]) -> list[str]:
+        try:
+            return [unmask_text(t, m.spans) for t, m in zip(translated, masks)]
+        except PlaceholderError:
+            get_tracer().add("translate.placeholder_errors")
+            raise
+
+    def _record_mask_savings(self, texts: list[str]) -> int:
+        """Estimated input tokens saved by masking *texts* (recorded as a counter).
+
+        The reply echoes the masked spans too, so output tokens drop by about
+        the same amount.
+        """
+        if not self._uses_masking():
+            return 0
+        estimate = self.backend.estimate_tokens
+        saved = sum(max(0, estimate(t) - estimate(mask_text(t).text)) for t in texts)
+        get_tracer().add("translate.mask_saved_tokens", saved)
+        return saved
@@ -0,0 +1,173 @@
+"""Reading-order priority scheduling for translation batches.
+
+``PaperTranslator.translate_async`` used to start every batch at once behind a
+semaphore, so under rate limiting page 30 could finish before page 1. Batches
+are now handed to a fixed pool of workers in priority order:
+
+1. batches on pages in the :class:`ViewportHint` (what the reader is looking at),
+2. the main text, nearest to the viewport first, then by page and reading order,
+3. deferred text -- footnotes, references and everything after them (appendix).
+
+The hint can be updated while a translation runs; batches that have not
+started yet are re-ordered on the next pick. With a token budget, deferred
+batches that no longer fit are skipped and keep their source text.
+
+A batch that keeps failing is split in two and both halves are :meth:`pushed
+<BatchScheduler.push>` back, so retries wait for a free worker like any other
+batch instead of bypassing the concurrency limit.
+"""
+from __future__ import annotations
+
+import heapq
+import threading
+from dataclasses import dataclass, field
+from typing import Iterable, List, Optional
+
+from src.translator.units import TranslationUnit
+from src.utils.selection import section_key
+
+# Sections whose text (and everything after them) is translated last
+_DEFERRED_SECTIONS = ("references", "bibliography", "appendix", "appendices", "supplementary", "acknowledg")
+
+# Priority tiers
+VIEWPORT, MAIN, DEFERRED = 0, 1, 2
+
+
+class ViewportHint:
+    """Pages (0-based) the reader is currently looking at.
+
+    Thread-safe: the UI may call :meth:`set` from another thread while the
+    translation loop reads :attr:`pages`. :attr:`version` changes on every
+    update so the scheduler knows when to re-rank pending batches.
+    """
+
+    def __init__(self, pages: Iterable[int] = ()):
+        self._lock = threading.Lock()
+        self._pages = frozenset(pages)
+        self.version = 0
+
+    @property
+    def pages(self) -> frozenset[int]:
+        with self._lock:
+            return self._pages
+
+    def set(self, pages: Iterable[int]) -> None:
+        with self._lock:
+            self._pages = frozenset(pages)
+            self.version += 1
+
+    def distance(self, pages: Iterable[int]) -> int:
+        """Smallest page distance between *pages* and the viewport (0 without a hint)."""
+        viewport = self.pages
+        if not viewport:
+            return 0
+        return min((abs(p - v) for p in pages for v in viewport), default=0)
+
+
+@dataclass
+class ScheduledBatch:
+    """One batch of source texts with the reading position of its first unit."""
+
+    index: int
+    texts: List[str]
+    pages: List[int]
+    order: int
+    deferred: bool = False
+    tokens: int = 0
+    #: Number of halvings since the batch was packed (0 for packed batches)
+    depth: int = 0
+    #: Index of the packed batch a split batch came from
+    origin: Optional[int] = None
+    #: Tier the batch was dispatched with (set by :class:`BatchScheduler`)
+    tier: Optional[int] = field(default=None, compare=False)
+
+
+def deferred_unit_ids(units: List[TranslationUnit]) -> set[str]:
+    """Unit ids translated last: footnotes, references and whatever follows them.
+
+    Body paragraphs from the first references/appendix section on are deferred
+    (arXiv appendices are often titled "A Proofs" rather than "Appendix").
+    Tables and figures are deferred when they sit on a later page than where
+    that section starts.
+    """
+    deferred = {u.unit_id for u in units if u.kind == "footnote"}
+    tail_page: Optional[int] = None
+    in_tail = False
+    for unit in units:
+        if unit.kind != "body":
+            continue
+        if not in_tail and section_key(unit.section).startswith(_DEFERRED_SECTIONS):
+            in_tail = True
+            tail_page = unit.page
+        if in_tail:
+            deferred.add(unit.unit_id)
+    if tail_page is not None:
+        deferred.update(
+            u.unit_id for u in units if u.kind != "body" and u.page is not None and u.page > tail_page
+        )
+    return deferred
+
+
+class BatchScheduler:
+    """Hands out batches in priority order; see the module docstring.
+
+    *budget_tokens* caps the estimated input tokens of all dispatched batches.
+    Only deferred batches are ever skipped for it -- the main text always runs,
+    and so do the halves of a batch that was already dispatched.
+    """
+
+    def __init__(
+        self,
+        batches: List[ScheduledBatch],
+        viewport: Optional[ViewportHint] = None,
+        budget_tokens: Optional[int] = None,
+    ):
+        self.viewport = viewport or ViewportHint()
+        self.budget_tokens = budget_tokens
+        self.spent_tokens = 0
+        self.skipped: List[ScheduledBatch] = []
+        self._pending = list(batches)
+        self._heap: list[tuple] = []
+        self._version = -1
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def priority(self, batch: ScheduledBatch) -> tuple:
+        """Sort key: (tier, viewport distance, page, reading order)."""
+        viewport = self.viewport.pages
+        if viewport and viewport.intersection(batch.pages):
+            tier = VIEWPORT
+        else:
+            tier = DEFERRED if batch.deferred else MAIN
+        first_page = min(batch.pages, default=0)
+        return (tier, self.viewport.distance(batch.pages), first_page, batch.order, batch.index)
+
+    def _rebuild(self) -> None:
+        self._heap = [(self.priority(b), b) for b in self._pending]
+        heapq.heapify(self._heap)
+        self._version = self.viewport.version
+
+    def push(self, batch: ScheduledBatch) -> None:
+        """Add *batch* (e.g. half of a failed batch) to the pending batches."""
+        self._pending.append(batch)
+        if self._version == self.viewport.version:
+            heapq.heappush(self._heap, (self.priority(batch), batch))
+
+    def pop(self) -> Optional[ScheduledBatch]:
+        """Next batch to run, or None when everything is dispatched or skipped."""
+        if self._version != self.viewport.version:
+            self._rebuild()
+        while self._heap:
+            key, batch = heapq.heappop(self._heap)
+            self._pending.remove(batch)
+            batch.tier = key[0]
+            over_budget = (
+                self.budget_tokens is not None and self.spent_tokens + batch.tokens > self.budget_tokens
+            )
+            if batch.deferred and batch.depth == 0 and key[0] == DEFERRED and over_budget:
+                self.skipped.append(batch)
+                continue
+            self.spent_tokens += batch.tokens
+            return batch
+        return None
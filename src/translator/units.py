@@ -0,0 +1,151 @@
+"""ParsedPaper의 번역 대상 텍스트를 번역 단위(TranslationUnit)로 분해/재조립."""
+from __future__ import annotations
+
+import html
+import itertools
+import re
+from dataclasses import dataclass, replace
+from typing import Dict, List, Optional
+
+from src.models.paper import Figure, ParsedPaper, Table
+
+# MinerU 테이블 HTML의 셀: <td ...>내용</td> / <th ...>내용</th>
+_CELL_RE = re.compile(r"(<t[dh]\b[^>]*>)(.*?)(</t[dh]\s*>)", re.IGNORECASE | re.DOTALL)
+_TAG_RE = re.compile(r"<[^>]+>")
+
+
+@dataclass
+class TranslationUnit:
+    """번역 엔진에 보낼 최소 텍스트 단위.
+
+    ``unit_id`` 는 ParsedPaper 내 위치를 나타낸다::
+
+        body:<i>                      본문 문단
+        table:<i>:caption[:<j>]       테이블 캡션 (리스트면 j번째 항목)
+        table:<i>:cell:<j>            테이블 HTML의 j번째 셀
+        figure:<i>:caption[:<j>]      그림 캡션
+        footnote:<i>                  metadata["raw"]의 i번째 page_footnote 블록
+    """
+
+    unit_id: str
+    text: str
+    kind: str = "body"
+    page: Optional[int] = None
+    section: Optional[str] = None
+
+
+def _cell_text(inner: str) -> str:
+    return html.unescape(_TAG_RE.sub("", inner)).strip()
+
+
+def _caption_units(prefix: str, caption, kind: str, page: Optional[int]) -> List[TranslationUnit]:
+    if isinstance(caption, str) and caption.strip():
+        return [TranslationUnit(f"{prefix}:caption", caption, kind, page)]
+    if isinstance(caption, list):
+        return [
+            TranslationUnit(f"{prefix}:caption:{j}", item, kind, page)
+            for j, item in enumerate(caption)
+            if isinstance(item, str) and item.strip()
+        ]
+    return []
+
+
+def collect_units(paper: ParsedPaper, include_extras: bool = True) -> List[TranslationUnit]:
+    """ParsedPaper에서 텍스트가 있는 모든 부분을 TranslationUnit 리스트로 추출.
+
+    *include_extras* 가 False면 본문 문단만 추출한다.
+    """
+    units = [
+        TranslationUnit(f"body:{i}", para.text, "body", para.page, para.section)
+        for i, para in enumerate(paper.body)
+    ]
+    if not include_extras:
+        return units
+
+    for i, table in enumerate(paper.tables):
+        if not isinstance(table, Table):
+            continue
+        units.extend(_caption_units(f"table:{i}", table.caption, "table_caption", table.page))
+        for j, match in enumerate(_CELL_RE.finditer(table.html or "")):
+            text = _cell_text(match.group(2))
+            if text:
+                units.append(TranslationUnit(f"table:{i}:cell:{j}", text, "table_cell", table.page))
+
+    for i, figure in enumerate(paper.figures):
+        if not isinstance(figure, Figure):
+            continue
+        units.extend(_caption_units(f"figure:{i}", figure.caption, "figure_caption", figure.page))
+
+    for i, block in enumerate(paper.metadata.get("raw", []) if isinstance(paper.metadata, dict) else []):
+        if block.get("type") == "page_footnote":
+            text = block.get("text") or block.get("content") or ""
+            if text.strip():
+                units.append(TranslationUnit(f"footnote:{i}", text, "footnote", block.get("page_idx")))
+
+    return units
+
+
+def _apply_caption(prefix: str, caption, translations: Dict[str, str]):
+    if isinstance(caption, str):
+        return translations.get(f"{prefix}:caption", caption)
+    if isinstance(caption, list):
+        return [translations.get(f"{prefix}:caption:{j}", item) for j, item in enumerate(caption)]
+    return caption
+
+
+def _apply_cells(prefix: str, table_html: str, translations: Dict[str, str]) -> str:
+    counter = itertools.count()
+
+    def substitute(match: re.Match) -> str:
+        unit_id = f"{prefix}:cell:{next(counter)}"
+        if unit_id not in translations:
+            return match.group(0)
+        return f"{match.group(1)}{html.escape(translations[unit_id], quote=False)}{match.group(3)}"
+
+    return _CELL_RE.sub(substitute, table_html)
+
+
+def apply_translations(paper: ParsedPaper, translations: Dict[str, str]) -> ParsedPaper:
+    """unit_id -> 번역문 매핑을 적용한 새 ParsedPaper를 반환.
+
+    매핑에 없는 단위는 원문을 유지한다. 입력 paper는 변경하지 않는다.
+    """
+    body = [
+        replace(para, text=translations.get(f"body:{i}", para.text))
+        for i, para in enumerate(paper.body)
+    ]
+
+    tables = []
+    for i, table in enumerate(paper.tables):
+        if isinstance(table, Table):
+            table = replace(
+                table,
+                html=_apply_cells(f"table:{i}", table.html or "", translations),
+                caption=_apply_caption(f"table:{i}", table.caption, translations),
+            )
+        tables.append(table)
+
+    figures = []
+    for i, figure in enumerate(paper.figures):
+        if isinstance(figure, Figure):
+            figure = replace(figure, caption=_apply_caption(f"figure:{i}", figure.caption, translations))
+        figures.append(figure)
+
+    metadata = paper.metadata
+    if isinstance(metadata, dict) and any(uid.startswith("footnote:") for uid in translations):
+        raw = []
+        for i, block in enumerate(metadata.get("raw", [])):
+            unit_id = f"footnote:{i}"
+            if unit_id in translations:
+                key = "text" if block.get("text") else "content"
+                block = {**block, key: translations[unit_id]}
+            raw.append(block)
+        metadata = {**metadata, "raw": raw}
+
+    return ParsedPaper(
+        body=body,
+        tables=tables,
+        figures=figures,
+        equations=paper.equations,
+        metadata=metadata,
+    )
@@ -1,3 +1,13 @@
-from .pdf_utils import ensure_pdf
+from .arxiv import ARXIV_PATTERN, download_arxiv_pdf
+from .pdf_utils import ensure_pdf, pdf_page_count
+from .selection import parse_page_spec, select_sections, selection_pages
 
-__all__ = ["ensure_pdf"]
+__all__ = [
+    "ARXIV_PATTERN",
+    "download_arxiv_pdf",
+    "ensure_pdf",
+    "parse_page_spec",
+    "pdf_page_count",
+    "select_sections",
+    "selection_pages",
+]
@@ -0,0 +1,36 @@
+"""arXiv URL 파싱 및 PDF 다운로드 (웹 스택 없이 CLI에서도 가볍게 쓰도록 분리)."""
+from __future__ import annotations
+
+import os
+import re
+import tempfile
+
+from src.utils.tracing import get_tracer
+
+# arXiv URL 패턴: abs, pdf, html 등 다양한 형태 지원
+ARXIV_PATTERN = re.compile(
+    r"(?:https?://)?(?:www\.)?arxiv\.org/(?:abs|pdf|html)/(\d{4}\.\d{4,5}(?:v\d+)?)"
+)
+
+
+def download_arxiv_pdf(url: str) -> str:
+    """arXiv URL에서 PDF를 다운로드하여 임시 파일 경로를 반환."""
+    import requests  # 다운로드할 때만 로드
+
+    match = ARXIV_PATTERN.search(url.strip())
+    if not match:
+        raise ValueError(f"유효한 arXiv URL이 아닙니다: {url}")
+
+    paper_id = match.group(1)
+    pdf_url = f"https://arxiv.org/pdf/{paper_id}"
+
+    with get_tracer().span("download", paper_id=paper_id) as span:
+        resp = requests.get(pdf_url, timeout=60)
+        resp.raise_for_status()
+        span.attributes["bytes"] = len(resp.content)
+
+    tmp_dir = tempfile.mkdtemp()
+    pdf_path = os.path.join(tmp_dir, f"{paper_id}.pdf")
+    with open(pdf_path, "wb") as f:
+        f.write(resp.content)
+    return pdf_path
@@ -0,0 +1,80 @@
+"""번역 결과 HTML의 수식을 서버에서 MathML로 미리 렌더링.
+
+브라우저가 문서 전체를 훑어 수식을 조판하지 않도록 결과 생성 시 한 번만 변환한다
+(클라이언트 쪽 수식 작업 없음, CDN 없이 오프라인 동작). MathML은 브라우저가 기본
+지원하므로 별도 스크립트/폰트 파일이 필요 없다. 변환 결과는 LaTeX 문자열별로 캐시한다.
+
+``latex2mathml``이 없거나 변환에 실패한 수식은 원본 LaTeX를 그대로(escape) 보여준다.
+"""
+from __future__ import annotations
+
+import html
+import re
+from functools import lru_cache
+
+from src.parser.latex_normalizer import LatexNormalizer
+from src.utils.tracing import get_tracer
+
+_MATH_SPAN_RE = re.compile(LatexNormalizer.MATH_SPAN_PATTERN)
+# 수식 번호만 붙는 환경: 내용만 변환
+_EQUATION_ENV_RE = re.compile(r"^\\begin\{(equation|displaymath|math)\*?\}([\s\S]*)\\end\{\1\*?\}$")
+
+# 결과 HTML에 인라인으로 넣는 수식 스타일 (수식 폰트는 시스템 폰트 사용)
+MATH_CSS = """
+<style>
+    .para-text math {
+        font-family: 'Latin Modern Math', 'STIX Two Math', 'Cambria Math', math;
+        font-size: 1.05em;
+    }
+    .para-text math[display="block"] {
+        display: block;
+        margin: 6px 0;
+        overflow-x: auto;
+    }
+    .para-text .math-raw {
+        font-family: 'SFMono-Regular', Consolas, monospace;
+        font-size: 0.92em;
+        color: #7a5b1e;
+    }
+</style>
+"""
+
+
+def _split_delimiters(span: str) -> tuple[str, bool]:
+    """수식 구간 -> (구분자를 뗀 LaTeX, display 여부)."""
+    if span.startswith("$$"):
+        return span[2:-2], True
+    if span.startswith("$"):
+        return span[1:-1], False
+    if span.startswith(r"\("):
+        return span[2:-2], False
+    if span.startswith(r"\["):
+        return span[2:-2], True
+    match = _EQUATION_ENV_RE.match(span)
+    return (match.group(2) if match else span), True
+
+
+@lru_cache(maxsize=4096)
+def render_latex(latex: str, display: bool = False) -> str:
+    """LaTeX 수식 하나를 MathML로 변환 (실패 시 escape한 원본)."""
+    latex = latex.strip()
+    try:
+        from latex2mathml.converter import convert
+
+        return convert(latex, display="block" if display else "inline")
+    except Exception:
+        get_tracer().add("render.math_fallbacks")
+        source = f"$${latex}$$" if display else f"${latex}$"
+        return f'<span class="math-raw">{html.escape(source)}</span>'
+
+
+def render_math(text: str) -> str:
+    """문단 텍스트를 HTML로: 수식은 MathML, 나머지는 escape."""
+    parts = []
+    last = 0
+    for match in _MATH_SPAN_RE.finditer(text):
+        parts.append(html.escape(text[last : match.start()]))
+        parts.append(render_latex(*_split_delimiters(match.group(0))))
+        last = match.end()
+    parts.append(html.escape(text[last:]))
+    return "".join(parts)
@@ -8,3 +8,10 @@ def ensure_pdf(path: str | Path) -> Path:
     if pdf_path.suffix.lower() != ".pdf":
         raise ValueError(f"Not a PDF: {pdf_path}")
     return pdf_path
+
+
+def pdf_page_count(path: str | Path) -> int:
+    import fitz  # PyMuPDF
+
+    with fitz.open(str(path)) as doc:
+        return len(doc)
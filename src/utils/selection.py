@@ -0,0 +1,80 @@
+from __future__ import annotations
+
+import re
+from typing import Iterable, List
+
+from src.models import Paragraph
+
+# "1 Introduction", "II. RELATED WORK", "A. Setup" 등 제목 앞 번호
+_NUMBERING_RE = re.compile(r"^(?:[ivx]+\.|\d+(?:\.\d+)*\.?|[a-z]\.)\s+", re.IGNORECASE)
+
+# 페이지 수를 아직 모를 때(다운로드 전) 허용하는 최대 페이지 번호
+MAX_PAGES = 2000
+
+
+def parse_page_spec(spec: str | None, page_count: int | None = None) -> List[int] | None:
+    """``"1-5,8"`` 형식(1부터 시작)의 페이지 지정을 0부터 시작하는 정렬된 페이지 리스트로 변환.
+
+    빈 값이면 None(전체 페이지). ``"3-"`` 처럼 끝을 생략하면 *page_count* 까지.
+    범위 끝은 *page_count* 로 자르고, *page_count* 를 모르면 :data:`MAX_PAGES` 를 넘는
+    범위는 ValueError (``"1-999999999"`` 같은 입력으로 거대한 집합을 만들지 않도록).
+    """
+    if spec is None or not spec.strip():
+        return None
+    limit = page_count if page_count is not None else MAX_PAGES
+    pages: set[int] = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        start_text, sep, end_text = part.partition("-")
+        try:
+            start = int(start_text)
+            if not sep:
+                end = start
+            elif end_text.strip():
+                end = int(end_text)
+            elif page_count is not None:
+                end = page_count
+            else:
+                raise ValueError
+        except ValueError:
+            raise ValueError(f"Invalid page range: {part!r} (예: 1-5,8)") from None
+        if start < 1 or end < start:
+            raise ValueError(f"Invalid page range: {part!r} (예: 1-5,8)")
+        if start > limit or (page_count is None and end > limit):
+            raise ValueError(f"Page range out of bounds: {part!r} (최대 {limit}쪽)")
+        pages.update(range(start - 1, min(end, limit)))
+    return sorted(pages)
+
+
+def section_key(title: str | None) -> str:
+    """섹션 제목을 비교용 키로 정규화 ("2 Related Work" -> "related work")."""
+    if not title:
+        return ""
+    return " ".join(_NUMBERING_RE.sub("", title.strip()).lower().split())
+
+
+def paragraph_section(paragraph: Paragraph) -> str:
+    """문단이 속한 섹션 키. 제목 없이 "Abstract"로 시작하는 문단은 abstract로 본다."""
+    if paragraph.text.lstrip().lower().startswith("abstract"):
+        return "abstract"
+    return section_key(paragraph.section)
+
+
+def select_sections(paragraphs: Iterable[Paragraph], sections: Iterable[str]) -> List[Paragraph]:
+    """*sections* (예: ``["abstract", "introduction"]``) 중 하나로 시작하는 섹션의 문단만 반환.
+
+    "conclusion"은 "Conclusions and Future Work"와 같이 앞부분만 일치해도 선택된다.
+    """
+    keys = [section_key(name) for name in sections if name.strip()]
+    return [p for p in paragraphs if any(paragraph_section(p).startswith(key) for key in keys)]
+
+
+def selection_pages(paragraphs: Iterable[Paragraph]) -> List[int]:
+    """문단(병합된 영역 포함)이 걸쳐 있는 페이지 목록."""
+    pages: set[int] = set()
+    for paragraph in paragraphs:
+        for region in paragraph.bboxes or [{"page": paragraph.page or 0}]:
+            pages.add(region["page"])
+    return sorted(pages)
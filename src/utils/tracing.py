@@ -0,0 +1,247 @@
+"""Lightweight pipeline tracing: spans, counters, JSONL/Prometheus export.
+
+Usage::
+
+    tracer = get_tracer()
+    with tracer.span("mineru", device="cpu") as span:
+        ...
+        span.attributes["blocks"] = len(blocks)
+    tracer.add("translate.retries")
+
+Spans nest automatically (also across ``asyncio`` tasks, via contextvars).
+
+Only the most recent ``max_spans`` finished spans are kept (for JSONL export
+and inspection); :meth:`Tracer.summary` and the Prometheus export use running
+per-name totals, so a long-running server neither grows nor rescans history.
+
+Work done in another process (e.g. a ``ProcessPoolExecutor`` worker) records
+into that process's tracer; ship :meth:`Tracer.snapshot` back with the result
+and fold it in with :meth:`Tracer.merge`.
+"""
+from __future__ import annotations
+
+import contextvars
+import itertools
+import json
+import re
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from dataclasses import asdict, dataclass, field
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+
+_current_span: contextvars.ContextVar[Optional["Span"]] = contextvars.ContextVar("sunlight_span", default=None)
+_METRIC_NAME_RE = re.compile(r"[^a-zA-Z0-9_]")
+
+
+@dataclass
+class Span:
+    name: str
+    span_id: int
+    parent_id: Optional[int]
+    start: float
+    end: Optional[float] = None
+    attributes: Dict[str, object] = field(default_factory=dict)
+
+    @property
+    def duration(self) -> float:
+        return (self.end if self.end is not None else time.time()) - self.start
+
+
+class Tracer:
+    """Thread-safe in-memory collector of spans and counters."""
+
+    def __init__(self, max_spans: int = 10000) -> None:
+        self._lock = threading.Lock()
+        self._ids = itertools.count(1)
+        self.max_spans = max_spans
+        self.spans: Deque[Span] = deque(maxlen=max_spans)
+        self.counters: Dict[Tuple[str, Tuple[Tuple[str, str], ...]], float] = {}
+        self._totals: Dict[str, dict] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self.spans = deque(maxlen=self.max_spans)
+            self.counters = {}
+            self._totals = {}
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        parent = _current_span.get()
+        span = Span(
+            name=name,
+            span_id=next(self._ids),
+            parent_id=parent.span_id if parent else None,
+            start=time.time(),
+            attributes=dict(attributes),
+        )
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as exc:
+            span.attributes["error"] = type(exc).__name__
+            raise
+        finally:
+            span.end = time.time()
+            _current_span.reset(token)
+            with self._lock:
+                self._record(span)
+
+    def _record(self, span: Span) -> None:
+        """Store a finished span and update its running totals (caller holds the lock)."""
+        duration = span.duration
+        self.spans.append(span)
+        row = self._totals.setdefault(span.name, {"name": span.name, "count": 0, "total": 0.0, "max": 0.0})
+        row["count"] += 1
+        row["total"] += duration
+        row["max"] = max(row["max"], duration)
+
+    def add(self, name: str, value: float = 1, **labels) -> None:
+        """Increment counter *name* (with optional string labels) by *value*."""
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + value
+
+    def counter(self, name: str, **labels) -> float:
+        key = (name, tuple(sorted((k, str(v)) for k, v in labels.items())))
+        return self.counters.get(key, 0)
+
+    # ------------------------------------------------------------------
+    # Cross-process
+    # ------------------------------------------------------------------
+
+    def snapshot(self) -> dict:
+        """Picklable copy of the finished spans and counters, for :meth:`merge` in another process."""
+        with self._lock:
+            return {
+                "spans": [asdict(span) for span in self.spans],
+                "counters": [(name, labels, value) for (name, labels), value in self.counters.items()],
+            }
+
+    def merge(self, snapshot: dict) -> None:
+        """Fold a :meth:`snapshot` taken in another process into this tracer.
+
+        Span ids are renumbered; the snapshot's root spans become children of
+        the span currently open here (if any). Counters are added up.
+        """
+        parent = _current_span.get()
+        root_id = parent.span_id if parent else None
+        ids = {data["span_id"]: next(self._ids) for data in snapshot["spans"]}
+        with self._lock:
+            for data in sorted(snapshot["spans"], key=lambda d: d["start"]):
+                self._record(Span(
+                    name=data["name"],
+                    span_id=ids[data["span_id"]],
+                    parent_id=ids.get(data["parent_id"], root_id),
+                    start=data["start"],
+                    end=data["end"],
+                    attributes=dict(data["attributes"]),
+                ))
+            for name, labels, value in snapshot["counters"]:
+                key = (name, tuple(tuple(pair) for pair in labels))
+                self.counters[key] = self.counters.get(key, 0) + value
+
+    # ------------------------------------------------------------------
+    # Export
+    # ------------------------------------------------------------------
+
+    def export_jsonl(self, path: str | Path) -> None:
+        """Write one JSON object per span, then one per counter."""
+        with self._lock:
+            spans = list(self.spans)
+            counters = dict(self.counters)
+        with Path(path).open("w", encoding="utf-8") as handle:
+            for span in sorted(spans, key=lambda s: s.start):
+                record = {"kind": "span", **asdict(span), "duration": span.duration}
+                handle.write(json.dumps(record, ensure_ascii=False, default=str) + "\n")
+            for (name, labels), value in counters.items():
+                record = {"kind": "counter", "name": name, "labels": dict(labels), "value": value}
+                handle.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    def summary(self) -> List[dict]:
+        """Per span name: count, total/mean/max duration in seconds (all spans since reset)."""
+        with self._lock:
+            rows = [dict(row) for row in self._totals.values()]
+        for row in rows:
+            row["mean"] = row["total"] / row["count"]
+        return sorted(rows, key=lambda r: r["total"], reverse=True)
+
+    def format_summary(self) -> str:
+        lines = [f"{'span':<28} {'count':>6} {'total s':>9} {'mean s':>9} {'max s':>9}", "-" * 65]
+        for row in self.summary():
+            lines.append(
+                f"{row['name']:<28} {row['count']:>6} {row['total']:>9.3f} {row['mean']:>9.3f} {row['max']:>9.3f}"
+            )
+        with self._lock:
+            counters = sorted(self.counters.items())
+        if counters:
+            lines.append("-" * 65)
+            for (name, labels), value in counters:
+                label_text = ",".join(f"{k}={v}" for k, v in labels)
+                key = f"{name}{{{label_text}}}" if label_text else name
+                lines.append(f"{key:<45} {value:>19g}")
+        return "\n".join(lines)
+
+    def prometheus_text(self) -> str:
+        """Render counters and span durations in the Prometheus text format."""
+        lines: List[str] = []
+        with self._lock:
+            counters = sorted(self.counters.items())
+        seen = set()
+        for (name, labels), value in counters:
+            metric = f"sunlight_{_METRIC_NAME_RE.sub('_', name)}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{_format_labels(labels)} {value:g}")
+
+        rows = self.summary()
+        if rows:
+            lines.append("# TYPE sunlight_span_duration_seconds summary")
+            for row in rows:
+                labels = _format_labels((("span", row["name"]),))
+                lines.append(f"sunlight_span_duration_seconds_sum{labels} {row['total']:.6f}")
+                lines.append(f"sunlight_span_duration_seconds_count{labels} {row['count']}")
+        return "\n".join(lines) + "\n"
+
+
+def _format_labels(labels: Tuple[Tuple[str, str], ...]) -> str:
+    if not labels:
+        return ""
+    body = ",".join(f'{k}="{v}"' for k, v in labels)
+    return "{" + body + "}"
+
+
+_default_tracer = Tracer()
+
+
+def get_tracer() -> Tracer:
+    """Process-wide tracer used by the pipeline."""
+    return _default_tracer
+
+
+def serve_metrics(port: int = 9464, host: str = "127.0.0.1", tracer: Tracer | None = None) -> ThreadingHTTPServer:
+    """Serve ``GET /metrics`` in Prometheus text format on a daemon thread."""
+    tracer = tracer or get_tracer()
+
+    class _MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self) -> None:  # noqa: N802 (http.server API)
+            if self.path.rstrip("/") != "/metrics":
+                self.send_error(404)
+                return
+            body = tracer.prometheus_text().encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args) -> None:  # noqa: A002
+            pass
+
+    server = ThreadingHTTPServer((host, port), _MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
@@ -0,0 +1,248 @@
+"""번역 결과 JSON API 테스트 (echo 백엔드, 다운로드/파싱은 로컬 대체)."""
+
+import gzip
+import json
+import time
+import urllib.error
+import urllib.request
+from pathlib import Path
+
+import pytest
+
+import src.api as api_module
+import src.pipeline as pipeline_module
+from src.api import ApiService, serve_api
+from src.models.paper import Paragraph, ParsedPaper
+from src.pipeline import Pipeline
+from src.utils.tracing import get_tracer
+
+TEST_PDF = Path(__file__).resolve().parents[1] / "test.pdf"
+
+
+def _parsed(pdf_path, pages=None, pdf_hash=None):
+    body = [
+        Paragraph(text="Deep networks learn features.", page=0, bbox=[10, 10, 500, 80]),
+        Paragraph(text="The loss is defined below.", page=0, bbox=[10, 90, 500, 160]),
+        Paragraph(text="Results improve on every benchmark.", page=1, bbox=[10, 10, 500, 80]),
+    ]
+    if pages is not None:
+        body = [p for p in body if p.page in pages]
+    return ParsedPaper(body=body, tables=[], figures=[], equations=[], metadata={})
+
+
+@pytest.fixture
+def api(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv("SUNLIGHT_BACKEND", "echo")
+    monkeypatch.setenv("SUNLIGHT_GLOSSARY", str(tmp_path / "glossary.json"))
+    monkeypatch.setattr(pipeline_module, "download_arxiv_pdf", lambda url: str(TEST_PDF))
+    monkeypatch.setattr(pipeline_module, "parse_pdf", _parsed)
+    pipeline_module.shared_backend.cache_clear()
+    pipeline_module.shop_glossary.cache_clear()
+    pipeline_module.shared_catalog.cache_clear()
+    pipeline_module.shared_search_index.cache_clear()
+    pipeline_module.TRANSLATION_CACHE.clear()
+    service = ApiService(Pipeline(process_pools=False))
+    server = serve_api(port=0, service=service)
+    base = f"http://127.0.0.1:{server.server_address[1]}"
+    yield base, service
+    server.shutdown()
+    service.pipeline.shutdown()
+    pipeline_module.shared_backend.cache_clear()
+    pipeline_module.shop_glossary.cache_clear()
+    pipeline_module.shared_catalog.cache_clear()
+    pipeline_module.shared_search_index.cache_clear()
+
+
+def _request(url, data=None, headers=None):
+    body = json.dumps(data).encode() if data is not None else None
+    req = urllib.request.Request(url, data=body, headers=headers or {}, method="POST" if body else "GET")
+    try:
+        with urllib.request.urlopen(req, timeout=10) as resp:
+            return resp.status, dict(resp.headers), resp.read()
+    except urllib.error.HTTPError as exc:
+        return exc.code, dict(exc.headers), exc.read()
+
+
+def _wait_done(base, job_id):
+    for _ in range(200):
+        status, _, body = _request(f"{base}/jobs/{job_id}")
+        job = json.loads(body)
+        if job["status"] in ("done", "error"):
+            return job
+        time.sleep(0.02)
+    raise AssertionError("작업이 끝나지 않음")
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test.pdf 없음")
+def test_job_lifecycle_pages_and_image(api):
+    base, _ = api
+    status, headers, body = _request(f"{base}/jobs", {"url": "https://arxiv.org/abs/2301.12345"})
+    assert status == 202
+    job_id = json.loads(body)["id"]
+    assert headers["Location"] == f"/jobs/{job_id}"
+    status, _, body = _request(f"{base}/jobs/{job_id}/viewport", {"pages": [1]})
+    assert status == 200 and json.loads(body)["viewport"] == [1]
+
+    job = _wait_done(base, job_id)
+    assert job["status"] == "done", job
+    assert job["pages"] == [{"page": 0, "paragraphs": 2}, {"page": 1, "paragraphs": 1}]
+
+    status, _, body = _request(f"{base}/jobs/{job_id}/pages/0")
+    page = json.loads(body)
+    assert [p["translated"] for p in page["pairs"]] == [
+        "[ko] Deep networks learn features.",
+        "[ko] The loss is defined below.",
+    ]
+    assert page["pairs"][0]["bboxes"] == [{"bbox": [10, 10, 500, 80], "page": 0}]
+
+    status, headers, body = _request(f"{base}/jobs/{job_id}/pages/0/image?scale=0.5")
+    assert status == 200 and headers["Content-Type"] == "image/png"
+    assert body.startswith(b"\x89PNG")
+
+
+def test_catalog_records_and_reuses_download(api):
+    """두 번째 작업은 카탈로그의 PDF를 재사용하고 번역 기록이 남는다."""
+    base, service = api
+    get_tracer().reset()
+    for _ in range(2):
+        job = service.submit("https://arxiv.org/abs/2301.12345v2")
+        assert _wait_done(base, job.id)["status"] == "done"
+
+    catalog = pipeline_module.shared_catalog()
+    paper = catalog.find_arxiv("2301.12345", "v2")
+    assert paper["pdf_path"] == str(TEST_PDF)
+    assert catalog.translation(paper["pdf_hash"], "ko", "echo")["paragraphs"] == 3
+    assert get_tracer().counter("catalog.download_hits") == 1
+
+
+def test_repeated_job_replays_journal(api):
+    """같은 PDF/언어/모델 작업은 저널에서 복원하고 백엔드에 다시 보내지 않는다."""
+    base, service = api
+    _wait_done(base, service.submit("https://arxiv.org/abs/2301.12345").id)
+    pipeline_module.TRANSLATION_CACHE.clear()  # 프로세스 재시작 흉내
+    calls_before = len(pipeline_module.shared_backend().calls)
+    get_tracer().reset()
+
+    job = service.submit("https://arxiv.org/abs/2301.12345")
+    assert _wait_done(base, job.id)["status"] == "done"
+    assert get_tracer().counter("translate.journal_restored") == 3
+    assert len(pipeline_module.shared_backend().calls) == calls_before
+    assert [p["translated"] for p in job.pairs][0] == "[ko] Deep networks learn features."
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test.pdf 없음")
+def test_pages_beyond_pdf_fail_job(api):
+    base, service = api
+    job = _wait_done(base, service.submit("https://arxiv.org/abs/2301.12345", pages_spec="1500-1600").id)
+    assert job["status"] == "error" and "PDF" in job["error"]
+
+
+def test_search_finished_papers(api):
+    base, service = api
+    job = service.submit("https://arxiv.org/abs/2301.12345v2")
+    _wait_done(base, job.id)
+
+    status, _, body = _request(f"{base}/search?q=benchmark")
+    hits = json.loads(body)["hits"]
+    assert status == 200
+    assert [(h["side"], h["paragraph"], h["page"], h["arxiv_id"]) for h in hits] == [
+        ("original", 2, 1, "2301.12345"),
+        ("translated", 2, 1, "2301.12345"),
+    ]
+    status, _, body = _request(f"{base}/search?q=benchmark&lang=original")
+    assert [h["side"] for h in json.loads(body)["hits"]] == ["original"]
+    assert _request(f"{base}/search")[0] == 400
+
+    # 일부 페이지만 처리한 작업은 전체 논문 색인을 덮어쓰지 않음
+    assert _wait_done(base, service.submit("https://arxiv.org/abs/2301.12345v2", pages_spec="2").id)["status"] == "done"
+    hits = json.loads(_request(f"{base}/search?q=benchmark")[2])["hits"]
+    assert [(h["side"], h["paragraph"]) for h in hits] == [("original", 2), ("translated", 2)]
+
+
+def test_etag_and_gzip(api):
+    base, service = api
+    job = service.submit("https://arxiv.org/abs/2301.12345")
+    _wait_done(base, job.id)
+    job.pairs = job.pairs * 20  # gzip 임계값을 넘기도록
+
+    status, headers, body = _request(f"{base}/jobs/{job.id}/pages/0", headers={"Accept-Encoding": "gzip"})
+    assert status == 200 and headers["Content-Encoding"] == "gzip"
+    assert json.loads(gzip.decompress(body))["page"] == 0
+
+    status, headers2, body = _request(f"{base}/jobs/{job.id}/pages/0", headers={"If-None-Match": headers["ETag"]})
+    assert status == 304 and body == b""
+    assert headers2["ETag"] == headers["ETag"]
+
+
+def test_errors_and_admission(api):
+    base, service = api
+    assert _request(f"{base}/jobs", {"url": "not a url"})[0] == 400
+    assert _request(f"{base}/jobs", {"url": "https://arxiv.org/abs/2301.12345", "pages": "1-999999999"})[0] == 400
+    assert _request(f"{base}/jobs/missing")[0] == 404
+    assert _request(f"{base}/jobs/missing/viewport", {"pages": [1]})[0] == 404
+
+    service.pipeline.parse.max_queue = 0
+    service.pipeline.parse.running = service.pipeline.parse.workers
+    status, headers, body = _request(f"{base}/jobs", {"url": "https://arxiv.org/abs/2301.12345"})
+    assert status == 503 and headers["Retry-After"] == "30"
+    assert "parse" in json.loads(body)["error"]
+
+
+def test_malformed_job_body_returns_400(api):
+    """본문 필드 타입이 틀리면 연결을 끊지 않고 400 JSON 오류."""
+    base, service = api
+    url = "https://arxiv.org/abs/2301.12345"
+    for payload in (
+        {"url": 123},
+        {"url": url, "pages": 5},
+        {"url": url, "pages": [True]},
+        {"url": url, "sections": {"abstract": 1}},
+        {"url": url, "sections": [1]},
+        {"url": url, "lang": 7},
+        {"url": url, "lang": "../ko"},
+    ):
+        status, _, body = _request(f"{base}/jobs", payload)
+        assert status == 400 and "error" in json.loads(body), payload
+    assert service.jobs == {}
+
+    status, _, body = _request(f"{base}/jobs", {"url": url, "pages": ["1-2", 4], "sections": ["abstract", "method"]})
+    assert status == 202
+    job = service.get(json.loads(body)["id"])
+    assert job.pages == [0, 1, 3] and job.sections == ["abstract", "method"]
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test.pdf 없음")
+def test_invalid_parameters_return_400(api):
+    base, service = api
+    job = service.submit("https://arxiv.org/abs/2301.12345")
+    _wait_done(base, job.id)
+    for path in (
+        "search?q=x&limit=abc",
+        "search?q=x&limit=0",
+        f"jobs/{job.id}/pages/0/image?scale=x",
+        f"jobs/{job.id}/pages/0/image?scale=100",
+        f"jobs/{job.id}/pages/0/image?scale=nan",
+    ):
+        status, _, body = _request(f"{base}/{path}")
+        assert status == 400 and "error" in json.loads(body), path
+    assert _request(f"{base}/jobs/{job.id}/viewport", {"pages": ["a"]})[0] == 400
+    assert _request(f"{base}/jobs", [1, 2])[0] == 400
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test.pdf 없음")
+def test_page_images_and_finished_jobs_are_evicted(api, monkeypatch):
+    base, service = api
+    job = service.submit("https://arxiv.org/abs/2301.12345")
+    _wait_done(base, job.id)
+    monkeypatch.setattr(api_module, "MAX_JOB_IMAGES", 2)
+    for scale in (0.5, 0.6, 0.7):
+        assert _request(f"{base}/jobs/{job.id}/pages/0/image?scale={scale}")[0] == 200
+    assert list(job.images) == [(0, 0.6), (0, 0.7)]
+
+    service.max_jobs = 1
+    second = service.submit("https://arxiv.org/abs/2301.12345")
+    _wait_done(base, second.id)
+    assert _request(f"{base}/jobs/{job.id}")[0] == 404  # 작업 수 초과: 먼저 끝난 작업부터
+    service.job_ttl = 0
+    assert _request(f"{base}/jobs/{second.id}")[0] == 404  # 만료
@@ -0,0 +1,161 @@
+"""BulkTranslator (배치 작업 API) 테스트: 로컬 파일 기반 클라이언트로 왕복 및 재시작."""
+
+import json
+from unittest.mock import Mock
+
+import pytest
+
+from src.models.paper import Paragraph, ParsedPaper, Table
+from src.translator import EchoBackend
+from src.translator.bulk import BatchClient, BulkTranslator, LocalBatchClient, OpenAIBatchClient
+
+
+def _paper(name: str, n: int = 3) -> ParsedPaper:
+    return ParsedPaper(
+        body=[Paragraph(text=f"{name} paragraph number {i} is here.", page=0) for i in range(n)]
+        + [Paragraph(text="$x + y$"), Paragraph(text=f"{name} paragraph number 0 is here.")],
+        tables=[Table(html="<table><tr><td>Our model</td></tr></table>", caption=f"{name} results table")],
+        figures=[], equations=[], metadata={},
+    )
+
+
+def _bulk(tmp_path, backend=None, **kwargs):
+    client = LocalBatchClient(tmp_path / "jobs", backend=backend, polls_to_complete=2)
+    return BulkTranslator(client, tmp_path / "work", batch_size=2, poll_interval=0, **kwargs), client
+
+
+def test_round_trip_across_papers(tmp_path):
+    bulk, _ = _bulk(tmp_path)
+    papers = {"a": _paper("Alpha"), "b": _paper("Beta")}
+    result = bulk.run(papers)
+
+    assert result["a"].body[0].text == "[ko] Alpha paragraph number 0 is here."
+    assert result["a"].body[3].text == "$x + y$"
+    assert result["a"].body[4].text == result["a"].body[0].text
+    assert result["b"].tables[0].caption == "[ko] Beta results table"
+    assert "<td>[ko] Our model</td>" in result["b"].tables[0].html
+
+    lines = [json.loads(line) for line in (tmp_path / "work" / "requests-r1.jsonl").read_text().splitlines()]
+    # 논문별 배치 (중복 문단은 한 번만), 배치당 최대 2개
+    assert len(lines) == 6
+    assert {line["url"] for line in lines} == {"/v1/chat/completions"}
+    assert all(line["body"]["messages"][-1]["role"] == "user" for line in lines)
+    assert json.loads((tmp_path / "work" / "state.json").read_text())["status"] == "done"
+
+
+def test_mismatched_results_are_retried_one_by_one(tmp_path):
+    class MergingBackend(EchoBackend):
+        def translate_batch(self, texts, target_lang):
+            out = super().translate_batch(texts, target_lang)
+            return out if len(out) == 1 else [" ".join(out)]
+
+    bulk, client = _bulk(tmp_path, backend=MergingBackend())
+    papers = {"a": _paper("Alpha")}
+    result = bulk.run(papers)
+
+    assert [p.text for p in result["a"].body[:3]] == [f"[ko] Alpha paragraph number {i} is here." for i in range(3)]
+    state = bulk.load_state()
+    assert state["round"] == 2
+    assert all(batch["single"] for batch in state["batches"].values())
+    assert len(list((tmp_path / "jobs").iterdir())) == 2
+
+
+def test_restart_resumes_outstanding_job(tmp_path):
+    """제출 후 중단된 실행을 다시 시작하면 새 작업을 만들지 않고 기존 작업을 이어감."""
+    papers = {"a": _paper("Alpha")}
+    crashed, _ = _bulk(tmp_path)
+    crashed.submit(crashed.prepare(papers))
+
+    restarted, client = _bulk(tmp_path)
+    client.submit = Mock(side_effect=AssertionError("must not resubmit"))
+    result = restarted.run(papers)
+
+    assert result["a"].body[1].text == "[ko] Alpha paragraph number 1 is here."
+    assert len(list((tmp_path / "jobs").iterdir())) == 1
+
+
+def test_crash_during_submit_adopts_tagged_job(tmp_path):
+    """제출 직후 상태 저장 전에 중단돼도 요청 해시로 기존 작업을 찾아 다시 제출하지 않음."""
+    papers = {"a": _paper("Alpha")}
+    crashed, _ = _bulk(tmp_path)
+    state = crashed.prepare(papers)
+    # 제출은 성공했지만 submitted 상태를 저장하기 전에 죽은 상황
+    original_save = crashed._save
+    crashed._save = Mock(side_effect=lambda s: original_save(s) if s["status"] == "submitting" else None)
+    crashed.submit(state)
+    assert crashed.load_state()["status"] == "submitting"
+
+    restarted, client = _bulk(tmp_path)
+    client.submit = Mock(side_effect=AssertionError("must not resubmit"))
+    result = restarted.run(papers)
+
+    assert result["a"].body[1].text == "[ko] Alpha paragraph number 1 is here."
+    assert len(list((tmp_path / "jobs").iterdir())) == 1
+
+
+def test_crash_before_submit_submits_again(tmp_path):
+    """marker만 남고 작업이 없으면 같은 요청 파일을 한 번 제출."""
+    papers = {"a": _paper("Alpha")}
+    crashed, _ = _bulk(tmp_path)
+    state = crashed.prepare(papers)
+    state["request_hash"] = "0" * 64
+    state["status"] = "submitting"
+    crashed._save(state)
+
+    restarted, _ = _bulk(tmp_path)
+    result = restarted.run(papers)
+    assert result["a"].body[1].text == "[ko] Alpha paragraph number 1 is here."
+    assert len(list((tmp_path / "jobs").iterdir())) == 1
+
+
+def test_state_for_other_papers_is_rejected(tmp_path):
+    bulk, _ = _bulk(tmp_path)
+    bulk.prepare({"a": _paper("Alpha")})
+    with pytest.raises(ValueError):
+        bulk.run({"b": _paper("Beta")})
+
+
+def test_cached_texts_are_not_submitted(tmp_path):
+    cache = {}
+    first, _ = _bulk(tmp_path / "one", cache=cache)
+    first.run({"a": _paper("Alpha")})
+
+    second, _ = _bulk(tmp_path / "two", cache=cache)
+    result = second.run({"a": _paper("Alpha")})
+    assert second.load_state()["batches"] == {}
+    assert result["a"].body[2].text == "[ko] Alpha paragraph number 2 is here."
+
+
+def test_openai_batch_client_calls():
+    client = Mock()
+    client.files.create.return_value.id = "file-in"
+    client.batches.create.return_value.id = "batch_1"
+    client.batches.retrieve.return_value = Mock(status="completed", output_file_id="file-out", error_file_id="file-err")
+    client.files.content.side_effect = lambda file_id: Mock(text=json.dumps({"custom_id": file_id}) + "\n")
+
+    batch_client = OpenAIBatchClient(client)
+    path = __file__
+    assert batch_client.submit(path) == "batch_1"
+    assert client.files.create.call_args.kwargs["purpose"] == "batch"
+    assert client.batches.create.call_args.kwargs == {
+        "input_file_id": "file-in", "endpoint": "/v1/chat/completions", "completion_window": "24h",
+    }
+    assert batch_client.status("batch_1") == "completed"
+
+    batch_client.submit(path, "abc")
+    assert client.batches.create.call_args.kwargs["metadata"] == {"request_hash": "abc"}
+    client.batches.list.return_value.data = [Mock(id="batch_0", metadata=None), Mock(id="batch_2", metadata={"request_hash": "abc"})]
+    assert batch_client.find("abc") == "batch_2"
+    assert batch_client.find("other") is None
+    assert [line["custom_id"] for line in batch_client.results("batch_1")] == ["file-out", "file-err"]
+
+
+def test_incomplete_batch_client_fails_at_construction():
+    """status/results 가 없는 클라이언트는 실행 도중이 아니라 생성 시점에 실패 (find는 선택)."""
+
+    class SubmitOnly(BatchClient):
+        def submit(self, request_path, request_hash=None):
+            return "job"
+
+    with pytest.raises(TypeError, match="results"):
+        SubmitOnly()
@@ -0,0 +1,128 @@
+"""SQLite 논문 카탈로그 테스트."""
+
+import os
+import shutil
+import threading
+import time
+
+from src.catalog import Catalog, split_arxiv_id
+
+
+def _pdf(tmp_path, name="2301.12345v2.pdf", content=b"%PDF-1.4 test"):
+    path = tmp_path / name
+    path.write_bytes(content)
+    return path
+
+
+def test_split_arxiv_id():
+    assert split_arxiv_id("https://arxiv.org/abs/2301.12345v2") == ("2301.12345", "v2")
+    assert split_arxiv_id("/tmp/x/2301.12345.pdf") == ("2301.12345", None)
+    assert split_arxiv_id("paper.pdf") == (None, None)
+
+
+def test_register_and_lookup(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.sqlite3")
+    pdf = _pdf(tmp_path)
+    pdf_hash = catalog.register_pdf(pdf, "https://arxiv.org/pdf/2301.12345v2")
+
+    row = catalog.find_arxiv("2301.12345")
+    assert row["pdf_hash"] == pdf_hash and row["version"] == "v2"
+    assert catalog.find_arxiv("2301.12345", "v1") is None
+    assert catalog.cached_pdf("https://arxiv.org/abs/2301.12345v2") == str(pdf)
+
+    # 같은 내용은 경로가 달라도 같은 논문 (경로만 갱신)
+    copy = _pdf(tmp_path, "copy.pdf")
+    assert catalog.register_pdf(copy) == pdf_hash
+    assert len(catalog.papers()) == 1
+    assert catalog.paper(pdf_hash)["arxiv_id"] == "2301.12345"
+
+
+def test_cached_pdf_requires_version_and_intact_file(tmp_path):
+    """버전 없는 URL, 지워지거나 바뀐 파일은 캐시로 쓰지 않음 (다시 다운로드)."""
+    catalog = Catalog(tmp_path / "catalog.sqlite3")
+    pdf = _pdf(tmp_path)
+    catalog.register_pdf(pdf, "https://arxiv.org/abs/2301.12345v1")
+    assert catalog.cached_pdf("https://arxiv.org/abs/2301.12345v1") == str(pdf)
+    assert catalog.cached_pdf("https://arxiv.org/abs/2301.12345") is None
+    assert catalog.cached_pdf("https://arxiv.org/abs/2301.12345v2") is None
+
+    pdf.write_bytes(b"%PDF-1.4 other content")
+    assert catalog.cached_pdf("https://arxiv.org/abs/2301.12345v1") is None
+    pdf.unlink()
+    assert catalog.cached_pdf("https://arxiv.org/abs/2301.12345v1") is None
+
+
+def test_parse_and_translation_records(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.sqlite3")
+    pdf_hash = catalog.register_pdf(_pdf(tmp_path))
+    artifact = tmp_path / "output" / "2301.12345v2"
+    (artifact / "auto").mkdir(parents=True)
+    (artifact / "auto" / "content_list.json").write_text("[]")
+
+    catalog.record_parse(pdf_hash, "auto", [2, 0], artifact_path=artifact, paragraphs=12, seconds=1.5)
+    row = catalog.parse(pdf_hash, "auto", [0, 2])
+    assert row["paragraphs"] == 12 and row["artifact_bytes"] == 2
+    assert catalog.parse(pdf_hash, "auto") is None
+
+    catalog.record_translation(pdf_hash, "ko", "gpt-4o-mini", paragraphs=12, seconds=3.0)
+    catalog.record_translation(pdf_hash, "ja", "gpt-4o-mini", paragraphs=12, seconds=2.0)
+    assert catalog.translation(pdf_hash, "ko", "gpt-4o-mini")["seconds"] == 3.0
+    assert catalog.languages(pdf_hash) == ["ja", "ko"]
+
+
+def test_concurrent_writers(tmp_path):
+    """스레드(=연결)별 동시 기록이 잠금 오류 없이 모두 반영."""
+    path = tmp_path / "catalog.sqlite3"
+    pdf_hash = Catalog(path).register_pdf(_pdf(tmp_path))
+    errors = []
+
+    def write(worker):
+        catalog = Catalog(path)
+        try:
+            for i in range(20):
+                catalog.record_translation(pdf_hash, f"l{worker}-{i}", "m", paragraphs=i)
+        except Exception as exc:  # pragma: no cover - 실패 시 원인 보고
+            errors.append(exc)
+
+    threads = [threading.Thread(target=write, args=(w,)) for w in range(4)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert not errors
+    assert len(Catalog(path).languages(pdf_hash)) == 80
+
+
+def test_gc_removes_orphaned_artifacts(tmp_path):
+    catalog = Catalog(tmp_path / "catalog.sqlite3")
+    root = tmp_path / "output"
+    pdf_hash = catalog.register_pdf(_pdf(tmp_path, "kept.pdf"))
+    kept = root / "kept"
+    (kept / "auto").mkdir(parents=True)
+    catalog.record_parse(pdf_hash, "mineru", artifact_path=kept)
+    content_list = kept / "auto" / "kept_content_list.json"
+    content_list.write_text("[]")
+    catalog.record_parse_output(pdf_hash, content_list)
+
+    orphan = root / "orphan"
+    (orphan / "pages_1-4").mkdir(parents=True)
+    fresh = root / "fresh"
+    fresh.mkdir()
+    (fresh / "glossary.json").write_text("{}")
+    unrelated = root / "notes"
+    unrelated.mkdir()
+    old = time.time() - 48 * 3600
+    for path in (orphan, unrelated, kept):
+        os.utime(path, (old, old))
+
+    assert catalog.gc(root, dry_run=True) == [orphan]
+    assert orphan.exists()
+    assert catalog.gc(root) == [orphan]
+    assert not orphan.exists() and kept.exists() and fresh.exists() and unrelated.exists()
+
+    # 산출물이 사라진 파싱 기록은 경로를 비움
+    shutil.rmtree(kept)
+    catalog.gc(root)
+    assert catalog.parse(pdf_hash, "mineru")["artifact_path"] is None
+    assert catalog.parse_outputs(pdf_hash) == {}
+    assert catalog._conn().execute("SELECT COUNT(*) FROM parse_outputs").fetchone()[0] == 0
@@ -0,0 +1,122 @@
+"""TermStore / 용어 추출 및 학습 테스트."""
+
+import asyncio
+
+from src.models.paper import Paragraph, ParsedPaper
+from src.translator import EchoBackend, PaperTranslator, TermStore
+from src.translator.glossary import extract_terms, learned_terms
+from src.translator.openai_translator import OpenAIBackend
+
+
+class GlossaryEcho(EchoBackend):
+    """glossary를 받는 echo 백엔드: 호출마다 받은 glossary를 기록."""
+
+    supports_glossary = True
+
+    def __init__(self):
+        super().__init__()
+        self.glossaries = []
+
+    def translate_batch(self, texts, target_lang, glossary=None):
+        self.glossaries.append(glossary)
+        return super().translate_batch(texts, target_lang)
+
+    async def translate_batch_async(self, texts, target_lang, glossary=None):
+        return self.translate_batch(texts, target_lang, glossary)
+
+
+def test_extract_terms_repeated_title_case_and_acronyms():
+    texts = [
+        "We train a Graph Neural Network with long short-term memory (LSTM) cells.",
+        "In Table 2 the Graph Neural Network beats the baseline.",
+        "The Transformer Encoder is used once.",
+    ]
+    assert extract_terms(texts) == {
+        "long short-term memory": "long short-term memory",
+        "graph neural network": "Graph Neural Network",
+    }
+
+
+def test_learned_terms_strips_particles_and_acronyms():
+    text = "제안하는 그래프 신경망(Graph Neural Network)은 강화 학습(reinforcement learning)과 LSTM(LSTM)을 쓴다."
+    assert learned_terms(text) == [
+        ("Graph Neural Network", "그래프 신경망"),
+        ("reinforcement learning", "강화 학습"),
+    ]
+
+
+def test_store_layers_persist_and_promote(tmp_path):
+    shop = TermStore(tmp_path / "glossary.json")
+    shop.learn("Graph Neural Network", "그래프 신경망")
+    paper = TermStore(tmp_path / "paper" / "glossary.json", parent=shop)
+
+    assert paper.get("graph neural network") == "그래프 신경망"
+    assert not paper.learn("Graph  Neural Network", "그래프 뉴럴 네트워크")  # 처음 정한 번역 유지
+    assert paper.learn("Attention Head", "어텐션 헤드")
+    assert paper.find("two attention\nheads and an Attention Head") == {"attention head": "Attention Head"}
+
+    paper.commit()
+    reloaded = TermStore(tmp_path / "glossary.json")
+    assert reloaded.get("attention head") == "어텐션 헤드"
+    assert TermStore(tmp_path / "paper" / "glossary.json").terms == {"attention head": "어텐션 헤드"}
+
+
+def test_empty_store_does_not_create_file(tmp_path):
+    TermStore(tmp_path / "glossary.json").commit()
+    assert not (tmp_path / "glossary.json").exists()
+
+
+def test_batches_get_glossary_and_introduce_terms_once():
+    """첫 등장 배치만 '번역(English)' 형태, 이후 배치는 번역어만."""
+    backend = GlossaryEcho()
+    backend.max_concurrency = 1
+    store = TermStore()
+    paper = ParsedPaper(
+        body=[Paragraph(text=f"The Graph Neural Network model number {i} works.", page=i) for i in range(3)],
+        tables=[], figures=[], equations=[], metadata={},
+    )
+    asyncio.run(PaperTranslator(backend=backend, glossary=store).translate_async(paper, "ko", batch_size=1))
+
+    # 1차: 후보 용어 한 번에 번역 -> 저장소에 기록
+    assert backend.calls[0] == ["Graph Neural Network"]
+    assert store.get("graph neural network") == "[ko] Graph Neural Network"
+    assert backend.glossaries[1] == {"Graph Neural Network": "[ko] Graph Neural Network(Graph Neural Network)"}
+    assert backend.glossaries[2] == backend.glossaries[3] == {"Graph Neural Network": "[ko] Graph Neural Network"}
+
+
+def test_terms_learned_from_results_reach_later_batches():
+    class ExplainingBackend(GlossaryEcho):
+        def translate_batch(self, texts, target_lang, glossary=None):
+            self.glossaries.append(glossary)
+            self.calls.append(list(texts))
+            return ["어텐션 헤드(attention head)를 쓴다." for _ in texts]
+
+    backend = ExplainingBackend()
+    backend.max_concurrency = 1
+    store = TermStore()
+    paper = ParsedPaper(
+        body=[Paragraph(text=f"Every attention head number {i} is pruned.", page=i) for i in range(2)],
+        tables=[], figures=[], equations=[], metadata={},
+    )
+    asyncio.run(PaperTranslator(backend=backend, glossary=store).translate_async(paper, "ko", batch_size=1))
+
+    assert store.get("attention head") == "어텐션 헤드"
+    assert backend.glossaries == [None, {"attention head": "어텐션 헤드"}]
+
+
+def test_glossary_ignored_by_unaware_backends():
+    backend = EchoBackend()
+    store = TermStore()
+    store.learn("Graph Neural Network", "그래프 신경망")
+    paper = ParsedPaper(body=[Paragraph(text="A Graph Neural Network here.")], tables=[], figures=[], equations=[], metadata={})
+    result = PaperTranslator(backend=backend, glossary=store).translate(paper, "ko")
+    assert result.body[0].text == "[ko] A Graph Neural Network here."
+    assert backend.calls == [["A Graph Neural Network here."]]
+
+
+def test_openai_prompt_lists_glossary():
+    backend = OpenAIBackend(api_key="test")
+    messages = backend._batch_messages(["text"], "ko", {"Graph Neural Network": "그래프 신경망"})
+    assert messages[1]["role"] == "system"
+    assert messages[1]["content"].endswith("- Graph Neural Network: 그래프 신경망\n")
+    assert len(backend._batch_messages(["text"], "ko")) == 2
@@ -0,0 +1,84 @@
+"""느린 배치 요청 중복 전송(hedging) 테스트."""
+
+import asyncio
+
+import pytest
+
+from src.translator.hedging import HedgeBudget, LatencyTracker, hedged
+from src.utils.tracing import get_tracer
+
+
+def _warm(tracker, tokens=100, seconds=0.01, n=8):
+    for _ in range(n):
+        tracker.observe(tokens, seconds)
+    return tracker
+
+
+class Calls:
+    """n번째 호출의 지연/실패를 지정하는 가짜 요청."""
+
+    def __init__(self, *delays, fail=()):
+        self.delays = delays
+        self.fail = fail
+        self.started = 0
+        self.cancelled = []
+
+    async def __call__(self):
+        n = self.started
+        self.started += 1
+        try:
+            await asyncio.sleep(self.delays[n])
+        except asyncio.CancelledError:
+            self.cancelled.append(n)
+            raise
+        if n in self.fail:
+            raise RuntimeError(f"call {n} failed")
+        return f"result {n}"
+
+
+def test_tracker_buckets_and_p95():
+    tracker = LatencyTracker(min_samples=4)
+    assert [tracker.bucket(t) for t in (1, 256, 257, 600, 5000)] == [0, 0, 1, 2, 5]
+    for seconds in (0.1, 0.2, 0.3):
+        tracker.observe(100, seconds)
+    assert tracker.p95(100) is None
+    tracker.observe(200, 1.0)
+    assert tracker.p95(100) == 1.0
+    assert tracker.p95(1000) is None  # 다른 크기 구간
+
+
+def test_slow_request_is_hedged_and_loser_cancelled():
+    tracker, calls = _warm(LatencyTracker()), Calls(1.0, 0.01)
+    get_tracer().reset()
+    result = asyncio.run(hedged(calls, 100, tracker, HedgeBudget(), expected_output_tokens=150))
+
+    assert result == "result 1"
+    assert calls.cancelled == [0]
+    tracer = get_tracer()
+    assert tracer.counter("translate.hedges") == 1 and tracer.counter("translate.hedge_wins") == 1
+    assert tracer.counter("translate.hedge_wasted_tokens") == 250
+
+
+def test_no_hedge_without_budget_or_history():
+    get_tracer().reset()
+    assert asyncio.run(hedged(Calls(0.05), 100, LatencyTracker())) == "result 0"
+    assert asyncio.run(hedged(Calls(0.05), 100, LatencyTracker(), HedgeBudget())) == "result 0"
+    assert get_tracer().counter("translate.hedges") == 0
+
+
+def test_budget_limits_hedges():
+    budget = HedgeBudget(ratio=0.0)
+    assert budget.take() and not budget.take()
+    budget = HedgeBudget(ratio=0.5)
+    for _ in range(4):
+        budget.request()
+    assert [budget.take() for _ in range(4)] == [True, True, True, False]
+
+
+def test_failed_copy_falls_back_to_other_and_both_failing_raises():
+    tracker = _warm(LatencyTracker())
+    calls = Calls(0.3, 0.01, fail={1})
+    assert asyncio.run(hedged(calls, 100, tracker, HedgeBudget())) == "result 0"
+
+    with pytest.raises(RuntimeError, match="call 0"):
+        asyncio.run(hedged(Calls(0.1, 0.01, fail={0, 1}), 100, tracker, HedgeBudget()))
@@ -0,0 +1,84 @@
+"""작업별 번역 저널(중단 후 이어서 번역) 테스트."""
+
+import asyncio
+import json
+
+import pytest
+
+from src.models.paper import Paragraph, ParsedPaper
+from src.translator import EchoBackend, PaperTranslator, TranslationJournal
+from src.translator.journal import journal_key
+from src.utils.tracing import get_tracer
+
+
+def _paper(n):
+    body = [Paragraph(text=f"Paragraph {i} describes the training setup in detail.", page=i // 4) for i in range(n)]
+    return ParsedPaper(body=body, tables=[], figures=[], equations=[], metadata={})
+
+
+class Crash(BaseException):
+    """프로세스 종료를 흉내 (번역기의 재시도/분할에 잡히지 않음)."""
+
+
+class CrashingBackend(EchoBackend):
+    max_concurrency = 1
+
+    def __init__(self, crash_on_call):
+        super().__init__()
+        self.crash_on_call = crash_on_call
+
+    def translate_batch(self, texts, target_lang):
+        if len(self.calls) + 1 == self.crash_on_call:
+            raise Crash()
+        return super().translate_batch(texts, target_lang)
+
+
+def test_record_replay_and_torn_tail(tmp_path):
+    journal = TranslationJournal(tmp_path / "job.jsonl")
+    journal.record([(["body:0"], "Hello there.", "안녕하세요.")])
+    journal.close()
+    # 기록 도중 죽어 잘린 마지막 줄
+    with open(journal.path, "ab") as f:
+        f.write(b'{"t": 1, "units": [{"ids": ["body:1"], "src": "ab')
+
+    assert TranslationJournal(journal.path).restore(["Hello there.", "Other."]) == {"Hello there.": "안녕하세요."}
+    journal.record([(["body:1"], "Other.", "다른 것.")])
+    journal.close()
+    lines = journal.path.read_text(encoding="utf-8").splitlines()
+    assert [json.loads(line)["units"][0]["ids"] for line in lines] == [["body:0"], ["body:1"]]
+
+
+def test_journal_key_depends_on_job():
+    assert journal_key("h", "ko", "m") == journal_key("h", "ko", "m")
+    assert len({journal_key("h", "ko", "m"), journal_key("h", "ja", "m"), journal_key("h", "ko", "m2")}) == 3
+
+
+def test_async_resume_sends_only_unfinished_units(tmp_path):
+    paper = _paper(12)
+    journal = TranslationJournal.for_job("pdfhash", "ko", "echo", root=tmp_path)
+    translator = PaperTranslator(backend=CrashingBackend(crash_on_call=3))
+    with pytest.raises(Crash):
+        asyncio.run(translator.translate_async(paper, "ko", batch_size=4, journal=journal))
+    journal.close()
+
+    backend = EchoBackend()
+    get_tracer().reset()
+    journal = TranslationJournal.for_job("pdfhash", "ko", "echo", root=tmp_path)
+    result = asyncio.run(PaperTranslator(backend=backend).translate_async(paper, "ko", batch_size=4, journal=journal))
+
+    assert [p.text for p in result.body] == [f"[ko] {p.text}" for p in paper.body]
+    assert backend.calls == [[p.text for p in paper.body[8:]]]
+    assert get_tracer().counter("translate.journal_restored") == 8
+
+
+def test_sync_resume_and_changed_selection(tmp_path):
+    """저널은 원문 digest로 맞추므로 문단 번호가 바뀌어도(다른 섹션 선택) 재사용된다."""
+    paper = _paper(6)
+    journal = TranslationJournal(tmp_path / "job.jsonl")
+    section = ParsedPaper(body=paper.body[2:5], tables=[], figures=[], equations=[], metadata={})
+    PaperTranslator(backend=EchoBackend()).translate(section, "ko", journal=journal)
+
+    backend = EchoBackend()
+    result = PaperTranslator(backend=backend).translate(paper, "ko", journal=journal)
+    assert [p.text for p in result.body] == [f"[ko] {p.text}" for p in paper.body]
+    assert backend.calls == [[paper.body[i].text for i in (0, 1, 5)]]  # 남은 문단만 한 배치로
@@ -0,0 +1,92 @@
+"""LayoutAnalyzer tests on a small labeled fixture set."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.parser.layout_analyzer import LayoutAnalyzer
+from src.parser.paragraph_builder import ParagraphBuilder
+
+FIXTURE_DIR = Path(__file__).parent / "fixtures" / "layout"
+FIXTURES = sorted(FIXTURE_DIR.glob("*.json"))
+
+
+def _load(path: Path) -> dict:
+    return json.loads(path.read_text(encoding="utf-8"))
+
+
+def _bad_merges(result: list[str], expected: list[str]) -> int:
+    """기대 문단과 다르게 나온 문단 수."""
+    return len(set(expected) - set(result)) + len(set(result) - set(expected))
+
+
+class TestLayoutAnalyzer:
+    def setup_method(self):
+        self.analyzer = LayoutAnalyzer()
+
+    def test_three_columns_detected(self):
+        """3단 레이아웃 -> 컬럼 0, 1, 2 순서로 정렬."""
+        blocks = _load(FIXTURE_DIR / "three_column.json")["blocks"]
+        annotated = self.analyzer.annotate(blocks)
+        columns = [b["layout"]["column"] for b in annotated]
+        assert columns == sorted(columns)
+        assert set(columns) == {0, 1, 2}
+
+    def test_wide_figure_splits_bands(self):
+        """와이드 그림은 컬럼에 속하지 않고 위/아래 band를 나눔."""
+        blocks = _load(FIXTURE_DIR / "wide_figure.json")["blocks"]
+        annotated = self.analyzer.annotate(blocks)
+        figure = next(b for b in annotated if b["type"] == "image")
+        assert figure["layout"]["column"] == -1
+        above = [b for b in annotated if b["page_idx"] == 0 and b["layout"]["band"] < figure["layout"]["band"]]
+        assert {b["layout"]["column"] for b in above} == {0, 1}
+
+    def test_head_and_tail_flags(self):
+        """컬럼별 첫/마지막 흐름 블록 표시."""
+        blocks = _load(FIXTURE_DIR / "two_column.json")["blocks"]
+        annotated = [b for b in self.analyzer.annotate(blocks) if b["page_idx"] == 0]
+        flags = [(b["layout"]["col_head"], b["layout"]["col_tail"]) for b in annotated]
+        assert flags == [(True, False), (False, True), (True, False), (False, True)]
+
+    def test_blocks_without_bbox_keep_order(self):
+        """bbox가 없는 페이지는 원래 순서 유지, layout 정보 없음."""
+        blocks = [{"type": "text", "text": "b", "page_idx": 0}, {"type": "text", "text": "a", "page_idx": 0}]
+        annotated = self.analyzer.annotate(blocks)
+        assert [b["text"] for b in annotated] == ["b", "a"]
+        assert all("layout" not in b for b in annotated)
+
+    def test_centered_blocks_are_not_columns(self):
+        """x 범위가 겹치는 좁은 블록(가운데 정렬 수식 등)은 다단으로 보지 않음."""
+        blocks = [
+            {"type": "text", "text": "wide", "page_idx": 0, "bbox": [60, 100, 940, 200]},
+            {"type": "equation", "text": "eq", "page_idx": 0, "bbox": [350, 220, 650, 260]},
+            {"type": "text", "text": "short", "page_idx": 0, "bbox": [60, 280, 450, 300]},
+        ]
+        annotated = self.analyzer.annotate(blocks)
+        assert [b["text"] for b in annotated] == ["wide", "eq", "short"]
+
+
+@pytest.mark.parametrize("path", FIXTURES, ids=[p.stem for p in FIXTURES])
+def test_labeled_fixture_merges(path: Path):
+    """레이아웃 분석 후 병합 결과가 라벨과 일치."""
+    fixture = _load(path)
+    builder = ParagraphBuilder()
+    annotated = LayoutAnalyzer().annotate(fixture["blocks"])
+    result = [p.text for p in builder.merge_broken_paragraphs(annotated)]
+    assert result == fixture["expected"]
+
+
+def test_fewer_bad_merges_than_pairwise_thresholds():
+    """픽스처 전체에서 레이아웃 기반 병합의 오류가 기존 pairwise 판단보다 적음."""
+    builder = ParagraphBuilder()
+    legacy_errors = 0
+    layout_errors = 0
+    for path in FIXTURES:
+        fixture = _load(path)
+        legacy = [p.text for p in builder.merge_broken_paragraphs(fixture["blocks"])]
+        layout = [p.text for p in builder.merge_broken_paragraphs(LayoutAnalyzer().annotate(fixture["blocks"]))]
+        legacy_errors += _bad_merges(legacy, fixture["expected"])
+        layout_errors += _bad_merges(layout, fixture["expected"])
+    assert layout_errors == 0
+    assert layout_errors < legacy_errors
@@ -0,0 +1,88 @@
+"""수식/인용/URL/코드 placeholder 마스킹 테스트."""
+
+import asyncio
+
+import pytest
+
+from src.models.paper import Paragraph, ParsedPaper
+from src.translator import EchoBackend, PaperTranslator
+from src.translator.backends import TranslationBackend
+from src.translator.masking import PlaceholderError, mask_text, unmask_text
+from src.utils.tracing import get_tracer
+
+TEXT = (
+    r"We minimize $\mathcal{L} = -\log p(y \mid x)$ as in \citep{vaswani2017} and [3, 5-7]; "
+    "code is at https://github.com/org/repo. Call `train(cfg)` with $x$."
+)
+
+
+def _paper(*texts):
+    return ParsedPaper(
+        body=[Paragraph(text=t, page=0) for t in texts], tables=[], figures=[], equations=[], metadata={}
+    )
+
+
+def test_mask_round_trip():
+    masked = mask_text(TEXT)
+    assert masked.text == "We minimize ⟦0⟧ as in ⟦1⟧ and ⟦2⟧; code is at ⟦3⟧. Call ⟦4⟧ with $x$."
+    assert masked.spans[3] == "https://github.com/org/repo"
+    assert unmask_text(masked.text, masked.spans) == TEXT
+
+
+def test_unmask_tolerates_reordering_and_spacing():
+    masked = mask_text(r"Both $a + b$ and $c + d$ hold.")
+    assert unmask_text("⟦ 1 ⟧ 와 ⟦0⟧ 모두 성립한다.", masked.spans) == "$c + d$ 와 $a + b$ 모두 성립한다."
+
+
+def test_unmask_missing_or_unknown_placeholder_fails():
+    masked = mask_text(r"Both $a + b$ and $c + d$ hold.")
+    with pytest.raises(PlaceholderError):
+        unmask_text("⟦0⟧ 만 성립한다.", masked.spans)
+    with pytest.raises(PlaceholderError):
+        unmask_text("⟦0⟧, ⟦1⟧, ⟦2⟧", masked.spans)
+
+
+def test_backend_sees_placeholders_and_savings_are_reported():
+    backend = EchoBackend()
+    get_tracer().reset()
+    result = asyncio.run(PaperTranslator(backend=backend).translate_async(_paper(TEXT), "ko"))
+
+    assert result.body[0].text == f"[ko] {TEXT}"
+    assert "$\\mathcal" not in backend.calls[0][0]
+    span = next(s for s in get_tracer().spans if s.name == "translate")
+    assert span.attributes["mask_saved_tokens"] > 0
+    assert get_tracer().counter("translate.mask_saved_tokens") == span.attributes["mask_saved_tokens"]
+
+
+def test_lost_placeholder_splits_batch_then_sends_unmasked():
+    """placeholder를 잃은 응답은 배치 실패로 처리, 단일 문단은 마스킹 없이 재요청."""
+
+    class DroppingBackend(EchoBackend):
+        def translate_batch(self, texts, target_lang):
+            out = super().translate_batch(texts, target_lang)
+            return [t.replace("⟦0⟧", "") for t in out]
+
+    backend = DroppingBackend()
+    plain = "A paragraph without any math in it."
+    get_tracer().reset()
+    result = asyncio.run(PaperTranslator(backend=backend).translate_async(_paper(TEXT, plain), "ko"))
+
+    assert [p.text for p in result.body] == [f"[ko] {TEXT}", f"[ko] {plain}"]
+    assert get_tracer().counter("translate.placeholder_errors") >= 3
+    assert [TEXT] in backend.calls  # 마스킹 없이 원문 그대로
+
+
+def test_masking_off_for_unsupported_backends_and_flag():
+    class PlainBackend(TranslationBackend):
+        def __init__(self):
+            self.seen = []
+
+        def translate_batch(self, texts, target_lang):
+            self.seen.extend(texts)
+            return list(texts)
+
+    plain, echo = PlainBackend(), EchoBackend()
+    asyncio.run(PaperTranslator(backend=plain).translate_async(_paper(TEXT), "ko"))
+    asyncio.run(PaperTranslator(backend=echo, mask=False).translate_async(_paper(TEXT), "ko"))
+    assert plain.seen == [TEXT]
+    assert echo.calls == [[TEXT]]
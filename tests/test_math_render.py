@@ -0,0 +1,46 @@
+"""서버 측 수식 렌더링 (MathML) 테스트."""
+
+import importlib.util
+import sys
+
+import pytest
+
+from src.utils.math_render import render_latex, render_math
+
+needs_converter = pytest.mark.skipif(
+    importlib.util.find_spec("latex2mathml") is None, reason="latex2mathml 미설치"
+)
+
+
+@needs_converter
+def test_inline_and_display_math_become_mathml():
+    html = render_math(r"손실은 $\frac{1}{n}$ 이며 $$\sum_i x_i$$ 로 정의된다.")
+    assert html.startswith("손실은 <math")
+    assert 'display="inline"' in html and 'display="block"' in html
+    assert "$" not in html
+
+
+@needs_converter
+def test_equation_environment_and_brackets():
+    assert 'display="block"' in render_math(r"\begin{equation}E = mc^2\end{equation}")
+    assert 'display="inline"' in render_math(r"값 \(x^2\) 참고")
+
+
+@needs_converter
+def test_text_outside_math_is_escaped():
+    assert render_math("<b>굵게</b> & $x$") == "&lt;b&gt;굵게&lt;/b&gt; &amp; " + render_latex("x")
+
+
+@needs_converter
+def test_render_is_cached_per_latex_string():
+    render_latex.cache_clear()
+    render_math(r"$a + b$ 그리고 $a + b$")
+    info = render_latex.cache_info()
+    assert (info.misses, info.hits) == (1, 1)
+
+
+def test_missing_converter_falls_back_to_escaped_latex(monkeypatch):
+    render_latex.cache_clear()
+    monkeypatch.setitem(sys.modules, "latex2mathml.converter", None)
+    assert render_math("$a < b$") == '<span class="math-raw">$a &lt; b$</span>'
+    render_latex.cache_clear()
@@ -0,0 +1,104 @@
+"""MiddleJsonLoader tests: 스트리밍 디코딩과 content list 블록 매칭."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.parser import MiddleJsonLoader, PaperParser
+
+PAGE_SIZE = [500, 1000]
+
+
+def _line(x0, y0, x1, y1, *types):
+    spans = [{"bbox": [x0, y0, x1, y1], "type": t, "content": "a" if t == "text" else "x^2"} for t in types or ("text",)]
+    return {"bbox": [x0, y0, x1, y1], "spans": spans}
+
+
+def _middle(pages: list[list[dict]]) -> dict:
+    return {
+        "pdf_info": [
+            {"page_idx": i, "page_size": PAGE_SIZE, "para_blocks": blocks, "discarded_blocks": []}
+            for i, blocks in enumerate(pages)
+        ],
+        "_backend": "pipeline",
+        "_version_name": "2.1.0",
+    }
+
+
+@pytest.fixture
+def middle_path(tmp_path: Path) -> Path:
+    pages = [
+        [
+            {"type": "title", "bbox": [30, 50, 200, 70], "lines": [_line(30, 50, 200, 70)]},
+            {
+                "type": "text",
+                "bbox": [30, 100, 240, 160],
+                "lines": [
+                    _line(40, 100, 240, 110),  # 들여쓰기된 첫 줄
+                    _line(30, 120, 240, 130, "text", "inline_equation"),
+                    _line(30, 140, 238, 150),  # 꽉 찬 마지막 줄
+                ],
+            },
+        ],
+        [
+            {
+                "type": "text",
+                "bbox": [30, 50, 240, 100],
+                "lines": [_line(30, 50, 240, 60), _line(30, 70, 240, 80), _line(30, 90, 120, 100)],
+            },
+        ],
+    ]
+    path = tmp_path / "paper_middle.json"
+    path.write_text(json.dumps(_middle(pages), indent=1), encoding="utf-8")
+    return path
+
+
+class TestMiddleJsonLoader:
+    def test_iter_pages_matches_full_load(self, middle_path):
+        """작은 청크로 읽어도 json.load와 같은 페이지를 순서대로 반환."""
+        expected = json.loads(middle_path.read_text(encoding="utf-8"))["pdf_info"]
+        for chunk_size in (7, 64, 1 << 20):
+            assert list(MiddleJsonLoader(chunk_size=chunk_size).iter_pages(middle_path)) == expected
+
+    def test_iter_pages_is_lazy(self, middle_path):
+        """첫 페이지는 파일 끝까지 읽지 않고 얻을 수 있음."""
+        pages = MiddleJsonLoader(chunk_size=32).iter_pages(middle_path)
+        assert next(pages)["page_idx"] == 0
+        pages.close()
+
+    def test_attach_lines_by_bbox(self, middle_path):
+        blocks = [
+            {"type": "text", "text": "Intro", "text_level": 1, "bbox": [60, 50, 400, 70], "page_idx": 0},
+            {"type": "text", "text": "Body", "bbox": [60, 100, 480, 160], "page_idx": 0},
+            {"type": "image", "img_path": "a.png", "bbox": [60, 100, 480, 160], "page_idx": 0},
+            {"type": "text", "text": "Unmatched", "bbox": [600, 600, 900, 700], "page_idx": 0},
+        ]
+        result = MiddleJsonLoader().attach(blocks, middle_path)
+
+        assert "lines" not in blocks[1]  # 원본은 변경하지 않음
+        assert [line["bbox"] for line in result[1]["lines"]] == [[80, 100, 480, 110], [60, 120, 480, 130], [60, 140, 476, 150]]
+        assert result[1]["lines"][1]["spans"] == ["text", "inline_equation"]
+        assert result[1]["lines"][0]["font_size"] == 10
+        assert "lines" in result[0]
+        assert "lines" not in result[2]
+        assert "lines" not in result[3]
+
+    def test_parse_content_list_with_middle_json(self, tmp_path, middle_path):
+        """줄 정보로 병합: 마지막 줄이 꽉 차고 다음 첫 줄이 들여쓰기 없으면 종결 부호가 있어도 연속."""
+        blocks = [
+            {"type": "text", "text": "Intro", "text_level": 1, "bbox": [60, 50, 400, 70], "page_idx": 0},
+            {"type": "text", "text": "The model is good.", "bbox": [60, 100, 480, 160], "page_idx": 0},
+            {"type": "text", "text": "It is also fast.", "bbox": [60, 50, 480, 100], "page_idx": 1},
+        ]
+        content_list = tmp_path / "paper_content_list.json"
+        content_list.write_text(json.dumps(blocks), encoding="utf-8")
+
+        without = PaperParser().parse_content_list(content_list)
+        with_lines = PaperParser().parse_content_list(content_list, middle_path=middle_path)
+
+        assert len(without.body) == 3
+        assert [p.text for p in with_lines.body] == ["Intro", "The model is good. It is also fast."]
+        regions = with_lines.body[1].bboxes
+        assert [r["page"] for r in regions] == [0, 1]
+        assert len(regions[0]["lines"]) == 3
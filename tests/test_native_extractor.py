@@ -0,0 +1,131 @@
+"""NativeExtractor (PyMuPDF 텍스트 레이어) 및 PaperParser 엔진 전환 테스트."""
+
+from pathlib import Path
+
+import pytest
+
+fitz = pytest.importorskip("fitz")
+
+from src.parser import NativeExtractor, PaperParser  # noqa: E402
+
+_BODY = (
+    "Transformers process tokens in parallel and have become the standard architecture "
+    "for sequence modelling in language and vision. "
+)
+
+
+def _make_pdf(path: Path) -> Path:
+    """1쪽: 제목 + 2단 본문, 2쪽: 괘선이 있는 표 페이지."""
+    doc = fitz.open()
+    page = doc.new_page(width=612, height=792)
+    page.insert_textbox(fitz.Rect(60, 60, 552, 100), "A Study of Native Parsing", fontsize=18, align=1)
+    page.insert_textbox(fitz.Rect(60, 120, 296, 140), "1 Introduction", fontsize=10)
+    page.insert_textbox(fitz.Rect(60, 145, 296, 700), _BODY * 6, fontsize=10)
+    page.insert_textbox(fitz.Rect(316, 120, 552, 700), _BODY * 6, fontsize=10)
+
+    page = doc.new_page(width=612, height=792)
+    page.insert_textbox(fitz.Rect(60, 60, 552, 300), _BODY * 4, fontsize=10)
+    for y in (350, 380, 410, 440):
+        page.draw_line((60, y), (552, y))
+    page.insert_textbox(fitz.Rect(60, 355, 552, 375), "Method   Score", fontsize=10)
+    doc.save(str(path))
+    doc.close()
+    return path
+
+
+@pytest.fixture
+def pdf_path(tmp_path: Path) -> Path:
+    return _make_pdf(tmp_path / "sample.pdf")
+
+
+def test_extract_blocks_and_fallback_pages(pdf_path):
+    """텍스트 페이지는 블록으로, 표 페이지는 fallback 목록으로."""
+    blocks, fallback = NativeExtractor().extract(pdf_path)
+
+    assert fallback == [1]
+    assert {b["page_idx"] for b in blocks} == {0}
+    title = next(b for b in blocks if b.get("text_level") == 1)
+    assert title["text"] == "A Study of Native Parsing"
+    assert any(b.get("text_level") == 1 and b["text"] == "1 Introduction" for b in blocks)
+    for block in blocks:
+        assert all(0 <= v <= 1000 for v in block["bbox"])
+        assert block["lines"] and "font_size" in block["lines"][0]
+
+
+def test_assess_reports_table_reason(pdf_path):
+    with fitz.open(str(pdf_path)) as doc:
+        page = doc[1]
+        quality = NativeExtractor().assess(page, page.get_text("dict"))
+    assert not quality.ok
+    assert quality.reasons == ["table"]
+    assert quality.table_rules >= 3
+
+
+def test_join_lines_dehyphenates():
+    assert NativeExtractor._join_lines(["the trans-", "former model"]) == "the transformer model"
+    assert NativeExtractor._join_lines(["GPT-", "4 results"]) == "GPT- 4 results"
+
+
+def test_native_engine_parses_two_columns(pdf_path):
+    """native 엔진: MinerU 없이 2단 본문을 왼쪽 → 오른쪽 순서로 파싱."""
+    parser = PaperParser(engine="native")
+    parser._run_mineru = lambda *_a, **_k: pytest.fail("native engine must not run MinerU")
+
+    paper = parser.parse(pdf_path)
+
+    texts = [p.text for p in paper.body]
+    assert texts[0] == "A Study of Native Parsing"
+    assert "1 Introduction" in texts
+    assert all(p.page == 0 for p in paper.body)
+    assert texts[-1].startswith("Transformers")
+
+
+def test_auto_engine_sends_only_fallback_pages_to_mineru(pdf_path, monkeypatch):
+    monkeypatch.setattr("src.parser.mineru_parser.shutil.which", lambda _: "/usr/bin/mineru")
+    calls = []
+
+    def fake_mineru(path, page_range=None):
+        calls.append(page_range)
+        return iter([{"type": "table", "table_body": "<table></table>", "page_idx": 1, "bbox": [100, 400, 900, 600]}])
+
+    parser = PaperParser(engine="auto")
+    parser._run_mineru = fake_mineru
+    paper = parser.parse(pdf_path)
+
+    assert calls == [(1, 1)]
+    assert len(paper.tables) == 1
+    assert paper.body
+
+
+def test_auto_engine_without_mineru_uses_text_layer(pdf_path, monkeypatch, capsys, caplog):
+    """MinerU가 없으면 fallback 페이지도 텍스트 레이어로 처리 (stdout 대신 로그로 알림)."""
+    monkeypatch.setattr("src.parser.mineru_parser.shutil.which", lambda _: None)
+    parser = PaperParser(engine="auto")
+    parser._run_mineru = lambda *_a, **_k: pytest.fail("MinerU is not installed")
+
+    with caplog.at_level("WARNING", logger="src.parser.mineru_parser"):
+        paper = parser.parse(pdf_path)
+
+    assert {p.page for p in paper.body} == {0, 1}
+    assert capsys.readouterr().out == ""
+    assert "MinerU CLI" in caplog.text
+
+
+def test_auto_engine_page_selection_skips_unselected_fallback(pdf_path):
+    """선택하지 않은 페이지(표 페이지)는 추출도 MinerU 실행도 하지 않음."""
+    parser = PaperParser(engine="auto")
+    parser._run_mineru = lambda *_a, **_k: pytest.fail("page 2 was not requested")
+
+    paper = parser.parse(pdf_path, pages=[0])
+
+    assert paper.body and all(p.page == 0 for p in paper.body)
+
+
+def test_page_ranges_groups_consecutive_pages():
+    assert PaperParser._page_ranges([5, 1, 2, 3, 7, 6]) == [(1, 3), (5, 7)]
+    assert PaperParser._page_ranges([]) == []
+
+
+def test_unknown_engine_raises():
+    with pytest.raises(ValueError):
+        PaperParser(engine="ocr")
@@ -119,3 +119,104 @@ class TestBuild:
         result = self.builder.build(blocks)
         assert len(result) == 1
         assert result[0].text == r"\mathrm{x}"
+
+
+class TestMergeBrokenParagraphs:
+    """ParagraphBuilder.merge_broken_paragraphs / iter_merged_paragraphs tests."""
+
+    def setup_method(self):
+        self.builder = ParagraphBuilder()
+
+    def test_merges_unterminated_block(self):
+        """문장종결 부호 없이 끝나는 블록 -> 다음 블록과 병합."""
+        blocks = [
+            {"type": "text", "text": "The model is trained on", "page_idx": 0, "bbox": [60, 800, 480, 900]},
+            {"type": "text", "text": "Large corpora.", "page_idx": 1, "bbox": [60, 80, 480, 120]},
+        ]
+        result = self.builder.merge_broken_paragraphs(blocks)
+        assert len(result) == 1
+        assert result[0].text == "The model is trained on Large corpora."
+        assert result[0].bboxes == [
+            {"bbox": [60, 800, 480, 900], "page": 0},
+            {"bbox": [60, 80, 480, 120], "page": 1},
+        ]
+
+    def test_lowercase_start_forces_merge(self):
+        """다음 블록이 소문자로 시작하면 종결 부호가 있어도 병합."""
+        blocks = [
+            {"type": "text", "text": "We use Eq. 1.", "page_idx": 0},
+            {"type": "text", "text": "where x is the input.", "page_idx": 0},
+        ]
+        result = self.builder.merge_broken_paragraphs(blocks)
+        assert [p.text for p in result] == ["We use Eq. 1. where x is the input."]
+
+    def test_title_and_terminated_blocks_not_merged(self):
+        """title 블록과 종결된 문단은 병합하지 않음."""
+        blocks = [
+            {"type": "title", "text": "Introduction", "text_level": 1, "page_idx": 0},
+            {"type": "text", "text": "First paragraph.", "page_idx": 0},
+            {"type": "text", "text": "Second paragraph.", "page_idx": 0},
+        ]
+        result = self.builder.merge_broken_paragraphs(blocks)
+        assert [p.text for p in result] == ["Introduction", "First paragraph.", "Second paragraph."]
+        assert all(p.bboxes is None for p in result)
+
+    def test_empty_block_between_merge_candidates(self):
+        """사이에 낀 빈 블록은 무시하고 직전 블록 기준으로 판단."""
+        blocks = [
+            {"type": "text", "text": "A sentence that continues", "page_idx": 0, "bbox": [60, 100, 480, 200]},
+            {"type": "text", "text": "", "page_idx": 0, "bbox": [520, 900, 940, 950]},
+            {"type": "text", "text": "Onto the next block.", "page_idx": 0, "bbox": [60, 210, 480, 300]},
+        ]
+        result = self.builder.merge_broken_paragraphs(blocks)
+        assert [p.text for p in result] == ["A sentence that continues Onto the next block."]
+
+    def test_streaming_emits_before_input_exhausted(self):
+        """경계가 결정되면 나머지 블록을 읽기 전에 문단을 yield."""
+        consumed = []
+
+        def blocks():
+            for text in ["First paragraph.", "Second paragraph.", "Third paragraph."]:
+                consumed.append(text)
+                yield {"type": "text", "text": text, "page_idx": 0}
+
+        stream = self.builder.iter_merged_paragraphs(blocks())
+        first = next(stream)
+        assert first.text == "First paragraph."
+        assert consumed == ["First paragraph.", "Second paragraph."]
+
+    def test_normalizes_each_block_once(self):
+        """각 블록은 정확히 한 번만 정규화."""
+        calls = []
+
+        class CountingNormalizer:
+            def normalize(self, text):
+                calls.append(text)
+                return text
+
+        builder = ParagraphBuilder(normalizer=CountingNormalizer())
+        blocks = [{"type": "text", "text": f"part {i}", "page_idx": 0} for i in range(50)]
+        result = builder.merge_broken_paragraphs(blocks)
+        assert len(result) == 1
+        assert len(calls) == 50
+
+    def test_line_geometry_overrides_punctuation(self):
+        """줄 정보가 있으면 종결 부호 대신 마지막 줄/들여쓰기로 판단."""
+
+        def lines(*x_ranges):
+            return [{"bbox": [x0, 100 + 20 * i, x1, 110 + 20 * i], "font_size": 10, "spans": ["text"]}
+                    for i, (x0, x1) in enumerate(x_ranges)]
+
+        blocks = [
+            # 짧은 마지막 줄 -> 종결 부호가 없어도 문단 끝
+            {"type": "text", "text": "Ends with a short line", "page_idx": 0, "lines": lines((70, 480), (60, 480), (60, 200))},
+            {"type": "text", "text": "Next paragraph ends full.", "page_idx": 0, "lines": lines((70, 480), (60, 480), (60, 478))},
+            # 들여쓰기 없는 첫 줄 + 직전 마지막 줄이 꽉 참 -> 연속
+            {"type": "text", "text": "Continued here.", "page_idx": 0, "lines": lines((60, 480), (60, 300))},
+        ]
+        result = self.builder.merge_broken_paragraphs(blocks)
+        assert [p.text for p in result] == [
+            "Ends with a short line",
+            "Next paragraph ends full. Continued here.",
+        ]
+        assert result[0].bboxes[0]["lines"][2] == [60, 140, 200, 150]
@@ -0,0 +1,61 @@
+"""Parser corpus smoke tests and the benchmark regression gate."""
+
+import json
+
+import pytest
+
+from benchmarks.parser_bench import bench_file, bench_layout, check, check_layout, check_scaling, dense_page, run_layout
+from benchmarks.parser_corpus import CORPUS, CorpusSpec, corpus_path, generate
+from src.parser import PaperParser
+
+COMMITTED = [name for name, spec in CORPUS.items() if spec.committed]
+
+
+@pytest.mark.parametrize("name", COMMITTED)
+def test_corpus_parses_without_mineru(name):
+    """기록된 content list를 MinerU 없이 파싱."""
+    paper = PaperParser().parse_content_list(corpus_path(name))
+    assert paper.body
+    assert all(t.html.startswith("<table>") and t.caption for t in paper.tables)
+    assert all(eq.startswith("$$") for eq in paper.equations)
+    assert not any(p.text.startswith("[1]") for p in paper.body)
+
+
+def test_committed_corpus_matches_generator():
+    """커밋된 파일은 생성기 출력과 동일해야 함 (재현 가능성)."""
+    for name in COMMITTED:
+        recorded = json.loads(corpus_path(name).read_text(encoding="utf-8"))
+        assert recorded == generate(name, CORPUS[name])
+
+
+def test_parse_cost_scales_linearly(tmp_path):
+    """블록 수가 늘어도 블록당 비용이 크게 늘지 않음."""
+    results = {}
+    for name, pages in (("scale_small", 8), ("scale_large", 64)):
+        path = tmp_path / f"{name}_content_list.json"
+        path.write_text(json.dumps(generate(name, CorpusSpec(pages=pages, columns=2, math_ratio=0.3))))
+        results[name] = bench_file(path, repeat=3)
+    assert results["scale_large"]["blocks"] > 5 * results["scale_small"]["blocks"]
+    assert check_scaling(results, max_scaling=3.0) == []
+
+
+def test_gate_flags_slower_stage():
+    baseline = {"a": {"file": "a", "blocks": 10, "us_per_block": 10.0, "stages_ms": {"paragraphs": 4.0, "layout": 0.2}}}
+    current = {"a": {"file": "a", "blocks": 10, "us_per_block": 10.0, "stages_ms": {"paragraphs": 9.0, "layout": 0.9}}}
+    problems = check(current, baseline, tolerance=1.5)
+    assert len(problems) == 1
+    assert problems[0].startswith("a/paragraphs")
+
+
+def test_pairwise_layout_matches_vectorized():
+    """쌍별 비교 구현과 NumPy 구현의 레이아웃 결과가 같음 (bench_layout이 검증)."""
+    results = run_layout(repeat=1, sizes=(30,))
+    assert set(results) == set(COMMITTED) | {"dense_30"}
+    assert all(r["vectorized_ms"] > 0 and r["pairwise_ms"] > 0 for r in results.values())
+
+
+def test_vectorized_layout_faster_on_dense_pages():
+    """블록이 빽빽한 페이지에서는 벡터화가 쌍별 비교보다 확실히 빠름."""
+    result = bench_layout(dense_page(300), repeat=3)
+    assert result["blocks_per_page"] == 300
+    assert check_layout({"dense_300": result}, min_speedup=2.0) == []
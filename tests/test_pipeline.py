@@ -0,0 +1,128 @@
+"""웹 UI 단계별 작업 풀 (동시 실행/대기열 제한) 테스트."""
+
+import asyncio
+import threading
+import time
+from pathlib import Path
+
+import pytest
+
+from benchmarks.parser_corpus import corpus_path
+from src.parser import PaperParser
+from src.pipeline import LRUCache, Pipeline, PipelineBusy, Stage, pdf_to_images
+from src.utils.tracing import get_tracer
+
+TEST_PDF = Path(__file__).resolve().parents[1] / "test.pdf"
+
+
+def test_stage_queues_then_rejects_when_saturated():
+    """동시 실행 1 + 대기열 1: 세 번째 요청은 거절."""
+    release = threading.Event()
+    stage = Stage("parse", workers=1, max_queue=1, executor=None)
+
+    async def blocked(i):
+        await asyncio.to_thread(release.wait)
+        return i
+
+    async def main():
+        first = asyncio.create_task(stage.submit(blocked, 1))
+        second = asyncio.create_task(stage.submit(blocked, 2))
+        await asyncio.sleep(0.01)
+        assert (stage.running, stage.waiting) == (1, 1)
+        with pytest.raises(PipelineBusy):
+            await stage.submit(blocked, 3)
+        release.set()
+        return await asyncio.gather(first, second)
+
+    get_tracer().reset()
+    assert asyncio.run(main()) == [1, 2]
+    assert get_tracer().counter("pipeline.rejected", stage="parse") == 1
+    assert (stage.running, stage.waiting) == (0, 0)
+
+
+def test_executor_stage_bounds_concurrency_and_records_queue_time():
+    active = peak = 0
+    lock = threading.Lock()
+
+    def work(i):
+        nonlocal active, peak
+        with lock:
+            active += 1
+            peak = max(peak, active)
+        time.sleep(0.02)
+        with lock:
+            active -= 1
+        return i * 2
+
+    pipeline = Pipeline(render_workers=2, max_queue=8, process_pools=False)
+
+    async def main():
+        return await asyncio.gather(*(pipeline.render.submit(work, i) for i in range(6)))
+
+    get_tracer().reset()
+    try:
+        assert asyncio.run(main()) == [0, 2, 4, 6, 8, 10]
+    finally:
+        pipeline.shutdown()
+    assert peak == 2
+    spans = [s for s in get_tracer().spans if s.name == "pipeline.render"]
+    assert len(spans) == 6 and max(s.attributes["queued_ms"] for s in spans) > 0
+
+
+def test_admit_rejects_new_request_when_any_stage_is_full():
+    pipeline = Pipeline(max_queue=0, process_pools=False)
+    try:
+        pipeline.admit()
+        pipeline.translate.running = pipeline.translate.workers
+        with pytest.raises(PipelineBusy, match="translate"):
+            pipeline.admit()
+    finally:
+        pipeline.shutdown()
+
+
+@pytest.mark.skipif(not TEST_PDF.exists(), reason="test.pdf 없음")
+def test_render_runs_in_process_pool():
+    pipeline = Pipeline(render_workers=1)
+
+    async def main():
+        return await pipeline.render.submit(pdf_to_images, str(TEST_PDF), scale=0.2, pages=[0])
+
+    try:
+        images = asyncio.run(main())
+    finally:
+        pipeline.shutdown()
+    assert [img["page"] for img in images] == [0]
+    assert images[0]["base64"]
+
+
+def test_process_pool_spans_reach_parent_tracer():
+    """프로세스 풀 워커의 파싱 span/카운터가 부모 tracer에 합쳐짐 (MinerU 없이 기록된 content list로)."""
+    pipeline = Pipeline(parse_workers=1)
+    tracer = get_tracer()
+    tracer.reset()
+
+    async def main():
+        parsed = await pipeline.parse.submit(PaperParser().parse_content_list, corpus_path("small_1col"))
+        with pytest.raises(FileNotFoundError):
+            await pipeline.parse.submit(PaperParser().parse, "missing.pdf")
+        return parsed
+
+    try:
+        paper = asyncio.run(main())
+    finally:
+        pipeline.shutdown()
+    assert paper.body
+    spans = {s.name: s for s in tracer.spans}
+    assert {"layout", "classify", "paragraphs", "extras"} <= set(spans)
+    stage = [s for s in tracer.spans if s.name == "pipeline.parse"][0]
+    assert spans["layout"].parent_id == stage.span_id
+    assert spans["paragraphs"].attributes["paragraphs"] == len(paper.body)
+
+
+def test_lru_cache_evicts_least_recently_used():
+    cache = LRUCache(maxsize=2)
+    cache[("ko", "a")] = "가"
+    cache[("ko", "b")] = "나"
+    assert cache[("ko", "a")] == "가"  # a가 최근 사용
+    cache[("ko", "c")] = "다"
+    assert list(cache) == [("ko", "a"), ("ko", "c")]
@@ -0,0 +1,71 @@
+"""원문/번역 문단 검색 색인 테스트."""
+
+from src.models.paper import Paragraph, ParsedPaper
+from src.search import ORIGINAL, SearchIndex, tokenize
+
+
+def _paper(*texts):
+    body = [Paragraph(text=t, page=i // 2, bbox=[10, 10 + i, 500, 80 + i]) for i, t in enumerate(texts)]
+    return ParsedPaper(body=body, tables=[], figures=[], equations=[], metadata={})
+
+
+ORIGINAL_PAPER = _paper(
+    "The Transformer relies entirely on self-attention.",
+    "We train the model on WMT 2014 English-German data.",
+    "Results improve BLEU by 2.0 points.",
+)
+TRANSLATED_PAPER = _paper(
+    "트랜스포머는 전적으로 셀프 어텐션에 의존한다.",
+    "WMT 2014 영어-독일어 데이터로 모델을 학습한다.",
+    "결과는 BLEU를 2.0점 향상시킨다.",
+)
+
+
+def test_tokenize_korean_bigrams_and_words():
+    assert tokenize("모델을 Self-Attention") == ["모델", "델을", "self", "attention"]
+    assert tokenize("ＢＬＥＵ 점") == ["bleu", "점"]
+
+
+def test_search_both_languages_with_locations(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    assert index.add_paper("p1", ORIGINAL_PAPER, TRANSLATED_PAPER, "ko") == 6
+
+    hits = index.search("self-attention")
+    assert [(h.paper, h.lang, h.paragraph) for h in hits] == [("p1", ORIGINAL, 0)]
+    assert hits[0].page == 0 and hits[0].bbox == [10, 10, 500, 80] and hits[0].side == "original"
+
+    # 조사가 붙은 "모델을"도 "모델"로 검색
+    hits = index.search("모델")
+    assert [(h.lang, h.paragraph, h.page) for h in hits] == [("ko", 1, 0)]
+    assert hits[0].to_dict()["side"] == "translated"
+
+    assert {h.lang for h in index.search("BLEU")} == {ORIGINAL, "ko"}
+    assert [h.lang for h in index.search("BLEU", lang="ko")] == ["ko"]
+    assert index.search("어텐션 데이터") == []  # 모든 토큰을 포함하는 문단만
+    assert index.search("없는단어") == []
+
+
+def test_phrase_matches_rank_first(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.add_paper("p1", _paper("attention layers use multi head attention", "head of the attention block"))
+    hits = index.search("head attention")
+    assert [h.paragraph for h in hits] == [0, 1]
+    assert hits[0].score > hits[1].score
+    assert "head attention" in hits[0].snippet
+
+
+def test_reindex_replaces_paper(tmp_path):
+    index = SearchIndex(tmp_path / "search.sqlite3")
+    index.add_paper("p1", ORIGINAL_PAPER, TRANSLATED_PAPER, "ko")
+    index.add_paper("p1", ORIGINAL_PAPER, _paper("새 번역 문단."), "ko")
+    index.add_paper("p2", _paper("Another paper about self-attention."))
+
+    assert index.search("트랜스포머") == []
+    assert [h.paragraph for h in index.search("번역", lang="ko")] == [0]
+    assert sorted(h.paper for h in index.search("self-attention")) == ["p1", "p2"]
+    assert index.stats()["paragraphs"] == 3 + 1 + 1
+
+    index.remove_paper("p1")
+    assert [h.paper for h in index.search("self-attention")] == ["p2"]
+    assert index.stats() == {"papers": 1, "paragraphs": 1, "terms": 5}
+
@@ -0,0 +1,15 @@
+"""Search index benchmark harness tests."""
+
+from benchmarks.search_bench import SyntheticCorpus, run_benchmark
+
+
+def test_synthetic_corpus_is_deterministic():
+    a, b = SyntheticCorpus(paragraphs=3, seed=1), SyntheticCorpus(paragraphs=3, seed=1)
+    assert [p.text for p in a.paper()[1].body] == [p.text for p in b.paper()[1].body]
+
+
+def test_search_bench_runs():
+    result = run_benchmark(papers=5, paragraphs=4, queries=12)
+    assert result["paragraphs"] == 5 * 4 * 2
+    assert result["query_ms"]["p99"] >= result["query_ms"]["p50"]
+    assert set(result["by_kind"]) == {f"{lang}-{kind}" for lang in ("en", "ko") for kind in ("rare", "common", "mixed")}
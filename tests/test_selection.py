@@ -0,0 +1,175 @@
+"""페이지/섹션 선택 처리 테스트."""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from src.models import Paragraph
+from src.parser import PaperParser, ParagraphBuilder
+from src.utils.selection import parse_page_spec, section_key, select_sections, selection_pages
+
+
+class TestPageSpec:
+    def test_ranges_and_singles(self):
+        assert parse_page_spec("1-3, 5") == [0, 1, 2, 4]
+        assert parse_page_spec("2") == [1]
+        assert parse_page_spec("") is None
+        assert parse_page_spec(None) is None
+
+    def test_open_range_and_clamp(self):
+        assert parse_page_spec("3-", page_count=4) == [2, 3]
+        assert parse_page_spec("1-10", page_count=3) == [0, 1, 2]
+
+    @pytest.mark.parametrize("spec", ["0", "5-2", "a-b", "3-", "1-999999999", "2001"])
+    def test_invalid(self, spec):
+        with pytest.raises(ValueError):
+            parse_page_spec(spec)
+
+    def test_range_beyond_page_count(self):
+        assert parse_page_spec("1-999999999", page_count=5) == [0, 1, 2, 3, 4]
+        with pytest.raises(ValueError):
+            parse_page_spec("6-8", page_count=5)
+
+
+class TestSections:
+    def _paragraphs(self):
+        blocks = [
+            {"type": "text", "text": "A Paper Title", "text_level": 1, "page_idx": 0},
+            {"type": "text", "text": "Abstract. We study things.", "page_idx": 0},
+            {"type": "text", "text": "1 Introduction", "text_level": 1, "page_idx": 0},
+            {"type": "text", "text": "Intro text.", "page_idx": 0},
+            {"type": "text", "text": "2 Method", "text_level": 1, "page_idx": 1},
+            {"type": "text", "text": "2.1 Setup", "text_level": 1, "page_idx": 1},
+            {"type": "text", "text": "Setup text.", "page_idx": 2},
+            {"type": "text", "text": "3 Conclusions and Future Work", "text_level": 1, "page_idx": 3},
+            {"type": "text", "text": "Done.", "page_idx": 3},
+        ]
+        return ParagraphBuilder().merge_broken_paragraphs(blocks)
+
+    def test_paragraphs_carry_top_level_section(self):
+        """하위 섹션(2.1) 문단은 상위 섹션(2 Method)에 속함."""
+        sections = {p.text: p.section for p in self._paragraphs()}
+        assert sections["Intro text."] == "1 Introduction"
+        assert sections["Setup text."] == "2 Method"
+        assert section_key("II. RELATED WORK") == "related work"
+
+    def test_select_sections(self):
+        selected = select_sections(self._paragraphs(), ["abstract", "introduction", "conclusion"])
+        assert [p.text for p in selected] == [
+            "Abstract. We study things.",
+            "1 Introduction",
+            "Intro text.",
+            "3 Conclusions and Future Work",
+            "Done.",
+        ]
+        assert selection_pages(selected) == [0, 3]
+
+    def test_ieee_roman_numeral_outline(self):
+        """"I. INTRODUCTION"/"V. CONCLUSION"은 최상위 섹션, "A."/"B."는 하위 섹션."""
+        titles = [
+            "Hedging Requests in Large Language Model Serving",
+            "I. INTRODUCTION",
+            "II. METHOD",
+            "A. Datasets",
+            "B. Training",
+            "III. RESULTS",
+            "V. CONCLUSION",
+        ]
+        blocks = []
+        for i, title in enumerate(titles):
+            blocks.append({"type": "text", "text": title, "text_level": 1, "page_idx": i})
+            blocks.append({"type": "text", "text": f"Text {i}.", "page_idx": i})
+        paragraphs = ParagraphBuilder().merge_broken_paragraphs(blocks)
+
+        sections = {p.text: p.section for p in paragraphs}
+        assert sections["Text 0."] == titles[0]
+        assert sections["Text 1."] == "I. INTRODUCTION"
+        assert sections["Text 3."] == sections["Text 4."] == "II. METHOD"
+        assert sections["Text 6."] == "V. CONCLUSION"
+        assert [p.text for p in select_sections(paragraphs, ["introduction"])] == ["I. INTRODUCTION", "Text 1."]
+        assert [p.text for p in select_sections(paragraphs, ["conclusion"])] == ["V. CONCLUSION", "Text 6."]
+
+    def test_letter_subsections_need_numbered_parent(self):
+        blocks = [
+            {"type": "text", "text": "Appendix", "text_level": 1, "page_idx": 0},
+            {"type": "text", "text": "A. Proofs", "text_level": 1, "page_idx": 0},
+            {"type": "text", "text": "Proof text.", "page_idx": 0},
+            {"type": "text", "text": "IV. RESULTS", "text_level": 1, "page_idx": 1},
+            {"type": "text", "text": "H. Ablations", "text_level": 1, "page_idx": 1},
+            {"type": "text", "text": "I. Scaling", "text_level": 1, "page_idx": 1},
+            {"type": "text", "text": "Scaling text.", "page_idx": 1},
+        ]
+        sections = {p.text: p.section for p in ParagraphBuilder().merge_broken_paragraphs(blocks)}
+        assert sections["Proof text."] == "A. Proofs"
+        assert sections["Scaling text."] == "IV. RESULTS"  # H 다음의 "I."는 하위 섹션
+
+    def test_selection_pages_includes_merged_regions(self):
+        para = Paragraph(text="x", page=1, bboxes=[{"bbox": [0, 0, 1, 1], "page": 1}, {"bbox": [0, 0, 1, 1], "page": 2}])
+        assert selection_pages([para]) == [1, 2]
+
+
+class TestParserPages:
+    def _write_cache(self, root: Path, stem: str, start: int, end: int) -> None:
+        path = PaperParser._range_content_list_path(Path(f"{stem}.pdf"), start, end, root)
+        path.parent.mkdir(parents=True)
+        # MinerU는 잘라낸 PDF 기준으로 page_idx를 0부터 매긴다
+        blocks = [{"type": "text", "text": f"Page {p}.", "page_idx": p - start} for p in range(start, end + 1)]
+        path.write_text(json.dumps(blocks), encoding="utf-8")
+
+    def test_mineru_pages_reuse_cached_ranges(self, tmp_path, monkeypatch):
+        """이미 처리한 구간(0-4)은 재사용하고 남은 페이지(5-6)만 MinerU 실행."""
+        monkeypatch.chdir(tmp_path)
+        self._write_cache(Path("output"), "paper", 0, 4)
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+
+        invoked = []
+
+        def fake_invoke(path, run_root, extra_args=None):
+            invoked.append(extra_args)
+            start, end = int(extra_args[1]), int(extra_args[3])
+            self._write_cache(Path("output"), "paper", start, end)
+            return "cpu"
+
+        monkeypatch.setattr(PaperParser, "_invoke_mineru", staticmethod(fake_invoke))
+        paper = PaperParser(engine="mineru").parse(pdf_path, pages=[1, 2, 5, 6])
+
+        assert invoked == [["-s", "5", "-e", "6"]]
+        assert [p.page for p in paper.body] == [1, 2, 5, 6]
+        assert [p.text for p in paper.body] == ["Page 1.", "Page 2.", "Page 5.", "Page 6."]
+
+        # 같은 요청을 다시 하면 MinerU를 실행하지 않음
+        invoked.clear()
+        PaperParser(engine="mineru").parse(pdf_path, pages=[0, 6])
+        assert invoked == []
+
+    def test_catalog_records_and_serves_cached_ranges(self, tmp_path, monkeypatch):
+        """카탈로그에 기록된 MinerU 결과가 있으면 output/<stem>을 뒤지지 않는다."""
+        from src.catalog import Catalog
+        from src.utils.tracing import get_tracer
+
+        monkeypatch.chdir(tmp_path)
+        self._write_cache(Path("output"), "paper", 0, 4)
+        pdf_path = tmp_path / "paper.pdf"
+        pdf_path.write_bytes(b"%PDF-1.4")
+        catalog = Catalog(tmp_path / "catalog.sqlite3")
+
+        def fake_invoke(path, run_root, extra_args=None):
+            self._write_cache(Path("output"), "paper", int(extra_args[1]), int(extra_args[3]))
+            return "cpu"
+
+        monkeypatch.setattr(PaperParser, "_invoke_mineru", staticmethod(fake_invoke))
+        PaperParser(engine="mineru", catalog=catalog).parse(pdf_path, pages=[1, 6])
+        pdf_hash = catalog.register_pdf(pdf_path)
+        assert set(catalog.parse_outputs(pdf_hash)) == {(0, 4), (6, 6)}
+
+        def no_scan(*_args, **_kwargs):
+            raise AssertionError("catalog hit must not scan the output directory")
+
+        monkeypatch.setattr(PaperParser, "_cached_page_ranges", classmethod(no_scan))
+        monkeypatch.setattr(PaperParser, "_invoke_mineru", staticmethod(no_scan))
+        get_tracer().reset()
+        paper = PaperParser(engine="mineru", catalog=catalog).parse(pdf_path, pages=[2, 6], pdf_hash=pdf_hash)
+        assert [p.text for p in paper.body] == ["Page 2.", "Page 6."]
+        assert get_tracer().counter("catalog.parse_hits") > 0
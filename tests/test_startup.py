@@ -0,0 +1,28 @@
+"""CLI startup must not pull in the web stack or the OpenAI client."""
+
+import sys
+
+import pytest
+
+from benchmarks.startup import import_time_report, top_level_packages
+
+
+def test_cli_does_not_import_web_stack():
+    packages = top_level_packages(import_time_report("src.cli"))
+    assert "src" in packages
+    assert "gradio" not in packages
+    assert "openai" not in packages
+    assert "requests" not in packages
+    assert "fitz" not in packages
+
+
+def test_cli_backend_choices_come_from_registry(monkeypatch, capsys):
+    """An unknown --backend is rejected with the names listed in backends.BACKENDS."""
+    from src import cli
+    from src.translator import BACKENDS
+
+    monkeypatch.setattr(sys, "argv", ["cli", "paper.pdf", "--backend", "bogus"])
+    with pytest.raises(SystemExit) as exc:
+        cli.main()
+    assert exc.value.code == 2
+    assert ", ".join(BACKENDS) in capsys.readouterr().err
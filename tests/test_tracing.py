@@ -0,0 +1,111 @@
+"""Tracer tests: nesting, counters, exports."""
+
+import asyncio
+import json
+import pickle
+import urllib.request
+
+from src.utils.tracing import Tracer, serve_metrics
+
+
+def test_spans_nest_and_record_attributes():
+    tracer = Tracer()
+    with tracer.span("parse", pdf="a.pdf") as outer:
+        with tracer.span("mineru") as inner:
+            inner.attributes["blocks"] = 3
+    assert [s.name for s in tracer.spans] == ["mineru", "parse"]
+    assert inner.parent_id == outer.span_id
+    assert inner.attributes == {"blocks": 3}
+    assert outer.duration >= inner.duration
+
+
+def test_async_tasks_inherit_parent_span():
+    tracer = Tracer()
+
+    async def batch(i):
+        with tracer.span("translate.batch", index=i):
+            await asyncio.sleep(0)
+
+    async def run():
+        with tracer.span("translate") as parent:
+            await asyncio.gather(*(batch(i) for i in range(3)))
+        return parent
+
+    parent = asyncio.run(run())
+    batches = [s for s in tracer.spans if s.name == "translate.batch"]
+    assert len(batches) == 3
+    assert all(s.parent_id == parent.span_id for s in batches)
+
+
+def test_error_is_recorded():
+    tracer = Tracer()
+    try:
+        with tracer.span("download"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert tracer.spans[0].attributes["error"] == "ValueError"
+
+
+def test_jsonl_and_prometheus_export(tmp_path):
+    tracer = Tracer()
+    with tracer.span("render"):
+        pass
+    tracer.add("translate.prompt_tokens", 120)
+    tracer.add("translate.prompt_tokens", 30)
+    tracer.add("translate.bisect", depth=1)
+
+    path = tmp_path / "trace.jsonl"
+    tracer.export_jsonl(path)
+    records = [json.loads(line) for line in path.read_text().splitlines()]
+    assert records[0]["kind"] == "span" and records[0]["name"] == "render"
+    assert {"kind": "counter", "name": "translate.prompt_tokens", "labels": {}, "value": 150} in records
+
+    text = tracer.prometheus_text()
+    assert "sunlight_translate_prompt_tokens_total 150" in text
+    assert 'sunlight_translate_bisect_total{depth="1"} 1' in text
+    assert 'sunlight_span_duration_seconds_count{span="render"} 1' in text
+
+
+def test_metrics_endpoint():
+    tracer = Tracer()
+    tracer.add("translate.requests", 2)
+    server = serve_metrics(port=0, tracer=tracer)
+    try:
+        port = server.server_address[1]
+        body = urllib.request.urlopen(f"http://127.0.0.1:{port}/metrics").read().decode()
+        assert "sunlight_translate_requests_total 2" in body
+    finally:
+        server.shutdown()
+
+
+def test_span_history_is_bounded_but_summary_counts_all():
+    tracer = Tracer(max_spans=3)
+    for i in range(10):
+        with tracer.span("translate.batch", index=i):
+            pass
+    assert [s.attributes["index"] for s in tracer.spans] == [7, 8, 9]
+    (row,) = tracer.summary()
+    assert row["name"] == "translate.batch" and row["count"] == 10
+    tracer.reset()
+    assert tracer.summary() == [] and not tracer.spans
+
+
+def test_merge_snapshot_from_other_process():
+    worker = Tracer()
+    with worker.span("parse"):
+        with worker.span("layout"):
+            pass
+    worker.add("catalog.parse_hits", 2)
+    snapshot = pickle.loads(pickle.dumps(worker.snapshot()))
+
+    tracer = Tracer()
+    tracer.add("catalog.parse_hits")
+    with tracer.span("pipeline.parse") as stage:
+        tracer.merge(snapshot)
+    spans = {s.name: s for s in tracer.spans}
+    assert spans["parse"].parent_id == stage.span_id
+    assert spans["layout"].parent_id == spans["parse"].span_id
+    assert len({s.span_id for s in tracer.spans}) == 3
+    assert tracer.counter("catalog.parse_hits") == 3
+    assert {row["name"] for row in tracer.summary()} == {"pipeline.parse", "parse", "layout"}
@@ -0,0 +1,60 @@
+"""Translation benchmark harness and OpenAI stub server tests."""
+
+from benchmarks.mock_openai import StubConfig
+from benchmarks.translate_bench import run_benchmark, synthetic_paper
+
+
+def test_synthetic_paper_is_deterministic():
+    a = synthetic_paper(40, seed=1)
+    b = synthetic_paper(40, seed=1)
+    assert [p.text for p in a.body] == [p.text for p in b.body]
+    assert len(a.body) == 40
+
+
+def test_benchmark_translates_everything_through_stub():
+    result = run_benchmark(50, StubConfig(), batch_size=10)
+    assert result["untranslated"] == 0
+    assert result["requests"] == result["batches"]
+    assert result["status"] == {"200": result["requests"]}
+    assert result["prompt_tokens"] > 0 and result["completion_tokens"] > 0
+    assert result["mask_saved_tokens"] > 0 and result["placeholder_errors"] == 0
+    assert result["batch_latency_ms"]["p99"] >= result["batch_latency_ms"]["p50"]
+
+
+def test_malformed_replies_fall_back():
+    result = run_benchmark(50, StubConfig(malformed_rate=1.0), batch_size=10)
+    assert result["untranslated"] == 0
+    assert result["malformed_replies"] > 0
+    assert result["fallbacks"] == result["batches"]
+    assert result["bisect"]["1"] == 2 * result["batches"]
+
+
+def test_streaming_resumes_cut_and_truncated_streams():
+    config = StubConfig(stream_cut_rate=0.3, stream_length_rate=0.3)
+    result = run_benchmark(50, config, batch_size=10, stream=True)
+    assert result["untranslated"] == 0
+    assert result["stream_resumes"] > 0
+    assert result["first_segment_ms"] is not None
+
+
+def test_stub_reports_prompt_cache_hits():
+    result = run_benchmark(50, StubConfig(cache_min_tokens=0), batch_size=5)
+    assert result["untranslated"] == 0
+    assert 0 < result["cached_tokens"] < result["prompt_tokens"]
+
+
+def test_stragglers_are_hedged_within_budget():
+    # seed 0: stragglers fall after the first concurrent wave has warmed the tracker
+    config = StubConfig(latency_ms=20, straggler_rate=0.05, straggler_ms=1000, seed=0)
+    result = run_benchmark(400, config, batch_size=5)
+    assert result["untranslated"] == 0
+    assert result["hedges"] > 0 and result["hedge_wins"] > 0
+    assert result["hedge_rate"] <= 0.1 + 1 / result["batches"]
+    assert result["hedge_wasted_tokens"] > 0
+
+
+def test_no_hedge_waits_for_stragglers():
+    config = StubConfig(latency_ms=20, straggler_rate=0.1, straggler_ms=500, seed=3)
+    result = run_benchmark(100, config, batch_size=5, hedge=False)
+    assert result["hedges"] == 0
+    assert result["batch_latency_ms"]["p99"] >= 500
@@ -1,8 +1,26 @@
+import asyncio
+
 import pytest
 from unittest.mock import Mock, patch
 
-from src.models.paper import Paragraph, ParsedPaper
-from src.translator import PaperTranslator
+from benchmarks.mock_openai import MockOpenAIServer, StubConfig
+from src.models.paper import Figure, Paragraph, ParsedPaper, Table
+from src.translator import (
+    CTranslate2Backend,
+    EchoBackend,
+    PaperContext,
+    PaperTranslator,
+    StreamInterrupted,
+    TermStore,
+    TranslationBackend,
+    ViewportHint,
+    apply_translations,
+    collect_units,
+    create_backend,
+)
+from src.translator.backends import SegmentSplitter
+from src.translator.scheduler import deferred_unit_ids
+from src.utils.tracing import get_tracer
 
 
 def test_translate_preserves_tables():
@@ -91,3 +109,442 @@ class TestShouldSkipTranslation:
     def test_bracket_latex_skip(self):
         r"""\[ ... \] 형태 LaTeX -> True."""
         assert PaperTranslator._should_skip_translation(r"\[ x^2 + y^2 = z^2 \]") is True
+
+
+# ------------------------------------------------------------------
+# Translation units (tables, captions, footnotes)
+# ------------------------------------------------------------------
+
+
+def _fake_async_client(prefix: str = "번역:"):
+    """배치 입력을 세그먼트별로 prefix를 붙여 돌려주는 AsyncOpenAI mock."""
+    calls = []
+
+    async def create(model, messages, **kwargs):
+        content = messages[-1]["content"]
+        calls.append(content)
+        segments = [s.strip() for s in content.split(PaperTranslator.SEPARATOR)]
+        reply = f"\n{PaperTranslator.SEPARATOR}\n".join(f"{prefix}{s}" for s in segments)
+        return Mock(choices=[Mock(message=Mock(content=reply))])
+
+    client = Mock()
+    client.chat.completions.create = create
+    return client, calls
+
+
+def _paper_with_extras() -> ParsedPaper:
+    return ParsedPaper(
+        body=[
+            Paragraph(text="Deep networks learn features.", page=0, bbox=[0, 0, 1, 1]),
+            Paragraph(text="$x + y$", page=0),
+        ],
+        tables=[
+            Table(
+                html="<table><tr><th>Model</th><th>Acc</th></tr><tr><td>Our model</td><td>91.2</td></tr></table>",
+                caption="Results on the test set",
+                page=1,
+            )
+        ],
+        figures=[Figure(path="fig.png", caption=["Overview of the method"], page=2)],
+        equations=[],
+        metadata={"raw": [
+            {"type": "header", "text": "Preprint"},
+            {"type": "page_footnote", "text": "Work done during an internship.", "page_idx": 0},
+        ]},
+    )
+
+
+class TestTranslationUnits:
+    def test_collect_units_covers_all_parts(self):
+        units = collect_units(_paper_with_extras())
+        ids = [u.unit_id for u in units]
+        assert ids == [
+            "body:0",
+            "body:1",
+            "table:0:caption",
+            "table:0:cell:0",
+            "table:0:cell:1",
+            "table:0:cell:2",
+            "table:0:cell:3",
+            "figure:0:caption:0",
+            "footnote:1",
+        ]
+        assert units[5].text == "Our model"
+
+    def test_body_only(self):
+        units = collect_units(_paper_with_extras(), include_extras=False)
+        assert [u.kind for u in units] == ["body", "body"]
+
+    def test_apply_reassembles_table_html(self):
+        paper = _paper_with_extras()
+        result = apply_translations(paper, {"table:0:cell:2": "우리 모델 <v2>", "footnote:1": "인턴십 중 수행."})
+        assert result.tables[0].html == (
+            "<table><tr><th>Model</th><th>Acc</th></tr>"
+            "<tr><td>우리 모델 &lt;v2&gt;</td><td>91.2</td></tr></table>"
+        )
+        assert result.metadata["raw"][1]["text"] == "인턴십 중 수행."
+        assert paper.metadata["raw"][1]["text"] == "Work done during an internship."
+
+
+class TestTranslateAsync:
+    def _translator(self):
+        with patch("src.translator.openai_translator.AsyncOpenAI") as mock:
+            client, calls = _fake_async_client()
+            mock.return_value = client
+            translator = PaperTranslator(api_key="test")
+        return translator, calls
+
+    def test_whole_paper_in_one_pass(self):
+        translator, calls = self._translator()
+        result = asyncio.run(translator.translate_async(_paper_with_extras(), "ko"))
+
+        assert len(calls) == 1
+        assert result.body[0].text == "번역:Deep networks learn features."
+        assert result.body[0].bbox == [0, 0, 1, 1]
+        assert result.body[1].text == "$x + y$"
+        assert result.tables[0].caption == "번역:Results on the test set"
+        assert "<td>번역:Our model</td><td>91.2</td>" in result.tables[0].html
+        assert result.figures[0].caption == ["번역:Overview of the method"]
+        assert result.metadata["raw"][1]["text"] == "번역:Work done during an internship."
+
+    def test_duplicates_and_cache(self):
+        translator, calls = self._translator()
+        paper = ParsedPaper(
+            body=[Paragraph(text="Same sentence here.") for _ in range(3)],
+            tables=[], figures=[], equations=[], metadata={},
+        )
+        asyncio.run(translator.translate_async(paper, "ko"))
+        assert calls == ["Same sentence here."]
+
+        result = asyncio.run(translator.translate_async(paper, "ko"))
+        assert len(calls) == 1
+        assert [p.text for p in result.body] == ["번역:Same sentence here."] * 3
+
+    def test_batches_are_token_packed(self):
+        batches = PaperTranslator._pack_batches(["a" * 400, "b" * 400, "c" * 40], batch_size=25, max_batch_tokens=150)
+        assert [len(b) for b in batches] == [1, 2]
+
+
+class TestBackends:
+    def _paper(self, n=6):
+        return ParsedPaper(
+            body=[Paragraph(text=f"Paragraph number {i} is here.", page=i) for i in range(n)],
+            tables=[], figures=[], equations=[], metadata={},
+        )
+
+    def test_echo_backend_through_shared_pipeline(self):
+        """echo 백엔드도 같은 배치/중복 제거/캐시 경로를 거침."""
+        backend = EchoBackend()
+        translator = PaperTranslator(backend=backend)
+        paper = _paper_with_extras()
+        result = asyncio.run(translator.translate_async(paper, "ko", batch_size=2))
+
+        assert result.body[0].text == "[ko] Deep networks learn features."
+        assert result.body[1].text == "$x + y$"
+        assert result.tables[0].caption == "[ko] Results on the test set"
+        assert all(len(batch) <= 2 for batch in backend.calls)
+
+        calls = len(backend.calls)
+        asyncio.run(translator.translate_async(paper, "ko"))
+        assert len(backend.calls) == calls  # 두 번째 호출은 캐시
+
+    def test_sync_translate_keeps_paragraph_fields(self):
+        translator = PaperTranslator(backend=EchoBackend())
+        result = translator.translate(self._paper(2), "ja")
+        assert [p.text for p in result.body] == ["[ja] Paragraph number 0 is here.", "[ja] Paragraph number 1 is here."]
+        assert result.body[1].page == 1
+
+    def test_max_concurrency_is_respected(self):
+        active = peak = 0
+
+        class SlowBackend(EchoBackend):
+            max_concurrency = 2
+
+            async def translate_batch_async(self, texts, target_lang):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.01)
+                active -= 1
+                return self.translate_batch(texts, target_lang)
+
+        asyncio.run(PaperTranslator(backend=SlowBackend()).translate_async(self._paper(8), "ko", batch_size=1))
+        assert peak == 2
+
+    def test_context_limit_caps_batch_tokens(self):
+        backend = EchoBackend()
+        backend.max_context_tokens = 20  # 배치당 10 토큰 -> 문단 하나씩
+        asyncio.run(PaperTranslator(backend=backend).translate_async(self._paper(3), "ko"))
+        assert [len(b) for b in backend.calls] == [1, 1, 1]
+
+    def test_mismatched_batch_falls_back_to_single(self):
+        class MergingBackend(EchoBackend):
+            def translate_batch(self, texts, target_lang):
+                out = super().translate_batch(texts, target_lang)
+                return out if len(out) == 1 else [" ".join(out)]
+
+        result = asyncio.run(PaperTranslator(backend=MergingBackend()).translate_async(self._paper(3), "ko"))
+        assert [p.text for p in result.body] == [f"[ko] Paragraph number {i} is here." for i in range(3)]
+
+    def test_failing_batch_is_bisected(self):
+        """실패한 배치는 문단별 요청 대신 절반씩 나눠 재시도."""
+
+        class PoisonBackend(EchoBackend):
+            def translate_batch(self, texts, target_lang):
+                if len(texts) > 1 and any("number 5 " in t for t in texts):
+                    self.calls.append(list(texts))
+                    raise RuntimeError("bad batch")
+                return super().translate_batch(texts, target_lang)
+
+        backend = PoisonBackend()
+        get_tracer().reset()
+        result = asyncio.run(PaperTranslator(backend=backend).translate_async(self._paper(8), "ko"))
+
+        assert [p.text for p in result.body] == [f"[ko] Paragraph number {i} is here." for i in range(8)]
+        # 8 -> 4+4 -> 2+2 -> 1+1: 전체 2회 + 절반 6회 (문단별 폴백이면 8회 추가)
+        assert sorted((len(b) for b in backend.calls), reverse=True) == [8, 8, 4, 4, 2, 2, 1, 1]
+        tracer = get_tracer()
+        assert tracer.counter("translate.fallbacks") == 1
+        assert [tracer.counter("translate.bisect", depth=d) for d in (1, 2, 3)] == [2, 2, 2]
+
+    def test_bisect_retries_respect_max_concurrency(self):
+        active = peak = 0
+
+        class MergingSlowBackend(EchoBackend):
+            max_concurrency = 2
+
+            async def translate_batch_async(self, texts, target_lang):
+                nonlocal active, peak
+                active += 1
+                peak = max(peak, active)
+                await asyncio.sleep(0.005)
+                active -= 1
+                out = self.translate_batch(texts, target_lang)
+                return out if len(out) == 1 else [" ".join(out)]
+
+        paper = self._paper(12)
+        result = asyncio.run(
+            PaperTranslator(backend=MergingSlowBackend()).translate_async(paper, "ko", batch_size=6)
+        )
+        assert [p.text for p in result.body] == [f"[ko] {p.text}" for p in paper.body]
+        assert peak == 2
+
+    def test_sync_translate_bisects_failed_batch(self):
+        class MergingBackend(EchoBackend):
+            def translate_batch(self, texts, target_lang):
+                out = super().translate_batch(texts, target_lang)
+                return out if len(out) < 3 else [" ".join(out)]
+
+        backend = MergingBackend()
+        result = PaperTranslator(backend=backend).translate(self._paper(4), "ko")
+        assert [p.text for p in result.body] == [f"[ko] Paragraph number {i} is here." for i in range(4)]
+        assert [len(b) for b in backend.calls] == [4, 2, 2]
+
+    def test_create_backend(self):
+        assert isinstance(create_backend("echo"), EchoBackend)
+        local = create_backend("local", model_dir="models/none")
+        assert isinstance(local, CTranslate2Backend)
+        assert local._translator is None  # 모델은 첫 번역 때 로드
+        with pytest.raises(ValueError):
+            create_backend("deepl")
+
+    def test_incomplete_backend_fails_at_construction(self):
+        """translate_batch 없는 백엔드는 번역 도중이 아니라 생성 시점에 실패."""
+
+        class NoBatchBackend(TranslationBackend):
+            name = "incomplete"
+
+        with pytest.raises(TypeError, match="translate_batch"):
+            NoBatchBackend()
+
+    def test_sentence_split_for_local_backend(self):
+        text = "We train a model. It works well! See Fig. 2 and $x$ values."
+        assert CTranslate2Backend.split_sentences(text) == [
+            "We train a model.",
+            "It works well!",
+            "See Fig. 2 and $x$ values.",
+        ]
+
+
+class TestStreaming:
+    def _paper(self, n=5):
+        return ParsedPaper(
+            body=[Paragraph(text=f"Paragraph number {i} is here.") for i in range(n)],
+            tables=[], figures=[], equations=[], metadata={},
+        )
+
+    def test_segment_splitter_handles_split_separator(self):
+        splitter = SegmentSplitter("\n---\n")
+        assert splitter.feed("first\n-") == []
+        assert splitter.feed("--\nsec") == ["first"]
+        assert splitter.feed("ond\n---\nthird") == ["second"]
+        assert splitter.close() == "third"
+
+    def test_on_segment_called_per_paragraph(self):
+        seen = []
+        result = asyncio.run(
+            PaperTranslator(backend=EchoBackend()).translate_async(
+                self._paper(), "ko", batch_size=2, stream=True, on_segment=lambda u, t: seen.append(t)
+            )
+        )
+        assert sorted(seen) == sorted(p.text for p in result.body)
+        assert len(seen) == 5
+
+    def test_broken_stream_resumes_tail_only(self):
+        """끊긴 스트림은 받은 문단을 유지하고 나머지만 다시 요청."""
+        requests = []
+
+        class CuttingBackend(EchoBackend):
+            async def stream_batch(self, texts, target_lang):
+                requests.append(list(texts))
+                for i, text in enumerate(texts):
+                    if len(requests) == 1 and i == 2:
+                        raise StreamInterrupted("cut")
+                    yield f"[{target_lang}] {text}"
+
+        paper = self._paper()
+        result = asyncio.run(PaperTranslator(backend=CuttingBackend()).translate_async(paper, "ko", stream=True))
+
+        assert [p.text for p in result.body] == [f"[ko] {p.text}" for p in paper.body]
+        assert requests[1] == [p.text for p in paper.body[2:]]
+
+    def test_misaligned_stream_falls_back(self):
+        class MergingStream(EchoBackend):
+            async def stream_batch(self, texts, target_lang):
+                yield " ".join(f"[{target_lang}] {t}" for t in texts)
+
+        paper = self._paper(3)
+        result = asyncio.run(PaperTranslator(backend=MergingStream()).translate_async(paper, "ko", stream=True))
+        assert [p.text for p in result.body] == [f"[ko] {p.text}" for p in paper.body]
+
+
+class TestScheduling:
+    def _paper(self, sections):
+        """섹션 이름 리스트 -> 페이지 i에 문단 하나씩."""
+        return ParsedPaper(
+            body=[
+                Paragraph(text=f"Paragraph on page {i} is here.", page=i, section=section)
+                for i, section in enumerate(sections)
+            ],
+            tables=[], figures=[], equations=[], metadata={},
+        )
+
+    def _run(self, paper, backend=None, **kwargs):
+        backend = backend or EchoBackend()
+        backend.max_concurrency = 1
+        result = asyncio.run(PaperTranslator(backend=backend).translate_async(paper, "ko", batch_size=1, **kwargs))
+        pages = [int(batch[0].split()[3]) for batch in backend.calls]
+        return result, pages
+
+    def test_reading_order_with_extras_by_page(self):
+        """표 캡션은 본문 뒤에 수집되지만 자기 페이지 순서에 번역됨."""
+        paper = self._paper(["Intro"] * 3)
+        paper.tables = [Table(html="", caption="Results on page 1 here", page=1)]
+        backend = EchoBackend()
+        backend.max_concurrency = 1
+        asyncio.run(PaperTranslator(backend=backend).translate_async(paper, "ko", batch_size=1))
+        assert [b[0] for b in backend.calls] == [
+            "Paragraph on page 0 is here.",
+            "Paragraph on page 1 is here.",
+            "Results on page 1 here",
+            "Paragraph on page 2 is here.",
+        ]
+
+    def test_viewport_pages_first_then_nearest(self):
+        _, pages = self._run(self._paper(["Intro"] * 6), viewport=ViewportHint([3]))
+        assert pages == [3, 2, 4, 1, 5, 0]
+
+    def test_viewport_update_reorders_pending_batches(self):
+        hint = ViewportHint()
+
+        class ScrollingBackend(EchoBackend):
+            def translate_batch(self, texts, target_lang):
+                if not self.calls:
+                    hint.set([5])  # 첫 배치 도중 사용자가 5쪽으로 스크롤
+                return super().translate_batch(texts, target_lang)
+
+        _, pages = self._run(self._paper(["Intro"] * 6), backend=ScrollingBackend(), viewport=hint)
+        assert pages == [0, 5, 4, 3, 2, 1]
+
+    def test_footnotes_and_references_run_last(self):
+        paper = self._paper(["Intro", "Method", "References", "A Proofs", "Method"])
+        paper.metadata = {"raw": [{"type": "page_footnote", "text": "Footnote on page 0 here.", "page_idx": 0}]}
+        _, pages = self._run(paper)
+        # 0쪽 각주도 본문 뒤로, 참고문헌 이후 문단은 섹션 이름과 무관하게 모두 미뤄짐
+        assert pages == [0, 1, 0, 2, 3, 4]
+
+    def test_deferred_unit_ids(self):
+        paper = self._paper(["Intro", "Method", "References", "A Proofs"])
+        paper.tables = [Table(html="", caption="Early table", page=1), Table(html="", caption="Late table", page=3)]
+        paper.metadata = {"raw": [{"type": "page_footnote", "text": "Footnote text.", "page_idx": 0}]}
+        assert deferred_unit_ids(collect_units(paper)) == {"body:2", "body:3", "table:1:caption", "footnote:0"}
+
+    def test_budget_skips_only_deferred_batches(self):
+        paper = self._paper(["Intro", "Intro", "References", "Appendix"])
+        result, pages = self._run(paper, budget_tokens=1)
+        assert pages == [0, 1]
+        assert result.body[1].text.startswith("[ko] ")
+        assert result.body[3].text == paper.body[3].text
+
+    def test_viewport_overrides_budget_deferral(self):
+        paper = self._paper(["Intro", "References", "Appendix"])
+        _, pages = self._run(paper, viewport=ViewportHint([2]), budget_tokens=1)
+        assert pages == [2, 0]
+
+
+class TestPromptContext:
+    def _paper(self):
+        return ParsedPaper(
+            body=[
+                Paragraph(text="Abstract. We study a Graph Neural Network for molecules.", section=None),
+                Paragraph(text="The Graph Neural Network has many layers.", section="1 Introduction"),
+                Paragraph(text="Results follow the usual protocol here.", section="1 Introduction"),
+            ],
+            tables=[], figures=[], equations=[],
+            metadata={"raw": [{"type": "text", "text": "Molecular  Graphs", "text_level": 1, "page_idx": 0}]},
+        )
+
+    def test_from_paper_header_and_sorted_glossary(self):
+        store = TermStore()
+        store.learn("Message Passing", "메시지 전달")
+        store.learn("Graph Neural Network", "그래프 신경망")
+        paper = self._paper()
+        context = PaperContext.from_paper(paper, store, [p.text for p in paper.body])
+
+        assert context.title == "Molecular Graphs"
+        assert context.abstract == "We study a Graph Neural Network for molecules."
+        assert context.glossary == (("graph neural network", "그래프 신경망"),)
+        assert context.render() == PaperContext.from_paper(paper, store, [p.text for p in paper.body]).render()
+
+    def test_batches_share_byte_identical_prefix(self):
+        """모든 배치 요청이 같은 system 메시지로 시작 (프롬프트 캐시 적중 조건)."""
+        seen = []
+        with MockOpenAIServer(StubConfig(cache_min_tokens=0)) as server:
+            translator = PaperTranslator(api_key="stub", base_url=server.base_url)
+            create = translator.backend.async_client.chat.completions.create
+
+            async def spy(**kwargs):
+                seen.append(kwargs)
+                return await create(**kwargs)
+
+            translator.backend.async_client.chat.completions.create = spy
+            get_tracer().reset()
+            translator.backend.max_concurrency = 1
+            asyncio.run(translator.translate_async(self._paper(), "ko", batch_size=1))
+
+        assert len(seen) == 3
+        assert len({kw["messages"][0]["content"] for kw in seen}) == 1
+        assert "Title: Molecular Graphs" in seen[0]["messages"][0]["content"]
+        assert {kw["prompt_cache_key"] for kw in seen} == {PaperContext.from_paper(self._paper()).cache_key}
+        assert get_tracer().counter("translate.cached_tokens") > 0
+
+    def test_batch_glossary_skips_terms_in_prefix(self):
+        store = TermStore()
+        store.learn("Graph Neural Network", "그래프 신경망")
+        translator = PaperTranslator(backend=EchoBackend(), glossary=store)
+        context = PaperContext(glossary=(("graph neural network", "그래프 신경망"),))
+        texts = ["A Graph Neural Network."]
+        assert translator._batch_glossary(texts, {"graph neural network"}, context) == {}
+        assert translator._batch_glossary(texts, set(), context) == {
+            "Graph Neural Network": "그래프 신경망(Graph Neural Network)"
+        }